@@ -12,13 +12,18 @@ This script demonstrates programmatic schema analysis:
 import argparse
 from pathlib import Path
 from collections import defaultdict
-from linkml_runtime.utils.schemaview import SchemaView
 from typing import Dict, List, Set, Tuple
 
+try:
+    from linkml_coral.utils.schema_snapshot import load_schema_snapshot
+except ImportError:
+    # Fallback for when running from the repository root without installing
+    from src.linkml_coral.utils.schema_snapshot import load_schema_snapshot
+
 
 def analyze_schema(schema_path: Path) -> Dict:
     """Analyze a LinkML schema and return statistics."""
-    sv = SchemaView(str(schema_path))
+    sv = load_schema_snapshot(schema_path)
     
     stats = {
         'classes': {},
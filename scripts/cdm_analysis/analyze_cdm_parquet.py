@@ -5,51 +5,83 @@ Analyzes system tables, static data tables (sdt_*), and dynamic data tables (ddt
 """
 
 import pandas as pd
+import pyarrow.parquet as pq
 from pathlib import Path
 import json
 from collections import defaultdict
 from typing import Dict, List, Any
 
+from parquet_footers import parquet_files, scan_cdm_footers
+
 # Path to the parquet database
 DB_PATH = Path("data/enigma_coral.db")
 
+_footers = None
+
+
+def get_footers() -> Dict[str, Dict[str, Any]]:
+    """Footers of every table under DB_PATH, scanned concurrently once per run."""
+    global _footers
+    if _footers is None:
+        _footers = scan_cdm_footers(DB_PATH)
+    return _footers
+
 def find_parquet_file(table_dir: Path) -> Path:
     """Find the actual parquet file in a Delta Lake table directory."""
-    # Look for .parquet files (not in _delta_log)
-    parquet_files = [f for f in table_dir.glob('*.parquet') if not f.parent.name.startswith('_')]
-    if parquet_files:
-        return parquet_files[0]  # Return first parquet file
+    files = parquet_files(table_dir)
+    if files:
+        return files[0]  # Return first parquet file
     return None
 
-def get_parquet_info(table_dir: Path) -> Dict[str, Any]:
-    """Get detailed information about a parquet table."""
+def read_sample(parquet_file: Path, rows: int = 100) -> pd.DataFrame:
+    """Read the first rows of a parquet file without decoding the rest."""
+    batch = next(pq.ParquetFile(parquet_file).iter_batches(batch_size=rows), None)
+    return batch.to_pandas() if batch is not None else pd.DataFrame()
+
+def get_parquet_info(table_dir: Path, load_data: bool = False) -> Dict[str, Any]:
+    """
+    Get detailed information about a parquet table.
+
+    Row counts, types, nullability and sizes come from the footers of all of
+    the table's files; only sample values are read from the data.
+
+    Args:
+        table_dir: CDM table directory
+        load_data: Also return the first file as a DataFrame under 'dataframe'
+
+    Returns:
+        Dict with row/column counts, column details and uncompressed size
+    """
     try:
-        # Find the parquet file
+        footer = get_footers().get(table_dir.name)
         parquet_file = find_parquet_file(table_dir)
-        if not parquet_file:
+        if not footer or not parquet_file:
             return {'error': 'No parquet file found'}
 
-        # Read the data
-        df = pd.read_parquet(parquet_file)
+        sample = read_sample(parquet_file)
 
         # Extract column information
         columns = []
-        for col_name in df.columns:
+        for col_name, col_footer in footer['columns'].items():
+            null_count = col_footer['null_count']
             col_info = {
                 'name': col_name,
-                'type': str(df[col_name].dtype),
-                'nullable': df[col_name].isna().any(),
-                'sample_values': df[col_name].dropna().head(3).tolist() if not df.empty else []
+                'type': col_footer['type'],
+                'nullable': null_count is None or null_count > 0,
+                'sample_values': (sample[col_name].dropna().head(3).tolist()
+                                  if col_name in sample.columns else [])
             }
             columns.append(col_info)
 
-        return {
-            'row_count': len(df),
-            'column_count': len(df.columns),
+        info = {
+            'row_count': footer['total_rows'],
+            'column_count': len(columns),
             'columns': columns,
-            'memory_usage_mb': df.memory_usage(deep=True).sum() / 1024 / 1024,
-            'dataframe': df  # Return df for further analysis
+            'size_mb': footer['uncompressed_bytes'] / 1024 / 1024,
         }
+        if load_data:
+            info['dataframe'] = pd.read_parquet(parquet_file)  # Return df for further analysis
+        return info
     except Exception as e:
         return {'error': str(e)}
 
@@ -79,7 +111,7 @@ def analyze_system_tables():
             print(f"  ⚠️  Table directory not found at {table_dir}")
             continue
 
-        info = get_parquet_info(table_dir)
+        info = get_parquet_info(table_dir, load_data=True)
         results[table_name] = info
 
         if 'error' in info:
@@ -88,7 +120,7 @@ def analyze_system_tables():
 
         print(f"  Rows: {info['row_count']:,}")
         print(f"  Columns: {info['column_count']}")
-        print(f"  Memory: {info['memory_usage_mb']:.2f} MB")
+        print(f"  Size: {info['size_mb']:.2f} MB")
         print(f"\n  Column Details:")
 
         for col in info['columns']:
@@ -159,21 +191,21 @@ def analyze_static_tables():
 
         print(f"  Rows: {info['row_count']:,}")
         print(f"  Columns: {info['column_count']}")
-        print(f"  Memory: {info['memory_usage_mb']:.2f} MB")
+        print(f"  Size: {info['size_mb']:.2f} MB")
 
         # Identify primary key pattern
-        df = info['dataframe']
-        pk_candidates = [col for col in df.columns if col.endswith('_id') and 'sys_oterm' not in col]
+        column_names = [col['name'] for col in info['columns']]
+        pk_candidates = [col for col in column_names if col.endswith('_id') and 'sys_oterm' not in col]
         if pk_candidates:
             print(f"  Primary Key Candidates: {', '.join(pk_candidates)}")
 
         # Identify foreign key patterns
-        fk_candidates = [col for col in df.columns if col.endswith('_id') and col not in pk_candidates and 'sys_oterm' not in col]
+        fk_candidates = [col for col in column_names if col.endswith('_id') and col not in pk_candidates and 'sys_oterm' not in col]
         if fk_candidates:
             print(f"  Foreign Key Candidates: {', '.join(fk_candidates)}")
 
         # Identify ontology term fields
-        oterm_fields = [col for col in df.columns if 'sys_oterm' in col]
+        oterm_fields = [col for col in column_names if 'sys_oterm' in col]
         if oterm_fields:
             print(f"  Ontology Term Fields: {', '.join(oterm_fields)}")
 
@@ -215,7 +247,7 @@ def analyze_dynamic_tables():
 
     ndarray_dir = DB_PATH / 'ddt_ndarray'
     if ndarray_dir.exists():
-        info = get_parquet_info(ndarray_dir)
+        info = get_parquet_info(ndarray_dir, load_data=True)
         results['ddt_ndarray'] = info
 
         if 'error' not in info:
@@ -256,7 +288,7 @@ def analyze_dynamic_tables():
 
         print(f"  Rows: {info['row_count']:,}")
         print(f"  Columns: {info['column_count']}")
-        print(f"  Memory: {info['memory_usage_mb']:.2f} MB")
+        print(f"  Size: {info['size_mb']:.2f} MB")
         print(f"\n  Columns:")
         for col in info['columns']:
             print(f"    - {col['name']}: {col['type']}")
@@ -290,15 +322,10 @@ def analyze_schema_differences():
     sample_tables = ['sdt_sample', 'sdt_location', 'sdt_asv']
 
     for table_name in sample_tables:
-        table_dir = DB_PATH / table_name
-        if table_dir.exists():
-            parquet_file = find_parquet_file(table_dir)
-            if not parquet_file:
-                continue
-            df = pd.read_parquet(parquet_file)
-
+        footer = get_footers().get(table_name)
+        if footer:
             # Look for ontology term splitting pattern
-            oterm_fields = [col for col in df.columns if 'sys_oterm' in col]
+            oterm_fields = [col for col in footer['columns'] if 'sys_oterm' in col]
             if oterm_fields:
                 base_fields = set()
                 for field in oterm_fields:
@@ -33,70 +33,62 @@ except ImportError:
     print("Error: pyarrow not installed. Run: uv pip install pyarrow")
     sys.exit(1)
 
+from parquet_footers import SPARK_METADATA_KEY, parquet_files, scan_cdm_footers
 
-def analyze_parquet_table(table_path: Path, sample_rows: int = 5) -> Dict[str, Any]:
+
+def analyze_parquet_table(table_path: Path, sample_rows: int = 5,
+                          footer: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """
     Analyze a single parquet table to extract metadata and structure.
 
     Args:
         table_path: Path to parquet file or directory (Delta Lake)
         sample_rows: Number of sample rows to include
+        footer: The table's entry from parquet_footers.scan_cdm_footers
+            (default: scan this table's footers)
 
     Returns:
         Dict with table metadata, schema, and sample data
     """
     table_name = table_path.name
 
-    # Read parquet metadata
-    parquet_files = list(table_path.glob("*.parquet"))
-    if not parquet_files:
+    if footer is None:
+        footer = scan_cdm_footers(table_path.parent, [table_name]).get(table_name)
+    files = parquet_files(table_path)
+    if footer is None or not files:
         return {"error": "No parquet files found"}
 
-    # Get schema from first parquet file
-    parquet_file = pq.ParquetFile(parquet_files[0])
-    schema = parquet_file.schema_arrow
-    metadata = parquet_file.metadata
-
-    # Extract column information
+    # Extract column information, with row-group statistics from all files
     columns = []
-    for i, field in enumerate(schema):
+    for col_name, col_footer in footer['columns'].items():
         col_info = {
-            'name': field.name,
-            'type': str(field.type),
-            'nullable': field.nullable,
+            'name': col_name,
+            'type': col_footer['type'],
+            'nullable': col_footer['nullable'],
+            'null_count': col_footer['null_count'],
+            'min': col_footer['min'],
+            'max': col_footer['max'],
         }
 
         # Extract field metadata if available
-        if field.metadata:
-            col_info['metadata'] = {
-                k.decode('utf-8'): v.decode('utf-8')
-                for k, v in field.metadata.items()
-            }
+        if col_footer['metadata']:
+            col_info['metadata'] = col_footer['metadata']
 
         columns.append(col_info)
 
     # Get table-level metadata
-    table_metadata = {}
-    if metadata.metadata:
-        table_metadata = {
-            k.decode('utf-8'): v.decode('utf-8')
-            for k, v in metadata.metadata.items()
-        }
+    table_metadata = dict(footer['table_metadata'])
+    if footer['spark_metadata']:
+        table_metadata[SPARK_METADATA_KEY.decode('utf-8')] = json.dumps(footer['spark_metadata'])
 
-    # Get row count
-    total_rows = 0
-    for pf in parquet_files:
-        parquet_file = pq.ParquetFile(pf)
-        total_rows += parquet_file.metadata.num_rows
-
-    # Read sample data
-    df = pd.read_parquet(parquet_files[0])
-    sample_data = df.head(sample_rows).to_dict('records')
+    # Read sample data from the first row batch only
+    batch = next(pq.ParquetFile(files[0]).iter_batches(batch_size=max(sample_rows, 1)), None)
+    sample_data = batch.to_pandas().to_dict('records') if batch is not None else []
 
     return {
         'table_name': table_name,
-        'num_parquet_files': len(parquet_files),
-        'total_rows': total_rows,
+        'num_parquet_files': footer['num_files'],
+        'total_rows': footer['total_rows'],
         'num_columns': len(columns),
         'columns': columns,
         'table_metadata': table_metadata,
@@ -310,6 +302,10 @@ def main():
     print(f"   • Dynamic (ddt_*): {len(categories['dynamic'])} tables")
     print(f"\n{'='*70}\n")
 
+    # Read all footers once, concurrently
+    footers = scan_cdm_footers(args.cdm_database, [t.name for t in tables_to_analyze],
+                               verbose=args.verbose)
+
     # Analyze each table
     for i, table_path in enumerate(tables_to_analyze, 1):
         table_name = table_path.name
@@ -318,7 +314,8 @@ def main():
             print(f"[{i}/{len(tables_to_analyze)}] Analyzing {table_name}...")
 
         try:
-            table_info = analyze_parquet_table(table_path, sample_rows=args.sample_rows)
+            table_info = analyze_parquet_table(table_path, sample_rows=args.sample_rows,
+                                               footer=footers.get(table_name))
             results['tables'][table_name] = table_info
 
             # Print summary
@@ -0,0 +1,450 @@
+#!/usr/bin/env python3
+"""
+Sampling and estimation for CDM brick tables.
+
+Brick tables can hold hundreds of millions of rows, so sample stores
+(``cdm_store_sample.db``) load only a subset of each brick. Taking the head of
+the parquet files with ``LIMIT`` is biased toward whatever was written first,
+so this module provides proper probability samples instead:
+
+- ``reservoir``: simple random sample of exactly N rows
+- ``bernoulli``: each row kept independently with probability N / total
+- ``stratified``: proportional random sample within each value of a
+  dimension column (default: the brick's leading dimension)
+- ``head``: the old ``LIMIT`` behaviour, kept for reproducing old stores
+
+Every sampled row carries a ``_sample_weight`` column (rows in the population
+represented by that row) and the sample design is recorded in the
+``cdm_sampling`` table. The estimators below use both to return counts, means
+and quantiles with confidence intervals (stratified SRS formulas with finite
+population correction; quantile intervals by Woodruff's method).
+
+Tables without sampling metadata are treated as a census: estimates are exact
+and intervals collapse to the point estimate.
+"""
+
+import math
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from statistics import NormalDist
+from typing import Any, Dict, List, Optional, Tuple
+
+
+SAMPLE_METHODS = ("reservoir", "bernoulli", "stratified", "head")
+DEFAULT_SAMPLE_METHOD = "reservoir"
+WEIGHT_COLUMN = "_sample_weight"
+SAMPLING_TABLE = "cdm_sampling"
+
+
+@dataclass
+class Estimate:
+    """A point estimate with a confidence interval."""
+
+    statistic: str
+    estimate: Optional[float]
+    std_error: Optional[float]
+    ci_low: Optional[float]
+    ci_high: Optional[float]
+    confidence: float
+    sample_rows: int
+    method: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a plain dictionary (for JSON export)."""
+        return asdict(self)
+
+
+def _quote_ident(name: str) -> str:
+    escaped = name.replace('"', '""')
+    return f'"{escaped}"'
+
+
+def _z_value(confidence: float) -> float:
+    return NormalDist().inv_cdf(0.5 + confidence / 2)
+
+
+# ============================================================================
+# Load-time sampling
+# ============================================================================
+
+def build_sample_query(
+    source_sql: str,
+    method: str,
+    sample_rows: int,
+    population_rows: int,
+    strata_column: Optional[str] = None,
+    seed: int = 42
+) -> str:
+    """
+    Build a SELECT that draws a weighted sample from a source relation.
+
+    Args:
+        source_sql: SELECT statement producing the full population
+        method: One of SAMPLE_METHODS
+        sample_rows: Target number of sampled rows
+        population_rows: Number of rows in the population
+        strata_column: Column to stratify on (required for 'stratified')
+        seed: Random seed for reproducible samples
+
+    Returns:
+        SQL producing the sampled rows plus a ``_sample_weight`` column
+    """
+    if method not in SAMPLE_METHODS:
+        raise ValueError(f"Unknown sample method '{method}' (expected one of {', '.join(SAMPLE_METHODS)})")
+    if sample_rows <= 0 or population_rows <= 0:
+        raise ValueError("sample_rows and population_rows must be positive")
+
+    sample_rows = min(sample_rows, population_rows)
+    weight = population_rows / sample_rows
+
+    if method == "head":
+        return f"""
+            SELECT *, CAST({weight!r} AS DOUBLE) AS {WEIGHT_COLUMN}
+            FROM ({source_sql}) src
+            LIMIT {sample_rows}
+        """
+
+    if method == "reservoir":
+        return f"""
+            SELECT *, CAST({weight!r} AS DOUBLE) AS {WEIGHT_COLUMN}
+            FROM ({source_sql}) src
+            USING SAMPLE {sample_rows} ROWS (reservoir, {seed})
+        """
+
+    if method == "bernoulli":
+        percentage = 100.0 * sample_rows / population_rows
+        return f"""
+            SELECT *, CAST({weight!r} AS DOUBLE) AS {WEIGHT_COLUMN}
+            FROM ({source_sql}) src
+            USING SAMPLE {percentage!r} PERCENT (bernoulli, {seed})
+        """
+
+    if not strata_column:
+        raise ValueError("Stratified sampling requires a strata column")
+
+    # Proportional allocation, at least one row per stratum. Rows are ranked
+    # by a seeded hash so the sample is reproducible without a global sort.
+    strata = _quote_ident(strata_column)
+    return f"""
+        SELECT * EXCLUDE (_rn, _stratum_rows, _stratum_take),
+               CAST(_stratum_rows AS DOUBLE) / _stratum_take AS {WEIGHT_COLUMN}
+        FROM (
+            SELECT *,
+                   GREATEST(1, LEAST(_stratum_rows,
+                       CAST(ROUND({sample_rows} * _stratum_rows / {population_rows}) AS BIGINT)
+                   )) AS _stratum_take
+            FROM (
+                SELECT src.*,
+                       COUNT(*) OVER (PARTITION BY {strata}) AS _stratum_rows,
+                       ROW_NUMBER() OVER (
+                           PARTITION BY {strata}
+                           ORDER BY hash(src, {seed})
+                       ) AS _rn
+                FROM ({source_sql}) src
+            )
+        )
+        WHERE _rn <= _stratum_take
+    """
+
+
+def calibrate_sample_weights(conn, table_name: str, method: str, population_rows: int) -> int:
+    """
+    Make the weights of a loaded sample add up to the population size.
+
+    Bernoulli samples only hit the target size on average, so their weights
+    are reset from the realized sample size. Stratified weights are already
+    exact per stratum and are left alone.
+
+    Returns:
+        Number of rows in the sample
+    """
+    sample_rows = conn.execute(f"SELECT COUNT(*) FROM {table_name}").fetchone()[0]
+    if sample_rows and method != "stratified":
+        conn.execute(
+            f"UPDATE {table_name} SET {WEIGHT_COLUMN} = ?",
+            [population_rows / sample_rows]
+        )
+    return sample_rows
+
+
+def record_sampling_metadata(
+    conn,
+    table_name: str,
+    method: str,
+    population_rows: int,
+    sample_rows: int,
+    strata_column: Optional[str] = None,
+    seed: Optional[int] = None
+) -> None:
+    """Record (or replace) the sample design for a table in ``cdm_sampling``."""
+    conn.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS {SAMPLING_TABLE} (
+            table_name VARCHAR PRIMARY KEY,
+            method VARCHAR,
+            population_rows BIGINT,
+            sample_rows BIGINT,
+            strata_column VARCHAR,
+            seed INTEGER,
+            sampled_at TIMESTAMP
+        )
+        """
+    )
+    conn.execute(f"DELETE FROM {SAMPLING_TABLE} WHERE table_name = ?", [table_name])
+    conn.execute(
+        f"INSERT INTO {SAMPLING_TABLE} VALUES (?, ?, ?, ?, ?, ?, ?)",
+        [table_name, method, population_rows, sample_rows, strata_column, seed, datetime.now()]
+    )
+
+
+def clear_sampling_metadata(conn, table_name: str) -> None:
+    """Forget the sample design of a table that was reloaded in full."""
+    try:
+        conn.execute(f"DELETE FROM {SAMPLING_TABLE} WHERE table_name = ?", [table_name])
+    except Exception:
+        pass  # No sampling table yet
+
+
+def get_sampling_metadata(conn, table_name: str) -> Optional[Dict[str, Any]]:
+    """Return the recorded sample design for a table, or None for a census."""
+    try:
+        row = conn.execute(
+            f"""
+            SELECT method, population_rows, sample_rows, strata_column, seed
+            FROM {SAMPLING_TABLE} WHERE table_name = ?
+            """,
+            [table_name]
+        ).fetchone()
+    except Exception:
+        return None
+    if not row:
+        return None
+    return {
+        'method': row[0],
+        'population_rows': row[1],
+        'sample_rows': row[2],
+        'strata_column': row[3],
+        'seed': row[4],
+    }
+
+
+# ============================================================================
+# Estimation
+# ============================================================================
+
+def _design(conn, table_name: str) -> Tuple[str, str, str]:
+    """Return (method, weight expression, strata expression) for a table."""
+    metadata = get_sampling_metadata(conn, table_name)
+    columns = {row[0] for row in conn.execute(f"DESCRIBE {table_name}").fetchall()}
+
+    weight_expr = WEIGHT_COLUMN if WEIGHT_COLUMN in columns else "1.0"
+    method = metadata['method'] if metadata else "census"
+
+    strata_expr = "0"
+    if metadata and metadata['method'] == "stratified" and metadata['strata_column'] in columns:
+        strata_expr = _quote_ident(metadata['strata_column'])
+
+    return method, weight_expr, strata_expr
+
+
+def _stratum_aggregates(
+    conn,
+    table_name: str,
+    value_expr: str,
+    domain_expr: str,
+    params: Optional[Dict[str, Any]] = None
+) -> List[Tuple[float, int, float, float, float]]:
+    """
+    Per-stratum sufficient statistics.
+
+    Returns rows of (N_h, n_h, sum d, sum d*y, sum d*y^2) where d is the domain
+    indicator and y the value. ``params`` binds ``$name`` parameters used in
+    the expressions.
+    """
+    method, weight_expr, strata_expr = _design(conn, table_name)
+    return conn.execute(
+        f"""
+        SELECT SUM(w), COUNT(*), SUM(d), SUM(d * y), SUM(d * y * y)
+        FROM (
+            SELECT {strata_expr} AS s,
+                   CAST({weight_expr} AS DOUBLE) AS w,
+                   CAST(({domain_expr}) AND ({value_expr}) IS NOT NULL AS DOUBLE) AS d,
+                   COALESCE(CAST({value_expr} AS DOUBLE), 0.0) AS y
+            FROM {table_name}
+        )
+        GROUP BY s
+        """,
+        params or {}
+    ).fetchall()
+
+
+def _stratified_total(strata, ratio: Optional[float] = None) -> Tuple[float, float]:
+    """
+    Stratified SRS estimate of a total and its variance.
+
+    With ``ratio`` given, estimates the total of z = d * (y - ratio) instead,
+    which linearizes the ratio (domain mean) estimator.
+    """
+    total = 0.0
+    variance = 0.0
+    for N_h, n_h, s_d, s_dy, s_dyy in strata:
+        if not n_h:
+            continue
+        if ratio is None:
+            # y = d (count); d is 0/1 so d^2 = d
+            sum_z, sum_zz = s_d, s_d
+        else:
+            sum_z = s_dy - ratio * s_d
+            sum_zz = s_dyy - 2 * ratio * s_dy + ratio * ratio * s_d
+        total += N_h * sum_z / n_h
+        if n_h > 1:
+            s2 = max(0.0, (sum_zz - sum_z * sum_z / n_h) / (n_h - 1))
+            fpc = max(0.0, 1 - n_h / N_h) if N_h else 0.0
+            variance += N_h * N_h * fpc * s2 / n_h
+    return total, variance
+
+
+def _make_estimate(statistic, value, variance, confidence, sample_rows, method) -> Estimate:
+    if value is None:
+        return Estimate(statistic, None, None, None, None, confidence, sample_rows, method)
+    std_error = math.sqrt(variance) if variance is not None else None
+    margin = _z_value(confidence) * std_error if std_error is not None else 0.0
+    return Estimate(statistic, value, std_error, value - margin, value + margin,
+                    confidence, sample_rows, method)
+
+
+def estimate_count(
+    conn,
+    table_name: str,
+    where: Optional[str] = None,
+    confidence: float = 0.95
+) -> Estimate:
+    """
+    Estimate the number of population rows matching a filter.
+
+    Args:
+        conn: DuckDB connection
+        table_name: Sampled (or census) table
+        where: Optional SQL filter expression
+        confidence: Confidence level for the interval
+
+    Returns:
+        Estimate of the matching row count
+    """
+    method = _design(conn, table_name)[0]
+    strata = _stratum_aggregates(conn, table_name, "1", where or "TRUE")
+    sample_rows = int(sum(s[2] for s in strata))
+    total, variance = _stratified_total(strata)
+    return _make_estimate("count", total, variance, confidence, sample_rows, method)
+
+
+def estimate_mean(
+    conn,
+    table_name: str,
+    column: str,
+    where: Optional[str] = None,
+    confidence: float = 0.95
+) -> Estimate:
+    """
+    Estimate the population mean of a column (over non-null, matching rows).
+
+    Uses the weighted ratio estimator with Taylor-linearized variance.
+
+    Args:
+        conn: DuckDB connection
+        table_name: Sampled (or census) table
+        column: Numeric column
+        where: Optional SQL filter expression
+        confidence: Confidence level for the interval
+
+    Returns:
+        Estimate of the mean
+    """
+    method = _design(conn, table_name)[0]
+    strata = _stratum_aggregates(conn, table_name, _quote_ident(column), where or "TRUE")
+    sample_rows = int(sum(s[2] for s in strata))
+
+    domain_total = sum(N_h * s_d / n_h for N_h, n_h, s_d, _, _ in strata if n_h)
+    if not domain_total:
+        return _make_estimate("mean", None, None, confidence, sample_rows, method)
+
+    value_total = sum(N_h * s_dy / n_h for N_h, n_h, _, s_dy, _ in strata if n_h)
+    ratio = value_total / domain_total
+    _, z_variance = _stratified_total(strata, ratio=ratio)
+    return _make_estimate("mean", ratio, z_variance / (domain_total * domain_total),
+                          confidence, sample_rows, method)
+
+
+def _weighted_quantile(values: List[Tuple[float, float]], q: float) -> float:
+    """Quantile of (value, weight) pairs sorted by value."""
+    total = sum(w for _, w in values)
+    target = q * total
+    cumulative = 0.0
+    for value, weight in values:
+        cumulative += weight
+        if cumulative >= target:
+            return value
+    return values[-1][0]
+
+
+def estimate_quantile(
+    conn,
+    table_name: str,
+    column: str,
+    q: float = 0.5,
+    where: Optional[str] = None,
+    confidence: float = 0.95
+) -> Estimate:
+    """
+    Estimate a population quantile of a column.
+
+    The point estimate is the weighted sample quantile; the interval comes
+    from Woodruff's method (an interval for the CDF at the estimate, mapped
+    back through the weighted quantile function).
+
+    Args:
+        conn: DuckDB connection
+        table_name: Sampled (or census) table
+        column: Numeric column
+        q: Quantile in (0, 1)
+        where: Optional SQL filter expression
+        confidence: Confidence level for the interval
+
+    Returns:
+        Estimate of the quantile
+    """
+    if not 0 < q < 1:
+        raise ValueError("Quantile must be between 0 and 1")
+
+    method, weight_expr, _ = _design(conn, table_name)
+    quoted = _quote_ident(column)
+    rows = conn.execute(
+        f"""
+        SELECT CAST({quoted} AS DOUBLE), CAST({weight_expr} AS DOUBLE)
+        FROM {table_name}
+        WHERE {quoted} IS NOT NULL AND ({where or 'TRUE'})
+        ORDER BY 1
+        """
+    ).fetchall()
+    statistic = f"quantile_{q:g}"
+    if not rows:
+        return _make_estimate(statistic, None, None, confidence, 0, method)
+
+    point = _weighted_quantile(rows, q)
+
+    # Standard error of the estimated CDF at the point estimate
+    below = f"CASE WHEN {quoted} <= $point THEN 1.0 ELSE 0.0 END"
+    domain = f"{quoted} IS NOT NULL AND ({where or 'TRUE'})"
+    strata = _stratum_aggregates(conn, table_name, below, domain, {"point": point})
+    domain_total = sum(N_h * s_d / n_h for N_h, n_h, s_d, _, _ in strata if n_h)
+    p_hat = sum(N_h * s_dy / n_h for N_h, n_h, _, s_dy, _ in strata if n_h) / domain_total
+    _, z_variance = _stratified_total(strata, ratio=p_hat)
+    p_se = math.sqrt(z_variance) / domain_total
+
+    margin = _z_value(confidence) * p_se
+    ci_low = _weighted_quantile(rows, max(0.0, q - margin))
+    ci_high = _weighted_quantile(rows, min(1.0, q + margin))
+    std_error = (ci_high - ci_low) / (2 * _z_value(confidence)) if margin else 0.0
+
+    return Estimate(statistic, point, std_error, ci_low, ci_high,
+                    confidence, len(rows), method)
@@ -0,0 +1,600 @@
+#!/usr/bin/env python3
+"""
+Reproducible CDM benchmarks on synthetic data.
+
+Generates synthetic CDM parquet directories (``synthetic_cdm.py``) at
+several scales and times the hot paths against them:
+
+- ``load``: parquet -> CDM store with direct DuckDB import
+- ``load_pandas``: the same load through pandas (the baseline the README's
+  direct-import speedup is measured against)
+- ``validate``: LinkML validation of the ``sdt_*`` tables (skipped when
+  ``linkml-validate`` is not installed)
+- ``lineage``: ``CDMStoreQuery.trace_lineage`` for a set of reads
+- ``unused_reads``: reads above a read count that no assembly used
+- ``nl_context``: building (and trimming) the NL query prompt context
+
+Like asv, each benchmark runs in its own Python process (so DuckDB
+connections, caches and peak RSS do not leak between benchmarks), is
+repeated, and reports the median time and throughput. Results are saved
+per machine and commit (``benchmark_results/<machine>/<commit>.json``) so
+runs on different commits can be compared; ``compare`` exits non-zero when
+a throughput dropped by more than the threshold.
+
+Synthetic datasets and stores are kept in ``~/.cache/linkml-coral/synthetic``
+(override with CDM_SYNTHETIC_DIR) and reused across runs.
+
+Usage:
+    # Run all benchmarks at the default scales
+    python cdm_benchmark.py run
+
+    # Query benchmarks only, at three scales
+    python cdm_benchmark.py run --scales 0.1,1,10 --benchmarks lineage,unused_reads
+
+    # Compare the latest run with the previous one (or two commits)
+    python cdm_benchmark.py compare
+    python cdm_benchmark.py compare 78d23fe b5d2c4e --threshold 0.2
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import re
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from load_cdm_parquet_to_store import (
+    CDM_SCHEMA,
+    REPO_ROOT,
+    create_store,
+    load_all_cdm_parquet,
+    load_schema,
+    release_duckdb_connection,
+)
+from synthetic_cdm import DEFAULT_SEED, generate_cdm, read_manifest
+
+BENCHMARKS = ("load", "load_pandas", "validate", "lineage", "unused_reads", "nl_context")
+DEFAULT_SCALES = (0.1, 1.0)
+DEFAULT_REPEAT = 3
+DEFAULT_THRESHOLD = 0.10
+LINEAGE_LOOKUPS = 20
+UNUSED_READS_MIN_COUNT = 10_000
+NL_QUESTION = "reads with a high read count that were never assembled"
+
+RESULTS_DIR_ENV = "CDM_BENCHMARK_DIR"
+DEFAULT_RESULTS_DIR = REPO_ROOT / "benchmark_results"
+SYNTHETIC_DIR_ENV = "CDM_SYNTHETIC_DIR"
+DEFAULT_SYNTHETIC_DIR = Path.home() / ".cache" / "linkml-coral" / "synthetic"
+RESULTS_VERSION = 1
+
+# Reads above a read count that were never the input of a process producing an assembly
+UNUSED_READS_SQL = """
+SELECT r.sdt_reads_id, r.sdt_reads_name, r.read_count_count_unit
+FROM sdt_reads r
+WHERE r.read_count_count_unit >= ?
+  AND r.sdt_reads_id NOT IN (
+      SELECT i.sdt_reads_id
+      FROM sys_process_input i
+      JOIN sys_process_output o ON o.sys_process_id = i.sys_process_id
+      WHERE i.sdt_reads_id IS NOT NULL AND o.sdt_assembly_id IS NOT NULL
+  )
+ORDER BY r.read_count_count_unit DESC
+"""
+
+
+@dataclass
+class BenchmarkResult:
+    """Timings of one benchmark at one scale."""
+
+    benchmark: str
+    scale: float
+    status: str = "ok"  # ok, skipped, error
+    rows: int = 0
+    unit: str = "rows/s"
+    times: List[float] = field(default_factory=list)
+    seconds: Optional[float] = None
+    throughput: Optional[float] = None
+    peak_rss_mb: Optional[float] = None
+    note: Optional[str] = None
+
+    def finish(self, times: List[float], rows: int) -> "BenchmarkResult":
+        """Record repeat timings: median seconds and throughput."""
+        self.times = [round(t, 6) for t in times]
+        self.rows = rows
+        self.seconds = statistics.median(times)
+        self.throughput = rows / self.seconds if self.seconds > 0 else None
+        return self
+
+
+def synthetic_dir() -> Path:
+    """Directory holding generated datasets and their stores."""
+    return Path(os.environ.get(SYNTHETIC_DIR_ENV, DEFAULT_SYNTHETIC_DIR))
+
+
+def results_dir() -> Path:
+    """Directory holding saved benchmark results."""
+    return Path(os.environ.get(RESULTS_DIR_ENV, DEFAULT_RESULTS_DIR))
+
+
+def prepare_dataset(scale: float, seed: int = DEFAULT_SEED, workdir: Optional[Path] = None) -> Path:
+    """
+    Synthetic CDM directory for a scale, generated on first use.
+
+    Args:
+        scale: Synthetic data scale
+        seed: Random seed
+        workdir: Parent directory (default: ``synthetic_dir()``)
+
+    Returns:
+        Path to the parquet directory
+    """
+    data_dir = Path(workdir or synthetic_dir()) / f"scale_{scale:g}_seed_{seed}" / "enigma_coral.db"
+    manifest = read_manifest(data_dir)
+    if manifest is None or manifest.get("scale") != scale or manifest.get("seed") != seed:
+        if data_dir.exists():
+            shutil.rmtree(data_dir)
+        generate_cdm(data_dir, scale=scale, brick_rows=int(20_000 * scale) or 1, seed=seed)
+    return data_dir
+
+
+def count_rows(data_dir: Path, prefixes: Sequence[str] = ("sdt_", "sys_", "ddt_")) -> int:
+    """Rows in a synthetic dataset's tables with the given prefixes."""
+    tables = read_manifest(data_dir)["tables"]
+    return sum(rows for table, rows in tables.items() if table.startswith(tuple(prefixes)))
+
+
+def build_store(data_dir: Path, store_path: Path, direct: bool = True) -> int:
+    """
+    Load a synthetic dataset into a new CDM store.
+
+    Args:
+        data_dir: Synthetic parquet directory
+        store_path: Store database file (replaced if it exists)
+        direct: Use direct DuckDB import (False: pandas)
+
+    Returns:
+        Number of records loaded
+    """
+    store_path = Path(store_path)
+    for path in (store_path, store_path.with_name(store_path.name + ".wal")):
+        path.unlink(missing_ok=True)
+    client, db, schema_view = create_store(str(store_path), CDM_SCHEMA)
+    results = load_all_cdm_parquet(
+        data_dir, db, schema_view,
+        include_system=True, include_static=True, include_dynamic=True,
+        use_direct_import=direct, use_chunked=True,
+    )
+    release_duckdb_connection(db)
+    db.engine.dispose()
+    return sum(results.values())
+
+
+def store_path_for(data_dir: Path) -> Path:
+    """Store built from a synthetic dataset, built on first use."""
+    store_path = data_dir.parent / "cdm_store.db"
+    if not store_path.exists():
+        with contextlib.redirect_stdout(io.StringIO()):
+            build_store(data_dir, store_path)
+    return store_path
+
+
+def time_repeats(fn: Callable[[], Any], repeat: int) -> List[float]:
+    """Wall-clock seconds of ``repeat`` calls."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+# Benchmarks: each returns (rows per call, callable to time) or raises SkipBenchmark
+
+class SkipBenchmark(Exception):
+    """Raised when a benchmark cannot run in this environment."""
+
+
+def bench_load(data_dir: Path, tmpdir: Path, direct: bool = True) -> Tuple[int, Callable[[], Any]]:
+    store_path = tmpdir / ("load.db" if direct else "load_pandas.db")
+    return count_rows(data_dir), lambda: build_store(data_dir, store_path, direct=direct)
+
+
+def bench_validate(data_dir: Path, tmpdir: Path) -> Tuple[int, Callable[[], Any]]:
+    if shutil.which("linkml-validate") is None:
+        raise SkipBenchmark("linkml-validate not installed")
+    from validate_parquet_linkml import validate_parquet_file
+
+    tables = sorted(p for p in data_dir.iterdir() if p.is_dir() and p.name.startswith("sdt_"))
+
+    def run():
+        for table in tables:
+            validate_parquet_file(table, schema_path=CDM_SCHEMA)
+
+    return count_rows(data_dir, ("sdt_",)), run
+
+
+def bench_lineage(data_dir: Path, tmpdir: Path) -> Tuple[int, Callable[[], Any]]:
+    from query_cdm_store import CDMStoreQuery
+
+    query = CDMStoreQuery(str(store_path_for(data_dir)), use_cache=False)
+    reads = [row["sdt_reads_id"] for row in query.get_collection("sdt_reads").find(limit=LINEAGE_LOOKUPS).rows]
+
+    def run():
+        for reads_id in reads:
+            query.trace_lineage("Reads", reads_id)
+
+    return len(reads), run
+
+
+def bench_unused_reads(data_dir: Path, tmpdir: Path) -> Tuple[int, Callable[[], Any]]:
+    import duckdb
+
+    conn = duckdb.connect(str(store_path_for(data_dir)), read_only=True)
+    total = conn.execute("SELECT count(*) FROM sdt_reads").fetchone()[0]
+    return total, lambda: conn.execute(UNUSED_READS_SQL, [UNUSED_READS_MIN_COUNT]).fetchall()
+
+
+def bench_nl_context(data_dir: Path, tmpdir: Path) -> Tuple[int, Callable[[], Any]]:
+    import duckdb
+    from prompt_context import build_prompt_context
+
+    conn = duckdb.connect(str(store_path_for(data_dir)), read_only=True)
+    schema_view = load_schema(CDM_SCHEMA)
+    tables = conn.execute("SELECT count(*) FROM duckdb_tables()").fetchone()[0]
+
+    def run():
+        context = build_prompt_context(conn, schema_view)
+        context.relevant_tables(NL_QUESTION)
+
+    return tables, run
+
+
+BENCHMARK_FUNCTIONS = {
+    "load": (bench_load, "rows/s"),
+    "load_pandas": (lambda data_dir, tmpdir: bench_load(data_dir, tmpdir, direct=False), "rows/s"),
+    "validate": (bench_validate, "rows/s"),
+    "lineage": (bench_lineage, "lookups/s"),
+    "unused_reads": (bench_unused_reads, "rows/s"),
+    "nl_context": (bench_nl_context, "tables/s"),
+}
+
+
+def run_benchmark(name: str, scale: float, repeat: int = DEFAULT_REPEAT,
+                  seed: int = DEFAULT_SEED, workdir: Optional[Path] = None) -> BenchmarkResult:
+    """
+    Run one benchmark in this process.
+
+    Args:
+        name: Benchmark name (see ``BENCHMARKS``)
+        scale: Synthetic data scale
+        repeat: Timed repetitions (the median is reported)
+        seed: Synthetic data seed
+        workdir: Directory for datasets and stores (default: ``synthetic_dir()``)
+
+    Returns:
+        BenchmarkResult
+    """
+    setup, unit = BENCHMARK_FUNCTIONS[name]
+    result = BenchmarkResult(benchmark=name, scale=scale, unit=unit)
+    data_dir = prepare_dataset(scale, seed, workdir)
+    with tempfile.TemporaryDirectory(dir=data_dir.parent) as tmpdir:
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                rows, fn = setup(data_dir, Path(tmpdir))
+                result.finish(time_repeats(fn, repeat), rows)
+        except SkipBenchmark as e:
+            result.status, result.note = "skipped", str(e)
+        except Exception as e:
+            result.status, result.note = "error", f"{type(e).__name__}: {str(e).splitlines()[0]}"
+    result.peak_rss_mb = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    return result
+
+
+def run_isolated(name: str, scale: float, repeat: int = DEFAULT_REPEAT,
+                 seed: int = DEFAULT_SEED, workdir: Optional[Path] = None) -> BenchmarkResult:
+    """Run one benchmark in a fresh Python process (see ``run_benchmark``)."""
+    cmd = [sys.executable, str(Path(__file__).resolve()), "_run", name,
+           "--scale", repr(scale), "--repeat", str(repeat), "--seed", str(seed)]
+    if workdir:
+        cmd += ["--workdir", str(workdir)]
+    proc = subprocess.run(cmd, capture_output=True, text=True)
+    lines = proc.stdout.strip().splitlines()
+    if proc.returncode != 0 or not lines:
+        error = (proc.stderr.strip().splitlines() or ["no output"])[-1]
+        return BenchmarkResult(benchmark=name, scale=scale, status="error", note=error)
+    return BenchmarkResult(**json.loads(lines[-1]))
+
+
+def git_commit(repo: Path = REPO_ROOT) -> Tuple[str, bool]:
+    """Current commit hash and whether tracked files have uncommitted changes."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=repo, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        status = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=repo,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        return commit, bool(status)
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown", False
+
+
+def machine_info() -> Dict[str, Any]:
+    """Host details stored with results (runs are only comparable on one machine)."""
+    info = {
+        "name": re.sub(r"[^A-Za-z0-9_.-]", "_", platform.node() or "unknown"),
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "cpus": os.cpu_count(),
+    }
+    try:
+        import psutil
+        info["memory_gb"] = round(psutil.virtual_memory().total / 1024 ** 3, 1)
+    except ImportError:
+        pass
+    try:
+        import duckdb
+        info["duckdb"] = duckdb.__version__
+    except ImportError:
+        pass
+    return info
+
+
+def run_suite(
+    scales: Sequence[float] = DEFAULT_SCALES,
+    benchmarks: Sequence[str] = BENCHMARKS,
+    repeat: int = DEFAULT_REPEAT,
+    seed: int = DEFAULT_SEED,
+    workdir: Optional[Path] = None,
+    isolate: bool = True,
+    verbose: bool = True
+) -> Dict[str, Any]:
+    """
+    Run benchmarks at several scales.
+
+    Args:
+        scales: Synthetic data scales
+        benchmarks: Benchmark names
+        repeat: Timed repetitions per benchmark
+        seed: Synthetic data seed
+        workdir: Directory for datasets and stores (default: ``synthetic_dir()``)
+        isolate: Run each benchmark in its own process
+        verbose: Print each result as it finishes
+
+    Returns:
+        Results document (commit, machine, parameters and results)
+    """
+    commit, dirty = git_commit()
+    results = []
+    for scale in scales:
+        prepare_dataset(scale, seed, workdir)
+        for name in benchmarks:
+            runner = run_isolated if isolate else run_benchmark
+            result = runner(name, scale, repeat, seed, workdir)
+            results.append(asdict(result))
+            if verbose:
+                print(format_result(result))
+    return {
+        "version": RESULTS_VERSION,
+        "commit": commit,
+        "dirty": dirty,
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "machine": machine_info(),
+        "params": {"scales": list(scales), "repeat": repeat, "seed": seed},
+        "results": results,
+    }
+
+
+def format_result(result: BenchmarkResult) -> str:
+    """One-line summary of a result."""
+    label = f"{result.benchmark:<13} scale {result.scale:<5g}"
+    if result.status != "ok":
+        return f"  ⊘ {label} {result.status}: {result.note}"
+    return (f"  ✓ {label} {result.seconds:8.3f}s  {result.throughput:>12,.0f} {result.unit:<10}"
+            f" ({result.rows:,} per run, {result.peak_rss_mb:,.0f} MB peak)")
+
+
+def save_results(document: Dict[str, Any], directory: Optional[Path] = None) -> Path:
+    """
+    Write a results document as ``<dir>/<machine>/<commit>[-dirty].json``.
+
+    Results already saved for the same commit are kept unless this run
+    measured the same benchmark and scale again.
+    """
+    directory = Path(directory or results_dir()) / document["machine"]["name"]
+    directory.mkdir(parents=True, exist_ok=True)
+    suffix = "-dirty" if document.get("dirty") else ""
+    path = directory / f"{document['commit'][:12]}{suffix}.json"
+    if path.exists():
+        previous = json.loads(path.read_text())
+        measured = {(r["benchmark"], r["scale"]) for r in document["results"]}
+        kept = [r for r in previous["results"] if (r["benchmark"], r["scale"]) not in measured]
+        scales = sorted(set(previous["params"]["scales"]) | set(document["params"]["scales"]))
+        document = {**document, "results": kept + document["results"],
+                    "params": {**document["params"], "scales": scales}}
+    tmp_path = path.with_suffix(".json.tmp")
+    tmp_path.write_text(json.dumps(document, indent=2))
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_results(ref: str, directory: Optional[Path] = None) -> Dict[str, Any]:
+    """
+    Results document by file path or commit prefix.
+
+    Args:
+        ref: JSON file path, or a commit (prefix) with results for this machine
+        directory: Results directory (default: ``results_dir()``)
+
+    Returns:
+        Results document
+    """
+    path = Path(ref)
+    if not path.is_file():
+        machine_dir = Path(directory or results_dir()) / machine_info()["name"]
+        matches = sorted(machine_dir.glob(f"{ref[:12]}*.json"), key=lambda p: p.stat().st_mtime)
+        if not matches:
+            raise FileNotFoundError(f"No benchmark results for '{ref}' in {machine_dir}")
+        path = matches[-1]
+    return json.loads(path.read_text())
+
+
+def latest_results(count: int = 2, directory: Optional[Path] = None) -> List[Path]:
+    """Most recent result files for this machine, oldest first."""
+    machine_dir = Path(directory or results_dir()) / machine_info()["name"]
+    return sorted(machine_dir.glob("*.json"), key=lambda p: p.stat().st_mtime)[-count:]
+
+
+def compare_results(base: Dict[str, Any], head: Dict[str, Any],
+                    threshold: float = DEFAULT_THRESHOLD) -> List[Dict[str, Any]]:
+    """
+    Throughput changes between two results documents.
+
+    Args:
+        base: Earlier results document
+        head: Later results document
+        threshold: Relative change treated as a regression/improvement
+
+    Returns:
+        One row per benchmark and scale present in both: benchmark, scale,
+        base, head (throughputs), ratio (head / base) and change
+        ('regressed', 'improved' or 'unchanged')
+    """
+    base_results = {(r["benchmark"], r["scale"]): r for r in base["results"] if r["status"] == "ok"}
+    rows = []
+    for result in head["results"]:
+        key = (result["benchmark"], result["scale"])
+        if result["status"] != "ok" or key not in base_results:
+            continue
+        before, after = base_results[key]["throughput"], result["throughput"]
+        ratio = after / before if before else None
+        change = "unchanged"
+        if ratio is not None and ratio < 1 - threshold:
+            change = "regressed"
+        elif ratio is not None and ratio > 1 + threshold:
+            change = "improved"
+        rows.append({"benchmark": key[0], "scale": key[1], "unit": result["unit"],
+                     "base": before, "head": after, "ratio": ratio, "change": change})
+    return rows
+
+
+def print_results(document: Dict[str, Any]) -> None:
+    """Summary of a run, including the direct-import speedup over pandas."""
+    by_key = {(r["benchmark"], r["scale"]): r for r in document["results"] if r["status"] == "ok"}
+    for scale in document["params"]["scales"]:
+        direct, pandas_load = by_key.get(("load", scale)), by_key.get(("load_pandas", scale))
+        if direct and pandas_load:
+            speedup = direct["throughput"] / pandas_load["throughput"]
+            print(f"  ⚡ scale {scale:g}: direct import {speedup:.1f}x faster than pandas "
+                  f"({direct['throughput']:,.0f} vs {pandas_load['throughput']:,.0f} rows/s)")
+
+
+def cmd_run(args) -> int:
+    scales = [float(s) for s in args.scales.split(",")]
+    benchmarks = args.benchmarks.split(",") if args.benchmarks else list(BENCHMARKS)
+    unknown = set(benchmarks) - set(BENCHMARKS)
+    if unknown:
+        print(f"❌ Unknown benchmark(s): {', '.join(sorted(unknown))} (choose from {', '.join(BENCHMARKS)})")
+        return 2
+
+    print(f"⏱️  CDM benchmarks: {', '.join(benchmarks)} at scale(s) {args.scales} (repeat {args.repeat})")
+    document = run_suite(scales, benchmarks, args.repeat, args.seed, args.workdir, isolate=not args.in_process)
+    print_results(document)
+    if not args.no_save:
+        path = save_results(document, args.results_dir)
+        print(f"\n💾 Results saved to {path}")
+    return 1 if any(r["status"] == "error" for r in document["results"]) else 0
+
+
+def cmd_compare(args) -> int:
+    if args.base and args.head:
+        base, head = load_results(args.base, args.results_dir), load_results(args.head, args.results_dir)
+    else:
+        files = latest_results(1 if args.base else 2, args.results_dir)
+        if args.base:
+            base, head = load_results(args.base, args.results_dir), json.loads(files[-1].read_text())
+        elif len(files) < 2:
+            print("❌ Need two benchmark runs to compare")
+            return 2
+        else:
+            base, head = (json.loads(f.read_text()) for f in files)
+
+    print(f"📊 {base['commit'][:12]} -> {head['commit'][:12]} (threshold {args.threshold:.0%})\n")
+    rows = compare_results(base, head, args.threshold)
+    icons = {"regressed": "🔴", "improved": "🟢", "unchanged": "⚪"}
+    for row in rows:
+        ratio = f"{row['ratio']:.2f}x" if row["ratio"] is not None else "n/a"
+        print(f"  {icons[row['change']]} {row['benchmark']:<13} scale {row['scale']:<5g} "
+              f"{row['base']:>12,.0f} -> {row['head']:>12,.0f} {row['unit']:<10} {ratio}")
+    regressions = [row for row in rows if row["change"] == "regressed"]
+    if regressions:
+        print(f"\n⚠️  {len(regressions)} regression(s)")
+        return 1
+    print("\n✅ No regressions")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Reproducible CDM benchmarks on synthetic data',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python cdm_benchmark.py run
+  python cdm_benchmark.py run --scales 0.1,1,10 --benchmarks load,load_pandas
+  python cdm_benchmark.py compare
+  python cdm_benchmark.py compare 78d23fe b5d2c4e --threshold 0.2
+        """
+    )
+    parser.add_argument('--results-dir', type=Path, default=None,
+                        help=f'Results directory (default: ${RESULTS_DIR_ENV} or {DEFAULT_RESULTS_DIR.name}/)')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help='Run benchmarks and save results for this commit')
+    run_parser.add_argument('--scales', default=",".join(f"{s:g}" for s in DEFAULT_SCALES),
+                            help='Comma-separated synthetic data scales (default: %(default)s)')
+    run_parser.add_argument('--benchmarks', help=f'Comma-separated subset of: {", ".join(BENCHMARKS)}')
+    run_parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT,
+                            help=f'Timed repetitions per benchmark (default: {DEFAULT_REPEAT})')
+    run_parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help='Synthetic data seed')
+    run_parser.add_argument('--workdir', type=Path, default=None,
+                            help=f'Dataset/store directory (default: ${SYNTHETIC_DIR_ENV} or {DEFAULT_SYNTHETIC_DIR})')
+    run_parser.add_argument('--in-process', action='store_true', help='Run benchmarks in this process')
+    run_parser.add_argument('--no-save', action='store_true', help='Do not save results')
+
+    compare_parser = subparsers.add_parser('compare', help='Compare two runs (default: the latest two)')
+    compare_parser.add_argument('base', nargs='?', help='Base commit or results file')
+    compare_parser.add_argument('head', nargs='?', help='Head commit or results file (default: latest run)')
+    compare_parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                                help=f'Relative throughput change that counts (default: {DEFAULT_THRESHOLD})')
+
+    # Internal: one benchmark in a child process, result as JSON on stdout
+    child_parser = subparsers.add_parser('_run')
+    child_parser.add_argument('benchmark', choices=BENCHMARKS)
+    child_parser.add_argument('--scale', type=float, required=True)
+    child_parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT)
+    child_parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    child_parser.add_argument('--workdir', type=Path, default=None)
+
+    args = parser.parse_args()
+    if args.command == '_run':
+        result = run_benchmark(args.benchmark, args.scale, args.repeat, args.seed, args.workdir)
+        print(json.dumps(asdict(result)))
+        return 0
+    if args.command == 'run':
+        return cmd_run(args)
+    return cmd_compare(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Indexes and brick ordering for a CDM store.
+
+The loader calls ``build_cdm_indexes()`` (``--create-indexes``) to create ART
+indexes from the CDM schema's identifier and foreign key slots, the
+relationship catalog (the store's ``cdm_metadata`` schema, else the catalogs
+in ``data/cdm_metadata``) and computed ``*_category`` columns, and
+``sort_bricks()`` (``--sort-bricks``) to order large bricks by their leading
+dimension (see ``linkml_coral.utils.store_indexes``).
+
+``advise`` reads a query log and suggests further indexes or sort orders
+from the filters its queries push into table scans. A log is any mix of:
+
+- ``.sql`` files (statements separated by ``;``)
+- ``.jsonl`` / ``.json`` files of ``{"sql": ..., "count": n}`` records
+- the NL query tools' validated SQL cache (each entry weighted by its hits)
+
+Usage:
+    # Create declared indexes on an existing store, ordering bricks first
+    python cdm_indexes.py build --db cdm_store.db --sort-bricks
+
+    # Suggest (and optionally apply) indexes for logged queries
+    python cdm_indexes.py advise --db cdm_store.db queries.sql --apply
+"""
+
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Tuple
+
+try:
+    from linkml_coral.utils.store_indexes import (
+        DEFAULT_ADVICE_MIN_ROWS,
+        DEFAULT_SORT_MIN_ROWS,
+        IndexSpec,
+        advise,
+        build_indexes,
+        declared_indexes,
+        sort_bricks,
+        store_columns,
+    )
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+    from linkml_coral.utils.store_indexes import (
+        DEFAULT_ADVICE_MIN_ROWS,
+        DEFAULT_SORT_MIN_ROWS,
+        IndexSpec,
+        advise,
+        build_indexes,
+        declared_indexes,
+        sort_bricks,
+        store_columns,
+    )
+
+from metadata_catalog import MetadataCatalog, has_metadata_catalog
+
+REPO_ROOT = Path(__file__).parent.parent.parent
+METADATA_DIR = REPO_ROOT / "data" / "cdm_metadata"
+CDM_SCHEMA = REPO_ROOT / "src" / "linkml_coral" / "schema" / "cdm" / "linkml_coral_cdm.yaml"
+
+
+def catalog_relationships(conn, metadata_dir: Path = METADATA_DIR) -> List[Dict[str, Any]]:
+    """
+    FK relationships from the metadata catalog.
+
+    Args:
+        conn: DuckDB connection to the store
+        metadata_dir: Catalog directory used when the store has no
+            cdm_metadata schema
+
+    Returns:
+        Relationship records (empty if no catalog is found)
+    """
+    if has_metadata_catalog(conn):
+        return MetadataCatalog(conn).relationships()
+    try:
+        with MetadataCatalog.open(metadata_dir) as catalog:
+            return catalog.relationships()
+    except FileNotFoundError:
+        return []
+
+
+def build_cdm_indexes(
+    conn,
+    schema_view=None,
+    verbose: bool = False,
+    metadata_dir: Path = METADATA_DIR
+) -> Tuple[int, List[str]]:
+    """
+    Create the CDM store's declared indexes and entity key indexes.
+
+    Args:
+        conn: DuckDB connection to the store
+        schema_view: CDM SchemaSnapshot (None: relationship catalog and
+            computed columns only)
+        verbose: Print each index
+        metadata_dir: Catalog directory used when the store has no
+            cdm_metadata schema
+
+    Returns:
+        Tuple of (number created, error messages)
+    """
+    specs = declared_indexes(conn, schema_view, catalog_relationships(conn, metadata_dir))
+    declared = {(spec.table, spec.column) for spec in specs}
+    # Entity keys by CDM naming: the schema's sys_process_input/output slots
+    # redefine sdt_<entity>_id without ``identifier``
+    for table, columns in store_columns(conn).items():
+        if not table.startswith(("sdt_", "sys_")):
+            continue
+        for column, reason in ((f"{table}_id", "primary key"), (f"{table}_name", "unique key")):
+            if column in columns and (table, column) not in declared:
+                specs.append(IndexSpec(table, column, reason))
+    return build_indexes(conn, specs, verbose=verbose)
+
+
+def read_query_log(paths: Iterable[Path], include_sql_cache: bool = True) -> List[Tuple[str, int]]:
+    """
+    Queries and their weights from log files (and the NL SQL cache).
+
+    Args:
+        paths: .sql, .json or .jsonl files
+        include_sql_cache: Add the validated SQL cached by the NL query tools
+
+    Returns:
+        List of (sql, weight)
+    """
+    queries: List[Tuple[str, int]] = []
+    for path in map(Path, paths):
+        text = path.read_text()
+        if path.suffix == ".jsonl":
+            records = [json.loads(line) for line in text.splitlines() if line.strip()]
+        elif path.suffix == ".json":
+            records = json.loads(text)
+        else:
+            records = [statement for statement in text.split(";") if statement.strip()]
+        for record in records:
+            if isinstance(record, str):
+                queries.append((record.strip(), 1))
+            elif record.get("sql"):
+                queries.append((record["sql"], int(record.get("count", 1))))
+
+    if include_sql_cache:
+        from nl_translation import SQLCache
+        for entry in SQLCache().entries():
+            queries.append((entry["sql"], entry.get("hits", 0) + 1))
+    return queries
+
+
+def main():
+    """Build indexes or advise on a query log."""
+    import argparse
+    import duckdb
+
+    try:
+        from linkml_coral.utils.schema_snapshot import load_schema_snapshot
+    except ImportError:
+        sys.path.insert(0, str(REPO_ROOT / "src"))
+        from linkml_coral.utils.schema_snapshot import load_schema_snapshot
+
+    parser = argparse.ArgumentParser(description='CDM store indexes and brick ordering')
+    parser.add_argument('command', choices=['build', 'advise'], help='Action to perform')
+    parser.add_argument('logs', nargs='*', type=Path, help='Query log files (for advise)')
+    parser.add_argument('--db', default='cdm_store.db', help='Path to CDM store database')
+    parser.add_argument('--sort-bricks', action='store_true', help='Order large bricks by their leading dimension (build)')
+    parser.add_argument('--sort-min-rows', type=int, default=DEFAULT_SORT_MIN_ROWS,
+                        help=f'Only order bricks with at least this many rows (default: {DEFAULT_SORT_MIN_ROWS:,})')
+    parser.add_argument('--min-rows', type=int, default=DEFAULT_ADVICE_MIN_ROWS,
+                        help=f'Ignore smaller tables when advising (default: {DEFAULT_ADVICE_MIN_ROWS:,})')
+    parser.add_argument('--no-sql-cache', dest='sql_cache', action='store_false',
+                        help="Don't read the NL query tools' SQL cache (advise)")
+    parser.add_argument('--apply', action='store_true', help='Apply the advice (advise)')
+    args = parser.parse_intermixed_args()
+
+    read_only = args.command == 'advise' and not args.apply
+    with duckdb.connect(args.db, read_only=read_only) as conn:
+        if args.command == 'build':
+            if args.sort_bricks:
+                print("📐 Ordering bricks by leading dimension...")
+                print(f"  ✅ {len(sort_bricks(conn, args.sort_min_rows, verbose=True))} brick(s) re-sorted")
+            print("🔍 Creating declared indexes...")
+            schema_view = load_schema_snapshot(CDM_SCHEMA) if CDM_SCHEMA.exists() else None
+            created, errors = build_cdm_indexes(conn, schema_view, verbose=True)
+            for error in errors:
+                print(f"  ⚠️  {error}")
+            print(f"  ✅ Created {created} indexes")
+            return 0
+
+        queries = read_query_log(args.logs, include_sql_cache=args.sql_cache)
+        if not queries:
+            print("No queries to analyze (pass log files or use the NL query tools first)")
+            return 1
+        advice, failed = advise(conn, queries, min_rows=args.min_rows)
+        print(f"📊 Analyzed {len(queries) - failed} of {len(queries)} queries"
+              f"{f' ({failed} could not be planned)' if failed else ''}")
+        if not advice:
+            print("✅ No index or ordering changes suggested")
+            return 0
+        for item in advice:
+            icon = "🔍" if item.kind == "index" else "📐"
+            print(f"\n{icon} {item.kind} {item.table}.{item.column} "
+                  f"(used by {item.queries} queries, {item.table_rows:,} rows)")
+            print(f"   {item.sql};")
+            if args.apply:
+                item.apply(conn)
+                print("   ✅ applied")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
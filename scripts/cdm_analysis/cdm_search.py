@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Text search over a CDM store: ontology terms and entity names.
+
+The loader builds a trigram index (``linkml_coral.utils.search_index``) over
+
+- ``sys_oterm``: term names, synonyms and definitions (keyed by
+  ``sys_oterm_id``)
+- ``sdt_*``: every ``*_name`` / ``*_description`` column (keyed by the
+  table's ``<table>_id``), except ``*_sys_oterm_name`` labels, which are
+  covered by ``sys_oterm``
+
+and saves it next to the store as ``<db>.search/``. The index records the
+load ID from ``<db>.manifest.json``; an index from an earlier load is ignored
+so callers fall back to scanning the tables.
+
+Usage:
+    # Rebuild the index for an existing store
+    python cdm_search.py build --db cdm_store.db
+
+    # Ranked prefix/substring/fuzzy search
+    python cdm_search.py search --db cdm_store.db "sedimnt"
+"""
+
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    from linkml_coral.utils.search_index import SEARCH_MODES, SearchHit, SearchIndex
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+    from linkml_coral.utils.search_index import SEARCH_MODES, SearchHit, SearchIndex
+
+from result_cache import get_manifest_path
+
+OTERM_TABLE = "sys_oterm"
+OTERM_FIELDS = ("sys_oterm_name", "sys_oterm_synonyms", "sys_oterm_definition")
+
+
+def get_search_index_path(db_path) -> Path:
+    """Directory of the search index stored next to a database."""
+    db_path = Path(db_path)
+    return db_path.with_name(db_path.name + ".search")
+
+
+def _load_id(db_path) -> Optional[str]:
+    manifest_path = get_manifest_path(db_path)
+    try:
+        with open(manifest_path) as f:
+            return json.load(f).get('load_id')
+    except (OSError, ValueError):
+        return None
+
+
+def _quote_ident(name: str) -> str:
+    escaped = name.replace('"', '""')
+    return f'"{escaped}"'
+
+
+def searchable_columns(conn) -> Dict[str, Tuple[str, List[str]]]:
+    """
+    Tables and text columns to index.
+
+    Args:
+        conn: DuckDB connection
+
+    Returns:
+        Dict mapping table name to (key column, text columns)
+    """
+    rows = conn.execute("""
+        SELECT table_name, column_name
+        FROM information_schema.columns
+        WHERE table_schema = 'main'
+        ORDER BY table_name, ordinal_position
+    """).fetchall()
+    columns: Dict[str, List[str]] = {}
+    for table, column in rows:
+        columns.setdefault(table, []).append(column)
+
+    tables = {}
+    if OTERM_TABLE in columns and "sys_oterm_id" in columns[OTERM_TABLE]:
+        text = [c for c in columns[OTERM_TABLE] if c in OTERM_FIELDS or "synonym" in c]
+        if text:
+            tables[OTERM_TABLE] = ("sys_oterm_id", text)
+    for table, table_columns in columns.items():
+        key = f"{table}_id"
+        if not table.startswith("sdt_") or key not in table_columns:
+            continue
+        text = [
+            c for c in table_columns
+            if (c.endswith("_name") or c.endswith("_description"))
+            and not c.endswith("_sys_oterm_name")
+        ]
+        if text:
+            tables[table] = (key, text)
+    return tables
+
+
+def iter_documents(conn, batch_size: int = 50_000) -> Iterator[Tuple[str, str, str, str]]:
+    """
+    Yield (source table, key, field, text) for every indexed value.
+
+    Args:
+        conn: DuckDB connection
+        batch_size: Rows fetched per batch
+
+    Returns:
+        Iterator of documents
+    """
+    for table, (key, text_columns) in searchable_columns(conn).items():
+        select = ", ".join(f"CAST({_quote_ident(c)} AS VARCHAR)" for c in [key] + text_columns)
+        cursor = conn.execute(f"SELECT {select} FROM {_quote_ident(table)}")
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            for row in rows:
+                for column, value in zip(text_columns, row[1:]):
+                    if value:
+                        yield table, row[0], column, value
+
+
+def build_search_index(conn, db_path, verbose: bool = False) -> SearchIndex:
+    """
+    Build and save the search index for a store.
+
+    Args:
+        conn: DuckDB connection to the store
+        db_path: Database file (the index is written next to it)
+        verbose: Print per-table counts
+
+    Returns:
+        The saved SearchIndex
+    """
+    index = SearchIndex()
+    counts: Dict[str, int] = {}
+    for table, key, column, text in iter_documents(conn):
+        index.add(key, text, field=column, source=table)
+        counts[table] = counts.get(table, 0) + 1
+    if verbose:
+        for table, count in sorted(counts.items()):
+            print(f"  • {table}: {count:,} values")
+    index.save(get_search_index_path(db_path), metadata={
+        'load_id': _load_id(db_path),
+        'database': str(Path(db_path).resolve()),
+        'sources': counts,
+    })
+    return index
+
+
+def load_search_index(db_path) -> Optional[SearchIndex]:
+    """
+    Open the search index saved next to a store.
+
+    Args:
+        db_path: Database file
+
+    Returns:
+        SearchIndex, or None if there is no index or it is from an earlier load
+    """
+    path = get_search_index_path(db_path)
+    if not path.exists():
+        return None
+    try:
+        index = SearchIndex.load(path)
+    except (OSError, ValueError):
+        return None
+    load_id = _load_id(db_path)
+    if load_id is not None and index.metadata.get('load_id') != load_id:
+        return None
+    return index
+
+
+def search_hint_hits(index: SearchIndex, text: str, limit: int = 10) -> List[SearchHit]:
+    """
+    Stored terms/entities that match words (or word pairs) of a question.
+
+    Args:
+        index: Store search index
+        text: Natural-language question
+        limit: Maximum hits
+
+    Returns:
+        Best hit per (table, key), highest score first
+    """
+    words = [w for w in text.replace('"', ' ').replace("'", ' ').split() if len(w) >= 4]
+    hits: Dict[Tuple[str, str], SearchHit] = {}
+    phrases = [" ".join(words[i:i + 2]) for i in range(len(words) - 1)] + words
+    for phrase in phrases:
+        for hit in index.search(phrase, limit=3, mode="auto", min_similarity=0.5):
+            if hit.match == "substring":
+                continue
+            slot = (hit.source, hit.key)
+            if slot not in hits or hit.score > hits[slot].score:
+                hits[slot] = hit
+    return sorted(hits.values(), key=lambda h: -h.score)[:limit]
+
+
+def format_search_hints(index: SearchIndex, text: str, limit: int = 10) -> str:
+    """
+    Prompt lines naming stored terms/entities that match words of a question.
+
+    Lets natural-language translators use real ontology IDs and entity names
+    (e.g., 'sediment' -> ENVO:00002007) instead of guessing literals.
+
+    Args:
+        index: Store search index
+        text: Natural-language question
+        limit: Maximum hints
+
+    Returns:
+        Newline-separated hints ('' if nothing matched)
+    """
+    return format_hint_lines(search_hint_hits(index, text, limit))
+
+
+def format_hint_lines(hits: List[SearchHit]) -> str:
+    """One prompt line per hit: table.column = 'text' (key)."""
+    return "\n".join(f"- {h.source}.{h.field} = '{h.text}' ({h.key})" for h in hits)
+
+
+def main():
+    """Build or query the store search index."""
+    import argparse
+    import duckdb
+
+    parser = argparse.ArgumentParser(description='CDM store text search index')
+    parser.add_argument('command', choices=['build', 'search'], help='Action to perform')
+    parser.add_argument('query', nargs='?', help='Search text (for search)')
+    parser.add_argument('--db', default='cdm_store.db', help='Path to CDM store database')
+    parser.add_argument('--mode', choices=SEARCH_MODES, default='auto', help='Match mode (default: auto)')
+    parser.add_argument('--table', action='append', help='Only search these tables (repeatable)')
+    parser.add_argument('--limit', type=int, default=20, help='Max results (default: 20)')
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        with duckdb.connect(args.db, read_only=True) as conn:
+            index = build_search_index(conn, args.db, verbose=True)
+        print(f"✅ Indexed {len(index):,} values → {get_search_index_path(args.db)}")
+        return 0
+
+    if not args.query:
+        parser.error("search requires a query")
+    index = load_search_index(args.db)
+    if index is None:
+        print(f"Error: no current search index for {args.db} (run: cdm_search.py build)", file=sys.stderr)
+        return 1
+    for hit in index.search(args.query, limit=args.limit, mode=args.mode, sources=args.table):
+        print(f"  {hit.score:6.3f}  {hit.match:<9} {hit.source}.{hit.field}  {hit.key}: {hit.text}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,6 +9,7 @@ Usage:
     python cdm_unified_query.py --db cdm_store.db "How many samples?"
     python cdm_unified_query.py --db cdm_store.db "Find samples with their locations"
     python cdm_unified_query.py --db cdm_store.db --explore Sample
+    python cdm_unified_query.py --db cdm_store.db "Count Sample records" --provider template
 """
 
 import argparse
@@ -17,6 +18,11 @@ import re
 from pathlib import Path
 from typing import Optional
 
+if __name__ == "__main__":
+    # Hand off to a running query daemon before the heavy imports below
+    from query_daemon import forward_to_daemon
+    forward_to_daemon("cdm_unified_query")
+
 # Import both query tools
 try:
     from nl_sql_query import NaturalLanguageSQLQuery, format_results_text as format_nl
@@ -68,7 +74,8 @@ class UnifiedCDMQuery:
         db_path: str,
         schema_path: str = "src/linkml_coral/schema/linkml_coral.yaml",
         api_key: Optional[str] = None,
-        verbose: bool = False
+        verbose: bool = False,
+        provider: Optional[str] = None
     ):
         """
         Initialize unified query interface.
@@ -78,11 +85,13 @@ class UnifiedCDMQuery:
             schema_path: Path to LinkML schema
             api_key: Anthropic API key
             verbose: Enable verbose output
+            provider: Translation provider name (see nl_translation.py)
         """
         self.db_path = db_path
         self.schema_path = schema_path
         self.api_key = api_key
         self.verbose = verbose
+        self.provider = provider
 
         # Lazy initialization of query tools
         self._nl_query = None
@@ -94,7 +103,8 @@ class UnifiedCDMQuery:
             self._nl_query = NaturalLanguageSQLQuery(
                 self.db_path,
                 self.api_key,
-                self.verbose
+                self.verbose,
+                self.provider
             )
         return self._nl_query
 
@@ -105,7 +115,8 @@ class UnifiedCDMQuery:
                 self.db_path,
                 self.schema_path,
                 self.api_key,
-                self.verbose
+                self.verbose,
+                self.provider
             )
         return self._schema_query
 
@@ -250,6 +261,12 @@ Examples:
         help='Anthropic API key'
     )
 
+    parser.add_argument(
+        '--provider',
+        choices=['anthropic', 'template'],
+        help='Translation provider (default: CDM_NL_PROVIDER or anthropic)'
+    )
+
     parser.add_argument(
         '--fast',
         action='store_true',
@@ -311,7 +328,8 @@ Examples:
             db_path=args.db,
             schema_path=args.schema,
             api_key=args.api_key,
-            verbose=args.verbose
+            verbose=args.verbose,
+            provider=args.provider
         )
 
         # Handle different operations
@@ -4,7 +4,8 @@ Create comprehensive CDM metadata catalog for DuckDB loading.
 
 This script:
 1. Combines all extracted metadata into unified catalogs
-2. Generates DuckDB-ready table definitions
+2. Writes them as Parquet files and, with --store-db, into an indexed
+   cdm_metadata schema of the CDM store (queried via metadata_catalog.py)
 3. Creates column-level metadata for searchable catalog
 4. Prepares validation rules catalog
 """
@@ -13,9 +14,13 @@ import argparse
 import sys
 import json
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 from collections import defaultdict
 
+from extract_cdm_metadata import analyze_table
+from metadata_catalog import load_catalog_into_duckdb, write_catalog_parquet
+from parquet_footers import scan_cdm_footers, table_category
+
 
 def load_metadata_files(metadata_dir: Path) -> Dict[str, Any]:
     """Load all metadata JSON files."""
@@ -44,6 +49,38 @@ def load_metadata_files(metadata_dir: Path) -> Dict[str, Any]:
     return metadata
 
 
+def load_metadata_from_database(cdm_db_path: Path, workers: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Build the metadata of all tables straight from the CDM parquet footers.
+
+    Uses one concurrent (and cached) footer scan instead of the JSON files
+    written by extract_cdm_metadata.py.
+
+    Args:
+        cdm_db_path: CDM database directory
+        workers: Footer reader threads (default: parquet_footers.DEFAULT_WORKERS)
+
+    Returns:
+        Dict with the same static/system/dynamic layout as load_metadata_files()
+    """
+    metadata = {
+        'static': {},
+        'system': {},
+        'dynamic': {}
+    }
+
+    footers = scan_cdm_footers(cdm_db_path, workers=workers, verbose=True)
+    for table_name, footer in footers.items():
+        category = table_category(table_name)
+        if category is None:
+            continue
+        table_info = analyze_table(cdm_db_path / table_name, footer)
+        if 'error' not in table_info:
+            metadata[category][table_name] = table_info
+
+    return metadata
+
+
 def create_column_catalog(metadata: Dict[str, Any]) -> List[Dict[str, Any]]:
     """
     Create column-level metadata catalog.
@@ -73,12 +110,20 @@ def create_column_catalog(metadata: Dict[str, Any]) -> List[Dict[str, Any]]:
                     'constraint_pattern': col_meta.get('constraint', None),
                     'original_name': col_meta.get('orig_name', None),
                     'field_type': col_meta.get('field_type', None),
+                    'null_count': col_meta.get('null_count', None),
+                    'min_value': _stat_str(col_meta.get('min')),
+                    'max_value': _stat_str(col_meta.get('max')),
                 }
                 catalog.append(record)
 
     return catalog
 
 
+def _stat_str(value: Any) -> Optional[str]:
+    """Render a footer min/max statistic for a VARCHAR catalog column."""
+    return None if value is None else str(value)
+
+
 def create_table_catalog(metadata: Dict[str, Any]) -> List[Dict[str, Any]]:
     """
     Create table-level metadata catalog.
@@ -106,6 +151,8 @@ def create_table_catalog(metadata: Dict[str, Any]) -> List[Dict[str, Any]]:
                 'num_foreign_keys': fk_count,
                 'num_unique_keys': unique_count,
                 'num_required_columns': required_count,
+                'num_files': table_info.get('num_files', None),
+                'compressed_bytes': table_info.get('compressed_bytes', None),
                 'description': f"{category} table with {table_info.get('num_columns', 0)} columns",
             }
             catalog.append(record)
@@ -260,6 +307,9 @@ def generate_duckdb_ddl(catalogs: Dict[str, List[Dict[str, Any]]]) -> str:
     ddl.append("  constraint_pattern VARCHAR,")
     ddl.append("  original_name VARCHAR,")
     ddl.append("  field_type VARCHAR,")
+    ddl.append("  null_count BIGINT,")
+    ddl.append("  min_value VARCHAR,")
+    ddl.append("  max_value VARCHAR,")
     ddl.append("  PRIMARY KEY (table_name, column_name)")
     ddl.append(");")
     ddl.append("")
@@ -274,6 +324,8 @@ def generate_duckdb_ddl(catalogs: Dict[str, List[Dict[str, Any]]]) -> str:
     ddl.append("  num_foreign_keys INTEGER,")
     ddl.append("  num_unique_keys INTEGER,")
     ddl.append("  num_required_columns INTEGER,")
+    ddl.append("  num_files INTEGER,")
+    ddl.append("  compressed_bytes BIGINT,")
     ddl.append("  description TEXT")
     ddl.append(");")
     ddl.append("")
@@ -333,6 +385,13 @@ def main():
         help='Directory containing extracted metadata JSON files'
     )
 
+    parser.add_argument(
+        '--cdm-database',
+        type=Path,
+        help='Read metadata directly from this CDM database\'s parquet footers '
+             'instead of --metadata-dir'
+    )
+
     parser.add_argument(
         '--output-dir',
         type=Path,
@@ -340,6 +399,18 @@ def main():
         help='Output directory for catalog files'
     )
 
+    parser.add_argument(
+        '--store-db',
+        type=Path,
+        help='Also load the catalogs into the cdm_metadata schema of this DuckDB store'
+    )
+
+    parser.add_argument(
+        '--json',
+        action='store_true',
+        help='Also write the catalogs as JSON files (legacy format)'
+    )
+
     parser.add_argument(
         '--generate-ddl',
         action='store_true',
@@ -353,8 +424,15 @@ def main():
     print()
 
     # Load all metadata
-    print("📥 Loading metadata files...")
-    metadata = load_metadata_files(args.metadata_dir)
+    if args.cdm_database:
+        if not args.cdm_database.exists():
+            print(f"Error: Database not found: {args.cdm_database}", file=sys.stderr)
+            sys.exit(1)
+        print(f"📥 Scanning parquet footers in {args.cdm_database}...")
+        metadata = load_metadata_from_database(args.cdm_database)
+    else:
+        print("📥 Loading metadata files...")
+        metadata = load_metadata_files(args.metadata_dir)
 
     total_tables = (
         len(metadata['static']) +
@@ -396,19 +474,34 @@ def main():
         'relationship_catalog': relationship_catalog,
     }
 
-    for catalog_name, catalog_data in catalogs.items():
-        output_file = args.output_dir / f'{catalog_name}.json'
-        with open(output_file, 'w') as f:
-            json.dump(catalog_data, f, indent=2)
-        print(f"   ✅ {catalog_name}.json ({len(catalog_data)} records)")
-
-    # Generate combined catalog
-    combined_file = args.output_dir / 'all_catalogs.json'
-    with open(combined_file, 'w') as f:
-        json.dump(catalogs, f, indent=2)
-    print(f"   ✅ all_catalogs.json (combined)")
+    for catalog_name, path in write_catalog_parquet(catalogs, args.output_dir).items():
+        print(f"   ✅ {path.name} ({len(catalogs[catalog_name])} records)")
+
+    if args.json:
+        for catalog_name, catalog_data in catalogs.items():
+            output_file = args.output_dir / f'{catalog_name}.json'
+            with open(output_file, 'w') as f:
+                json.dump(catalog_data, f, indent=2)
+            print(f"   ✅ {catalog_name}.json ({len(catalog_data)} records)")
+
+        # Generate combined catalog
+        combined_file = args.output_dir / 'all_catalogs.json'
+        with open(combined_file, 'w') as f:
+            json.dump(catalogs, f, indent=2)
+        print(f"   ✅ all_catalogs.json (combined)")
     print()
 
+    # Load into the store database
+    if args.store_db:
+        import duckdb
+
+        print(f"🗄️  Loading catalogs into {args.store_db} (schema cdm_metadata)...")
+        with duckdb.connect(str(args.store_db)) as conn:
+            counts = load_catalog_into_duckdb(conn, args.output_dir)
+        for table_name, count in counts.items():
+            print(f"   ✅ cdm_metadata.{table_name} ({count} rows)")
+        print()
+
     # Generate DuckDB DDL
     if args.generate_ddl:
         print("🗄️  Generating DuckDB DDL...")
@@ -426,14 +519,19 @@ def main():
     print(f"Output directory: {args.output_dir}")
     print()
     print("Files created:")
-    print("  • column_catalog.json - All column metadata")
-    print("  • table_catalog.json - All table metadata")
-    print("  • validation_catalog.json - Validation rules")
-    print("  • microtype_catalog.json - Microtype usage")
-    print("  • relationship_catalog.json - FK relationships")
-    print("  • all_catalogs.json - Combined catalog")
+    print("  • column_catalog.parquet - All column metadata")
+    print("  • table_catalog.parquet - All table metadata")
+    print("  • validation_catalog.parquet - Validation rules")
+    print("  • microtype_catalog.parquet - Microtype usage")
+    print("  • relationship_catalog.parquet - FK relationships")
+    if args.json:
+        print("  • <catalog>.json, all_catalogs.json - JSON copies")
     if args.generate_ddl:
         print("  • cdm_metadata_schema.sql - DuckDB DDL")
+    print()
+    print("Query them with:")
+    print(f"  uv run python scripts/cdm_analysis/metadata_catalog.py "
+          f"--catalog {args.store_db or args.output_dir} columns --microtype ME:0000114")
 
 
 if __name__ == "__main__":
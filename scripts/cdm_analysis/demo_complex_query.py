@@ -20,23 +20,95 @@ from collections import defaultdict
 
 from linkml_store import Client
 
+from join_planner import DEFAULT_SCHEMA, JoinPlanner
+
+try:
+    from linkml_coral.utils.schema_snapshot import load_schema_snapshot
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+    from linkml_coral.utils.schema_snapshot import load_schema_snapshot
+
 
 class ComplexCDMQuery:
     """Demonstrate complex queries across CDM tables and bricks."""
 
-    def __init__(self, db_path: str):
-        """Initialize query interface."""
+    def __init__(self, db_path: str, schema_path: Path = DEFAULT_SCHEMA):
+        """
+        Initialize query interface.
+
+        Args:
+            db_path: Path to CDM store database
+            schema_path: CDM LinkML schema (join edges for the path queries)
+        """
         self.db_path = db_path
+        self.schema_path = Path(schema_path)
         self.client = Client()
         self.db = self.client.attach_database(f"duckdb:///{db_path}", alias="cdm")
+        self._sql_conn = None
+        self._planner = None
 
     def get_collection(self, collection_name: str):
         """Get a collection from the database."""
+        # DuckDB refuses a second connection with a different configuration
+        self.close_sql_connection()
         try:
             return self.db.get_collection(collection_name)
         except Exception as e:
             raise ValueError(f"Collection '{collection_name}' not found: {e}")
 
+    def get_sql_connection(self):
+        """Return a read-only DuckDB connection for the path queries."""
+        if self._sql_conn is None:
+            import duckdb
+            self.db.close()
+            self._sql_conn = duckdb.connect(self.db_path, read_only=True)
+        return self._sql_conn
+
+    def close_sql_connection(self):
+        """Close the SQL connection (linkml-store reopens the file itself)."""
+        if self._sql_conn is not None:
+            self._sql_conn.close()
+            self._sql_conn = None
+
+    def get_planner(self) -> JoinPlanner:
+        """Join planner for the store's tables and the CDM schema."""
+        if self._planner is None:
+            schema_view = load_schema_snapshot(self.schema_path) if self.schema_path.exists() else None
+            self._planner = JoinPlanner.from_connection(self.get_sql_connection(), schema_view)
+        return self._planner
+
+    def query_path(self, path: List[str], **kwargs):
+        """
+        Run an entity path as one SQL join.
+
+        Args:
+            path: Classes or tables in join order
+            **kwargs: filters, columns, limit, join_type (see JoinPlanner.compile)
+
+        Returns:
+            pyarrow.Table with '<step>.<column>' columns
+        """
+        return self.get_planner().run(self.get_sql_connection(), path, **kwargs)
+
+    def _columns(self, step: str, names: List[str]) -> List[str]:
+        """The given columns that the step's table actually has."""
+        planner = self.get_planner()
+        available = planner.tables[planner.resolve(step)]
+        return [name for name in names if name in available]
+
+    def _step_rows(self, table, step: str) -> List[dict]:
+        """Distinct non-empty values of one path step from a path query result."""
+        prefix = f"{step}."
+        rows, seen = [], set()
+        for row in table.to_pylist():
+            values = {k[len(prefix):]: v for k, v in row.items() if k.startswith(prefix)}
+            key = tuple(values.values())
+            if key in seen or all(v is None for v in key):
+                continue
+            seen.add(key)
+            rows.append(values)
+        return rows
+
     def _get_rows(self, query_result) -> List[dict]:
         """Get rows from linkml-store query result."""
         if hasattr(query_result, 'rows'):
@@ -52,9 +124,9 @@ class ComplexCDMQuery:
 
         This query demonstrates:
         1. Static table access (Location, Sample)
-        2. Dynamic brick data access (DynamicDataArray)
+        2. Dynamic brick data access (brick tables keyed by sample name)
         3. Ontology term resolution (SystemOntologyTerm)
-        4. Multi-table joins
+        4. Multi-table joins compiled by the join planner, filtered in SQL
 
         Args:
             location_id: Location ID to filter (default: use first location)
@@ -69,95 +141,99 @@ class ComplexCDMQuery:
 
         # Step 1: Get location info
         print(f"\n📍 Step 1: Fetching location data...")
-        location_coll = self.get_collection("Location")
-
-        if location_id:
-            locations = self._get_rows(location_coll.find({"sdt_location_id": location_id}))
-        else:
-            # Get first location
-            locations = self._get_rows(location_coll.find(limit=1))
+        location_columns = self._columns("Location", [
+            'sdt_location_id', 'sdt_location_name', 'latitude_degree', 'longitude_degree'])
+        locations = self.query_path(
+            ["Location"],
+            filters={"Location": {"sdt_location_id": location_id}} if location_id else None,
+            columns={"Location": location_columns},
+            limit=1
+        ).to_pylist()
 
         if not locations:
             print(f"  ❌ No location found")
             return {}
 
-        location = locations[0]
+        location = {k.split('.', 1)[1]: v for k, v in locations[0].items()}
         location_id = location.get('sdt_location_id')
         location_name = location.get('sdt_location_name', 'Unknown')
 
         print(f"  ✅ Location: {location_name} ({location_id})")
-        print(f"     Coordinates: {location.get('sdt_location_latitude')}, {location.get('sdt_location_longitude')}")
+        print(f"     Coordinates: {location.get('latitude_degree')}, {location.get('longitude_degree')}")
 
-        # Step 2: Find samples from this location
+        # Step 2: Find samples from this location (joined and filtered in SQL)
         print(f"\n🧪 Step 2: Finding samples from location {location_id}...")
-        sample_coll = self.get_collection("Sample")
-
-        # Find samples with this location_id
-        samples = self._get_rows(sample_coll.find(limit=limit))
-        # Filter for matching location (field name might vary)
-        samples_at_location = []
-        for sample in samples:
-            loc_ref = sample.get('sdt_sample_location_id') or sample.get('location_ref')
-            if loc_ref == location_id:
-                samples_at_location.append(sample)
+        location_filter = {"Location": {"sdt_location_id": location_id}}
+        samples = self._step_rows(self.query_path(
+            ["Location", "Sample"],
+            filters=location_filter,
+            columns={"Location": [], "Sample": self._columns("Sample", [
+                'sdt_sample_id', 'sdt_sample_name', 'material_sys_oterm_name', 'description'])},
+            limit=limit
+        ), "Sample")
 
-        if not samples_at_location:
+        if not samples:
             print(f"  ⚠️  No samples found at this location")
-            # Still show some samples for demo
-            samples_at_location = samples[:limit]
-            print(f"  📊 Showing {len(samples_at_location)} sample(s) from database (any location)")
         else:
-            print(f"  ✅ Found {len(samples_at_location)} sample(s)")
-
-        # Step 3: Get molecular measurements from brick data
-        print(f"\n💧 Step 3: Fetching molecular measurements (brick data)...")
-        dynamic_coll = self.get_collection("DynamicDataArray")
+            print(f"  ✅ Found {len(samples)} sample(s)")
 
         results = {
             'location': {
                 'id': location_id,
                 'name': location_name,
-                'latitude': location.get('sdt_location_latitude'),
-                'longitude': location.get('sdt_location_longitude'),
+                'latitude': location.get('latitude_degree'),
+                'longitude': location.get('longitude_degree'),
             },
             'samples': []
         }
 
-        for sample in samples_at_location[:limit]:
+        # Step 3: Get molecular measurements from brick data, one join per
+        # brick table that references samples
+        print(f"\n💧 Step 3: Fetching molecular measurements (brick data)...")
+        planner = self.get_planner()
+        measurements = defaultdict(list)
+        sample_names = [s['sdt_sample_name'] for s in samples]
+        bricks = [t for t in planner.referencing(planner.resolve("Sample")) if t.startswith("ddt_brick")]
+        for brick in bricks:
+            if all(len(measurements[name]) >= 3 for name in sample_names):
+                break
+            table = self.query_path(
+                ["Location", "Sample", brick],
+                filters={**location_filter, "Sample": {"sdt_sample_name": sample_names}},
+                columns={"Location": [], "Sample": ['sdt_sample_name'], brick: '*'},
+                limit=3 * len(sample_names)
+            )
+            for row in table.to_pylist():
+                name = row.pop('Sample.sdt_sample_name')
+                if len(measurements[name]) < 3:
+                    record = {k.split('.', 1)[1]: v for k, v in row.items()}
+                    record['brick'] = brick
+                    measurements[name].append(record)
+
+        for sample in samples:
             sample_id = sample.get('sdt_sample_id')
             sample_name = sample.get('sdt_sample_name', sample_id)
 
             print(f"\n  📌 Sample: {sample_name}")
 
-            # Find molecular measurements for this sample in brick data
-            # Look for records with sample_name field
-            brick_data = self._get_rows(dynamic_coll.find(limit=10))
-
-            # Filter for this sample
-            sample_measurements = []
-            for record in brick_data:
-                rec_sample = record.get('sdt_sample_name')
-                if rec_sample == sample_name:
-                    sample_measurements.append(record)
-                    if len(sample_measurements) >= 3:  # Limit for demo
-                        break
-
             sample_info = {
                 'id': sample_id,
                 'name': sample_name,
-                'material': sample.get('sdt_sample_material'),
-                'description': sample.get('sdt_sample_description'),
+                'material': sample.get('material_sys_oterm_name'),
+                'description': sample.get('description'),
                 'molecular_measurements': []
             }
 
+            sample_measurements = measurements.get(sample_name, [])
             if sample_measurements:
                 print(f"     ✅ Found {len(sample_measurements)} molecular measurement(s)")
-                for i, measurement in enumerate(sample_measurements[:3], 1):
+                for i, measurement in enumerate(sample_measurements, 1):
                     # Extract measurement info
                     mol_name = measurement.get('molecule_from_list_sys_oterm_name', 'Unknown')
                     mol_weight = measurement.get('molecule_molecular_weight_dalton')
 
                     meas_info = {
+                        'brick': measurement['brick'],
                         'molecule': mol_name,
                         'molecular_weight': mol_weight,
                     }
@@ -168,7 +244,7 @@ class ComplexCDMQuery:
                             meas_info[key] = value
 
                     sample_info['molecular_measurements'].append(meas_info)
-                    print(f"        {i}. {mol_name} (MW: {mol_weight})")
+                    print(f"        {i}. {mol_name} (MW: {mol_weight}) [{measurement['brick']}]")
             else:
                 print(f"     ⚠️  No molecular measurements in brick data")
 
@@ -182,11 +258,14 @@ class ComplexCDMQuery:
 
         This demonstrates the complete sequencing pipeline with provenance:
         1. Sample collection
-        2. Sequencing (Reads with quality metrics)
+        2. Sequencing (Reads)
         3. Assembly
-        4. Binning → Genome
+        4. Genome
         5. Gene calling
-        6. Provenance tracking through SystemProcess
+        6. Provenance tracking through SystemProcessInput/Output
+
+        The whole chain is compiled into one LEFT JOIN query, so missing later
+        stages still show the stages that exist.
 
         Args:
             sample_id: Sample ID to trace (default: use first sample)
@@ -200,29 +279,30 @@ class ComplexCDMQuery:
 
         # Step 1: Get sample
         print(f"\n🧪 Step 1: Fetching sample data...")
-        sample_coll = self.get_collection("Sample")
-
-        if sample_id:
-            samples = self._get_rows(sample_coll.find({"sdt_sample_id": sample_id}))
-        else:
-            samples = self._get_rows(sample_coll.find(limit=1))
+        samples = self.query_path(
+            ["Sample"],
+            filters={"Sample": {"sdt_sample_id": sample_id}} if sample_id else None,
+            columns={"Sample": self._columns("Sample", [
+                'sdt_sample_id', 'sdt_sample_name', 'material_sys_oterm_name'])},
+            limit=1
+        ).to_pylist()
 
         if not samples:
             print(f"  ❌ No sample found")
             return {}
 
-        sample = samples[0]
+        sample = {k.split('.', 1)[1]: v for k, v in samples[0].items()}
         sample_id = sample.get('sdt_sample_id')
         sample_name = sample.get('sdt_sample_name', sample_id)
 
         print(f"  ✅ Sample: {sample_name}")
-        print(f"     Material: {sample.get('sdt_sample_material')}")
+        print(f"     Material: {sample.get('material_sys_oterm_name')}")
 
         results = {
             'sample': {
                 'id': sample_id,
                 'name': sample_name,
-                'material': sample.get('sdt_sample_material'),
+                'material': sample.get('material_sys_oterm_name'),
             },
             'pipeline': {
                 'reads': [],
@@ -232,135 +312,48 @@ class ComplexCDMQuery:
             }
         }
 
-        # Step 2: Find Reads from this sample
-        print(f"\n📖 Step 2: Finding sequencing reads...")
-        reads_coll = self.get_collection("Reads")
-
-        # Find reads with this sample_id
-        all_reads = self._get_rows(reads_coll.find(limit=100))
-        sample_reads = []
-        for read in all_reads:
-            read_sample = read.get('sdt_reads_sample_id') or read.get('sample_ref')
-            if read_sample == sample_id:
-                sample_reads.append(read)
-
-        if sample_reads:
-            print(f"  ✅ Found {len(sample_reads)} read dataset(s)")
-            for i, read in enumerate(sample_reads[:3], 1):
-                read_count = read.get('sdt_reads_read_count')
-                read_info = {
-                    'id': read.get('sdt_reads_id'),
-                    'read_count': read_count,
-                    'read_count_category': read.get('read_count_category', 'unknown'),
-                }
-                results['pipeline']['reads'].append(read_info)
-                count_str = f"{read_count:,}" if read_count is not None else "N/A"
-                print(f"     {i}. {read_info['id']}: {count_str} reads ({read_info['read_count_category']})")
-        else:
-            print(f"  ⚠️  No reads found for this sample")
-
-        # Step 3: Find Assemblies (via provenance)
-        print(f"\n🧩 Step 3: Finding assemblies...")
-        assembly_coll = self.get_collection("Assembly")
-        process_coll = self.get_collection("SystemProcess")
-
-        # Find processes that used these reads
-        read_ids = [r.get('sdt_reads_id') for r in sample_reads if r.get('sdt_reads_id')]
-        assemblies = []
-
-        if read_ids:
-            # Find assembly processes
-            all_processes = self._get_rows(process_coll.find(limit=1000))
-            for proc in all_processes:
-                input_ids = proc.get('input_entity_ids', [])
-                # Check if any of our read IDs are in inputs
-                if input_ids and any(rid and rid in str(input_ids) for rid in read_ids if rid):
-                    # Check outputs for assemblies
-                    output_types = proc.get('output_entity_types', [])
-                    if 'Assembly' in output_types:
-                        output_ids = proc.get('output_entity_ids', [])
-                        for out_id in output_ids:
-                            # Get assembly details
-                            asm_list = self._get_rows(assembly_coll.find({"sdt_assembly_id": out_id}, limit=1))
-                            if asm_list:
-                                assemblies.append(asm_list[0])
-
-        if assemblies:
-            print(f"  ✅ Found {len(assemblies)} assembl(y/ies)")
-            for i, assembly in enumerate(assemblies[:3], 1):
-                asm_info = {
-                    'id': assembly.get('sdt_assembly_id'),
-                    'n_contigs': assembly.get('sdt_assembly_n_contigs'),
-                    'contig_category': assembly.get('contig_count_category', 'unknown'),
-                }
-                results['pipeline']['assemblies'].append(asm_info)
-                print(f"     {i}. {asm_info['id']}: {asm_info['n_contigs']} contigs ({asm_info['contig_category']})")
-        else:
-            print(f"  ⚠️  No assemblies found")
-
-        # Step 4: Find Genomes
-        print(f"\n🦠 Step 4: Finding genomes...")
-        genome_coll = self.get_collection("Genome")
-        bin_coll = self.get_collection("Bin")
-
-        # Find bins from assemblies
-        assembly_ids = [a.get('sdt_assembly_id') for a in assemblies]
-        bins = []
-
-        if assembly_ids:
-            all_bins = self._get_rows(bin_coll.find(limit=100))
-            for bin_rec in all_bins:
-                bin_asm = bin_rec.get('sdt_bin_assembly_id')
-                if bin_asm in assembly_ids:
-                    bins.append(bin_rec)
-
-        # Find genomes from bins
-        genomes = []
-        if bins:
-            bin_ids = [b.get('sdt_bin_id') for b in bins]
-            all_genomes = self._get_rows(genome_coll.find(limit=100))
-            for genome in all_genomes:
-                genome_bin = genome.get('sdt_genome_bin_id')
-                if genome_bin in bin_ids:
-                    genomes.append(genome)
-
-        if genomes:
-            print(f"  ✅ Found {len(genomes)} genome(s)")
-            for i, genome in enumerate(genomes[:3], 1):
-                genome_info = {
-                    'id': genome.get('sdt_genome_id'),
-                    'name': genome.get('sdt_genome_name'),
-                }
-                results['pipeline']['genomes'].append(genome_info)
-                print(f"     {i}. {genome_info['name']} ({genome_info['id']})")
-        else:
-            print(f"  ⚠️  No genomes found")
-
-        # Step 5: Find Genes
-        print(f"\n🧬 Step 5: Finding genes...")
-        gene_coll = self.get_collection("Gene")
-
-        # Find genes from genomes
-        genes = []
-        if genomes:
-            genome_ids = [g.get('sdt_genome_id') for g in genomes]
-            all_genes = self._get_rows(gene_coll.find(limit=100))
-            for gene in all_genes:
-                gene_genome = gene.get('sdt_gene_genome_id')
-                if gene_genome in genome_ids:
-                    genes.append(gene)
-
-        if genes:
-            print(f"  ✅ Found {len(genes)} gene(s)")
-            for i, gene in enumerate(genes[:5], 1):
-                gene_info = {
-                    'id': gene.get('sdt_gene_id'),
-                    'name': gene.get('sdt_gene_name'),
-                }
-                results['pipeline']['genes'].append(gene_info)
-                print(f"     {i}. {gene_info['name']} ({gene_info['id']})")
-        else:
-            print(f"  ⚠️  No genes found")
+        # Steps 2-5: one query over the stages this store can join
+        stages = [
+            ('Reads', 'reads', ['sdt_reads_id', 'sdt_reads_name', 'read_count_count_unit']),
+            ('Assembly', 'assemblies', ['sdt_assembly_id', 'sdt_assembly_name', 'n_contigs_count_unit']),
+            ('Genome', 'genomes', ['sdt_genome_id', 'sdt_genome_name']),
+            ('Gene', 'genes', ['sdt_gene_id', 'sdt_gene_name']),
+        ]
+        path = ["Sample"]
+        for step, _, _ in stages:
+            try:
+                self.get_planner().compile(path + [step])
+            except ValueError as e:
+                print(f"\n  ⚠️  Stopping the pipeline before {step}: {e}")
+                break
+            path.append(step)
+        if len(path) == 1:
+            return results
+
+        print(f"\n🔗 Joining {' → '.join(path)} in one query...")
+        columns = {"Sample": []}
+        for step, _, names in stages[:len(path) - 1]:
+            columns[step] = self._columns(step, names)
+        table = self.query_path(
+            path,
+            filters={"Sample": {"sdt_sample_id": sample_id}},
+            columns=columns,
+            join_type="LEFT"
+        )
+
+        icons = {'Reads': '📖', 'Assembly': '🧩', 'Genome': '🦠', 'Gene': '🧬'}
+        for step, key, _ in stages[:len(path) - 1]:
+            rows = self._step_rows(table, step)
+            print(f"\n{icons[step]} {step}:")
+            if not rows:
+                print(f"  ⚠️  No {key} found")
+                continue
+            print(f"  ✅ Found {len(rows)} record(s)")
+            for i, row in enumerate(rows[:5], 1):
+                results['pipeline'][key].append(row)
+                details = ", ".join(f"{k}={v}" for k, v in row.items() if not k.endswith(('_id', '_name')))
+                label = row.get(f"sdt_{step.lower()}_name") or row.get(f"sdt_{step.lower()}_id")
+                print(f"     {i}. {label}{f' ({details})' if details else ''}")
 
         return results
 
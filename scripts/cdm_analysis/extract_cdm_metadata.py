@@ -23,6 +23,8 @@ except ImportError:
     print("Error: pyarrow not installed. Run: uv pip install pyarrow")
     sys.exit(1)
 
+from parquet_footers import scan_cdm_footers, table_dirs
+
 
 def parse_spark_row_metadata(parquet_file: pq.ParquetFile) -> Dict[str, Any]:
     """
@@ -80,26 +82,27 @@ def extract_column_metadata(field_metadata: Dict[str, Any]) -> Dict[str, Any]:
     return extracted
 
 
-def analyze_table(table_path: Path) -> Dict[str, Any]:
+def analyze_table(table_path: Path, footer: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """
     Analyze a single table and extract all metadata.
 
+    Args:
+        table_path: CDM table directory
+        footer: The table's entry from parquet_footers.scan_cdm_footers
+            (default: scan this table's footers)
+
     Returns:
         Dict with table info and column metadata
     """
     table_name = table_path.name
 
-    # Find parquet files
-    parquet_files = list(table_path.glob("*.parquet"))
-    if not parquet_files:
+    if footer is None:
+        footer = scan_cdm_footers(table_path.parent, [table_name]).get(table_name)
+    if footer is None:
         return {'error': 'No parquet files found'}
 
-    # Read first file for schema
-    parquet_file = pq.ParquetFile(parquet_files[0])
-    schema = parquet_file.schema_arrow
-
-    # Parse Spark metadata
-    spark_metadata = parse_spark_row_metadata(parquet_file)
+    # Spark metadata merged across all of the table's files
+    spark_metadata = footer['spark_metadata']
 
     if not spark_metadata:
         return {'error': 'No Spark metadata found'}
@@ -115,18 +118,23 @@ def analyze_table(table_path: Path) -> Dict[str, Any]:
         # Extract structured metadata
         metadata = extract_column_metadata(col_metadata)
 
+        # Row-group statistics from the footers
+        stats = footer['columns'].get(col_name, {})
+
         columns[col_name] = {
             'type': col_type,
             'nullable': col_nullable,
-            **metadata
+            **metadata,
+            'null_count': stats.get('null_count'),
+            'min': stats.get('min'),
+            'max': stats.get('max'),
         }
 
-    # Count rows
-    total_rows = sum(pq.ParquetFile(pf).metadata.num_rows for pf in parquet_files)
-
     return {
         'table_name': table_name,
-        'total_rows': total_rows,
+        'total_rows': footer['total_rows'],
+        'num_files': footer['num_files'],
+        'compressed_bytes': footer['compressed_bytes'],
         'num_columns': len(columns),
         'columns': columns
     }
@@ -261,31 +269,16 @@ def main():
         sys.exit(1)
 
     # Categorize tables
-    tables = []
-    for table_dir in sorted(args.cdm_database.iterdir()):
-        if not table_dir.is_dir():
-            continue
-
-        name = table_dir.name
-
-        # Filter by category
-        if args.category == 'static' and not name.startswith('sdt_'):
-            continue
-        elif args.category == 'system' and not name.startswith('sys_'):
-            continue
-        elif args.category == 'dynamic' and not name.startswith('ddt_'):
-            continue
-
-        # Filter by specific table
-        if args.table and name != args.table:
-            continue
-
-        tables.append(table_dir)
+    tables = table_dirs(args.cdm_database, args.category, args.table)
 
     print(f"📊 ENIGMA CDM Metadata Extraction")
     print(f"{'='*70}\n")
     print(f"Analyzing {len(tables)} table(s)...\n")
 
+    # One concurrent footer scan for all tables
+    footers = scan_cdm_footers(args.cdm_database, [t.name for t in tables], verbose=True)
+    print()
+
     # Analyze tables
     results = {}
 
@@ -294,7 +287,11 @@ def main():
         print(f"📦 {table_name}")
 
         try:
-            table_info = analyze_table(table_path)
+            if table_name not in footers:
+                print(f"   ❌ No parquet files found\n")
+                continue
+
+            table_info = analyze_table(table_path, footers[table_name])
 
             if 'error' in table_info:
                 print(f"   ❌ {table_info['error']}\n")
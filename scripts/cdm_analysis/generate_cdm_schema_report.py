@@ -3,48 +3,107 @@
 Generate a comprehensive JSON report of the KBase CDM schema structure.
 """
 
+import duckdb
 import pandas as pd
+import pyarrow.parquet as pq
 from pathlib import Path
 import json
 from typing import Dict, List, Any
 
+from parquet_footers import parquet_files, scan_cdm_footers
+
 DB_PATH = Path("data/enigma_coral.db")
 
+_footers = None
+
+
+def get_footers() -> Dict[str, Dict[str, Any]]:
+    """Footers of every table under DB_PATH, scanned concurrently once per run."""
+    global _footers
+    if _footers is None:
+        _footers = scan_cdm_footers(DB_PATH, verbose=True)
+    return _footers
+
 def find_parquet_file(table_dir: Path) -> Path:
     """Find the actual parquet file in a Delta Lake table directory."""
-    parquet_files = [f for f in table_dir.glob('*.parquet') if not f.parent.name.startswith('_')]
-    if parquet_files:
-        return parquet_files[0]
+    files = parquet_files(table_dir)
+    if files:
+        return files[0]
     return None
 
+def count_unique_values(table_dir: Path, footer: Dict[str, Any]) -> Dict[str, int]:
+    """
+    Count distinct values per column over all of a table's files.
+
+    Key columns (*_id) are counted exactly since they decide primary key
+    classification; other columns use DuckDB's approx_count_distinct.
+    Columns with nested types (lists, structs) get -1.
+
+    Args:
+        table_dir: CDM table directory
+        footer: The table's entry from scan_cdm_footers
+
+    Returns:
+        Dict mapping column name to its distinct value count
+    """
+    counts = {}
+    expressions = []
+    for col_name, col_footer in footer['columns'].items():
+        if col_footer['type'].startswith(('list', 'large_list', 'struct', 'map')):
+            counts[col_name] = -1
+            continue
+        quoted = '"' + col_name.replace('"', '""') + '"'
+        if col_name.endswith('_id'):
+            expressions.append((col_name, f"count(DISTINCT {quoted})"))
+        else:
+            expressions.append((col_name, f"approx_count_distinct({quoted})"))
+
+    if expressions and footer['total_rows'] > 0:
+        files = [str(f) for f in parquet_files(table_dir)]
+        select = ', '.join(expr for _, expr in expressions)
+        with duckdb.connect() as conn:
+            row = conn.execute(f"SELECT {select} FROM read_parquet(?, union_by_name=true)",
+                               [files]).fetchone()
+        counts.update({col_name: int(value) for (col_name, _), value in zip(expressions, row)})
+    else:
+        counts.update({col_name: 0 for col_name, _ in expressions})
+
+    return counts
+
 def analyze_table_schema(table_dir: Path) -> Dict[str, Any]:
     """Extract schema details from a table."""
+    footer = get_footers().get(table_dir.name)
     parquet_file = find_parquet_file(table_dir)
-    if not parquet_file:
+    if not footer or not parquet_file:
         return None
 
-    df = pd.read_parquet(parquet_file)
+    # Row counts, null counts and types come from the footers; only the
+    # sample values are read from the first row batch
+    batch = next(pq.ParquetFile(parquet_file).iter_batches(batch_size=100), None)
+    sample = batch.to_pandas() if batch is not None else pd.DataFrame()
+    unique_counts = count_unique_values(table_dir, footer)
+    row_count = footer['total_rows']
 
     columns = []
-    for col_name in df.columns:
-        try:
-            unique_count = int(df[col_name].nunique()) if len(df) > 0 else 0
-        except (TypeError, ValueError):
-            # Column contains unhashable types like lists/arrays
-            unique_count = -1
+    for col_name, col_footer in footer['columns'].items():
+        unique_count = unique_counts[col_name]
+        null_count = col_footer['null_count']
 
         col_data = {
             'name': col_name,
-            'dtype': str(df[col_name].dtype),
-            'nullable': bool(df[col_name].isna().any()),
+            'dtype': col_footer['type'],
+            'nullable': null_count is None or null_count > 0,
             'unique_count': unique_count,
-            'null_count': int(df[col_name].isna().sum()),
-            'sample_values': [str(v)[:200] for v in df[col_name].dropna().head(5).tolist()]  # Truncate long values
+            'null_count': null_count,
+            'min': col_footer['min'],
+            'max': col_footer['max'],
+            'sample_values': ([str(v)[:200] for v in sample[col_name].dropna().head(5).tolist()]
+                              if col_name in sample.columns else [])  # Truncate long values
         }
 
         # Classify column type
         if col_name.endswith('_id') and 'sys_oterm' not in col_name:
-            if unique_count > 0 and unique_count == len(df) and not df[col_name].isna().any():
+            if unique_count > 0 and unique_count == row_count and null_count == 0:
                 col_data['classification'] = 'primary_key'
             else:
                 col_data['classification'] = 'foreign_key'
@@ -60,10 +119,11 @@ def analyze_table_schema(table_dir: Path) -> Dict[str, Any]:
         columns.append(col_data)
 
     return {
-        'row_count': len(df),
-        'column_count': len(df.columns),
+        'row_count': row_count,
+        'column_count': len(columns),
+        'num_files': footer['num_files'],
         'columns': columns,
-        'memory_usage_mb': float(df.memory_usage(deep=True).sum() / 1024 / 1024)
+        'uncompressed_size_mb': float(footer['uncompressed_bytes'] / 1024 / 1024)
     }
 
 def extract_typedef_mappings() -> Dict[str, Any]:
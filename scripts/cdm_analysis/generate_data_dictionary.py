@@ -3,33 +3,54 @@
 Generate comprehensive data dictionary from CDM metadata catalogs.
 
 Outputs:
-- HTML data dictionary (interactive, searchable)
+- HTML data dictionary (interactive, searchable; column lists and the
+  search index are separate files loaded on demand)
 - Markdown data dictionary
 - CSV data dictionary
 """
 
 import argparse
-import sys
 import json
+import re
+import sys
+from collections import defaultdict
+from html import escape
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 from datetime import datetime
 
+from metadata_catalog import MetadataCatalog
 
-def load_catalogs(metadata_dir: Path) -> Dict[str, List[Dict[str, Any]]]:
-    """Load all metadata catalogs."""
-    combined_file = metadata_dir / 'all_catalogs.json'
+# Lazy assets of the HTML dictionary, next to cdm_data_dictionary.html
+DICTIONARY_ASSETS = 'cdm_data_dictionary'
+SEARCH_PAGE_SIZE = 50
+SEARCH_SNIPPET_CHARS = 160
 
-    if not combined_file.exists():
-        print(f"Error: Catalog file not found: {combined_file}", file=sys.stderr)
+
+def load_catalogs(source: Path) -> MetadataCatalog:
+    """Open the metadata catalogs (catalog directory or store database)."""
+    try:
+        return MetadataCatalog.open(source)
+    except FileNotFoundError as e:
+        print(f"Error: {e}", file=sys.stderr)
         print("Run: uv run python scripts/cdm_analysis/create_metadata_catalog.py", file=sys.stderr)
         sys.exit(1)
 
-    with open(combined_file) as f:
-        return json.load(f)
 
+def catalog_overview(catalog: MetadataCatalog) -> Dict[str, int]:
+    """Table, column, row, microtype and relationship totals."""
+    counts = catalog.counts()
+    total_rows = catalog.query("SELECT coalesce(sum(total_rows), 0) AS n FROM cdm_table_metadata")[0]['n']
+    return {
+        'tables': counts['table_catalog'],
+        'columns': counts['column_catalog'],
+        'rows': int(total_rows),
+        'microtypes': counts['microtype_catalog'],
+        'relationships': counts['relationship_catalog'],
+    }
 
-def generate_markdown_dictionary(catalogs: Dict[str, List[Dict[str, Any]]]) -> str:
+
+def generate_markdown_dictionary(catalog: MetadataCatalog) -> str:
     """Generate Markdown data dictionary."""
     lines = []
 
@@ -57,71 +78,35 @@ def generate_markdown_dictionary(catalogs: Dict[str, List[Dict[str, Any]]]) -> s
     lines.append("## Overview")
     lines.append("")
 
-    table_catalog = {t['table_name']: t for t in catalogs['table_catalog']}
-    column_catalog_by_table = {}
-    for col in catalogs['column_catalog']:
-        table_name = col['table_name']
-        if table_name not in column_catalog_by_table:
-            column_catalog_by_table[table_name] = []
-        column_catalog_by_table[table_name].append(col)
-
-    total_tables = len(table_catalog)
-    total_columns = len(catalogs['column_catalog'])
-    total_rows = sum(t.get('total_rows', 0) for t in catalogs['table_catalog'])
-
-    lines.append(f"- **Total Tables:** {total_tables}")
-    lines.append(f"- **Total Columns:** {total_columns}")
-    lines.append(f"- **Total Rows:** {total_rows:,}")
-    lines.append(f"- **Microtypes Used:** {len(catalogs['microtype_catalog'])}")
-    lines.append(f"- **FK Relationships:** {len(catalogs['relationship_catalog'])}")
-    lines.append("")
-    lines.append("---")
-    lines.append("")
-
-    # Group tables by category
-    tables_by_category = {'static': [], 'system': [], 'dynamic': []}
-    for table_name, table_info in table_catalog.items():
-        category = table_info['table_category']
-        tables_by_category[category].append((table_name, table_info))
-
-    # Static Tables
-    lines.append("## Static Tables")
-    lines.append("")
-    lines.append("Static entity tables (sdt_*) store core domain entities.")
-    lines.append("")
-
-    for table_name, table_info in sorted(tables_by_category['static']):
-        lines.extend(format_table_section(
-            table_name,
-            table_info,
-            column_catalog_by_table.get(table_name, [])
-        ))
+    overview = catalog_overview(catalog)
 
-    # System Tables
-    lines.append("## System Tables")
+    lines.append(f"- **Total Tables:** {overview['tables']}")
+    lines.append(f"- **Total Columns:** {overview['columns']}")
+    lines.append(f"- **Total Rows:** {overview['rows']:,}")
+    lines.append(f"- **Microtypes Used:** {overview['microtypes']}")
+    lines.append(f"- **FK Relationships:** {overview['relationships']}")
     lines.append("")
-    lines.append("System tables (sys_*) store metadata and provenance information.")
+    lines.append("---")
     lines.append("")
 
-    for table_name, table_info in sorted(tables_by_category['system']):
-        lines.extend(format_table_section(
-            table_name,
-            table_info,
-            column_catalog_by_table.get(table_name, [])
-        ))
-
-    # Dynamic Tables
-    lines.append("## Dynamic Tables")
-    lines.append("")
-    lines.append("Dynamic data tables (ddt_*) store measurement arrays in brick format.")
-    lines.append("")
+    sections = [
+        ('static', "Static Tables", "Static entity tables (sdt_*) store core domain entities."),
+        ('system', "System Tables", "System tables (sys_*) store metadata and provenance information."),
+        ('dynamic', "Dynamic Tables", "Dynamic data tables (ddt_*) store measurement arrays in brick format."),
+    ]
+    for category, title, intro in sections:
+        lines.append(f"## {title}")
+        lines.append("")
+        lines.append(intro)
+        lines.append("")
 
-    for table_name, table_info in sorted(tables_by_category['dynamic']):
-        lines.extend(format_table_section(
-            table_name,
-            table_info,
-            column_catalog_by_table.get(table_name, [])
-        ))
+        # One query per table for its columns
+        for table_info in catalog.tables(category):
+            lines.extend(format_table_section(
+                table_info['table_name'],
+                table_info,
+                catalog.columns(table=table_info['table_name'])
+            ))
 
     # Microtype Reference
     lines.append("## Microtype Reference")
@@ -131,13 +116,13 @@ def generate_markdown_dictionary(catalogs: Dict[str, List[Dict[str, Any]]]) -> s
     lines.append("| Microtype | Usage Count | Example Description |")
     lines.append("|-----------|-------------|---------------------|")
 
-    for microtype in sorted(catalogs['microtype_catalog'], key=lambda x: -x['usage_count'])[:20]:
+    for microtype in catalog.microtypes(limit=20):
         usage = microtype['usage_count']
-        desc = microtype['example_description'][:80]
+        desc = (microtype['example_description'] or '')[:80]
         lines.append(f"| {microtype['microtype']} | {usage} | {desc} |")
 
     lines.append("")
-    lines.append(f"*Showing top 20 of {len(catalogs['microtype_catalog'])} microtypes*")
+    lines.append(f"*Showing top 20 of {overview['microtypes']} microtypes*")
     lines.append("")
 
     # Relationship Catalog
@@ -148,7 +133,7 @@ def generate_markdown_dictionary(catalogs: Dict[str, List[Dict[str, Any]]]) -> s
     lines.append("| Source Table | Source Column | Target Table | Target Column | Required |")
     lines.append("|--------------|---------------|--------------|---------------|----------|")
 
-    for rel in sorted(catalogs['relationship_catalog'], key=lambda x: x['source_table'])[:50]:
+    for rel in catalog.relationships(limit=50):
         req = "✓" if rel['is_required'] else ""
         target_col = rel['target_column'] or "(any)"
         lines.append(
@@ -157,7 +142,7 @@ def generate_markdown_dictionary(catalogs: Dict[str, List[Dict[str, Any]]]) -> s
         )
 
     lines.append("")
-    lines.append(f"*Showing 50 of {len(catalogs['relationship_catalog'])} relationships*")
+    lines.append(f"*Showing 50 of {overview['relationships']} relationships*")
     lines.append("")
 
     return '\n'.join(lines)
@@ -173,7 +158,7 @@ def format_table_section(
 
     lines.append(f"### {table_name}")
     lines.append("")
-    lines.append(f"**Rows:** {table_info.get('total_rows', 0):,} | **Columns:** {table_info.get('num_columns', 0)}")
+    lines.append(f"**Rows:** {table_info.get('total_rows') or 0:,} | **Columns:** {table_info.get('num_columns', 0)}")
     lines.append("")
 
     if table_info.get('description'):
@@ -210,8 +195,141 @@ def format_table_section(
     return lines
 
 
-def generate_html_dictionary(catalogs: Dict[str, List[Dict[str, Any]]]) -> str:
-    """Generate HTML data dictionary with search and filtering."""
+def format_column_rows(table_name: str, columns: List[Dict[str, Any]]) -> List[str]:
+    """Format a table's columns as HTML table rows (anchored for search hits)."""
+    rows = []
+    for col in sorted(columns, key=lambda x: x['column_name']):
+        constraints = []
+        if col.get('is_primary_key'):
+            constraints.append('<span class="badge badge-pk">PK</span>')
+        if col.get('is_unique_key'):
+            constraints.append('<span class="badge badge-unique">UNIQUE</span>')
+        if col.get('is_foreign_key'):
+            fk_ref = escape(col.get('fk_references') or '')
+            constraints.append(f'<span class="badge badge-fk">FK→{fk_ref}</span>')
+        if col.get('is_required'):
+            constraints.append('<span class="badge badge-req">REQ</span>')
+
+        microtype = col.get('microtype')
+        microtype_html = f"<br><span class='microtype'>{escape(microtype)}</span>" if microtype else ""
+        anchor = escape(f"col-{table_name}-{col['column_name']}", quote=True)
+
+        rows.append(f"<tr id='{anchor}'>")
+        rows.append(f"<td><code>{escape(col['column_name'])}</code>{microtype_html}</td>")
+        rows.append(f"<td><code>{escape(col['column_type'] or '')}</code></td>")
+        rows.append(f"<td>{escape(col.get('description') or '')}</td>")
+        rows.append(f"<td>{' '.join(constraints)}</td>")
+        rows.append("</tr>")
+    return rows
+
+
+def format_table_fragment(table_name: str, columns: List[Dict[str, Any]]) -> str:
+    """HTML of one table's column list, loaded by the page when the table is opened."""
+    html = ["<table>"]
+    html.append("<thead><tr><th>Column</th><th>Type</th><th>Description</th><th>Constraints</th></tr></thead>")
+    html.append("<tbody>")
+    html.extend(format_column_rows(table_name, columns))
+    html.append("</tbody>")
+    html.append("</table>")
+    return '\n'.join(html)
+
+
+def _search_tokens(text: Optional[str]) -> List[str]:
+    """Lowercase alphanumeric tokens (splits snake_case names and CURIEs)."""
+    return re.findall(r'[a-z0-9]+', (text or '').lower())
+
+
+def _search_keys(token: str) -> List[str]:
+    """Index keys of a token: its 1- and 2-character prefixes and its trigrams."""
+    keys = ['^' + token[:n] for n in (1, 2) if len(token) >= n]
+    keys.extend(token[i:i + 3] for i in range(len(token) - 2))
+    return keys
+
+
+def build_search_index(catalog: MetadataCatalog) -> Dict[str, Any]:
+    """
+    Precompute the dictionary's client-side search index.
+
+    Every table and column is a document. Queries of one or two characters
+    look up a prefix posting list ("^a", "^ab"); longer ones intersect the
+    posting lists of their trigrams and are then checked against the
+    document's tokens, so a keystroke never scans the whole dictionary.
+    Documents carry only a description snippet for display; the tokens
+    cover the full description.
+
+    Args:
+        catalog: Metadata catalogs
+
+    Returns:
+        Dict with 'docs' ([table, column, microtype, description snippet]
+        with column '' for table documents), 'terms' (each document's
+        space-separated tokens) and 'keys' (index key -> sorted,
+        delta-encoded document ids)
+    """
+    docs = []
+    terms = []
+    postings = defaultdict(set)
+
+    def add(table_name: str, column_name: str, microtype: str, description: str) -> None:
+        doc_id = len(docs)
+        docs.append([table_name, column_name, microtype, description[:SEARCH_SNIPPET_CHARS]])
+        tokens = dict.fromkeys(
+            token for field in (table_name, column_name, microtype, description)
+            for token in _search_tokens(field)
+        )
+        terms.append(' '.join(tokens))
+        for token in tokens:
+            for key in _search_keys(token):
+                postings[key].add(doc_id)
+
+    for table_info in catalog.tables():
+        add(table_info['table_name'], '', '', table_info.get('description') or '')
+    for col in catalog.query(
+        "SELECT table_name, column_name, microtype, description "
+        "FROM cdm_column_metadata ORDER BY table_name, column_name"
+    ):
+        add(col['table_name'], col['column_name'], col['microtype'] or '', col['description'] or '')
+
+    keys = {}
+    for key, ids in sorted(postings.items()):
+        ordered = sorted(ids)
+        keys[key] = [ordered[0]] + [b - a for a, b in zip(ordered, ordered[1:])]
+
+    return {'version': 2, 'docs': docs, 'terms': terms, 'keys': keys}
+
+
+def _jsonp(call: str, *args: Any) -> str:
+    """A script that passes JSON arguments to a page callback.
+
+    The page loads its fragments and search index as scripts rather than
+    with fetch() so the dictionary also works when opened from disk.
+    """
+    return f"{call}({', '.join(json.dumps(a, separators=(',', ':')) for a in args)});\n"
+
+
+def generate_html_dictionary(catalog: MetadataCatalog, output_dir: Path) -> Path:
+    """
+    Write the HTML data dictionary: a light index page plus lazy assets.
+
+    The page lists tables only. Each table's column list is a separate
+    fragment under cdm_data_dictionary/tables/, loaded when the table is
+    opened, and search uses the prebuilt cdm_data_dictionary/search_index.js
+    with debounced lookups and paginated results.
+
+    Args:
+        catalog: Metadata catalogs
+        output_dir: Directory for cdm_data_dictionary.html and its assets
+
+    Returns:
+        Path of the index page
+    """
+    output_dir = Path(output_dir)
+    assets_dir = output_dir / DICTIONARY_ASSETS
+    tables_dir = assets_dir / 'tables'
+    tables_dir.mkdir(parents=True, exist_ok=True)
+    for stale in tables_dir.glob('*.js'):
+        stale.unlink()
+
     html = []
 
     html.append("<!DOCTYPE html>")
@@ -230,92 +348,229 @@ def generate_html_dictionary(catalogs: Dict[str, List[Dict[str, Any]]]) -> str:
     html.append(f"    <p class='subtitle'>Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>")
 
     # Overview stats
+    overview = catalog_overview(catalog)
     html.append("    <div class='stats'>")
-    html.append(f"      <div class='stat'><strong>{len(catalogs['table_catalog'])}</strong><br>Tables</div>")
-    html.append(f"      <div class='stat'><strong>{len(catalogs['column_catalog'])}</strong><br>Columns</div>")
-    html.append(f"      <div class='stat'><strong>{len(catalogs['microtype_catalog'])}</strong><br>Microtypes</div>")
-    html.append(f"      <div class='stat'><strong>{len(catalogs['relationship_catalog'])}</strong><br>Relationships</div>")
+    html.append(f"      <div class='stat'><strong>{overview['tables']}</strong><br>Tables</div>")
+    html.append(f"      <div class='stat'><strong>{overview['columns']}</strong><br>Columns</div>")
+    html.append(f"      <div class='stat'><strong>{overview['microtypes']}</strong><br>Microtypes</div>")
+    html.append(f"      <div class='stat'><strong>{overview['relationships']}</strong><br>Relationships</div>")
     html.append("    </div>")
 
-    # Search box
+    # Search box and paginated results
     html.append("    <div class='search-box'>")
-    html.append("      <input type='text' id='searchInput' placeholder='Search tables, columns, descriptions...' onkeyup='filterTables()'>")
+    html.append("      <input type='text' id='searchInput' placeholder='Search tables, columns, descriptions, microtypes...' autocomplete='off'>")
+    html.append("      <p id='searchStatus' class='table-info'></p>")
+    html.append("      <ul id='searchResults'></ul>")
+    html.append("      <button id='moreResults' type='button' hidden>Show more</button>")
     html.append("    </div>")
 
-    # Tables
-    table_catalog = {t['table_name']: t for t in catalogs['table_catalog']}
-    column_catalog_by_table = {}
-    for col in catalogs['column_catalog']:
-        table_name = col['table_name']
-        if table_name not in column_catalog_by_table:
-            column_catalog_by_table[table_name] = []
-        column_catalog_by_table[table_name].append(col)
-
-    for table_name in sorted(table_catalog.keys()):
-        table_info = table_catalog[table_name]
-        columns = column_catalog_by_table.get(table_name, [])
-
-        html.append(f"    <div class='table-section' data-table='{table_name}'>")
-        html.append(f"      <h2>{table_name}</h2>")
-        html.append(f"      <p class='table-info'>")
-        html.append(f"        <span class='badge'>{table_info['table_category']}</span> ")
-        html.append(f"        {table_info.get('total_rows', 0):,} rows • {table_info.get('num_columns', 0)} columns")
-        html.append(f"      </p>")
-
-        html.append("      <table>")
-        html.append("        <thead>")
-        html.append("          <tr><th>Column</th><th>Type</th><th>Description</th><th>Constraints</th></tr>")
-        html.append("        </thead>")
-        html.append("        <tbody>")
-
-        for col in sorted(columns, key=lambda x: x['column_name']):
-            constraints = []
-            if col.get('is_primary_key'):
-                constraints.append('<span class="badge badge-pk">PK</span>')
-            if col.get('is_unique_key'):
-                constraints.append('<span class="badge badge-unique">UNIQUE</span>')
-            if col.get('is_foreign_key'):
-                fk_ref = col.get('fk_references', '')
-                constraints.append(f'<span class="badge badge-fk">FK→{fk_ref}</span>')
-            if col.get('is_required'):
-                constraints.append('<span class="badge badge-req">REQ</span>')
-
-            html.append("          <tr>")
-            html.append(f"            <td><code>{col['column_name']}</code></td>")
-            html.append(f"            <td><code>{col['column_type']}</code></td>")
-            html.append(f"            <td>{col.get('description', '')}</td>")
-            html.append(f"            <td>{' '.join(constraints)}</td>")
-            html.append("          </tr>")
-
-        html.append("        </tbody>")
-        html.append("      </table>")
-        html.append("    </div>")
+    # Tables: one collapsed entry each, column lists load on open
+    for table_info in catalog.tables():
+        table_name = table_info['table_name']
+        fragment = format_table_fragment(table_name, catalog.columns(table=table_name))
+        with open(tables_dir / f"{table_name}.js", 'w') as f:
+            f.write(_jsonp("cdmDictionary.fragment", table_name, fragment))
+
+        name = escape(table_name, quote=True)
+        html.append(f"    <details class='table-section' data-table='{name}' id='table-{name}'>")
+        html.append(f"      <summary><h2>{name}</h2>")
+        html.append(f"        <span class='table-info'><span class='badge'>{escape(table_info['table_category'])}</span> ")
+        html.append(f"        {table_info.get('total_rows') or 0:,} rows • {table_info.get('num_columns') or 0} columns</span>")
+        html.append("      </summary>")
+        html.append("      <div class='fragment'>Loading…</div>")
+        html.append("    </details>")
 
     html.append("  </div>")
 
-    # JavaScript for search
+    with open(assets_dir / 'search_index.js', 'w') as f:
+        f.write(_jsonp("cdmDictionary.searchIndex", build_search_index(catalog)))
+
     html.append("  <script>")
-    html.append("""
-    function filterTables() {
-      const input = document.getElementById('searchInput');
-      const filter = input.value.toLowerCase();
-      const sections = document.getElementsByClassName('table-section');
-
-      for (let section of sections) {
-        const text = section.textContent || section.innerText;
-        if (text.toLowerCase().indexOf(filter) > -1) {
-          section.style.display = '';
-        } else {
-          section.style.display = 'none';
-        }
-      }
-    }
-    """)
+    html.append(get_html_script())
     html.append("  </script>")
     html.append("</body>")
     html.append("</html>")
 
-    return '\n'.join(html)
+    html_file = output_dir / 'cdm_data_dictionary.html'
+    with open(html_file, 'w') as f:
+        f.write('\n'.join(html))
+    return html_file
+
+
+def get_html_script() -> str:
+    """Get the JavaScript for lazy table fragments and indexed search."""
+    return """
+    const ASSETS = '%(assets)s';
+    const PAGE_SIZE = %(page_size)d;
+    const DEBOUNCE_MS = 150;
+
+    const cdmDictionary = (() => {
+      const fragments = {};
+      const waiting = {};
+      let index = null;
+      let indexLoading = null;
+      const decoded = {};
+      let hits = [];
+      let shown = 0;
+
+      function loadScript(src) {
+        return new Promise((resolve, reject) => {
+          const script = document.createElement('script');
+          script.src = src;
+          script.onload = resolve;
+          script.onerror = () => reject(new Error('Could not load ' + src));
+          document.head.appendChild(script);
+        });
+      }
+
+      function loadFragment(table) {
+        if (fragments[table]) return Promise.resolve(fragments[table]);
+        if (!waiting[table]) {
+          waiting[table] = loadScript(ASSETS + '/tables/' + encodeURIComponent(table) + '.js')
+            .then(() => fragments[table]);
+        }
+        return waiting[table];
+      }
+
+      function openTable(table, column) {
+        const section = document.getElementById('table-' + table);
+        if (!section) return;
+        section.open = true;
+        loadFragment(table).then(() => {
+          const row = column && document.getElementById('col-' + table + '-' + column);
+          const target = row || section;
+          target.scrollIntoView({block: 'center'});
+          if (row) {
+            row.classList.add('highlight');
+            setTimeout(() => row.classList.remove('highlight'), 2000);
+          }
+        });
+      }
+
+      function loadIndex() {
+        if (!indexLoading) indexLoading = loadScript(ASSETS + '/search_index.js');
+        return indexLoading;
+      }
+
+      function postings(key) {
+        if (!(key in decoded)) {
+          const deltas = index.keys[key] || [];
+          const ids = new Array(deltas.length);
+          let id = 0;
+          for (let i = 0; i < deltas.length; i++) { id += deltas[i]; ids[i] = id; }
+          decoded[key] = ids;
+        }
+        return decoded[key];
+      }
+
+      function intersect(a, b) {
+        const out = [];
+        let i = 0, j = 0;
+        while (i < a.length && j < b.length) {
+          if (a[i] === b[j]) { out.push(a[i]); i++; j++; }
+          else if (a[i] < b[j]) i++;
+          else j++;
+        }
+        return out;
+      }
+
+      function candidates(term) {
+        if (term.length < 3) return postings('^' + term);
+        let ids = null;
+        for (let i = 0; i + 3 <= term.length; i++) {
+          const list = postings(term.slice(i, i + 3));
+          ids = ids === null ? list : intersect(ids, list);
+          if (!ids.length) break;
+        }
+        return ids;
+      }
+
+      function search(query) {
+        const terms = query.toLowerCase().match(/[a-z0-9]+/g) || [];
+        if (!terms.length) return null;
+        let ids = null;
+        for (const term of terms) {
+          const list = candidates(term);
+          ids = ids === null ? list : intersect(ids, list);
+          if (!ids.length) return [];
+        }
+        // Trigram hits can be false positives: check the document's tokens
+        return ids.filter(id => terms.every(term => index.terms[id].includes(term)));
+      }
+
+      function escapeHtml(text) {
+        const div = document.createElement('div');
+        div.textContent = text;
+        return div.innerHTML;
+      }
+
+      function renderPage() {
+        const list = document.getElementById('searchResults');
+        const page = hits.slice(shown, shown + PAGE_SIZE);
+        for (const id of page) {
+          const [table, column, microtype, description] = index.docs[id];
+          const item = document.createElement('li');
+          item.innerHTML = '<a href="#">' + escapeHtml(column ? table + '.' + column : table) + '</a>'
+            + (microtype ? ' <span class="microtype">' + escapeHtml(microtype) + '</span>' : '')
+            + (description ? ' — ' + escapeHtml(description) : '');
+          item.querySelector('a').onclick = event => { event.preventDefault(); openTable(table, column); };
+          list.appendChild(item);
+        }
+        shown += page.length;
+        document.getElementById('moreResults').hidden = shown >= hits.length;
+      }
+
+      function showResults(query) {
+        const list = document.getElementById('searchResults');
+        const status = document.getElementById('searchStatus');
+        list.innerHTML = '';
+        const found = search(query);
+        const sections = document.getElementsByClassName('table-section');
+        if (found === null) {
+          hits = [];
+          status.textContent = '';
+          document.getElementById('moreResults').hidden = true;
+          for (const section of sections) section.style.display = '';
+          return;
+        }
+        hits = found;
+        shown = 0;
+        const tables = new Set(hits.map(id => index.docs[id][0]));
+        for (const section of sections) {
+          section.style.display = tables.has(section.dataset.table) ? '' : 'none';
+        }
+        status.textContent = hits.length + ' match(es) in ' + tables.size + ' table(s)';
+        renderPage();
+      }
+
+      function init() {
+        const input = document.getElementById('searchInput');
+        let timer = null;
+        input.addEventListener('focus', loadIndex, {once: true});
+        input.addEventListener('input', () => {
+          clearTimeout(timer);
+          timer = setTimeout(() => loadIndex().then(() => showResults(input.value)), DEBOUNCE_MS);
+        });
+        document.getElementById('moreResults').onclick = renderPage;
+        for (const section of document.getElementsByClassName('table-section')) {
+          section.addEventListener('toggle', () => { if (section.open) loadFragment(section.dataset.table); });
+        }
+      }
+
+      return {
+        init,
+        search,
+        fragment(table, html) {
+          fragments[table] = html;
+          const section = document.getElementById('table-' + table);
+          if (section) section.querySelector('.fragment').innerHTML = html;
+        },
+        searchIndex(data) { index = data; },
+      };
+    })();
+
+    cdmDictionary.init();
+    """ % {'assets': DICTIONARY_ASSETS, 'page_size': SEARCH_PAGE_SIZE}
 
 
 def get_html_styles() -> str:
@@ -445,6 +700,24 @@ def get_html_styles() -> str:
       background: #27ae60;
       color: white;
     }
+    details.table-section summary {
+      cursor: pointer;
+    }
+    details.table-section summary h2 {
+      display: inline;
+      border: none;
+      margin-right: 10px;
+    }
+    #searchResults li {
+      margin: 4px 0;
+    }
+    .microtype {
+      color: #7f8c8d;
+      font-size: 12px;
+    }
+    tr.highlight {
+      background: #fff3cd;
+    }
     """
 
 
@@ -460,6 +733,12 @@ def main():
         help='Directory containing metadata catalog files'
     )
 
+    parser.add_argument(
+        '--store-db',
+        type=Path,
+        help='Read the catalogs from the cdm_metadata schema of this store instead of --metadata-dir'
+    )
+
     parser.add_argument(
         '--output-dir',
         type=Path,
@@ -482,8 +761,8 @@ def main():
 
     # Load catalogs
     print("📥 Loading metadata catalogs...")
-    catalogs = load_catalogs(args.metadata_dir)
-    print(f"   ✅ Loaded {len(catalogs)} catalogs")
+    catalog = load_catalogs(args.store_db or args.metadata_dir)
+    print(f"   ✅ Opened {len(catalog.counts())} catalogs")
     print()
 
     # Create output directory
@@ -492,7 +771,7 @@ def main():
     # Generate markdown
     if args.format in ['markdown', 'all']:
         print("📝 Generating Markdown dictionary...")
-        markdown = generate_markdown_dictionary(catalogs)
+        markdown = generate_markdown_dictionary(catalog)
         md_file = args.output_dir / 'CDM_DATA_DICTIONARY.md'
         with open(md_file, 'w') as f:
             f.write(markdown)
@@ -502,11 +781,9 @@ def main():
     # Generate HTML
     if args.format in ['html', 'all']:
         print("🌐 Generating HTML dictionary...")
-        html = generate_html_dictionary(catalogs)
-        html_file = args.output_dir / 'cdm_data_dictionary.html'
-        with open(html_file, 'w') as f:
-            f.write(html)
+        html_file = generate_html_dictionary(catalog, args.output_dir)
         print(f"   ✅ {html_file}")
+        print(f"   ✅ {args.output_dir / DICTIONARY_ASSETS}/ (table fragments + search index)")
         print()
 
     print("="*70)
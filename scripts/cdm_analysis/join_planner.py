@@ -0,0 +1,436 @@
+#!/usr/bin/env python3
+"""
+Join path planner for multi-hop CDM queries.
+
+Questions like "genomes assembled from reads of samples at this location"
+cross several tables. Instead of fetching rows hop by hop and matching them
+in Python, ``JoinPlanner`` compiles an entity path into a single DuckDB
+query.
+
+Join edges come from three places:
+
+- foreign keys declared in the LinkML schema (``SchemaSnapshot.foreign_keys``:
+  ``foreign_key`` annotations, class ranges, CDM ``constraint_type``)
+- CDM reference naming for columns the schema leaves unannotated
+  (``sdt_sample.sdt_location_name`` -> ``sdt_location``, a brick's
+  ``sdt_sample_name`` -> ``sdt_sample``)
+- provenance: ``sys_process_input`` / ``sys_process_output`` link an input
+  entity to the entities produced by the same process (Sample -> Reads ->
+  Assembly)
+
+Consecutive path steps that are not directly linked are connected by the
+cheapest chain of edges (each joined table costs 1, a provenance hop 3, or 4
+walked from output to input, so Sample -> Reads follows the process that
+used the sample even when samples are also process outputs; ontology terms
+are never used as a stepping stone).
+Filters for a step are placed in that step's JOIN condition, and results
+come back as a pyarrow Table.
+
+Usage:
+    # Samples and reads of one location, as one query
+    python join_planner.py --db cdm_store.db Location Sample Reads \\
+        --where Location.sdt_location_name=Lake_A
+
+    # Only print the SQL
+    python join_planner.py --db cdm_store.db Sample Reads Assembly Genome --sql
+"""
+
+import heapq
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from prompt_context import _class_table, _referenced_table
+
+try:
+    from linkml_coral.utils.instrumentation import span
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+    from linkml_coral.utils.instrumentation import span
+
+PROCESS_INPUT_TABLE = "sys_process_input"
+PROCESS_OUTPUT_TABLE = "sys_process_output"
+PROCESS_KEY = "sys_process_id"
+EDGE_COST = {"fk": 1, "process": 3}
+# Extra cost of a provenance hop walked from process output to input
+REVERSED_PROCESS_COST = 1
+# Shared lookup tables: a path may start or end here but never pass through
+# (two samples with the same material term are not related)
+HUB_TABLES = ("sys_oterm",)
+DEFAULT_SCHEMA = Path(__file__).parent.parent.parent / "src" / "linkml_coral" / "schema" / "cdm" / "linkml_coral_cdm.yaml"
+
+
+@dataclass(frozen=True)
+class JoinEdge:
+    """A join between two store tables."""
+
+    from_table: str
+    from_column: str
+    to_table: str
+    to_column: str
+    kind: str = "fk"  # 'fk' or 'process'
+    # False once reversed (a reversed process edge starts at the process output)
+    forward: bool = True
+
+    def reverse(self) -> "JoinEdge":
+        """The same join walked the other way."""
+        return JoinEdge(self.to_table, self.to_column, self.from_table, self.from_column,
+                        self.kind, not self.forward)
+
+    @property
+    def cost(self) -> int:
+        """Path cost of walking this edge."""
+        if self.kind == "process" and not self.forward:
+            return EDGE_COST[self.kind] + REVERSED_PROCESS_COST
+        return EDGE_COST[self.kind]
+
+
+class JoinPlanner:
+    """Plans and compiles entity paths into DuckDB joins."""
+
+    def __init__(self, tables: Dict[str, List[str]], schema_view=None):
+        """
+        Initialize the planner.
+
+        Args:
+            tables: Store tables and their column names
+            schema_view: Optional SchemaSnapshot (foreign keys and class names)
+        """
+        self.tables = tables
+        self.schema_view = schema_view
+        self.class_tables: Dict[str, str] = {}
+        if schema_view is not None:
+            for class_name in schema_view.all_classes():
+                slots = list(schema_view.class_slots(class_name))
+                identifier = next((s for s in slots if schema_view.induced_slot(s, class_name).identifier), None)
+                table = _class_table(class_name, slots, identifier, tables)
+                if table:
+                    self.class_tables.setdefault(class_name, table)
+        self.edges: Dict[str, List[JoinEdge]] = {table: [] for table in tables}
+        for edge in self._find_edges():
+            self.edges[edge.from_table].append(edge)
+            self.edges[edge.to_table].append(edge.reverse())
+
+    @classmethod
+    def from_connection(cls, conn, schema_view=None) -> "JoinPlanner":
+        """Planner for the tables of an open store."""
+        tables: Dict[str, List[str]] = {}
+        for table, column in conn.execute("""
+            SELECT table_name, column_name FROM information_schema.columns
+            WHERE table_schema = 'main' ORDER BY table_name, ordinal_position
+        """).fetchall():
+            tables.setdefault(table, []).append(column)
+        return cls(tables, schema_view)
+
+    def _find_edges(self) -> List[JoinEdge]:
+        edges = set()
+        process_tables = (PROCESS_INPUT_TABLE, PROCESS_OUTPUT_TABLE)
+
+        # Declared foreign keys
+        if self.schema_view is not None and hasattr(self.schema_view, "foreign_keys"):
+            for fk in self.schema_view.foreign_keys():
+                source = self.class_tables.get(fk["class"])
+                target = self.class_tables.get(fk["target_class"])
+                target_column = fk.get("target_slot")
+                if (source and target and source not in process_tables and source != target
+                        and target_column and fk["slot"] in self.tables[source]
+                        and target_column in self.tables[target]):
+                    edges.add(JoinEdge(source, fk["slot"], target, target_column))
+
+        # CDM reference naming (sdt_location_name -> sdt_location)
+        for table, columns in self.tables.items():
+            if table in process_tables:
+                continue
+            for column in columns:
+                target = _referenced_table(column)
+                if target is None or target == table or target not in self.tables:
+                    continue
+                key = target + ("_id" if column.endswith("_id") else "_name")
+                if key in self.tables[target]:
+                    edges.add(JoinEdge(table, column, target, key))
+
+        # Provenance: entity used by a process -> entity it produced
+        if PROCESS_INPUT_TABLE in self.tables and PROCESS_OUTPUT_TABLE in self.tables:
+            inputs = self._process_columns(PROCESS_INPUT_TABLE)
+            outputs = self._process_columns(PROCESS_OUTPUT_TABLE)
+            for source, in_column in inputs.items():
+                for target, out_column in outputs.items():
+                    if source != target:
+                        edges.add(JoinEdge(source, in_column, target, out_column, "process"))
+        return sorted(edges, key=lambda e: (e.from_table, e.from_column, e.to_table, e.kind))
+
+    def _process_columns(self, process_table: str) -> Dict[str, str]:
+        """Entity tables referenced by a process table's sdt_*_id columns."""
+        columns = {}
+        for column in self.tables[process_table]:
+            target = _referenced_table(column) if column.endswith("_id") else None
+            if target and target.startswith("sdt_") and column in self.tables.get(target, ()):
+                columns[target] = column
+        return columns
+
+    def resolve(self, name: str) -> str:
+        """Table for a class name ('Sample') or table name ('sdt_sample')."""
+        if name in self.tables:
+            return name
+        if name in self.class_tables:
+            return self.class_tables[name]
+        lowered = {c.lower(): t for c, t in self.class_tables.items()}
+        if name.lower() in lowered:
+            return lowered[name.lower()]
+        raise ValueError(f"Unknown entity '{name}' (not a schema class or store table)")
+
+    def referencing(self, table: str) -> List[str]:
+        """Tables with a foreign key column pointing at a table."""
+        return sorted({edge.to_table for edge in self.edges.get(table, ())
+                       if edge.kind == "fk" and not edge.forward})
+
+    def find_path(self, source: str, target: str) -> List[JoinEdge]:
+        """
+        Cheapest chain of joins between two tables.
+
+        Args:
+            source: Start table
+            target: End table
+
+        Returns:
+            Edges from source to target ([] if they are the same table)
+
+        Raises:
+            ValueError: If the tables are not connected
+        """
+        if source == target:
+            return []
+        queue = [(0, 0, source, [])]
+        best = {source: 0}
+        pushed = 0
+        while queue:
+            cost, _, table, path = heapq.heappop(queue)
+            if table == target:
+                return path
+            if cost > best.get(table, cost) or (table in HUB_TABLES and table != source):
+                continue
+            for edge in self.edges.get(table, ()):
+                next_cost = cost + edge.cost
+                if next_cost < best.get(edge.to_table, next_cost + 1):
+                    best[edge.to_table] = next_cost
+                    pushed += 1
+                    heapq.heappush(queue, (next_cost, pushed, edge.to_table, path + [edge]))
+        raise ValueError(f"No join path from {source} to {target}")
+
+    def compile(
+        self,
+        path: Sequence[str],
+        filters: Optional[Dict[str, Dict[str, Any]]] = None,
+        columns: Optional[Dict[str, Iterable[str]]] = None,
+        limit: Optional[int] = None,
+        join_type: str = "INNER"
+    ) -> Tuple[str, List[Any]]:
+        """
+        Compile an entity path into one SQL query.
+
+        Args:
+            path: Classes or tables, in join order (e.g. Location, Sample, Reads)
+            filters: Per path step, column -> value (a list means IN, None
+                means IS NULL); applied in that step's join condition
+            columns: Per path step, columns to return ('*' for all; default:
+                the table's _id and _name columns)
+            limit: Maximum rows
+            join_type: 'INNER' or 'LEFT' (keep rows whose later steps are missing)
+
+        Returns:
+            Tuple of (SQL, parameters)
+        """
+        if not path:
+            raise ValueError("Path must name at least one entity")
+        join_type = join_type.upper()
+        if join_type not in ("INNER", "LEFT"):
+            raise ValueError(f"Unsupported join type: {join_type}")
+        filters = filters or {}
+        columns = columns or {}
+
+        steps = [(name, self.resolve(name)) for name in path]
+        unknown = set(filters) | set(columns)
+        unknown -= {name for name, _ in steps}
+        if unknown:
+            raise ValueError(f"Filters/columns for steps not in the path: {', '.join(sorted(unknown))}")
+
+        select, joins, where = [], [], []
+        params, where_params = [], []
+        aliases = {}
+
+        def predicates(alias, table, step_filters, out):
+            clauses = []
+            for column, value in (step_filters or {}).items():
+                self._check_column(table, column)
+                if value is None:
+                    clauses.append(f"{alias}.{column} IS NULL")
+                elif isinstance(value, (list, tuple, set)):
+                    values = list(value)
+                    if not values:
+                        clauses.append("FALSE")
+                        continue
+                    clauses.append(f"{alias}.{column} IN ({', '.join('?' * len(values))})")
+                    out.extend(values)
+                else:
+                    clauses.append(f"{alias}.{column} = ?")
+                    out.append(value)
+            return clauses
+
+        first_name, first_table = steps[0]
+        aliases[0] = "t0"
+        from_clause = f"FROM {first_table} AS t0"
+        where.extend(predicates("t0", first_table, filters.get(first_name), where_params))
+
+        hop = 0
+        for index in range(1, len(steps)):
+            current_alias = aliases[index - 1]
+            current_table = steps[index - 1][1]
+            name, table = steps[index]
+            edges = self.find_path(current_table, table)
+            if not edges:
+                raise ValueError(f"Consecutive path steps name the same table: {name}")
+            for position, edge in enumerate(edges):
+                last = position == len(edges) - 1
+                alias = f"t{index}" if last else f"h{hop}"
+                hop += 1
+                # Step filters only apply to the table the step names
+                on = predicates(alias, table, filters.get(name), params) if last else []
+                if edge.kind == "process":
+                    process_joins = self._process_joins(edge, current_alias, alias, hop, join_type)
+                    process_joins[-1] += "".join(f" AND {clause}" for clause in on)
+                    joins.extend(process_joins)
+                else:
+                    on.insert(0, f"{alias}.{edge.to_column} = {current_alias}.{edge.from_column}")
+                    joins.append(f"{join_type} JOIN {edge.to_table} AS {alias} ON {' AND '.join(on)}")
+                current_alias = alias
+            aliases[index] = f"t{index}"
+
+        seen: Dict[str, int] = {}
+        for index, (name, table) in enumerate(steps):
+            seen[name] = seen.get(name, 0) + 1
+            label = name if seen[name] == 1 else f"{name}{seen[name]}"
+            wanted = columns.get(name)
+            if wanted is None:
+                wanted = [c for c in (f"{table}_id", f"{table}_name") if c in self.tables[table]] or self.tables[table][:1]
+            elif wanted == "*" or list(wanted) == ["*"]:
+                wanted = self.tables[table]
+            for column in wanted:
+                self._check_column(table, column)
+                select.append(f'{aliases[index]}.{column} AS "{label}.{column}"')
+
+        sql = "SELECT DISTINCT " + ",\n       ".join(select) + f"\n{from_clause}"
+        if joins:
+            sql += "\n" + "\n".join(joins)
+        if where:
+            sql += "\nWHERE " + " AND ".join(where)
+        if limit is not None:
+            sql += f"\nLIMIT {int(limit)}"
+        return sql, params + where_params
+
+    def _process_joins(self, edge: JoinEdge, source_alias: str, alias: str, hop: int, join_type: str) -> List[str]:
+        """Joins through sys_process_input/output for a provenance edge."""
+        # Walked backwards (Reads -> Sample), the source entity is a process
+        # output and the target an input
+        first, second = (PROCESS_INPUT_TABLE, PROCESS_OUTPUT_TABLE) if edge.forward \
+            else (PROCESS_OUTPUT_TABLE, PROCESS_INPUT_TABLE)
+        p1, p2 = f"p{hop}_a", f"p{hop}_b"
+        return [
+            f"{join_type} JOIN {first} AS {p1} ON {p1}.{edge.from_column} = {source_alias}.{edge.from_column}",
+            f"{join_type} JOIN {second} AS {p2} ON {p2}.{PROCESS_KEY} = {p1}.{PROCESS_KEY}",
+            f"{join_type} JOIN {edge.to_table} AS {alias} ON {alias}.{edge.to_column} = {p2}.{edge.to_column}",
+        ]
+
+    def _check_column(self, table: str, column: str) -> None:
+        if column not in self.tables[table]:
+            raise ValueError(f"Unknown column {table}.{column}")
+
+    def run(self, conn, path: Sequence[str], **kwargs):
+        """
+        Compile and execute a path query.
+
+        Args:
+            conn: DuckDB connection
+            path: Classes or tables, in join order
+            **kwargs: filters, columns, limit, join_type (see compile())
+
+        Returns:
+            pyarrow.Table with one '<step>.<column>' column per selected column
+        """
+        sql, params = self.compile(path, **kwargs)
+        with span("query", category="query", conn=conn, tool="join_planner", path=list(path)) as query_span:
+            result = conn.execute(sql, params)
+            # Newer DuckDB releases deprecate fetch_arrow_table()
+            fetch = getattr(result, "to_arrow_table", None) or result.fetch_arrow_table
+            table = fetch()
+            query_span.add(rows=table.num_rows, bytes=table.nbytes)
+        return table
+
+
+def _parse_assignment(text: str) -> Tuple[str, str, str]:
+    """Split 'Step.column=value' (or 'Step.column') into its parts."""
+    target, _, value = text.partition("=")
+    step, _, column = target.partition(".")
+    if not step or not column:
+        raise ValueError(f"Expected Step.column, got '{text}'")
+    return step, column, value
+
+
+def main():
+    """Compile (and run) an entity path query."""
+    import argparse
+    import duckdb
+
+    try:
+        from linkml_coral.utils.schema_snapshot import load_schema_snapshot
+    except ImportError:
+        sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+        from linkml_coral.utils.schema_snapshot import load_schema_snapshot
+
+    parser = argparse.ArgumentParser(description='Query a path of CDM entities as one SQL join')
+    parser.add_argument('path', nargs='+', help='Classes or tables in join order (e.g. Location Sample Reads)')
+    parser.add_argument('--db', default='cdm_store.db', help='Path to CDM store database')
+    parser.add_argument('--schema', default=str(DEFAULT_SCHEMA), help='CDM LinkML schema')
+    parser.add_argument('--where', action='append', default=[], metavar='STEP.COLUMN=VALUE',
+                        help='Filter a path step (repeatable; comma-separated values mean IN)')
+    parser.add_argument('--column', action='append', default=[], metavar='STEP.COLUMN',
+                        help="Column to return (repeatable; STEP.* for all columns)")
+    parser.add_argument('--left', action='store_true', help='Keep rows whose later steps are missing')
+    parser.add_argument('--limit', type=int, default=20, help='Maximum rows (default: 20)')
+    parser.add_argument('--sql', action='store_true', help='Only print the compiled SQL')
+    args = parser.parse_args()
+
+    filters: Dict[str, Dict[str, Any]] = {}
+    columns: Dict[str, List[str]] = {}
+    for text in args.where:
+        step, column, value = _parse_assignment(text)
+        filters.setdefault(step, {})[column] = value.split(",") if "," in value else value
+    for text in args.column:
+        step, column, _ = _parse_assignment(text)
+        columns.setdefault(step, []).append(column)
+
+    schema_view = load_schema_snapshot(args.schema) if Path(args.schema).exists() else None
+    with duckdb.connect(args.db, read_only=True) as conn:
+        planner = JoinPlanner.from_connection(conn, schema_view)
+        options = dict(filters=filters, columns=columns, limit=args.limit,
+                       join_type='LEFT' if args.left else 'INNER')
+        try:
+            sql, params = planner.compile(args.path, **options)
+        except ValueError as e:
+            print(f"❌ {e}")
+            return 1
+        print(sql)
+        if params:
+            print(f"-- parameters: {params}")
+        if args.sql:
+            return 0
+        table = planner.run(conn, args.path, **options)
+        print(f"\n✅ {table.num_rows} row(s)\n")
+        print("\t".join(table.column_names))
+        for row in table.to_pylist():
+            print("\t".join("" if v is None else str(v) for v in row.values()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
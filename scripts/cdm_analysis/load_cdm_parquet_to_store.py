@@ -30,8 +30,11 @@ Usage:
 
 import argparse
 import sys
+import json
+import uuid
+from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Iterator
+from typing import Dict, List, Any, Optional, Iterator, Callable, Union
 import time
 import gc
 
@@ -42,17 +45,12 @@ except ImportError:
     sys.exit(1)
 
 try:
+    import pyarrow as pa
     import pyarrow.parquet as pq
 except ImportError:
     print("Error: pyarrow not installed. Run: uv pip install pyarrow")
     sys.exit(1)
 
-try:
-    import psutil
-except ImportError:
-    print("Warning: psutil not installed. Memory monitoring disabled. Run: uv pip install psutil")
-    psutil = None
-
 try:
     from tqdm import tqdm
 except ImportError:
@@ -60,7 +58,33 @@ except ImportError:
     tqdm = None
 
 from linkml_store import Client
-from linkml_runtime.utils.schemaview import SchemaView
+
+try:
+    from linkml_coral.utils.schema_snapshot import SchemaSnapshot, load_schema_snapshot
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+    from linkml_coral.utils.schema_snapshot import SchemaSnapshot, load_schema_snapshot
+from linkml_coral.utils.instrumentation import configure_tracing, print_trace_summary, span
+
+from brick_sampling import (
+    SAMPLE_METHODS,
+    DEFAULT_SAMPLE_METHOD,
+    build_sample_query,
+    calibrate_sample_weights,
+    record_sampling_metadata,
+    clear_sampling_metadata,
+)
+from oterm_closure import CLOSURE_TABLE, build_closure_table
+from cdm_search import build_search_index, get_search_index_path
+from cdm_indexes import DEFAULT_SORT_MIN_ROWS, build_cdm_indexes, sort_bricks
+from memory_budget import (
+    MIN_SLICE_ROWS,
+    MemoryBudget,
+    RSSMonitor,
+    SliceController,
+    format_bytes,
+    parquet_footprint,
+)
 
 
 # CDM Schema path
@@ -102,86 +126,41 @@ TABLE_TO_CLASS = {
     "ddt_ndarray": "DynamicDataArray",
 }
 
+# VARCHAR columns with these suffixes (ontology labels, dimension values and
+# entity name references) are checked for ENUM encoding even when the parquet
+# writer did not dictionary-encode them
+ENUM_CANDIDATE_SUFFIXES = ("_sys_oterm_id", "_sys_oterm_name", "_value", "_name")
+ENUM_MAX_DISTINCT = 50_000
+ENUM_MAX_DISTINCT_RATIO = 0.05
 
-def get_memory_info() -> Dict[str, float]:
-    """Get current system memory information in GB."""
-    if psutil is None:
-        return {'total_gb': 0, 'available_gb': 0, 'used_gb': 0, 'percent': 0}
+# Join keys (ontology term references and entity names) share one ENUM type
+# across all tables, so joins between them compare codes rather than strings
+SHARED_ENUM_TYPE = "cdm_label_enum"
+SHARED_ENUM_SUFFIXES = ("_sys_oterm_id", "_sys_oterm_name", "_name")
 
-    mem = psutil.virtual_memory()
-    return {
-        'total_gb': mem.total / (1024**3),
-        'available_gb': mem.available / (1024**3),
-        'used_gb': mem.used / (1024**3),
-        'percent': mem.percent
-    }
 
+def _quote_ident(name: str) -> str:
+    escaped = name.replace('"', '""')
+    return f'"{escaped}"'
 
-def estimate_memory_requirement(parquet_path: Path) -> float:
-    """
-    Estimate memory required to load parquet file in GB.
-
-    Args:
-        parquet_path: Path to parquet file or directory
 
-    Returns:
-        Estimated memory in GB
-    """
+def get_parquet_bytes(parquet_path: Path) -> int:
+    """Compressed size of a parquet file or directory in bytes."""
     if parquet_path.is_dir():
-        total_size = sum(f.stat().st_size for f in parquet_path.glob("*.parquet")
-                        if not f.parent.name.startswith('_'))
-    else:
-        total_size = parquet_path.stat().st_size
-
-    # Estimate: compressed_size × 8 (decompression) × 2 (processing overhead)
-    estimated_gb = (total_size / (1024**3)) * 16
-    return estimated_gb
-
-
-def check_memory_warning(parquet_path: Path, verbose: bool = False) -> bool:
-    """
-    Check if sufficient memory is available and warn if low.
-
-    Args:
-        parquet_path: Path to parquet file/directory
-        verbose: Print detailed memory info
-
-    Returns:
-        True if sufficient memory, False otherwise
-    """
-    if psutil is None:
-        return True  # Can't check, assume OK
-
-    mem_info = get_memory_info()
-    required_gb = estimate_memory_requirement(parquet_path)
-
-    # Show warning if file requires more than 50% of available memory
-    if verbose or required_gb > mem_info['available_gb'] * 0.5:
-        print(f"\n  💾 Memory Check:")
-        print(f"     System Total: {mem_info['total_gb']:.1f} GB")
-        print(f"     Available: {mem_info['available_gb']:.1f} GB")
-        print(f"     Estimated Required: {required_gb:.1f} GB")
+        return sum(f.stat().st_size for f in parquet_path.glob("*.parquet")
+                   if not f.parent.name.startswith('_'))
+    return parquet_path.stat().st_size
 
-    if required_gb > mem_info['available_gb']:
-        print(f"\n  ⚠️  ⚠️  ⚠️  MEMORY WARNING ⚠️  ⚠️  ⚠️")
-        print(f"  This file may cause out-of-memory errors!")
-        print(f"  Required: ~{required_gb:.1f} GB")
-        print(f"  Available: {mem_info['available_gb']:.1f} GB")
-        print(f"\n  Will use CHUNKED loading (memory-safe)")
-        return False
 
-    return True
-
-
-def load_schema(schema_path: Path) -> SchemaView:
-    """Load LinkML schema."""
+def load_schema(schema_path: Path) -> SchemaSnapshot:
+    """Load LinkML schema (from the precompiled snapshot when it is current)."""
     if not schema_path.exists():
         raise FileNotFoundError(f"Schema not found: {schema_path}")
-    return SchemaView(str(schema_path))
+    return load_schema_snapshot(schema_path)
 
 
-def get_duckdb_connection(database):
-    """Return the underlying DuckDB connection from a linkml-store database."""
+def _get_store_duckdb_connection(database):
+    """Return the DuckDB connection held by a linkml-store database."""
     if hasattr(database, 'engine'):
         raw_conn = database.engine.raw_connection()
         wrapper = raw_conn.driver_connection
@@ -195,8 +174,85 @@ def get_duckdb_connection(database):
     raise AttributeError("Cannot access DuckDB connection from linkml-store")
 
 
+def get_duckdb_connection(database):
+    """
+    Return a live DuckDB connection for a linkml-store database.
+
+    Some linkml-store versions hand back a connection that is already closed;
+    in that case a direct connection to the database file is opened once and
+    reused for the rest of the load.
+    """
+    direct_conn = getattr(database, '_direct_duckdb_conn', None)
+    if direct_conn is not None:
+        return direct_conn
+
+    conn = _get_store_duckdb_connection(database)
+    try:
+        conn.execute("SELECT 1")
+    except Exception as e:
+        if "closed" in str(e).lower() and hasattr(database, "_duckdb_path"):
+            import duckdb
+            conn = duckdb.connect(database._duckdb_path)
+            database._direct_duckdb_conn = conn
+            # Settings live in the database instance, which closed with the last connection
+            budget = getattr(database, '_memory_budget', None)
+            if budget is not None:
+                budget.configure(conn)
+        else:
+            raise
+    return conn
+
+
+def configure_memory_budget(database, budget: MemoryBudget) -> Dict[str, Any]:
+    """
+    Apply a memory budget to a linkml-store database's DuckDB connection.
+
+    The budget is kept on the database so that reopened direct connections
+    and the table loaders use the same limits.
+
+    Args:
+        database: linkml-store database
+        budget: Memory budget for the load
+
+    Returns:
+        DuckDB settings that were applied
+    """
+    database._memory_budget = budget
+    return budget.configure(get_duckdb_connection(database))
+
+
+def get_memory_budget(database) -> MemoryBudget:
+    """The budget set by ``configure_memory_budget``, or an automatic one."""
+    budget = getattr(database, '_memory_budget', None)
+    if budget is None:
+        budget = MemoryBudget.from_option("auto")
+    return budget
+
+
+def release_duckdb_connection(database) -> None:
+    """
+    Close the direct connection opened by ``get_duckdb_connection``.
+
+    DuckDB refuses a second connection to the same file with a different
+    configuration, so linkml-store (and other readers in this process) can
+    only use the database again once the direct connection is closed. The
+    next ``get_duckdb_connection`` call reopens it.
+    """
+    direct_conn = getattr(database, '_direct_duckdb_conn', None)
+    if direct_conn is not None:
+        direct_conn.close()
+        database._direct_duckdb_conn = None
+
+
 def add_static_computed_fields_duckdb(conn, table_name: str) -> None:
     """Add computed fields for static tables when loaded via direct DuckDB import."""
+    if table_name not in ("sdt_reads", "sdt_assembly"):
+        return
+    with span("computed_fields", category="load", conn=conn, table=table_name):
+        _add_static_computed_fields(conn, table_name)
+
+
+def _add_static_computed_fields(conn, table_name: str) -> None:
     if table_name == "sdt_reads":
         conn.execute(
             "ALTER TABLE sdt_reads ADD COLUMN IF NOT EXISTS read_count_category VARCHAR"
@@ -238,10 +294,6 @@ def rebuild_table_with_double_casts_from_parquet(
     Rebuild table from parquet, casting DOUBLE columns explicitly when current table has FLOAT/REAL.
     This avoids ALTER failures on some DuckDB versions and ensures deterministic types.
     """
-    def _quote_ident(name: str) -> str:
-        escaped = name.replace('"', '""')
-        return f'"{escaped}"'
-
     try:
         parquet_rows = conn.execute(
             f"DESCRIBE SELECT * FROM read_parquet('{parquet_pattern}', union_by_name=true)"
@@ -273,12 +325,323 @@ def rebuild_table_with_double_casts_from_parquet(
     if verbose:
         print(f"  🔧 Rebuilding {table_name} to preserve DOUBLE precision")
 
-    conn.execute(
+    with span("cast_rebuild", category="load", conn=conn, table=table_name) as rebuild_span:
+        conn.execute(
+            f"""
+            CREATE OR REPLACE TABLE {table_name} AS
+            SELECT {select_list} FROM read_parquet('{parquet_pattern}', union_by_name=true)
+            """
+        )
+        rebuild_span.capture_profile()
+        rebuild_span.add(rows=conn.execute(f"SELECT count(*) FROM {table_name}").fetchone()[0])
+
+
+def get_parquet_dictionary_columns(parquet_path: Path) -> set:
+    """
+    Find columns that are dictionary-encoded in every parquet row group.
+
+    Reads footers only. A column whose writer kept a dictionary page for
+    every row group has a small vocabulary, so it is a good ENUM candidate.
+
+    Args:
+        parquet_path: Path to parquet file or directory (Delta Lake)
+
+    Returns:
+        Set of top-level column names with dictionary pages in all row groups
+    """
+    if parquet_path.is_dir():
+        parquet_files = [f for f in parquet_path.glob("*.parquet")
+                         if not f.parent.name.startswith('_')]
+    else:
+        parquet_files = [parquet_path]
+
+    dictionary_columns = None
+    for pf in parquet_files:
+        metadata = pq.ParquetFile(pf).metadata
+        for rg_idx in range(metadata.num_row_groups):
+            row_group = metadata.row_group(rg_idx)
+            rg_columns = set()
+            for col_idx in range(row_group.num_columns):
+                column = row_group.column(col_idx)
+                if column.has_dictionary_page:
+                    rg_columns.add(column.path_in_schema.split('.')[0])
+            if dictionary_columns is None:
+                dictionary_columns = rg_columns
+            else:
+                dictionary_columns &= rg_columns
+
+    return dictionary_columns or set()
+
+
+def detect_low_cardinality_columns(
+    conn,
+    table_name: str,
+    parquet_path: Optional[Path] = None,
+    max_distinct: int = ENUM_MAX_DISTINCT,
+    max_distinct_ratio: float = ENUM_MAX_DISTINCT_RATIO,
+    sample_rows: int = 100_000,
+    verbose: bool = False
+) -> Dict[str, int]:
+    """
+    Detect VARCHAR columns of a loaded table that repeat a small vocabulary.
+
+    Parquet dictionary pages are used as a free hint when available; every
+    candidate is then confirmed with DuckDB's approx_count_distinct over a
+    reservoir sample, so the check stays cheap on very large bricks.
+
+    Args:
+        conn: DuckDB connection
+        table_name: Loaded table to inspect
+        parquet_path: Source parquet file/directory (optional, for dictionary hints)
+        max_distinct: Largest vocabulary that is still encoded
+        max_distinct_ratio: Largest distinct/rows ratio that is still encoded
+        sample_rows: Rows sampled for the distinct estimate
+        verbose: Print detection details
+
+    Returns:
+        Dict mapping column name to estimated distinct count
+    """
+    varchar_columns = [
+        row[0] for row in conn.execute(f"DESCRIBE {table_name}").fetchall()
+        if str(row[1]).upper() == "VARCHAR"
+    ]
+    if not varchar_columns:
+        return {}
+
+    dictionary_hints = set()
+    if parquet_path is not None:
+        try:
+            dictionary_hints = get_parquet_dictionary_columns(parquet_path)
+        except Exception as e:
+            if verbose:
+                print(f"  ⚠️  Could not read dictionary pages for {table_name}: {e}")
+
+    # Columns named like ontology labels are always worth checking; other
+    # VARCHAR columns only when the parquet writer kept them dictionary-encoded
+    candidates = [
+        col for col in varchar_columns
+        if col in dictionary_hints or col.endswith(ENUM_CANDIDATE_SUFFIXES)
+    ]
+    if not candidates:
+        return {}
+
+    estimates = ", ".join(
+        f"approx_count_distinct({_quote_ident(col)})" for col in candidates
+    )
+    row = conn.execute(
         f"""
-        CREATE OR REPLACE TABLE {table_name} AS
-        SELECT {select_list} FROM read_parquet('{parquet_pattern}', union_by_name=true)
+        SELECT COUNT(*), {estimates}
+        FROM (SELECT * FROM {table_name} USING SAMPLE {sample_rows} ROWS (reservoir, 42))
         """
+    ).fetchone()
+    sampled_rows = row[0]
+    if not sampled_rows:
+        return {}
+
+    low_cardinality = {}
+    for col, distinct in zip(candidates, row[1:]):
+        # All-NULL columns would get an empty ENUM, which DuckDB cannot index
+        if not distinct or distinct > max_distinct:
+            continue
+        # The vocabulary must actually repeat for codes to pay off
+        if distinct / sampled_rows > max_distinct_ratio:
+            continue
+        low_cardinality[col] = distinct
+
+    if verbose and low_cardinality:
+        print(f"  🔎 Low-cardinality columns in {table_name}: "
+              f"{', '.join(f'{c} (~{n:,})' for c, n in low_cardinality.items())}")
+
+    return low_cardinality
+
+
+def encode_low_cardinality_columns(
+    conn,
+    table_name: str,
+    columns: List[str],
+    verbose: bool = False
+) -> List[str]:
+    """
+    Store the given VARCHAR columns as per-column DuckDB ENUM types.
+
+    Each column gets its own ENUM type named ``<table>__<column>_enum`` built
+    from its distinct values, and the table is rebuilt in place with the
+    casts. ENUM values are stored as 1-4 byte codes, which shrinks the table;
+    filters against string literals still cast the column to VARCHAR. Joins
+    between columns with different ENUM types fall back to VARCHAR
+    comparisons too; join keys are encoded with
+    ``encode_shared_label_columns`` instead.
+
+    Args:
+        conn: DuckDB connection
+        table_name: Table to rebuild
+        columns: Columns to encode
+        verbose: Print progress
+
+    Returns:
+        List of encoded column names
+    """
+    if not columns:
+        return []
+
+    table_columns = [row[0] for row in conn.execute(f"DESCRIBE {table_name}").fetchall()]
+    encoded = []
+    select_cols = []
+    for col_name in table_columns:
+        quoted = _quote_ident(col_name)
+        if col_name not in columns:
+            select_cols.append(quoted)
+            continue
+        has_values = conn.execute(
+            f"SELECT 1 FROM {table_name} WHERE {quoted} IS NOT NULL LIMIT 1"
+        ).fetchone()
+        if not has_values:
+            # All NULL: an empty ENUM type could not be indexed
+            select_cols.append(quoted)
+            continue
+        enum_type = _quote_ident(f"{table_name}__{col_name}_enum")
+        conn.execute(f"DROP TYPE IF EXISTS {enum_type}")
+        conn.execute(
+            f"""
+            CREATE TYPE {enum_type} AS ENUM (
+                SELECT DISTINCT {quoted} FROM {table_name}
+                WHERE {quoted} IS NOT NULL ORDER BY 1
+            )
+            """
+        )
+        select_cols.append(f"CAST({quoted} AS {enum_type}) AS {quoted}")
+        encoded.append(col_name)
+
+    if not encoded:
+        return []
+
+    conn.execute(
+        f"CREATE OR REPLACE TABLE {table_name} AS SELECT {', '.join(select_cols)} FROM {table_name}"
     )
+    if verbose:
+        print(f"  🗜️  Encoded {len(encoded)} column(s) of {table_name} as ENUM")
+
+    return encoded
+
+
+def _shared_label_key(col_name: str) -> str:
+    """Column that a join-key column references (e.g. sys_oterm_id for *_sys_oterm_id)."""
+    for suffix in ("_sys_oterm_id", "_sys_oterm_name"):
+        if col_name.endswith(suffix):
+            return suffix[1:]
+    return col_name
+
+
+def encode_shared_label_columns(
+    conn,
+    candidates: Dict[str, List[str]],
+    verbose: bool = False
+) -> Dict[str, List[str]]:
+    """
+    Store join-key columns of all tables as one shared DuckDB ENUM type.
+
+    The low-cardinality ``*_sys_oterm_id``, ``*_sys_oterm_name`` and ``*_name``
+    columns found while loading are encoded together with the columns they
+    join to: ``sys_oterm.sys_oterm_id`` / ``sys_oterm.sys_oterm_name`` and
+    same-named entity name columns of other tables (e.g.
+    ``sdt_sample.sdt_sample_name``). All of them get the ``cdm_label_enum``
+    type built from the union of their values, so joins between two of them
+    compare integer codes (filters against string literals still compare
+    VARCHAR). Must run after every table is loaded, since the type can only
+    be built once the whole vocabulary is known.
+
+    Args:
+        conn: DuckDB connection
+        candidates: Dict mapping table name to its low-cardinality join-key columns
+        verbose: Print progress
+
+    Returns:
+        Dict mapping table name to its encoded columns
+    """
+    wanted = set()
+    for columns in candidates.values():
+        for col_name in columns:
+            wanted.add(col_name)
+            wanted.add(_shared_label_key(col_name))
+    if not wanted:
+        return {}
+
+    # Every string column the candidates join to, in any table (ENUM columns
+    # from an earlier pass are re-encoded with the new vocabulary)
+    members: Dict[str, List[str]] = {}
+    rows = conn.execute(
+        """
+        SELECT table_name, column_name, data_type FROM duckdb_columns()
+        WHERE database_name = current_database() AND schema_name = 'main' AND NOT internal
+        ORDER BY table_name, column_index
+        """
+    ).fetchall()
+    for table_name, col_name, data_type in rows:
+        is_string = data_type == "VARCHAR" or data_type.startswith("ENUM")
+        if is_string and (col_name in wanted or col_name in candidates.get(table_name, ())):
+            members.setdefault(table_name, []).append(col_name)
+    if not members:
+        return {}
+
+    values = " UNION ".join(
+        f"SELECT DISTINCT CAST({_quote_ident(col)} AS VARCHAR) AS v FROM {_quote_ident(table)}"
+        for table, columns in members.items() for col in columns
+    )
+    enum_type = _quote_ident(SHARED_ENUM_TYPE)
+    # Tables keep the values of a dropped type, so every member is rebuilt below
+    conn.execute(f"DROP TYPE IF EXISTS {enum_type}")
+    conn.execute(
+        f"CREATE TYPE {enum_type} AS ENUM (SELECT v FROM ({values}) WHERE v IS NOT NULL ORDER BY 1)"
+    )
+
+    for table_name, columns in members.items():
+        table_columns = [row[0] for row in conn.execute(f"DESCRIBE {_quote_ident(table_name)}").fetchall()]
+        select_cols = [
+            f"CAST(CAST({_quote_ident(col)} AS VARCHAR) AS {enum_type}) AS {_quote_ident(col)}"
+            if col in columns else _quote_ident(col)
+            for col in table_columns
+        ]
+        conn.execute(
+            f"CREATE OR REPLACE TABLE {_quote_ident(table_name)} AS "
+            f"SELECT {', '.join(select_cols)} FROM {_quote_ident(table_name)}"
+        )
+        if verbose:
+            print(f"  🗜️  {table_name}: {', '.join(columns)} → {SHARED_ENUM_TYPE}")
+
+    return members
+
+
+def apply_enum_encoding(
+    db,
+    table_name: str,
+    parquet_path: Path,
+    shared_candidates: Optional[Dict[str, List[str]]] = None,
+    verbose: bool = False
+) -> List[str]:
+    """
+    Detect and ENUM-encode low-cardinality columns of a directly imported table.
+
+    Join-key columns (see ``SHARED_ENUM_SUFFIXES``) are only recorded in
+    ``shared_candidates`` for ``encode_shared_label_columns``; the remaining
+    columns get per-column ENUM types right away.
+    """
+    try:
+        conn = get_duckdb_connection(db)
+        with span("enum_encode", category="load", table=table_name) as encode_span:
+            columns = detect_low_cardinality_columns(
+                conn, table_name, parquet_path, verbose=verbose
+            )
+            shared = [col for col in columns if col.endswith(SHARED_ENUM_SUFFIXES)]
+            if shared_candidates is not None and shared:
+                shared_candidates[table_name] = shared
+            own = [col for col in columns if col not in shared]
+            encoded = encode_low_cardinality_columns(conn, table_name, own, verbose=verbose)
+            encode_span.set(columns=encoded, shared=shared)
+        return encoded
+    except Exception as e:
+        if verbose:
+            print(f"  ⚠️  Could not ENUM-encode {table_name}: {e}")
+        return []
 
 
 def create_store(db_path: str = None, schema_path: Path = None) -> tuple:
@@ -299,6 +662,8 @@ def create_store(db_path: str = None, schema_path: Path = None) -> tuple:
         print(f"📦 Connecting to database: {db_path}")
         db = client.attach_database(f"duckdb:///{db_path}", alias="cdm")
         db._duckdb_path = db_path
+        # Attaching is lazy; connect once so the database file exists
+        db.engine.connect().close()
     else:
         print(f"📦 Creating in-memory database")
         db = client.attach_database("duckdb", alias="cdm")
@@ -374,7 +739,7 @@ def read_parquet_data(
 
 def read_parquet_chunked(
     parquet_path: Path,
-    chunk_size: int = 100_000,
+    chunk_size: Union[int, Callable[[], int]] = 100_000,
     max_rows: Optional[int] = None,
     verbose: bool = False
 ) -> Iterator[pd.DataFrame]:
@@ -383,7 +748,8 @@ def read_parquet_chunked(
 
     Args:
         parquet_path: Path to parquet file or directory (Delta Lake)
-        chunk_size: Number of rows per chunk (default: 100K)
+        chunk_size: Number of rows per chunk (default: 100K), or a callable
+            returning the size of the next chunk (adaptive loading)
         max_rows: Maximum total rows to read (None = all)
         verbose: Print chunk progress
 
@@ -400,28 +766,54 @@ def read_parquet_chunked(
         # Single parquet file
         parquet_files = [parquet_path]
 
+    next_size = chunk_size if callable(chunk_size) else (lambda: chunk_size)
+    # Adaptive chunks are assembled from small batches so each can have a new size
+    batch_size = MIN_SLICE_ROWS["pandas"] if callable(chunk_size) else chunk_size
+
     total_yielded = 0
+    pending: List[pa.RecordBatch] = []
+    pending_rows = 0
     for file_idx, pf in enumerate(parquet_files, 1):
         if verbose and len(parquet_files) > 1:
             print(f"    Reading file {file_idx}/{len(parquet_files)}: {pf.name}")
 
         parquet_file = pq.ParquetFile(pf)
+        if pending and not pending[0].schema.equals(parquet_file.schema_arrow):
+            # Batches of files with different schemas cannot share a chunk
+            df_chunk = pa.Table.from_batches(pending).to_pandas()
+            pending, pending_rows = [], 0
+            total_yielded += len(df_chunk)
+            yield df_chunk
 
         # Iterate over row groups in batches
-        for batch in parquet_file.iter_batches(batch_size=chunk_size):
-            df_chunk = batch.to_pandas()
-
-            # Apply max_rows limit
+        for batch in parquet_file.iter_batches(batch_size=batch_size):
+            pending.append(batch)
+            pending_rows += batch.num_rows
+            target = next_size()
             if max_rows is not None:
-                rows_remaining = max_rows - total_yielded
-                if rows_remaining <= 0:
-                    return
-                if len(df_chunk) > rows_remaining:
-                    yield df_chunk.iloc[:rows_remaining]
-                    return
+                target = min(target, max_rows - total_yielded)
+            if pending_rows < target:
+                continue
 
+            table = pa.Table.from_batches(pending)
+            pending, pending_rows = [], 0
+            if table.num_rows > target:
+                # Carry the surplus into the next chunk
+                pending = table.slice(target).to_batches()
+                pending_rows = table.num_rows - target
+                table = table.slice(0, target)
+            df_chunk = table.to_pandas()
             total_yielded += len(df_chunk)
             yield df_chunk
+            if max_rows is not None and total_yielded >= max_rows:
+                return
+
+    if pending:
+        table = pa.Table.from_batches(pending)
+        if max_rows is not None:
+            table = table.slice(0, max_rows - total_yielded)
+        if table.num_rows:
+            yield table.to_pandas()
 
 
 def parse_array_field(value: Any) -> List[str]:
@@ -527,7 +919,10 @@ def load_parquet_to_duckdb_direct(
     db,
     max_rows: Optional[int] = None,
     verbose: bool = False,
-    force_chunked_threshold: int = 100_000_000  # 100M rows
+    sample_method: str = DEFAULT_SAMPLE_METHOD,
+    strata_column: Optional[str] = None,
+    sample_seed: int = 42,
+    memory_budget: Optional[MemoryBudget] = None
 ) -> int:
     """
     Load parquet directly into DuckDB without pandas (FAST, low memory).
@@ -535,8 +930,14 @@ def load_parquet_to_duckdb_direct(
     This bypasses pandas entirely and uses DuckDB's native parquet reader,
     which is 10-50x faster and uses minimal memory.
 
-    For very large files (>100M rows), automatically uses INSERT INTO with
-    chunked SELECT to avoid OOM errors.
+    Tables whose uncompressed size (from the parquet footers) does not fit
+    the memory budget are inserted in slices of file_row_number ranges; the
+    slice size adapts to the peak RSS and throughput of earlier slices (see
+    memory_budget.py).
+
+    When max_rows is smaller than the table, a weighted probability sample is
+    drawn (see brick_sampling.py) instead of the first max_rows rows, and the
+    sample design is recorded in the cdm_sampling table.
 
     Args:
         parquet_path: Path to parquet file/directory
@@ -545,7 +946,11 @@ def load_parquet_to_duckdb_direct(
         db: Database connection
         max_rows: Maximum rows to load (None = all)
         verbose: Print detailed progress
-        force_chunked_threshold: Row count above which to use chunked INSERT
+        sample_method: How to sample when max_rows < total rows
+            (reservoir, bernoulli, stratified or head)
+        strata_column: Column to stratify on (default: leading dimension)
+        sample_seed: Random seed for reproducible samples
+        memory_budget: Memory budget (default: the database's, see configure_memory_budget)
 
     Returns:
         Number of records loaded
@@ -557,169 +962,217 @@ def load_parquet_to_duckdb_direct(
 
     start_time = time.time()
 
-    try:
-        # Get total row count first to decide loading strategy
-        try:
-            total_rows = get_parquet_row_count(parquet_path)
-            load_rows = min(max_rows, total_rows) if max_rows else total_rows
-            print(f"  📊 Total rows: {total_rows:,}")
-            if max_rows and max_rows < total_rows:
-                print(f"     Loading: {load_rows:,} rows")
-        except Exception as e:
-            if verbose:
-                print(f"  ⚠️  Could not get row count: {e}")
-            total_rows = None
-            load_rows = max_rows if max_rows else None
-
-        # Get DuckDB connection from linkml-store
-        # Path: db.engine (SQLAlchemy) → raw_connection() (ConnectionFairy)
-        #       → driver_connection (ConnectionWrapper) → _ConnectionWrapper__c (DuckDB)
-        conn = get_duckdb_connection(db)
-        should_close_conn = False
+    with span("table_load", category="load", table=table_name, method="direct") as load_span:
         try:
-            conn.execute("SELECT 1")
-        except Exception as e:
-            if "closed" in str(e).lower() and hasattr(db, "_duckdb_path"):
-                conn = duckdb.connect(db._duckdb_path)
-                should_close_conn = True
+            # Get total row count first to decide loading strategy
+            try:
+                footprint = parquet_footprint(parquet_path)
+                total_rows = footprint.rows
+                load_rows = min(max_rows, total_rows) if max_rows else total_rows
+                print(f"  📊 Total rows: {total_rows:,}")
+                if max_rows and max_rows < total_rows:
+                    print(f"     Loading: {load_rows:,} rows")
+            except Exception as e:
                 if verbose:
-                    print("  ℹ️  Reopened DuckDB connection for direct import")
+                    print(f"  ⚠️  Could not get row count: {e}")
+                footprint = None
+                total_rows = None
+                load_rows = max_rows if max_rows else None
+
+            # Get DuckDB connection from linkml-store
+            # Path: db.engine (SQLAlchemy) → raw_connection() (ConnectionFairy)
+            #       → driver_connection (ConnectionWrapper) → _ConnectionWrapper__c (DuckDB)
+            conn = get_duckdb_connection(db)
+            if verbose and hasattr(db, 'engine'):
+                print(f"  ✓ Accessed DuckDB connection via SQLAlchemy engine")
+
+            # Build parquet path pattern
+            if parquet_path.is_dir():
+                parquet_pattern = f"{parquet_path}/*.parquet"
             else:
-                raise
-        if verbose and hasattr(db, 'engine'):
-            print(f"  ✓ Accessed DuckDB connection via SQLAlchemy engine")
-
-        # Build parquet path pattern
-        if parquet_path.is_dir():
-            parquet_pattern = f"{parquet_path}/*.parquet"
-        else:
-            parquet_pattern = str(parquet_path)
+                parquet_pattern = str(parquet_path)
 
-        def _quote_ident(name: str) -> str:
-            escaped = name.replace('"', '""')
-            return f'"{escaped}"'
-
-        def _build_select_list_with_double_casts() -> str:
-            """
-            Build SELECT list that upcasts FLOAT/REAL columns to DOUBLE to avoid precision loss.
-            Returns "*" if we cannot determine schema.
-            """
-            try:
-                describe_rows = conn.execute(
-                    f"DESCRIBE SELECT * FROM read_parquet('{parquet_pattern}', union_by_name=true)"
-                ).fetchall()
-                # DESCRIBE returns: column_name, column_type, null, key, default, extra
-                select_cols = []
-                for row in describe_rows:
-                    col_name = row[0]
-                    col_type = str(row[1]).upper()
-                    quoted = _quote_ident(col_name)
-                    if col_type in {"FLOAT", "REAL"}:
-                        select_cols.append(f"CAST({quoted} AS DOUBLE) AS {quoted}")
-                    else:
-                        select_cols.append(f"{quoted}")
-                return ", ".join(select_cols) if select_cols else "*"
-            except Exception:
-                return "*"
-
-        select_list = _build_select_list_with_double_casts()
-
-        # Decide loading strategy based on size
-        use_chunked_insert = (
-            load_rows is not None and
-            load_rows > force_chunked_threshold
-        )
-
-        if use_chunked_insert:
-            # LARGE FILE: Use chunked INSERT INTO for memory safety
-            print(f"  🔄 Using chunked DuckDB loading (row count: {load_rows:,} > {force_chunked_threshold:,})")
-
-            # Create table schema from first batch
-            schema_query = f"""
-                CREATE OR REPLACE TABLE {table_name} AS
-                SELECT {select_list} FROM read_parquet('{parquet_pattern}', union_by_name=true)
-                LIMIT 0
-            """
-            conn.execute(schema_query)
-            if verbose:
-                print(f"  ✓ Created table schema")
-
-            # Insert in chunks using OFFSET/LIMIT
-            chunk_size = 10_000_000  # 10M rows per chunk
-            num_chunks = (load_rows + chunk_size - 1) // chunk_size
-            print(f"  📦 Processing {num_chunks} chunks ({chunk_size:,} rows/chunk)")
-
-            total_loaded = 0
-            for chunk_idx in range(num_chunks):
-                chunk_start = time.time()
-                offset = chunk_idx * chunk_size
-                limit = min(chunk_size, load_rows - offset)
-
-                insert_query = f"""
-                    INSERT INTO {table_name}
-                    SELECT {select_list} FROM read_parquet('{parquet_pattern}', union_by_name=true)
-                    LIMIT {limit} OFFSET {offset}
+            def _build_select_list_with_double_casts() -> str:
                 """
+                Build SELECT list that upcasts FLOAT/REAL columns to DOUBLE to avoid precision loss.
+                Returns "*" if we cannot determine schema.
+                """
+                try:
+                    describe_rows = conn.execute(
+                        f"DESCRIBE SELECT * FROM read_parquet('{parquet_pattern}', union_by_name=true)"
+                    ).fetchall()
+                    # DESCRIBE returns: column_name, column_type, null, key, default, extra
+                    select_cols = []
+                    for row in describe_rows:
+                        col_name = row[0]
+                        col_type = str(row[1]).upper()
+                        quoted = _quote_ident(col_name)
+                        if col_type in {"FLOAT", "REAL"}:
+                            select_cols.append(f"CAST({quoted} AS DOUBLE) AS {quoted}")
+                        else:
+                            select_cols.append(f"{quoted}")
+                    return ", ".join(select_cols) if select_cols else "*"
+                except Exception:
+                    return "*"
+
+            select_list = _build_select_list_with_double_casts()
+
+            # Decide loading strategy based on size
+            use_sampling = (
+                max_rows is not None and
+                total_rows is not None and
+                max_rows < total_rows
+            )
+            budget = memory_budget or get_memory_budget(db)
+            load_bytes = int(footprint.bytes_per_row * load_rows) if footprint and load_rows else 0
+            use_chunked_insert = (
+                not use_sampling and
+                footprint is not None and
+                not budget.fits_single_pass(load_bytes)
+            )
 
-                conn.execute(insert_query)
-                total_loaded += limit
-
-                chunk_time = time.time() - chunk_start
-                progress_pct = ((chunk_idx + 1) / num_chunks) * 100
-                print(f"  [{chunk_idx+1}/{num_chunks}] {progress_pct:5.1f}% - "
-                      f"Loaded {limit:,} rows in {chunk_time:.1f}s "
-                      f"(total: {total_loaded:,})", end='\r')
-
-                # Force garbage collection after each chunk
-                gc.collect()
+            if use_sampling:
+                # SAMPLED LOAD: weighted probability sample instead of the file head
+                if sample_method == "stratified" and not strata_column:
+                    # Bricks list their leading dimension first
+                    strata_column = conn.execute(
+                        f"DESCRIBE SELECT * FROM read_parquet('{parquet_pattern}', union_by_name=true)"
+                    ).fetchone()[0]
+                strata_desc = f", strata: {strata_column}" if sample_method == "stratified" else ""
+                print(f"  🎲 Sampling {max_rows:,} of {total_rows:,} rows ({sample_method}{strata_desc})")
+
+                source_sql = f"SELECT {select_list} FROM read_parquet('{parquet_pattern}', union_by_name=true)"
+                sample_sql = build_sample_query(
+                    source_sql, sample_method, max_rows, total_rows,
+                    strata_column=strata_column, seed=sample_seed
+                )
+                query = f"CREATE OR REPLACE TABLE {table_name} AS {sample_sql}"
+                if verbose:
+                    print(f"  🔍 Query: {query}")
+                with span("load_chunk", category="load", conn=conn, table=table_name,
+                          chunk=0, sample_method=sample_method):
+                    if sample_method == "head" and not budget.preserve_insertion_order:
+                        # "head" means the first rows of the files
+                        conn.execute("SET preserve_insertion_order = true")
+                    try:
+                        conn.execute(query)
+                    finally:
+                        if sample_method == "head" and not budget.preserve_insertion_order:
+                            conn.execute("SET preserve_insertion_order = false")
+
+                count = calibrate_sample_weights(conn, table_name, sample_method, total_rows)
+                record_sampling_metadata(
+                    conn, table_name, sample_method, total_rows, count,
+                    strata_column=strata_column if sample_method == "stratified" else None,
+                    seed=sample_seed
+                )
 
-            print()  # New line after progress
-            count = total_loaded
+            elif use_chunked_insert:
+                # LARGE TABLE: insert file_row_number slices sized to the memory budget
+                controller = SliceController(budget, footprint.bytes_per_row)
+                print(f"  🔄 Using sliced DuckDB loading (~{format_bytes(load_bytes)} in memory "
+                      f"> single-pass limit of {format_bytes(budget.duckdb_memory_limit * 0.5)})")
+                print(f"  📦 Starting with {controller.rows:,} rows/slice "
+                      f"({footprint.bytes_per_row:.0f} bytes/row, budget {format_bytes(budget.limit_bytes)})")
 
-        else:
-            # SMALL/MEDIUM FILE: Use fast CREATE TABLE AS SELECT
-            if max_rows:
-                query = f"""
+                # Create table schema from first batch
+                schema_query = f"""
                     CREATE OR REPLACE TABLE {table_name} AS
                     SELECT {select_list} FROM read_parquet('{parquet_pattern}', union_by_name=true)
-                    LIMIT {max_rows}
+                    LIMIT 0
                 """
+                conn.execute(schema_query)
+                if verbose:
+                    print(f"  ✓ Created table schema")
+
+                # Each slice reads one row range of one file; DuckDB skips to its row groups
+                source = (f"read_parquet('{parquet_pattern}', union_by_name=true, "
+                          f"filename='_cdm_file', file_row_number=true)")
+                total_loaded = 0
+                chunk_idx = 0
+                for file_path, file_rows in footprint.files:
+                    quoted_file = str(file_path).replace("'", "''")
+                    first = 0
+                    while first < file_rows and total_loaded < load_rows:
+                        rows = min(controller.rows, file_rows - first, load_rows - total_loaded)
+                        insert_query = f"""
+                            INSERT INTO {table_name}
+                            SELECT {select_list} FROM {source}
+                            WHERE _cdm_file = '{quoted_file}'
+                              AND file_row_number >= {first} AND file_row_number < {first + rows}
+                        """
+                        chunk_start = time.time()
+                        with span("load_chunk", category="load", conn=conn, table=table_name,
+                                  chunk=chunk_idx, file=file_path.name, first_row=first,
+                                  slice_rows=rows) as chunk_span, RSSMonitor() as monitor:
+                            conn.execute(insert_query)
+                            chunk_span.add(rows=rows)
+                        chunk_time = time.time() - chunk_start
+                        controller.record(rows, chunk_time, monitor.peak)
+
+                        total_loaded += rows
+                        first += rows
+                        chunk_idx += 1
+                        progress_pct = total_loaded / load_rows * 100
+                        print(f"  [{chunk_idx}] {progress_pct:5.1f}% - "
+                              f"Loaded {rows:,} rows in {chunk_time:.1f}s "
+                              f"(peak RSS {format_bytes(monitor.peak)}, next {controller.rows:,} rows/slice)",
+                              end='\n' if verbose else '\r')
+
+                        # Force garbage collection after each chunk
+                        gc.collect()
+
+                print()  # New line after progress
+                load_span.set(slices=chunk_idx, slice_rows=controller.rows)
+                count = total_loaded
+
             else:
-                query = f"""
-                    CREATE OR REPLACE TABLE {table_name} AS
-                    SELECT {select_list} FROM read_parquet('{parquet_pattern}', union_by_name=true)
-                """
+                # SMALL/MEDIUM FILE: Use fast CREATE TABLE AS SELECT
+                if max_rows:
+                    query = f"""
+                        CREATE OR REPLACE TABLE {table_name} AS
+                        SELECT {select_list} FROM read_parquet('{parquet_pattern}', union_by_name=true)
+                        LIMIT {max_rows}
+                    """
+                else:
+                    query = f"""
+                        CREATE OR REPLACE TABLE {table_name} AS
+                        SELECT {select_list} FROM read_parquet('{parquet_pattern}', union_by_name=true)
+                    """
 
-            if verbose:
-                print(f"  🔍 Query: {query}")
+                if verbose:
+                    print(f"  🔍 Query: {query}")
 
-            # Execute (streaming, minimal memory overhead for small/medium files)
-            conn.execute(query)
+                # Execute (streaming, minimal memory overhead for small/medium files)
+                with span("load_chunk", category="load", conn=conn, table=table_name, chunk=0) as chunk_span:
+                    conn.execute(query)
+                    chunk_span.capture_profile()
 
-            # Get count
-            count_result = conn.execute(f"SELECT COUNT(*) FROM {table_name}").fetchone()
-            count = count_result[0] if count_result else 0
+                    # Get count
+                    count_result = conn.execute(f"SELECT COUNT(*) FROM {table_name}").fetchone()
+                    count = count_result[0] if count_result else 0
+                    chunk_span.add(rows=count)
 
-        elapsed = time.time() - start_time
-        print(f"  ✅ Loaded {count:,} records in {elapsed:.1f}s ({count/elapsed:.0f} records/sec)")
+            if not use_sampling:
+                clear_sampling_metadata(conn, table_name)
 
-        if should_close_conn:
-            conn.close()
-        return count
+            elapsed = time.time() - start_time
+            print(f"  ✅ Loaded {count:,} records in {elapsed:.1f}s ({count/elapsed:.0f} records/sec)")
+            load_span.add(rows=count, bytes=get_parquet_bytes(parquet_path))
 
-    except AttributeError as e:
-        # Could not access DuckDB connection - fall back to pandas
-        if verbose:
-            print(f"  ℹ️  Note: Could not access DuckDB connection ({e}), falling back to chunked pandas")
-        if 'should_close_conn' in locals() and should_close_conn:
-            conn.close()
-        return 0
-    except Exception as e:
-        # Other error during direct import - fall back to pandas
-        if verbose:
-            print(f"  ⚠️  Direct import failed: {e}")
-            print(f"  ℹ️  Falling back to chunked pandas loading...")
-        return 0
+            return count
+
+        except AttributeError as e:
+            # Could not access DuckDB connection - fall back to pandas
+            if verbose:
+                print(f"  ℹ️  Note: Could not access DuckDB connection ({e}), falling back to chunked pandas")
+            return 0
+        except Exception as e:
+            # Other error during direct import - fall back to pandas
+            if verbose:
+                print(f"  ⚠️  Direct import failed: {e}")
+                print(f"  ℹ️  Falling back to chunked pandas loading...")
+            return 0
 
 
 def load_parquet_collection_chunked(
@@ -727,25 +1180,30 @@ def load_parquet_collection_chunked(
     table_name: str,
     class_name: str,
     db,
-    schema_view: SchemaView,
+    schema_view: SchemaSnapshot,
     max_rows: Optional[int] = None,
-    chunk_size: int = 100_000,
-    verbose: bool = False
+    chunk_size: Optional[int] = None,
+    verbose: bool = False,
+    memory_budget: Optional[MemoryBudget] = None
 ) -> int:
     """
     Load a parquet table into linkml-store using chunked reading.
 
     This method loads data in chunks to avoid memory issues with large files.
+    Unless chunk_size is fixed, chunks start at a size derived from the memory
+    budget and the row size in the parquet footers, then adapt to the peak RSS
+    and throughput of each chunk.
 
     Args:
         parquet_path: Path to parquet file/directory
         table_name: CDM table name (e.g., "sdt_location", "ddt_brick0000476")
         class_name: LinkML class name for schema validation
         db: Database connection
-        schema_view: SchemaView instance
+        schema_view: SchemaSnapshot instance
         max_rows: Maximum rows to load (None = all)
-        chunk_size: Rows per chunk (default: 100K)
+        chunk_size: Fixed rows per chunk (default: adapt to the memory budget)
         verbose: Print detailed progress
+        memory_budget: Memory budget (default: the database's, see configure_memory_budget)
 
     Returns:
         Number of records loaded
@@ -753,12 +1211,16 @@ def load_parquet_collection_chunked(
     parquet_name = parquet_path.name
     print(f"\n📥 Loading {parquet_name} as {table_name} (CHUNKED MODE)...")
 
-    # Check memory availability
-    check_memory_warning(parquet_path, verbose=verbose)
+    budget = memory_budget or get_memory_budget(db)
+    controller = None
 
-    # Get total row count
+    # linkml-store inserts through its own connection
+    release_duckdb_connection(db)
+
+    # Get total row count and row size
     try:
-        total_rows = get_parquet_row_count(parquet_path)
+        footprint = parquet_footprint(parquet_path)
+        total_rows = footprint.rows
         load_rows = min(max_rows, total_rows) if max_rows else total_rows
 
         if max_rows and max_rows < total_rows:
@@ -766,21 +1228,21 @@ def load_parquet_collection_chunked(
         else:
             print(f"  📊 Total rows: {total_rows:,}")
 
-        # Adjust chunk size for very large files (>100M rows)
-        if load_rows > 100_000_000:
-            # Use smaller chunks for extremely large files
-            adjusted_chunk_size = min(chunk_size, 50_000)
-            print(f"  ⚡ Large file detected: reducing chunk size to {adjusted_chunk_size:,} rows")
-            chunk_size = adjusted_chunk_size
-
-        # Estimate chunks
-        num_chunks = (load_rows + chunk_size - 1) // chunk_size
-        print(f"  📦 Processing {num_chunks:,} chunks ({chunk_size:,} rows/chunk)")
+        if chunk_size is None:
+            controller = SliceController(budget, footprint.bytes_per_row, engine="pandas")
+            print(f"  📦 Adaptive chunks starting at {controller.rows:,} rows "
+                  f"({footprint.bytes_per_row:.0f} bytes/row, budget {format_bytes(budget.limit_bytes)})")
+            num_chunks = None
+        else:
+            num_chunks = (load_rows + chunk_size - 1) // chunk_size
+            print(f"  📦 Processing {num_chunks:,} chunks ({chunk_size:,} rows/chunk)")
 
     except Exception as e:
         print(f"  ⚠️  Could not get row count: {e}")
         total_rows = None
         num_chunks = None
+        if chunk_size is None:
+            controller = SliceController(budget, 0, engine="pandas")
 
     # Drop existing table and create fresh (consistent with direct DuckDB import behavior)
     try:
@@ -822,90 +1284,99 @@ def load_parquet_collection_chunked(
     else:
         pbar = None
 
-    try:
-        chunk_generator = read_parquet_chunked(
-            parquet_path,
-            chunk_size=chunk_size,
-            max_rows=max_rows,
-            verbose=verbose
-        )
+    with span("table_load", category="load", table=table_name, method="chunked") as load_span:
+        try:
+            chunk_generator = read_parquet_chunked(
+                parquet_path,
+                chunk_size=(lambda: controller.rows) if controller else chunk_size,
+                max_rows=max_rows,
+                verbose=verbose
+            )
 
-        for df_chunk in chunk_generator:
-            chunk_num += 1
-            chunk_start = time.time()
-
-            # Convert to records and enhance
-            records = df_chunk.to_dict('records')
-
-            # Handle NaN values
-            import numpy as np
-            for record in records:
-                for key, value in list(record.items()):
-                    if isinstance(value, np.ndarray):
-                        record[key] = value.tolist()
-                    elif isinstance(value, list):
-                        pass  # Keep as list
-                    elif pd.api.types.is_scalar(value):
-                        try:
-                            if pd.isna(value):
-                                record[key] = None
-                        except (ValueError, TypeError):
-                            pass
-
-            # Enhance records
-            enhanced_data = []
-            for record in records:
-                if class_name == 'SystemProcess':
-                    record = extract_provenance_info(record)
-                record = add_computed_fields(record, class_name)
-                enhanced_data.append(record)
-
-            # Insert chunk
-            collection.insert(enhanced_data)
-            total_loaded += len(enhanced_data)
+            for df_chunk in chunk_generator:
+                chunk_num += 1
+                chunk_start = time.time()
 
-            chunk_time = time.time() - chunk_start
+                with span("load_chunk", category="load", table=table_name, chunk=chunk_num - 1,
+                          method="pandas") as chunk_span, RSSMonitor() as monitor:
+                    # Convert to records and enhance
+                    records = df_chunk.to_dict('records')
+
+                    # Handle NaN values
+                    import numpy as np
+                    for record in records:
+                        for key, value in list(record.items()):
+                            if isinstance(value, np.ndarray):
+                                record[key] = value.tolist()
+                            elif isinstance(value, list):
+                                pass  # Keep as list
+                            elif pd.api.types.is_scalar(value):
+                                try:
+                                    if pd.isna(value):
+                                        record[key] = None
+                                except (ValueError, TypeError):
+                                    pass
+
+                    # Enhance records
+                    enhanced_data = []
+                    with span("computed_fields", category="load", table=table_name) as fields_span:
+                        fields_span.add(rows=len(records))
+                        for record in records:
+                            if class_name == 'SystemProcess':
+                                record = extract_provenance_info(record)
+                            record = add_computed_fields(record, class_name)
+                            enhanced_data.append(record)
+
+                    # Insert chunk
+                    collection.insert(enhanced_data)
+                    chunk_span.add(rows=len(enhanced_data))
+                    total_loaded += len(enhanced_data)
 
-            # Update progress
-            if pbar:
-                pbar.update(len(enhanced_data))
-            elif num_chunks and not verbose:
-                # Show simple progress if no bar
-                progress_pct = (chunk_num / num_chunks) * 100
-                print(f"  [{chunk_num}/{num_chunks}] {progress_pct:5.1f}% - {total_loaded:,} rows", end='\r')
-            elif verbose:
-                # Detailed progress in verbose mode
-                if num_chunks:
+                chunk_time = time.time() - chunk_start
+                if controller:
+                    controller.record(len(enhanced_data), chunk_time, monitor.peak)
+
+                # Update progress
+                if pbar:
+                    pbar.update(len(enhanced_data))
+                elif num_chunks and not verbose:
+                    # Show simple progress if no bar
                     progress_pct = (chunk_num / num_chunks) * 100
-                    print(f"  [{chunk_num}/{num_chunks}] {progress_pct:5.1f}% - "
-                          f"Loaded {len(enhanced_data):,} rows in {chunk_time:.1f}s "
-                          f"(total: {total_loaded:,})")
-                else:
-                    print(f"  [Chunk {chunk_num}] Loaded {len(enhanced_data):,} rows "
-                          f"in {chunk_time:.1f}s (total: {total_loaded:,})")
+                    print(f"  [{chunk_num}/{num_chunks}] {progress_pct:5.1f}% - {total_loaded:,} rows", end='\r')
+                elif verbose:
+                    # Detailed progress in verbose mode
+                    if num_chunks:
+                        progress_pct = (chunk_num / num_chunks) * 100
+                        print(f"  [{chunk_num}/{num_chunks}] {progress_pct:5.1f}% - "
+                              f"Loaded {len(enhanced_data):,} rows in {chunk_time:.1f}s "
+                              f"(total: {total_loaded:,})")
+                    else:
+                        print(f"  [Chunk {chunk_num}] Loaded {len(enhanced_data):,} rows "
+                              f"in {chunk_time:.1f}s (total: {total_loaded:,})")
 
-            # Force garbage collection after each chunk
-            gc.collect()
+                # Force garbage collection after each chunk
+                gc.collect()
 
-        if pbar:
-            pbar.close()
-        elif not verbose:
-            print()  # New line after progress
+            if pbar:
+                pbar.close()
+            elif not verbose:
+                print()  # New line after progress
 
-        elapsed = time.time() - start_time
-        print(f"  ✅ Loaded {total_loaded:,} records in {elapsed:.1f}s "
-              f"({total_loaded/elapsed:.0f} records/sec)")
+            elapsed = time.time() - start_time
+            print(f"  ✅ Loaded {total_loaded:,} records in {elapsed:.1f}s "
+                  f"({total_loaded/elapsed:.0f} records/sec)")
+            load_span.add(rows=total_loaded, bytes=get_parquet_bytes(parquet_path))
 
-        return total_loaded
+            return total_loaded
 
-    except Exception as e:
-        if pbar:
-            pbar.close()
-        print(f"  ❌ Error loading data: {e}")
-        if verbose:
-            import traceback
-            traceback.print_exc()
-        return total_loaded  # Return partial count
+        except Exception as e:
+            if pbar:
+                pbar.close()
+            print(f"  ❌ Error loading data: {e}")
+            if verbose:
+                import traceback
+                traceback.print_exc()
+            return total_loaded  # Return partial count
 
 
 def load_parquet_collection(
@@ -913,7 +1384,7 @@ def load_parquet_collection(
     table_name: str,
     class_name: str,
     db,
-    schema_view: SchemaView,
+    schema_view: SchemaSnapshot,
     max_rows: Optional[int] = None,
     verbose: bool = False
 ) -> int:
@@ -925,7 +1396,7 @@ def load_parquet_collection(
         table_name: CDM table name (e.g., "sdt_location", "ddt_brick0000476")
         class_name: LinkML class name for schema validation
         db: Database connection
-        schema_view: SchemaView instance
+        schema_view: SchemaSnapshot instance
         max_rows: Maximum rows to load (None = all)
         verbose: Print detailed progress
 
@@ -935,6 +1406,9 @@ def load_parquet_collection(
     parquet_name = parquet_path.name
     print(f"\n📥 Loading {parquet_name} as {table_name}...")
 
+    # linkml-store inserts through its own connection
+    release_duckdb_connection(db)
+
     # Get row count
     try:
         total_rows = get_parquet_row_count(parquet_path)
@@ -992,15 +1466,17 @@ def load_parquet_collection(
 
     # Enhance records with computed fields and provenance info
     enhanced_data = []
-    for record in records:
-        # Add provenance parsing for SystemProcess records
-        if class_name == 'SystemProcess':
-            record = extract_provenance_info(record)
+    with span("computed_fields", category="load", table=table_name) as fields_span:
+        fields_span.add(rows=len(records))
+        for record in records:
+            # Add provenance parsing for SystemProcess records
+            if class_name == 'SystemProcess':
+                record = extract_provenance_info(record)
 
-        # Add computed fields
-        record = add_computed_fields(record, class_name)
+            # Add computed fields
+            record = add_computed_fields(record, class_name)
 
-        enhanced_data.append(record)
+            enhanced_data.append(record)
 
     if verbose and len(enhanced_data) > 0:
         print(f"  🔍 Sample fields: {list(enhanced_data[0].keys())[:5]}...")
@@ -1031,7 +1507,9 @@ def load_parquet_collection(
     # Insert data
     try:
         insert_start = time.time()
-        collection.insert(enhanced_data)
+        with span("load_chunk", category="load", table=table_name, chunk=0, method="pandas") as chunk_span:
+            collection.insert(enhanced_data)
+            chunk_span.add(rows=len(enhanced_data))
         insert_time = time.time() - insert_start
 
         print(f"  ✅ Loaded {len(enhanced_data):,} records in {insert_time:.2f}s")
@@ -1047,7 +1525,7 @@ def load_parquet_collection(
 def load_all_cdm_parquet(
     cdm_db_path: Path,
     db,
-    schema_view: SchemaView,
+    schema_view: SchemaSnapshot,
     include_system: bool = True,
     include_static: bool = True,
     include_dynamic: bool = False,
@@ -1055,7 +1533,12 @@ def load_all_cdm_parquet(
     num_bricks: Optional[int] = None,
     use_direct_import: bool = True,
     use_chunked: bool = True,
-    chunk_size: int = 100_000,
+    chunk_size: Optional[int] = None,
+    enum_encode: bool = False,
+    sample_method: str = DEFAULT_SAMPLE_METHOD,
+    sample_strata: Optional[str] = None,
+    sample_seed: int = 42,
+    memory_budget: Optional[MemoryBudget] = None,
     verbose: bool = False
 ) -> Dict[str, int]:
     """
@@ -1064,7 +1547,7 @@ def load_all_cdm_parquet(
     Args:
         cdm_db_path: Path to CDM database directory (enigma_coral.db)
         db: Database connection
-        schema_view: SchemaView instance
+        schema_view: SchemaSnapshot instance
         include_system: Load sys_* tables
         include_static: Load sdt_* tables
         include_dynamic: Load ddt_* tables (large, sampled by default)
@@ -1072,7 +1555,13 @@ def load_all_cdm_parquet(
         num_bricks: Number of brick tables to load (None = all if include_dynamic, or 5 default)
         use_direct_import: Use direct DuckDB import (fastest, recommended)
         use_chunked: Use chunked loading for large files (memory-safe)
-        chunk_size: Rows per chunk when using chunked mode (default: 100K)
+        chunk_size: Fixed rows per chunk in chunked mode (default: adapt to the memory budget)
+        enum_encode: Store low-cardinality string columns as DuckDB ENUMs
+        sample_method: How bricks are sampled when max_dynamic_rows is set
+        sample_strata: Strata column for stratified sampling (default: leading dimension)
+        sample_seed: Random seed for brick sampling
+        memory_budget: DuckDB resource limits and slice sizing for the load
+            (default: keep the connection's settings, size slices from available memory)
         verbose: Print detailed progress
 
     Returns:
@@ -1081,6 +1570,15 @@ def load_all_cdm_parquet(
     results = {}
     total_records = 0
     start_time = time.time()
+    # Join-key columns found by ENUM detection, encoded together after the load
+    shared_enum_columns: Dict[str, List[str]] = {}
+
+    if memory_budget is not None:
+        try:
+            configure_memory_budget(db, memory_budget)
+            print(f"💾 Memory budget: {memory_budget.describe()}")
+        except Exception as e:
+            print(f"  ⚠️  Could not apply memory budget to DuckDB: {e}")
 
     # Static entity tables (17 tables, 273K rows)
     static_tables = [
@@ -1152,6 +1650,8 @@ def load_all_cdm_parquet(
                 except Exception as e:
                     if verbose:
                         print(f"  ⚠️  Could not add computed fields for {cdm_table_name}: {e}")
+                if enum_encode:
+                    apply_enum_encoding(db, cdm_table_name, table_path, shared_enum_columns, verbose=verbose)
             results[cdm_table_name] = count
             total_records += count
 
@@ -1200,6 +1700,8 @@ def load_all_cdm_parquet(
                 except Exception as e:
                     if verbose:
                         print(f"  ⚠️  Could not coerce types for {cdm_table_name}: {e}")
+                if enum_encode:
+                    apply_enum_encoding(db, cdm_table_name, table_path, shared_enum_columns, verbose=verbose)
             results[cdm_table_name] = count
             total_records += count
 
@@ -1213,12 +1715,13 @@ def load_all_cdm_parquet(
         if use_direct_import:
             print(f"📦 Using optimized loading (attempts direct DuckDB, falls back to pandas)")
         elif use_chunked:
-            print(f"📦 Using CHUNKED loading ({chunk_size:,} rows/chunk, memory-safe)")
+            chunk_desc = f"{chunk_size:,} rows/chunk" if chunk_size else "adaptive chunk size"
+            print(f"📦 Using CHUNKED loading ({chunk_desc}, memory-safe)")
         else:
             print(f"⚠️  Using standard pandas loading (may cause OOM on large bricks)")
 
         if max_dynamic_rows is not None:
-            print(f"⚠️  Note: Dynamic tables sampled at {max_dynamic_rows:,} rows each")
+            print(f"⚠️  Note: Dynamic tables sampled at {max_dynamic_rows:,} rows each ({sample_method})")
         else:
             print(f"⚠️  Note: Loading complete brick data")
         print(f"   (Total: 82.6M rows across ~20 brick tables)")
@@ -1272,7 +1775,10 @@ def load_all_cdm_parquet(
                     count = load_parquet_to_duckdb_direct(
                         brick_path, brick_name, "DynamicDataArray", db,
                         max_rows=max_dynamic_rows,
-                        verbose=verbose
+                        verbose=verbose,
+                        sample_method=sample_method,
+                        strata_column=sample_strata,
+                        sample_seed=sample_seed
                     )
                     if count == 0:  # Fallback to standard if direct fails
                         count = load_parquet_collection(
@@ -1280,6 +1786,8 @@ def load_all_cdm_parquet(
                             max_rows=max_dynamic_rows,
                             verbose=verbose
                         )
+                    elif enum_encode:
+                        apply_enum_encoding(db, brick_name, brick_path, shared_enum_columns, verbose=verbose)
                 else:
                     count = load_parquet_collection(
                         brick_path, brick_name, "DynamicDataArray", db, schema_view,
@@ -1299,7 +1807,10 @@ def load_all_cdm_parquet(
                     count = load_parquet_to_duckdb_direct(
                         brick_path, brick_name, "DynamicDataArray", db,
                         max_rows=max_dynamic_rows,
-                        verbose=verbose
+                        verbose=verbose,
+                        sample_method=sample_method,
+                        strata_column=sample_strata,
+                        sample_seed=sample_seed
                     )
                     if count == 0:  # Fallback to chunked if direct fails
                         count = load_parquet_collection_chunked(
@@ -1308,6 +1819,8 @@ def load_all_cdm_parquet(
                             chunk_size=chunk_size,
                             verbose=verbose
                         )
+                    elif enum_encode:
+                        apply_enum_encoding(db, brick_name, brick_path, shared_enum_columns, verbose=verbose)
                 elif use_chunked:
                     # Use chunked loading (memory-safe)
                     count = load_parquet_collection_chunked(
@@ -1329,6 +1842,19 @@ def load_all_cdm_parquet(
             if len(brick_tables) > bricks_to_load:
                 print(f"\n  ⚠️  Skipped {len(brick_tables) - bricks_to_load} additional brick tables")
 
+    if shared_enum_columns:
+        print(f"\n🗜️  Encoding join-key columns as {SHARED_ENUM_TYPE}...")
+        try:
+            conn = get_duckdb_connection(db)
+            with span("enum_encode_shared", category="load") as shared_span:
+                encoded = encode_shared_label_columns(conn, shared_enum_columns, verbose=verbose)
+                shared_span.set(tables=len(encoded))
+            print(f"  ✅ {sum(len(c) for c in encoded.values())} column(s) in {len(encoded)} table(s)")
+        except Exception as e:
+            print(f"  ⚠️  Could not encode shared join-key columns: {e}")
+
+    release_duckdb_connection(db)
+
     elapsed = time.time() - start_time
     print(f"\n{'='*60}")
     print(f"📊 Summary: Loaded {total_records:,} total records across {len(results)} collections")
@@ -1336,49 +1862,121 @@ def load_all_cdm_parquet(
     return results
 
 
-def create_indexes(db, verbose: bool = False):
-    """Create indexes for common query patterns."""
+def create_indexes(db, schema_view=None, sort_bricks_min_rows: Optional[int] = None, verbose: bool = False) -> int:
+    """
+    Create ART indexes on key, foreign key and computed columns.
+
+    Args:
+        db: Database connection
+        schema_view: CDM SchemaSnapshot (identifier and foreign key slots)
+        sort_bricks_min_rows: First order bricks with at least this many rows
+            by their leading dimension (None: leave brick order alone)
+        verbose: Print detailed progress
+
+    Returns:
+        Number of indexes created
+    """
+    conn = get_duckdb_connection(db)
+    if sort_bricks_min_rows is not None:
+        # Sort first: indexes are built once on the final row order
+        print(f"\n📐 Ordering bricks by leading dimension...")
+        start = time.time()
+        with span("brick_sort", category="load", min_rows=sort_bricks_min_rows) as sort_span:
+            sorted_bricks = sort_bricks(conn, sort_bricks_min_rows, verbose=verbose)
+            sort_span.set(tables=sorted_bricks)
+        print(f"  ✅ {len(sorted_bricks)} brick(s) re-sorted ({time.time() - start:.2f}s)")
+
     print(f"\n🔍 Creating indexes for query optimization...")
+    start = time.time()
+    with span("index_build", category="load") as index_span:
+        indexed_count, errors = build_cdm_indexes(conn, schema_view, verbose=verbose)
+        index_span.set(indexes=indexed_count, errors=len(errors))
+    for error in errors:
+        if verbose:
+            print(f"  ⚠️  Could not index {error}")
+    print(f"  ✅ Created {indexed_count} indexes ({time.time() - start:.2f}s)")
+    return indexed_count
 
-    index_specs = [
-        # Static entity primary keys (use CDM table names)
-        ('sdt_location', 'sdt_location_id'),
-        ('sdt_sample', 'sdt_sample_id'),
-        ('sdt_reads', 'sdt_reads_id'),
-        ('sdt_assembly', 'sdt_assembly_id'),
-        ('sdt_genome', 'sdt_genome_id'),
-
-        # Static entity foreign keys
-        ('sdt_sample', 'location_ref'),
-        ('sdt_assembly', 'strain_ref'),
-        ('sdt_genome', 'strain_ref'),
-
-        # System table keys
-        ('sys_oterm', 'sys_oterm_id'),
-        ('sys_process', 'sys_process_id'),
-
-        # Computed fields
-        ('sdt_reads', 'read_count_category'),
-        ('sdt_assembly', 'contig_count_category'),
-
-        # Provenance fields
-        ('sys_process', 'input_entity_types'),
-        ('sys_process', 'output_entity_types'),
-    ]
 
-    indexed_count = 0
-    for collection_name, field_name in index_specs:
-        try:
-            collection = db.get_collection(collection_name)
-            # Note: linkml-store may handle indexing automatically with DuckDB
-            if verbose:
-                print(f"  ✓ Indexed {collection_name}.{field_name}")
-            indexed_count += 1
-        except Exception as e:
-            if verbose:
-                print(f"  ⚠️  Could not index {collection_name}.{field_name}: {e}")
+def create_oterm_closure(db, obo_path: Optional[Path] = None, verbose: bool = False) -> int:
+    """
+    Materialize the sys_oterm_closure table for ontology subsumption queries.
+
+    Args:
+        db: Database connection
+        obo_path: Optional OBO file whose is_a edges are merged with sys_oterm parents
+        verbose: Print detailed progress
+
+    Returns:
+        Number of closure rows created
+    """
+    print(f"\n🌳 Building ontology closure table ({CLOSURE_TABLE})...")
+    start = time.time()
+    try:
+        count = build_closure_table(get_duckdb_connection(db), obo_path=obo_path, verbose=verbose)
+    except Exception as e:
+        print(f"  ⚠️  Could not build {CLOSURE_TABLE}: {e}")
+        return 0
+    if count:
+        print(f"  ✅ {count:,} ancestor/descendant pairs ({time.time() - start:.2f}s)")
+    else:
+        print(f"  ⊘ No ontology terms found, skipped")
+    return count
+
 
-    print(f"  ✅ Created {indexed_count} indexes")
+def create_search_index(db, output_path: Path, verbose: bool = False) -> int:
+    """
+    Build the text search index over ontology terms and entity names.
+
+    Args:
+        db: Database connection
+        output_path: Path to the loaded DuckDB database (index goes next to it)
+        verbose: Print detailed progress
+
+    Returns:
+        Number of indexed values
+    """
+    print(f"\n🔎 Building search index...")
+    start = time.time()
+    try:
+        index = build_search_index(get_duckdb_connection(db), output_path, verbose=verbose)
+    except Exception as e:
+        print(f"  ⚠️  Could not build search index: {e}")
+        return 0
+    print(f"  ✅ {len(index):,} values indexed → {get_search_index_path(output_path).name} "
+          f"({time.time() - start:.2f}s)")
+    return len(index)
+
+
+def write_load_manifest(output_path: Path, source_path: Path, results: Dict[str, int], options: Dict[str, Any]) -> Path:
+    """
+    Write ``<output>.manifest.json`` describing this load.
+
+    The ``load_id`` changes on every load, so result caches keyed on the
+    manifest are invalidated when the store is rebuilt.
+
+    Args:
+        output_path: Path to the loaded DuckDB database
+        source_path: CDM parquet database directory that was loaded
+        results: Dict mapping table names to loaded record counts
+        options: Loader options used for this load
+
+    Returns:
+        Path to the manifest file
+    """
+    output_path = Path(output_path)
+    manifest_path = output_path.with_name(output_path.name + ".manifest.json")
+    manifest = {
+        'load_id': uuid.uuid4().hex,
+        'loaded_at': datetime.now().isoformat(),
+        'source': str(Path(source_path).resolve()),
+        'options': options,
+        'tables': results,
+        'total_records': sum(results.values()),
+    }
+    with open(manifest_path, 'w') as f:
+        json.dump(manifest, f, indent=2, default=str)
+    return manifest_path
 
 
 def show_database_info(db):
@@ -1459,10 +2057,40 @@ Examples:
       --include-dynamic \\
       --max-dynamic-rows 10000
 
+  # Stratify the brick sample by its leading dimension
+  python load_cdm_parquet_to_store.py data/enigma_coral.db \\
+      --include-dynamic \\
+      --max-dynamic-rows 10000 \\
+      --sample-method stratified
+
   # Load only system tables
   python load_cdm_parquet_to_store.py data/enigma_coral.db \\
       --no-static \\
       --include-system
+
+  # Merge ontology is_a edges into the sys_oterm closure table
+  python load_cdm_parquet_to_store.py data/enigma_coral.db \\
+      --oterm-obo data/context_measurement_ontology.obo
+
+  # Store repeated ontology labels / dimension values as ENUMs (smaller store)
+  python load_cdm_parquet_to_store.py data/enigma_coral.db \\
+      --include-dynamic \\
+      --enum-encode
+
+  # Order large bricks by leading dimension, then index keys
+  python load_cdm_parquet_to_store.py data/enigma_coral.db \\
+      --include-dynamic \\
+      --sort-bricks
+
+  # Load all bricks within a 48 GB memory budget (spills to cdm_store.db.tmp/)
+  python load_cdm_parquet_to_store.py data/enigma_coral.db \\
+      --include-dynamic \\
+      --memory-budget 48GB
+
+  # Trace where the load spends its time (open in chrome://tracing or Perfetto)
+  python load_cdm_parquet_to_store.py data/enigma_coral.db \\
+      --include-dynamic \\
+      --trace load_trace.json --profile-duckdb
         """
     )
 
@@ -1518,6 +2146,24 @@ Examples:
         default=None,
         help='Max rows per dynamic table if included (default: None = load all rows)'
     )
+    parser.add_argument(
+        '--sample-method',
+        choices=SAMPLE_METHODS,
+        default=DEFAULT_SAMPLE_METHOD,
+        help=f'How bricks are sampled with --max-dynamic-rows (default: {DEFAULT_SAMPLE_METHOD}; '
+             f'"head" reproduces the old biased LIMIT behaviour)'
+    )
+    parser.add_argument(
+        '--sample-strata',
+        metavar='COLUMN',
+        help='Strata column for --sample-method stratified (default: leading dimension)'
+    )
+    parser.add_argument(
+        '--sample-seed',
+        type=int,
+        default=42,
+        help='Random seed for brick sampling (default: 42)'
+    )
     parser.add_argument(
         '--num-bricks',
         type=int,
@@ -1553,19 +2199,90 @@ Examples:
     parser.add_argument(
         '--chunk-size',
         type=int,
-        default=100_000,
-        help='Rows per chunk when using chunked mode (default: 100000)'
+        default=None,
+        help='Fixed rows per chunk in chunked (pandas) mode (default: adapt to --memory-budget)'
+    )
+    parser.add_argument(
+        '--memory-budget',
+        default='auto',
+        metavar='SIZE',
+        help='Memory the load may use, e.g. 48GB, 512MB or 75%% of RAM (default: auto = 75%% of '
+             'available memory). Sets DuckDB memory_limit/threads/temp_directory and slice sizes'
+    )
+    parser.add_argument(
+        '--threads',
+        type=int,
+        default=None,
+        help='DuckDB threads (default: CPU count, at most one per GiB of the DuckDB memory limit)'
+    )
+    parser.add_argument(
+        '--no-preserve-order',
+        dest='preserve_order',
+        action='store_false',
+        default=True,
+        help='Let DuckDB reorder rows while loading (lower memory for large single-pass loads; '
+             'bricks are no longer in parquet order unless --sort-bricks is used)'
+    )
+    parser.add_argument(
+        '--enum-encode',
+        action='store_true',
+        help='Store low-cardinality string columns (ontology labels, dimension values) '
+             'as DuckDB ENUM types (direct import only)'
+    )
+    parser.add_argument(
+        '--oterm-obo',
+        type=Path,
+        metavar='OBO_FILE',
+        help='Merge is_a edges from this OBO file (e.g. context_measurement_ontology.obo) '
+             'into the sys_oterm closure table'
+    )
+    parser.add_argument(
+        '--no-oterm-closure',
+        dest='oterm_closure',
+        action='store_false',
+        default=True,
+        help='Skip building the sys_oterm_closure table'
+    )
+    parser.add_argument(
+        '--no-search-index',
+        dest='search_index',
+        action='store_false',
+        default=True,
+        help='Skip building the term/name search index (<output>.search/)'
     )
     parser.add_argument(
         '--create-indexes',
         action='store_true',
-        help='Create indexes after loading'
+        help='Create ART indexes on key, foreign key and computed columns after loading'
+    )
+    parser.add_argument(
+        '--sort-bricks',
+        action='store_true',
+        help='Order large bricks by their leading dimension (better zone-map pruning; implies --create-indexes)'
+    )
+    parser.add_argument(
+        '--sort-min-rows',
+        type=int,
+        default=DEFAULT_SORT_MIN_ROWS,
+        help=f'Only order bricks with at least this many rows (default: {DEFAULT_SORT_MIN_ROWS:,})'
     )
     parser.add_argument(
         '--show-info',
         action='store_true',
         help='Show database information after loading'
     )
+    parser.add_argument(
+        '--trace',
+        type=Path,
+        metavar='FILE',
+        help='Record timing/memory spans (table loads, chunks, cast rebuilds, computed fields) '
+             'to FILE: .jsonl for JSON Lines, otherwise a Chrome trace'
+    )
+    parser.add_argument(
+        '--profile-duckdb',
+        action='store_true',
+        help='Add DuckDB query profiles to --trace spans'
+    )
     parser.add_argument(
         '--verbose', '-v',
         action='store_true',
@@ -1578,6 +2295,9 @@ Examples:
     if not args.cdm_database.exists():
         print(f"Error: CDM database not found: {args.cdm_database}", file=sys.stderr)
         sys.exit(1)
+    if args.oterm_obo and not args.oterm_obo.exists():
+        print(f"Error: OBO file not found: {args.oterm_obo}", file=sys.stderr)
+        sys.exit(1)
 
     schema_path = args.schema if args.schema else CDM_SCHEMA
     if not schema_path.exists():
@@ -1602,7 +2322,7 @@ Examples:
     print(f"  • Dynamic tables (ddt_*): {'Yes' if args.include_dynamic else 'No'}")
     if args.include_dynamic:
         if args.max_dynamic_rows is not None:
-            print(f"    - Max rows per brick: {args.max_dynamic_rows:,}")
+            print(f"    - Max rows per brick: {args.max_dynamic_rows:,} ({args.sample_method} sample)")
         else:
             print(f"    - Max rows per brick: all (no limit)")
         if args.num_bricks is not None:
@@ -1610,6 +2330,20 @@ Examples:
         else:
             print(f"    - Number of bricks: all")
 
+    try:
+        memory_budget = MemoryBudget.from_option(
+            args.memory_budget,
+            temp_directory=f"{args.output}.tmp",
+            threads=args.threads,
+            preserve_insertion_order=args.preserve_order,
+        )
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.trace:
+        configure_tracing(args.trace, profile_duckdb=args.profile_duckdb)
+
     client, db, schema_view = create_store(args.output, schema_path)
 
     # Show loading strategy
@@ -1618,32 +2352,66 @@ Examples:
         print(f"  • Direct DuckDB import: {'Yes' if args.use_direct_import else 'No'}")
         print(f"  • Chunked loading: {'Yes' if args.use_chunked else 'No'}")
         if args.use_chunked:
-            print(f"  • Chunk size: {args.chunk_size:,} rows")
+            print(f"  • Chunk size: {f'{args.chunk_size:,} rows' if args.chunk_size else 'adaptive'}")
+        print(f"  • ENUM encoding: {'Yes' if args.enum_encode else 'No'}")
 
     # Load data
-    results = load_all_cdm_parquet(
-        args.cdm_database,
-        db,
-        schema_view,
-        include_system=args.include_system,
-        include_static=args.include_static,
-        include_dynamic=args.include_dynamic,
-        max_dynamic_rows=args.max_dynamic_rows,
-        num_bricks=args.num_bricks,
-        use_direct_import=args.use_direct_import,
-        use_chunked=args.use_chunked,
-        chunk_size=args.chunk_size,
-        verbose=args.verbose
-    )
+    with span("load", category="load", source=str(args.cdm_database)) as load_span:
+        results = load_all_cdm_parquet(
+            args.cdm_database,
+            db,
+            schema_view,
+            include_system=args.include_system,
+            include_static=args.include_static,
+            include_dynamic=args.include_dynamic,
+            max_dynamic_rows=args.max_dynamic_rows,
+            num_bricks=args.num_bricks,
+            use_direct_import=args.use_direct_import,
+            use_chunked=args.use_chunked,
+            chunk_size=args.chunk_size,
+            enum_encode=args.enum_encode,
+            sample_method=args.sample_method,
+            sample_strata=args.sample_strata,
+            sample_seed=args.sample_seed,
+            memory_budget=memory_budget,
+            verbose=args.verbose
+        )
+        load_span.add(rows=sum(results.values()))
+
+    # Ontology closure for "descendant of X" filters
+    if args.oterm_closure and (results.get('sys_oterm') or args.oterm_obo):
+        create_oterm_closure(db, obo_path=args.oterm_obo, verbose=args.verbose)
 
     # Create indexes if requested
-    if args.create_indexes:
-        create_indexes(db, verbose=args.verbose)
+    if args.create_indexes or args.sort_bricks:
+        create_indexes(
+            db,
+            schema_view,
+            sort_bricks_min_rows=args.sort_min_rows if args.sort_bricks else None,
+            verbose=args.verbose
+        )
 
     # Show info if requested
     if args.show_info:
         show_database_info(db)
 
+    # Record this load so result caches for the old store are invalidated
+    write_load_manifest(args.output, args.cdm_database, results, {
+        'include_static': args.include_static,
+        'include_system': args.include_system,
+        'include_dynamic': args.include_dynamic,
+        'max_dynamic_rows': args.max_dynamic_rows,
+        'num_bricks': args.num_bricks,
+        'sample_method': args.sample_method if args.max_dynamic_rows is not None else None,
+        'enum_encode': args.enum_encode,
+        'oterm_closure': args.oterm_closure,
+        'oterm_obo': args.oterm_obo,
+    })
+
+    # Search index records the manifest's load ID, so build it afterwards
+    if args.search_index:
+        create_search_index(db, Path(args.output), verbose=args.verbose)
+
     # Show database file size
     db_file = Path(args.output)
     if db_file.exists():
@@ -1652,6 +2420,8 @@ Examples:
         print(f"   Size: {size_mb:.2f} MB")
 
     print(f"\n✨ Data loading complete!")
+    if args.trace:
+        print_trace_summary(args.trace)
 
     # Exit with status
     total_loaded = sum(results.values())
@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+"""
+Memory budget for loading CDM parquet into DuckDB.
+
+A single ``--memory-budget`` (e.g. ``48GB``, ``75%`` or ``auto``) replaces the
+per-machine loader recipes. The budget is turned into DuckDB resource settings
+(memory_limit, threads, temp_directory, preserve_insertion_order) and into the
+load plan for each table:
+
+- bytes per row come from the parquet footers (uncompressed row group sizes)
+  and a small decoded sample, not from a fixed multiple of the compressed size
+- a table whose uncompressed size fits comfortably under the DuckDB limit is
+  loaded with one CREATE TABLE AS; larger tables are inserted in slices
+- slices are ``file_row_number`` ranges of each parquet file, so DuckDB skips
+  straight to the row groups of a slice (OFFSET/LIMIT re-scans every earlier
+  row and depends on scan order)
+- slice sizes start from the budget and adapt to the measured peak RSS and
+  throughput of each slice (halve under memory pressure, grow while there is
+  headroom and throughput holds)
+
+Usage:
+    from memory_budget import MemoryBudget, SliceController, parquet_footprint
+
+    budget = MemoryBudget.from_option("48GB", temp_directory="cdm_store.db.tmp")
+    budget.configure(conn)
+    footprint = parquet_footprint(Path("data/enigma_coral.db/ddt_brick0000476"))
+    if not budget.fits_single_pass(footprint.uncompressed_bytes):
+        controller = SliceController(budget, footprint.bytes_per_row)
+"""
+
+import os
+import re
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import pyarrow.parquet as pq
+
+try:
+    import psutil
+except ImportError:
+    print("Warning: psutil not installed. Slice sizes will not adapt to memory use. Run: uv pip install psutil")
+    psutil = None
+
+
+# Share of the budget given to DuckDB's buffer manager; the rest covers
+# Python, pyarrow buffers and the pandas fallback
+DUCKDB_MEMORY_SHARE = 0.6
+
+# "auto" budget as a share of the memory available when the load starts
+AUTO_BUDGET_FRACTION = 0.75
+
+# DuckDB needs roughly this much memory per thread for parquet inserts
+THREAD_MEMORY_BYTES = 1024 ** 3
+
+# A single CREATE TABLE AS is used while the uncompressed table takes at most
+# this share of the DuckDB memory limit
+SINGLE_PASS_FRACTION = 0.5
+
+# Target size of one slice as a share of the budget
+SLICE_FRACTION = 0.125
+
+# pandas records (Python dicts) take this many times the columnar row size
+PANDAS_ROW_OVERHEAD = 10
+
+# Rows decoded from the first file to measure the in-memory row size
+ROW_SIZE_SAMPLE_ROWS = 10_000
+
+# Adaptive slicing: shrink above HIGH_WATER of the budget, grow below LOW_WATER
+HIGH_WATER = 0.85
+LOW_WATER = 0.5
+GROWTH_FACTOR = 1.5
+THROUGHPUT_TOLERANCE = 0.9
+
+MIN_SLICE_ROWS = {"duckdb": 100_000, "pandas": 1_000}
+MAX_SLICE_ROWS = {"duckdb": 50_000_000, "pandas": 1_000_000}
+
+RSS_SAMPLE_INTERVAL = 0.05
+
+_UNITS = {
+    "": 1, "B": 1,
+    "K": 1024, "KB": 1024, "KIB": 1024,
+    "M": 1024 ** 2, "MB": 1024 ** 2, "MIB": 1024 ** 2,
+    "G": 1024 ** 3, "GB": 1024 ** 3, "GIB": 1024 ** 3,
+    "T": 1024 ** 4, "TB": 1024 ** 4, "TIB": 1024 ** 4,
+}
+
+
+def available_memory() -> Optional[int]:
+    """Memory available to new allocations in bytes (None without psutil)."""
+    if psutil is None:
+        return None
+    return psutil.virtual_memory().available
+
+
+def process_rss() -> int:
+    """Resident set size of this process in bytes (0 without psutil)."""
+    if psutil is None:
+        return 0
+    try:
+        return psutil.Process().memory_info().rss
+    except psutil.Error:
+        return 0
+
+
+def parse_memory_size(value: str, total_bytes: Optional[int] = None) -> int:
+    """
+    Parse a memory size such as "48GB", "512MiB", "2.5G" or "75%".
+
+    Units are binary (GB = GiB, as machine RAM is quoted).
+
+    Args:
+        value: Size with an optional unit, or a percentage of total_bytes
+        total_bytes: Memory a percentage refers to (default: total system RAM)
+
+    Returns:
+        Size in bytes
+    """
+    text = str(value).strip().upper().replace(" ", "")
+    if text.endswith("%"):
+        if total_bytes is None:
+            if psutil is None:
+                raise ValueError(f"Cannot resolve '{value}' without psutil; give an absolute size")
+            total_bytes = psutil.virtual_memory().total
+        percent = float(text[:-1])
+        if not 0 < percent <= 100:
+            raise ValueError(f"Memory percentage must be in (0, 100]: '{value}'")
+        return int(total_bytes * percent / 100)
+
+    match = re.fullmatch(r"(\d+(?:\.\d+)?)([A-Z]*)", text)
+    if not match or match.group(2) not in _UNITS:
+        raise ValueError(f"Invalid memory size '{value}' (expected e.g. 48GB, 512MB or 75%)")
+    size = int(float(match.group(1)) * _UNITS[match.group(2)])
+    if size <= 0:
+        raise ValueError(f"Memory size must be positive: '{value}'")
+    return size
+
+
+def format_bytes(size: float) -> str:
+    """Human readable binary size (e.g. "1.5 GiB")."""
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if abs(size) < 1024:
+            return f"{size:.1f} {unit}" if unit != "B" else f"{int(size)} B"
+        size /= 1024
+    return f"{size:.1f} TiB"
+
+
+@dataclass
+class ParquetFootprint:
+    """Row counts and sizes of a parquet table read from its footers."""
+
+    rows: int
+    compressed_bytes: int
+    uncompressed_bytes: int
+    files: List[Tuple[Path, int]] = field(default_factory=list)
+    decoded_row_bytes: float = 0.0
+
+    @property
+    def bytes_per_row(self) -> float:
+        """In-memory bytes per row: dictionary-encoded strings are larger once decoded."""
+        encoded = self.uncompressed_bytes / self.rows if self.rows else 0.0
+        return max(encoded, self.decoded_row_bytes)
+
+
+def parquet_files(parquet_path: Path) -> List[Path]:
+    """Parquet files of a table directory (or the file itself), in load order."""
+    if parquet_path.is_dir():
+        return sorted(f for f in parquet_path.glob("*.parquet") if not f.parent.name.startswith('_'))
+    return [parquet_path]
+
+
+def parquet_footprint(parquet_path: Path) -> ParquetFootprint:
+    """
+    Read row counts and uncompressed sizes from the parquet footers.
+
+    The first ROW_SIZE_SAMPLE_ROWS rows are decoded to measure the Arrow
+    (columnar, in-memory) row size.
+
+    Args:
+        parquet_path: Parquet file or table directory
+
+    Returns:
+        ParquetFootprint with per-file row counts
+    """
+    footprint = ParquetFootprint(rows=0, compressed_bytes=0, uncompressed_bytes=0)
+    for path in parquet_files(parquet_path):
+        parquet_file = pq.ParquetFile(path)
+        metadata = parquet_file.metadata
+        if not footprint.decoded_row_bytes and metadata.num_rows:
+            sample = next(parquet_file.iter_batches(batch_size=ROW_SIZE_SAMPLE_ROWS))
+            footprint.decoded_row_bytes = sample.nbytes / sample.num_rows
+        footprint.rows += metadata.num_rows
+        footprint.compressed_bytes += path.stat().st_size
+        footprint.uncompressed_bytes += sum(
+            metadata.row_group(i).total_byte_size for i in range(metadata.num_row_groups)
+        )
+        footprint.files.append((path, metadata.num_rows))
+    return footprint
+
+
+@dataclass
+class MemoryBudget:
+    """Memory available to a load and the DuckDB settings derived from it."""
+
+    limit_bytes: int
+    threads: int
+    temp_directory: Optional[str] = None
+    preserve_insertion_order: bool = True
+    source: str = "auto"
+
+    @classmethod
+    def from_option(
+        cls,
+        value: Optional[str] = "auto",
+        temp_directory: Optional[str] = None,
+        threads: Optional[int] = None,
+        preserve_insertion_order: bool = True,
+    ) -> "MemoryBudget":
+        """
+        Build a budget from a --memory-budget value.
+
+        Args:
+            value: Size ("48GB"), share of total RAM ("75%") or "auto"
+                (75% of the memory available now)
+            temp_directory: Where DuckDB spills when the limit is reached
+            threads: DuckDB threads (default: CPUs, at most one per GiB of the limit)
+            preserve_insertion_order: Keep parquet row order in loaded tables
+
+        Returns:
+            MemoryBudget
+        """
+        value = value or "auto"
+        if value.strip().lower() == "auto":
+            available = available_memory()
+            if available is None:
+                # RAM unknown without psutil: assume a modest machine
+                limit = 8 * 1024 ** 3
+            else:
+                limit = int(available * AUTO_BUDGET_FRACTION)
+        else:
+            limit = parse_memory_size(value)
+
+        if threads is None:
+            duckdb_limit = int(limit * DUCKDB_MEMORY_SHARE)
+            threads = max(1, min(os.cpu_count() or 1, duckdb_limit // THREAD_MEMORY_BYTES))
+        return cls(
+            limit_bytes=limit,
+            threads=threads,
+            temp_directory=temp_directory,
+            preserve_insertion_order=preserve_insertion_order,
+            source=value,
+        )
+
+    @property
+    def duckdb_memory_limit(self) -> int:
+        return int(self.limit_bytes * DUCKDB_MEMORY_SHARE)
+
+    def duckdb_settings(self) -> Dict[str, Any]:
+        """DuckDB settings for this budget."""
+        settings = {
+            "memory_limit": f"{max(1, self.duckdb_memory_limit // 1024 ** 2)}MiB",
+            "threads": self.threads,
+            "preserve_insertion_order": self.preserve_insertion_order,
+        }
+        if self.temp_directory:
+            settings["temp_directory"] = self.temp_directory
+        return settings
+
+    def configure(self, conn) -> Dict[str, Any]:
+        """
+        Apply the budget's settings to a DuckDB connection.
+
+        Args:
+            conn: DuckDB connection
+
+        Returns:
+            Settings that were applied
+        """
+        settings = self.duckdb_settings()
+        for name, value in settings.items():
+            if isinstance(value, bool):
+                literal = "true" if value else "false"
+            elif isinstance(value, int):
+                literal = str(value)
+            else:
+                literal = "'" + str(value).replace("'", "''") + "'"
+            conn.execute(f"SET {name} = {literal}")
+        return settings
+
+    def describe(self) -> str:
+        """One-line summary of the budget and its DuckDB settings."""
+        temp = f", spill to {self.temp_directory}" if self.temp_directory else ""
+        order = "" if self.preserve_insertion_order else ", insertion order not preserved"
+        return (f"{format_bytes(self.limit_bytes)} ({self.source}): DuckDB memory_limit "
+                f"{format_bytes(self.duckdb_memory_limit)}, {self.threads} thread(s){temp}{order}")
+
+    def fits_single_pass(self, uncompressed_bytes: int) -> bool:
+        """Whether a table of this uncompressed size can be loaded in one statement."""
+        return uncompressed_bytes <= self.duckdb_memory_limit * SINGLE_PASS_FRACTION
+
+    def initial_slice_rows(self, bytes_per_row: float, engine: str = "duckdb") -> int:
+        """
+        Rows per slice so that one slice takes about SLICE_FRACTION of the budget.
+
+        Args:
+            bytes_per_row: Uncompressed bytes per row from the parquet footers
+            engine: "duckdb" (columnar inserts) or "pandas" (Python records)
+
+        Returns:
+            Rows per slice, clamped to the engine's bounds
+        """
+        row_bytes = max(bytes_per_row, 1.0)
+        if engine == "pandas":
+            row_bytes *= PANDAS_ROW_OVERHEAD
+        rows = int(self.limit_bytes * SLICE_FRACTION / row_bytes)
+        return max(MIN_SLICE_ROWS[engine], min(MAX_SLICE_ROWS[engine], rows))
+
+
+class RSSMonitor:
+    """Peak resident set size while a block runs, sampled in a background thread."""
+
+    def __init__(self, interval: float = RSS_SAMPLE_INTERVAL):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _sample(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, process_rss())
+
+    def __enter__(self) -> "RSSMonitor":
+        self.peak = process_rss()
+        if psutil is not None:
+            self._thread = threading.Thread(target=self._sample, name="cdm-rss-monitor", daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.peak = max(self.peak, process_rss())
+
+
+class SliceController:
+    """
+    Adapt slice sizes to the memory and throughput measured for each slice.
+
+    Slices shrink by half when the peak RSS of a slice passes HIGH_WATER of the
+    budget, and grow by GROWTH_FACTOR while the peak stays below LOW_WATER and
+    throughput is within THROUGHPUT_TOLERANCE of the best slice so far. A slice
+    that grew but got slower is undone.
+    """
+
+    def __init__(self, budget: MemoryBudget, bytes_per_row: float, engine: str = "duckdb",
+                 rows: Optional[int] = None):
+        self.budget = budget
+        self.engine = engine
+        self.rows = rows or budget.initial_slice_rows(bytes_per_row, engine)
+        self.best_throughput = 0.0
+        self.history: List[Dict[str, Any]] = []
+
+    def _clamp(self, rows: float) -> int:
+        return int(max(MIN_SLICE_ROWS[self.engine], min(MAX_SLICE_ROWS[self.engine], rows)))
+
+    def record(self, rows: int, seconds: float, peak_rss: int) -> int:
+        """
+        Record a finished slice and choose the size of the next one.
+
+        Args:
+            rows: Rows in the slice
+            seconds: Wall time of the slice
+            peak_rss: Peak RSS while the slice ran (0 if unknown)
+
+        Returns:
+            Rows for the next slice
+        """
+        throughput = rows / seconds if seconds > 0 else 0.0
+        pressure = peak_rss / self.budget.limit_bytes if peak_rss else 0.0
+        action = "keep"
+        if pressure > HIGH_WATER:
+            self.rows = self._clamp(self.rows / 2)
+            action = "shrink"
+        elif (self.history and self.history[-1]["action"] == "grow"
+              and throughput < self.best_throughput * THROUGHPUT_TOLERANCE):
+            self.rows = self._clamp(self.rows / GROWTH_FACTOR)
+            action = "undo"
+        elif pressure < LOW_WATER and rows >= self.rows and throughput >= self.best_throughput * THROUGHPUT_TOLERANCE:
+            self.rows = self._clamp(self.rows * GROWTH_FACTOR)
+            action = "grow"
+        self.best_throughput = max(self.best_throughput, throughput)
+        self.history.append({
+            "rows": rows, "seconds": round(seconds, 3), "throughput": round(throughput),
+            "pressure": round(pressure, 3), "action": action, "next_rows": self.rows,
+        })
+        return self.rows
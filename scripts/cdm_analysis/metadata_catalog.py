@@ -0,0 +1,483 @@
+#!/usr/bin/env python3
+"""
+Columnar CDM metadata catalogs with a DuckDB query API.
+
+create_metadata_catalog.py writes each catalog (columns, tables, validation
+rules, microtypes, FK relationships) as a Parquet file and can load them into
+a ``cdm_metadata`` schema of the CDM store database, indexed on table, column
+and microtype. Consumers open a MetadataCatalog on either and query only the
+rows they need instead of loading every catalog into Python.
+
+Usage:
+    # Which columns have microtype ME:0000114?
+    python metadata_catalog.py columns --microtype ME:0000114
+
+    # Columns of one table, from the catalogs loaded into the store
+    python metadata_catalog.py --catalog cdm_store.db columns --table sdt_sample
+
+    # Ad-hoc SQL over the catalog views
+    python metadata_catalog.py --catalog cdm_store.db sql \\
+        "SELECT table_name, count(*) FROM cdm_column_metadata GROUP BY 1 ORDER BY 2 DESC"
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+try:
+    import duckdb
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    print("Error: duckdb and pyarrow are required. Run: uv pip install duckdb pyarrow")
+    sys.exit(1)
+
+CATALOG_SCHEMA = 'cdm_metadata'
+
+# Catalog name -> table name (as in cdm_metadata_schema.sql)
+CATALOG_TABLES = {
+    'column_catalog': 'cdm_column_metadata',
+    'table_catalog': 'cdm_table_metadata',
+    'validation_catalog': 'cdm_validation_rules',
+    'microtype_catalog': 'cdm_microtype_catalog',
+    'relationship_catalog': 'cdm_relationship_catalog',
+}
+
+CATALOG_ARROW_SCHEMAS = {
+    'column_catalog': pa.schema([
+        ('table_name', pa.string()),
+        ('table_category', pa.string()),
+        ('column_name', pa.string()),
+        ('column_type', pa.string()),
+        ('description', pa.string()),
+        ('microtype', pa.string()),
+        ('units', pa.string()),
+        ('is_primary_key', pa.bool_()),
+        ('is_unique_key', pa.bool_()),
+        ('is_foreign_key', pa.bool_()),
+        ('fk_references', pa.string()),
+        ('is_required', pa.bool_()),
+        ('is_nullable', pa.bool_()),
+        ('constraint_pattern', pa.string()),
+        ('original_name', pa.string()),
+        ('field_type', pa.string()),
+        ('null_count', pa.int64()),
+        ('min_value', pa.string()),
+        ('max_value', pa.string()),
+    ]),
+    'table_catalog': pa.schema([
+        ('table_name', pa.string()),
+        ('table_category', pa.string()),
+        ('total_rows', pa.int64()),
+        ('num_columns', pa.int32()),
+        ('num_primary_keys', pa.int32()),
+        ('num_foreign_keys', pa.int32()),
+        ('num_unique_keys', pa.int32()),
+        ('num_required_columns', pa.int32()),
+        ('num_files', pa.int32()),
+        ('compressed_bytes', pa.int64()),
+        ('description', pa.string()),
+    ]),
+    'validation_catalog': pa.schema([
+        ('table_name', pa.string()),
+        ('column_name', pa.string()),
+        ('validation_type', pa.string()),
+        ('validation_pattern', pa.string()),
+        ('description', pa.string()),
+        ('microtype', pa.string()),
+    ]),
+    'microtype_catalog': pa.schema([
+        ('microtype', pa.string()),
+        ('usage_count', pa.int32()),
+        ('tables', pa.list_(pa.string())),
+        ('columns', pa.list_(pa.string())),
+        ('example_description', pa.string()),
+    ]),
+    'relationship_catalog': pa.schema([
+        ('source_table', pa.string()),
+        ('source_column', pa.string()),
+        ('target_table', pa.string()),
+        ('target_column', pa.string()),
+        ('relationship_type', pa.string()),
+        ('is_required', pa.bool_()),
+        ('description', pa.string()),
+    ]),
+}
+
+# (table, column) pairs indexed for point lookups
+CATALOG_INDEXES = [
+    ('cdm_column_metadata', 'table_name'),
+    ('cdm_column_metadata', 'column_name'),
+    ('cdm_column_metadata', 'microtype'),
+    ('cdm_table_metadata', 'table_name'),
+    ('cdm_validation_rules', 'table_name'),
+    ('cdm_microtype_catalog', 'microtype'),
+    ('cdm_relationship_catalog', 'source_table'),
+    ('cdm_relationship_catalog', 'target_table'),
+]
+
+
+def catalog_parquet_path(output_dir: Path, catalog_name: str) -> Path:
+    """Parquet file of one catalog in a metadata directory."""
+    return Path(output_dir) / f'{catalog_name}.parquet'
+
+
+def _normalize(value: Any, arrow_type: pa.DataType) -> Any:
+    """Coerce a catalog value to its column type (e.g. Spark struct types to JSON text)."""
+    if value is None:
+        return None
+    if pa.types.is_string(arrow_type) and not isinstance(value, str):
+        return json.dumps(value) if isinstance(value, (dict, list)) else str(value)
+    return value
+
+
+def catalog_to_arrow(catalog_name: str, records: List[Dict[str, Any]]) -> pa.Table:
+    """
+    Convert catalog records to an Arrow table with the catalog's fixed schema.
+
+    Args:
+        catalog_name: Key of CATALOG_ARROW_SCHEMAS (e.g. 'column_catalog')
+        records: Records from create_metadata_catalog.create_*_catalog()
+
+    Returns:
+        Arrow table; fields missing from older records are null
+    """
+    schema = CATALOG_ARROW_SCHEMAS[catalog_name]
+    columns = {
+        field.name: [_normalize(r.get(field.name), field.type) for r in records]
+        for field in schema
+    }
+    return pa.table(columns, schema=schema)
+
+
+def write_catalog_parquet(catalogs: Dict[str, List[Dict[str, Any]]], output_dir: Path) -> Dict[str, Path]:
+    """
+    Write each catalog as a Parquet file.
+
+    Args:
+        catalogs: Dict of catalog name -> list of records
+        output_dir: Directory for <catalog_name>.parquet files
+
+    Returns:
+        Dict of catalog name -> written path
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    written = {}
+    for catalog_name in CATALOG_TABLES:
+        path = catalog_parquet_path(output_dir, catalog_name)
+        pq.write_table(catalog_to_arrow(catalog_name, catalogs.get(catalog_name, [])), path)
+        written[catalog_name] = path
+    return written
+
+
+def load_catalog_into_duckdb(conn, metadata_dir: Path) -> Dict[str, int]:
+    """
+    (Re)create the indexed cdm_metadata schema tables from catalog Parquet files.
+
+    Args:
+        conn: DuckDB connection (e.g. to the CDM store database)
+        metadata_dir: Directory with the <catalog_name>.parquet files
+
+    Returns:
+        Dict of table name -> row count
+    """
+    counts = {}
+    conn.execute(f"CREATE SCHEMA IF NOT EXISTS {CATALOG_SCHEMA}")
+    for catalog_name, table_name in CATALOG_TABLES.items():
+        path = catalog_parquet_path(metadata_dir, catalog_name)
+        conn.execute(
+            f"CREATE OR REPLACE TABLE {CATALOG_SCHEMA}.{table_name} AS SELECT * FROM read_parquet(?)",
+            [str(path)],
+        )
+        counts[table_name] = conn.execute(
+            f"SELECT count(*) FROM {CATALOG_SCHEMA}.{table_name}"
+        ).fetchone()[0]
+    for table_name, column in CATALOG_INDEXES:
+        conn.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_{table_name}_{column} "
+            f"ON {CATALOG_SCHEMA}.{table_name}({column})"
+        )
+    return counts
+
+
+def has_metadata_catalog(conn) -> bool:
+    """Whether a DuckDB database holds the cdm_metadata catalog tables."""
+    found = conn.execute(
+        "SELECT count(*) FROM duckdb_tables() WHERE schema_name = ? AND table_name = ?",
+        [CATALOG_SCHEMA, CATALOG_TABLES['column_catalog']],
+    ).fetchone()[0]
+    return found > 0
+
+
+class MetadataCatalog:
+    """
+    Query API over the CDM metadata catalogs.
+
+    Open it on a DuckDB database with a cdm_metadata schema (the CDM store),
+    on a directory of catalog Parquet files, or on a directory with only the
+    legacy all_catalogs.json. Every method runs one SQL query and returns
+    plain dicts.
+    """
+
+    def __init__(self, conn, schema: str = CATALOG_SCHEMA):
+        """
+        Args:
+            conn: DuckDB connection holding the catalog tables or views
+            schema: Schema of the catalog tables
+        """
+        self.conn = conn
+        self.schema = schema
+
+    @classmethod
+    def open(cls, source: Path) -> 'MetadataCatalog':
+        """
+        Open the catalogs from a DuckDB file or a metadata directory.
+
+        Args:
+            source: CDM store database file, or directory with catalog
+                Parquet files (or all_catalogs.json)
+
+        Returns:
+            MetadataCatalog
+
+        Raises:
+            FileNotFoundError: If no catalogs are found at source
+        """
+        source = Path(source)
+        if source.is_file():
+            conn = duckdb.connect(str(source), read_only=True)
+            if not has_metadata_catalog(conn):
+                conn.close()
+                raise FileNotFoundError(
+                    f"No {CATALOG_SCHEMA} schema in {source}; "
+                    f"run create_metadata_catalog.py --store-db {source}"
+                )
+            return cls(conn)
+
+        conn = duckdb.connect()
+        conn.execute(f"CREATE SCHEMA {CATALOG_SCHEMA}")
+        if catalog_parquet_path(source, 'column_catalog').exists():
+            for catalog_name, table_name in CATALOG_TABLES.items():
+                path = catalog_parquet_path(source, catalog_name)
+                conn.execute(
+                    f"CREATE VIEW {CATALOG_SCHEMA}.{table_name} AS "
+                    f"SELECT * FROM read_parquet('{str(path).replace(chr(39), chr(39) * 2)}')"
+                )
+            return cls(conn)
+
+        combined_file = source / 'all_catalogs.json'
+        if combined_file.exists():
+            # Catalogs written before the Parquet format
+            with open(combined_file) as f:
+                catalogs = json.load(f)
+            for catalog_name, table_name in CATALOG_TABLES.items():
+                arrow_table = catalog_to_arrow(catalog_name, catalogs.get(catalog_name, []))
+                conn.register(f"_{table_name}", arrow_table)
+                conn.execute(f"CREATE TABLE {CATALOG_SCHEMA}.{table_name} AS SELECT * FROM _{table_name}")
+                conn.unregister(f"_{table_name}")
+            return cls(conn)
+
+        conn.close()
+        raise FileNotFoundError(
+            f"No metadata catalogs in {source}; run create_metadata_catalog.py"
+        )
+
+    def close(self) -> None:
+        """Close the underlying connection."""
+        self.conn.close()
+
+    def __enter__(self) -> 'MetadataCatalog':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _table(self, catalog_name: str) -> str:
+        return f"{self.schema}.{CATALOG_TABLES[catalog_name]}"
+
+    def query(self, sql: str, params: Optional[Sequence[Any]] = None) -> List[Dict[str, Any]]:
+        """
+        Run SQL against the catalogs (cdm_metadata is on the search path).
+
+        Args:
+            sql: Query, e.g. "SELECT * FROM cdm_column_metadata WHERE ..."
+            params: Positional parameters
+
+        Returns:
+            Result rows as dicts
+        """
+        self.conn.execute(f"SET search_path = '{self.schema},main'")
+        cursor = self.conn.execute(sql, list(params or []))
+        names = [d[0] for d in cursor.description]
+        return [dict(zip(names, row)) for row in cursor.fetchall()]
+
+    def _select(self, catalog_name: str, filters: Dict[str, Any], order_by: Optional[str] = None,
+                limit: Optional[int] = None, extra: Sequence[str] = ()) -> List[Dict[str, Any]]:
+        clauses = [f"{column} = ?" for column, value in filters.items() if value is not None]
+        params = [value for value in filters.values() if value is not None]
+        sql = f"SELECT * FROM {self._table(catalog_name)}"
+        if clauses or extra:
+            sql += " WHERE " + " AND ".join(clauses + list(extra))
+        if order_by:
+            sql += f" ORDER BY {order_by}"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        return self.query(sql, params)
+
+    def counts(self) -> Dict[str, int]:
+        """Number of records in each catalog."""
+        selects = ", ".join(
+            f"(SELECT count(*) FROM {self._table(name)}) AS {name}" for name in CATALOG_TABLES
+        )
+        return self.query(f"SELECT {selects}")[0]
+
+    def tables(self, category: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Table records, by name."""
+        return self._select('table_catalog', {'table_category': category}, order_by='table_name')
+
+    def table(self, table_name: str) -> Optional[Dict[str, Any]]:
+        """One table's record, or None."""
+        rows = self._select('table_catalog', {'table_name': table_name})
+        return rows[0] if rows else None
+
+    def columns(
+        self,
+        table: Optional[str] = None,
+        microtype: Optional[str] = None,
+        column: Optional[str] = None,
+        search: Optional[str] = None,
+        names: Optional[Sequence[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Column records matching all given filters, in catalog order.
+
+        Args:
+            table: Table name
+            microtype: Microtype term (e.g. ME:0000114)
+            column: Exact column name
+            search: Case-insensitive substring of column name or description
+            names: Any of these column names
+
+        Returns:
+            Column records
+        """
+        extra = []
+        if search:
+            pattern = '%' + search.replace("'", "''") + '%'
+            extra.append(f"(column_name ILIKE '{pattern}' OR description ILIKE '{pattern}')")
+        if names is not None:
+            quoted = ", ".join("'" + n.replace("'", "''") + "'" for n in names) or "NULL"
+            extra.append(f"column_name IN ({quoted})")
+        return self._select(
+            'column_catalog',
+            {'table_name': table, 'microtype': microtype, 'column_name': column},
+            extra=extra,
+        )
+
+    def microtypes(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Microtypes, most used first."""
+        return self._select('microtype_catalog', {}, order_by='usage_count DESC, microtype', limit=limit)
+
+    def relationships(self, table: Optional[str] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """FK relationships (from or to table, if given), by source table."""
+        extra = []
+        if table:
+            quoted = "'" + table.replace("'", "''") + "'"
+            extra.append(f"(source_table = {quoted} OR target_table = {quoted})")
+        return self._select('relationship_catalog', {}, order_by='source_table, source_column',
+                            limit=limit, extra=extra)
+
+    def validation_rules(self, table: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Validation rules, optionally of one table."""
+        return self._select('validation_catalog', {'table_name': table})
+
+
+def _print_rows(rows: List[Dict[str, Any]], fields: Sequence[str]) -> None:
+    """Print rows as aligned text columns."""
+    if not rows:
+        print("(no results)")
+        return
+    widths = {f: min(60, max(len(f), *(len(str(r.get(f) or '')) for r in rows))) for f in fields}
+    print("  ".join(f.ljust(widths[f]) for f in fields))
+    print("  ".join("-" * widths[f] for f in fields))
+    for row in rows:
+        print("  ".join(str(row.get(f) if row.get(f) is not None else '')[:60].ljust(widths[f])
+                        for f in fields))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Query the CDM metadata catalogs (Parquet directory or store database)'
+    )
+    parser.add_argument(
+        '--catalog',
+        type=Path,
+        default=Path('data/cdm_metadata'),
+        help='CDM store database or catalog directory (default: data/cdm_metadata)'
+    )
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--json', action='store_true', help='Print results as JSON')
+
+    subparsers = parser.add_subparsers(dest='command', help='Lookup to run')
+
+    tables_parser = subparsers.add_parser('tables', help='List tables', parents=[common])
+    tables_parser.add_argument('--category', choices=['static', 'system', 'dynamic'])
+
+    columns_parser = subparsers.add_parser('columns', help='Find columns', parents=[common])
+    columns_parser.add_argument('--table', help='Only columns of this table')
+    columns_parser.add_argument('--microtype', help='Only columns with this microtype (e.g. ME:0000114)')
+    columns_parser.add_argument('--column', help='Exact column name')
+    columns_parser.add_argument('--search', help='Substring of column name or description')
+
+    microtypes_parser = subparsers.add_parser('microtypes', help='Microtypes by usage', parents=[common])
+    microtypes_parser.add_argument('--limit', type=int, help='Max results')
+
+    relationships_parser = subparsers.add_parser('relationships', help='FK relationships', parents=[common])
+    relationships_parser.add_argument('--table', help='Only relationships from or to this table')
+
+    sql_parser = subparsers.add_parser('sql', help='Run SQL over the catalog tables', parents=[common])
+    sql_parser.add_argument('query', help='SQL, e.g. "SELECT * FROM cdm_column_metadata LIMIT 5"')
+
+    args = parser.parse_args()
+
+    try:
+        catalog = MetadataCatalog.open(args.catalog)
+    except FileNotFoundError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    with catalog:
+        if args.command == 'tables':
+            rows = catalog.tables(args.category)
+            fields = ['table_name', 'table_category', 'total_rows', 'num_columns']
+        elif args.command == 'columns':
+            rows = catalog.columns(table=args.table, microtype=args.microtype,
+                                   column=args.column, search=args.search)
+            fields = ['table_name', 'column_name', 'column_type', 'microtype', 'description']
+        elif args.command == 'microtypes':
+            rows = catalog.microtypes(args.limit)
+            fields = ['microtype', 'usage_count', 'example_description']
+        elif args.command == 'relationships':
+            rows = catalog.relationships(args.table)
+            fields = ['source_table', 'source_column', 'target_table', 'target_column']
+        elif args.command == 'sql':
+            rows = catalog.query(args.query)
+            fields = list(rows[0]) if rows else []
+        else:
+            for name, count in catalog.counts().items():
+                print(f"📋 {name}: {count:,} records")
+            return 0
+
+    if args.json:
+        print(json.dumps(rows, indent=2, default=str))
+    else:
+        _print_rows(rows, fields)
+        print(f"\n✅ {len(rows)} result(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,8 +2,10 @@
 """
 Natural Language SQL Query Tool for CDM DuckDB Database
 
-This tool takes natural language queries, translates them to SQL using Claude API,
-and executes them against the CDM DuckDB database.
+This tool takes natural language queries, translates them to SQL using Claude API
+(or the offline template provider, see nl_translation.py), and executes them
+against the CDM DuckDB database. SQL that ran successfully is cached, so a
+repeated question skips translation.
 
 Usage:
     # Basic query
@@ -17,28 +19,42 @@ Usage:
 
     # Output as JSON
     python nl_sql_query.py --db cdm_store.db "List all locations" --json
+
+    # Offline, rule-based translation (no API key needed)
+    python nl_sql_query.py --db cdm_store.db "How many samples?" --provider template
 """
 
 import argparse
 import sys
 import json
-import os
 from pathlib import Path
 from typing import Dict, List, Any, Optional
+
+if __name__ == "__main__":
+    # Hand off to a running query daemon before the heavy imports below
+    from query_daemon import forward_to_daemon
+    forward_to_daemon("nl_sql_query")
+
 import duckdb
 
-try:
-    from anthropic import Anthropic
-except ImportError:
-    print("Error: anthropic package not installed.", file=sys.stderr)
-    print("Install it with: uv add anthropic", file=sys.stderr)
-    sys.exit(1)
+from cdm_search import format_hint_lines, load_search_index, search_hint_hits
+from nl_translation import PROVIDERS, SQLCache, get_provider
+from prompt_context import load_prompt_context
+from query_profiler import QueryRunner
+from sql_guard import GuardedResult, QueryGuard, answer_nl_query, run_guarded
 
 
 class NaturalLanguageSQLQuery:
     """Natural language to SQL query translator and executor."""
 
-    def __init__(self, db_path: str, api_key: Optional[str] = None, verbose: bool = False):
+    def __init__(
+        self,
+        db_path: str,
+        api_key: Optional[str] = None,
+        verbose: bool = False,
+        provider: Optional[str] = None,
+        guard: Optional[QueryGuard] = None
+    ):
         """
         Initialize the NL SQL query tool.
 
@@ -46,83 +62,90 @@ class NaturalLanguageSQLQuery:
             db_path: Path to DuckDB database
             api_key: Anthropic API key (or use ANTHROPIC_API_KEY env var)
             verbose: Enable verbose output
+            provider: Translation provider name (see nl_translation.py)
+            guard: Execution limits for generated SQL (see sql_guard.py)
         """
         self.db_path = db_path
         self.verbose = verbose
         self.conn = duckdb.connect(db_path, read_only=True)
 
-        # Initialize Anthropic client
-        api_key = api_key or os.environ.get("ANTHROPIC_API_KEY")
-        if not api_key:
-            raise ValueError(
-                "Anthropic API key required. Set ANTHROPIC_API_KEY environment variable "
-                "or pass --api-key parameter."
-            )
-        self.client = Anthropic(api_key=api_key)
+        self.provider = get_provider(provider, api_key, max_tokens=1024)
+        self.sql_cache = SQLCache()
+        self.guard = guard or QueryGuard()
+        self.guard.configure(self.conn)
+        # Profiles each query (printed when verbose) and logs slow ones
+        self.runner = QueryRunner(self.conn, db_path, tool="nl_sql_query", show=verbose)
 
         # Cache schema information
         self._schema_cache = None
+        self._prompt_context = None
+        self._search_index = None
+
+    def get_prompt_context(self):
+        """Cached store description (see prompt_context.py)."""
+        if self._prompt_context is None:
+            self._prompt_context = load_prompt_context(self.conn, self.db_path)
+        return self._prompt_context
 
     def get_database_schema(self) -> Dict[str, Any]:
-        """Get database schema information (tables, columns, types)."""
+        """
+        Get database schema information (tables, columns, types).
+
+        Row counts are DuckDB's metadata estimates, not COUNT(*) scans.
+        """
         if self._schema_cache:
             return self._schema_cache
 
+        context = self.get_prompt_context()
         schema = {
-            'tables': {},
-            'table_counts': {}
+            'tables': {table: {'columns': info['columns']} for table, info in context.tables.items()},
+            'table_counts': {table: info['estimated_rows'] for table, info in context.tables.items()},
         }
 
-        # Get all tables
-        tables_result = self.conn.execute("""
-            SELECT table_name
-            FROM information_schema.tables
-            WHERE table_schema = 'main'
-            ORDER BY table_name
-        """).fetchall()
-
-        for (table_name,) in tables_result:
-            # Get column information
-            columns_result = self.conn.execute(f"""
-                SELECT column_name, data_type
-                FROM information_schema.columns
-                WHERE table_name = '{table_name}'
-                ORDER BY ordinal_position
-            """).fetchall()
-
-            schema['tables'][table_name] = {
-                'columns': [
-                    {'name': col, 'type': dtype}
-                    for col, dtype in columns_result
-                ]
-            }
-
-            # Get row count
-            try:
-                count = self.conn.execute(f"SELECT COUNT(*) FROM {table_name}").fetchone()[0]
-                schema['table_counts'][table_name] = count
-            except:
-                schema['table_counts'][table_name] = 0
-
         self._schema_cache = schema
         return schema
 
-    def format_schema_for_prompt(self, schema: Dict[str, Any]) -> str:
-        """Format schema information for the Claude prompt."""
+    def format_schema_for_prompt(self, schema: Dict[str, Any], tables: Optional[List[str]] = None) -> str:
+        """
+        Format schema information for the Claude prompt.
+
+        Args:
+            schema: Result of get_database_schema()
+            tables: Only describe these tables (default: all)
+        """
         lines = ["Available tables and their structure:\n"]
 
         for table_name, table_info in sorted(schema['tables'].items()):
+            if tables is not None and table_name not in tables:
+                continue
             count = schema['table_counts'].get(table_name, 0)
-            lines.append(f"\n{table_name} ({count:,} rows):")
+            lines.append(f"\n{table_name} (~{count:,} rows):")
 
             for col in table_info['columns']:
                 lines.append(f"  - {col['name']}: {col['type']}")
 
         return "\n".join(lines)
 
+    def get_value_hits(self, natural_query: str) -> list:
+        """
+        Stored ontology terms and entity names matching words of the question.
+
+        Uses the store's search index (built by the loader); returns [] when
+        the store has no current index.
+        """
+        if self._search_index is None:
+            self._search_index = load_search_index(self.db_path) or False
+        if not self._search_index:
+            return []
+        return search_hint_hits(self._search_index, natural_query)
+
+    def get_value_hints(self, natural_query: str) -> str:
+        """Prompt lines for get_value_hits() ('' if none)."""
+        return format_hint_lines(self.get_value_hits(natural_query))
+
     def translate_to_sql(self, natural_query: str) -> str:
         """
-        Translate natural language query to SQL using Claude API.
+        Translate natural language query to SQL using the translation provider.
 
         Args:
             natural_query: User's natural language question
@@ -131,7 +154,16 @@ class NaturalLanguageSQLQuery:
             SQL query string
         """
         schema = self.get_database_schema()
-        schema_text = self.format_schema_for_prompt(schema)
+        hits = self.get_value_hits(natural_query)
+        tables = self.get_prompt_context().relevant_tables(natural_query, [h.source for h in hits])
+        if self.verbose:
+            print(f"Describing {len(tables)} of {len(schema['tables'])} tables", file=sys.stderr)
+        schema_text = self.format_schema_for_prompt(schema, tables)
+        hints = format_hint_lines(hits)
+        hints_text = (
+            "Stored values matching the question (use these exact labels/IDs in filters):\n"
+            f"{hints}\n\n" if hints else ""
+        )
 
         prompt = f"""You are a SQL expert. Convert the following natural language query into a valid DuckDB SQL query.
 
@@ -146,34 +178,14 @@ Important notes:
 - For CDM tables: sdt_* = static data tables, sys_* = system tables, ddt_* = dynamic brick tables
 - Common foreign key patterns: sample_id, location_id, reads_id, assembly_id, etc.
 
-Natural language query: {natural_query}
+{hints_text}Natural language query: {natural_query}
 
 SQL query:"""
 
         if self.verbose:
-            print(f"Sending prompt to Claude API...", file=sys.stderr)
-
-        try:
-            response = self.client.messages.create(
-                model="claude-sonnet-4-20250514",
-                max_tokens=1024,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
-            )
-
-            sql_query = response.content[0].text.strip()
+            print(f"Sending prompt to {self.provider.name} provider...", file=sys.stderr)
 
-            # Remove markdown code blocks if present
-            if sql_query.startswith("```"):
-                lines = sql_query.split("\n")
-                sql_query = "\n".join(lines[1:-1]) if len(lines) > 2 else sql_query
-                sql_query = sql_query.replace("```sql", "").replace("```", "").strip()
-
-            return sql_query
-
-        except Exception as e:
-            raise RuntimeError(f"Failed to translate query: {e}")
+        return self.provider.translate(natural_query, prompt, self.get_prompt_context())
 
     def execute_sql(self, sql_query: str) -> List[Dict[str, Any]]:
         """
@@ -183,18 +195,21 @@ SQL query:"""
             sql_query: SQL query string
 
         Returns:
-            List of result rows as dictionaries
+            List of result rows as dictionaries (at most guard.max_rows)
         """
-        try:
-            result = self.conn.execute(sql_query).fetchall()
-            columns = [desc[0] for desc in self.conn.description]
+        return self.run_guarded(sql_query).rows
+
+    def run_guarded(self, sql_query: str) -> GuardedResult:
+        """
+        Execute SQL through the execution guard (plan check, LIMIT, timeout).
+
+        Args:
+            sql_query: SQL query string
 
-            return [
-                dict(zip(columns, row))
-                for row in result
-            ]
-        except Exception as e:
-            raise RuntimeError(f"SQL execution failed: {e}\nQuery: {sql_query}")
+        Returns:
+            GuardedResult
+        """
+        return run_guarded(self.guard, self.conn, sql_query, runner=self.runner, verbose=self.verbose)
 
     def query(self, natural_query: str) -> Dict[str, Any]:
         """
@@ -209,24 +224,16 @@ SQL query:"""
         if self.verbose:
             print(f"\n🤔 Natural language query: {natural_query}", file=sys.stderr)
 
-        # Translate to SQL
-        sql_query = self.translate_to_sql(natural_query)
-
-        if self.verbose:
-            print(f"\n📝 Generated SQL:\n{sql_query}\n", file=sys.stderr)
-
-        # Execute SQL
-        results = self.execute_sql(sql_query)
-
-        if self.verbose:
-            print(f"✅ Query returned {len(results)} rows\n", file=sys.stderr)
-
-        return {
-            'natural_query': natural_query,
-            'sql_query': sql_query,
-            'result_count': len(results),
-            'results': results
-        }
+        # Reuse SQL that already ran for this question against the same tables
+        return answer_nl_query(
+            natural_query,
+            self.get_prompt_context().fingerprint(),
+            self.sql_cache,
+            self.translate_to_sql,
+            self.run_guarded,
+            self.provider.name,
+            verbose=self.verbose,
+        )
 
     def close(self):
         """Close database connection."""
@@ -240,7 +247,10 @@ def format_results_text(query_result: Dict[str, Any]) -> str:
 
     lines.append(f"Natural Query: {query_result['natural_query']}")
     lines.append(f"\nGenerated SQL:\n{query_result['sql_query']}")
-    lines.append(f"\nResults ({query_result['result_count']} rows):")
+    truncated = " - truncated, refine the query for more" if query_result.get('truncated') else ""
+    lines.append(f"\nResults ({query_result['result_count']} rows{truncated}):")
+    for note in query_result.get('notes', []):
+        lines.append(f"  ℹ️  {note}")
 
     if not query_result['results']:
         lines.append("  (no results)")
@@ -308,6 +318,12 @@ Examples:
         help='Anthropic API key (or set ANTHROPIC_API_KEY env var)'
     )
 
+    parser.add_argument(
+        '--provider',
+        choices=PROVIDERS,
+        help='Translation provider (default: CDM_NL_PROVIDER or anthropic)'
+    )
+
     parser.add_argument(
         '--json',
         action='store_true',
@@ -334,7 +350,8 @@ Examples:
         nl_sql = NaturalLanguageSQLQuery(
             db_path=args.db,
             api_key=args.api_key,
-            verbose=args.verbose
+            verbose=args.verbose,
+            provider=args.provider
         )
 
         # Execute query
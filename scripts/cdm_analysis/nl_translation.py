@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+"""
+Translation providers and generated-SQL cache for the NL query tools.
+
+``NaturalLanguageSQLQuery``, ``SchemaAwareQuery`` and ``UnifiedCDMQuery``
+turn a question into SQL through a ``TranslationProvider``:
+
+- ``anthropic``: sends the tool's prompt to the Claude API (the default)
+- ``template``: deterministic, offline rules for the canned questions
+  listed by ``schema_aware_query.py --suggest-queries`` ("Count Sample
+  records", "Find Sample records with their Location information") plus
+  "how many ..." / "list ..." variants. Useful for tests and benchmarks.
+
+Select one with ``--provider`` or ``CDM_NL_PROVIDER``.
+
+SQL that executed successfully is saved under ``~/.cache/linkml-coral/sql``,
+keyed by the normalized question and the fingerprint of the tables/schema
+described to the provider (``PromptContext.fingerprint()``), so asking the
+same question again skips translation. Entries record how often they were
+reused.
+
+Usage:
+    # Show cached questions and their hit counts / clear the cache
+    python nl_translation.py stats
+    python nl_translation.py clear
+
+Set ``CDM_SQL_CACHE=off`` to disable the cache, or ``CDM_SQL_CACHE_DIR``
+to move it.
+"""
+
+import hashlib
+import json
+import os
+import re
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from prompt_context import TABLE_PREFIXES, _referenced_table, _words
+
+DEFAULT_MODEL = "claude-sonnet-4-20250514"
+PROVIDER_ENV = "CDM_NL_PROVIDER"
+PROVIDERS = ("anthropic", "template")
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "linkml-coral" / "sql"
+CACHE_DIR_ENV = "CDM_SQL_CACHE_DIR"
+DISABLE_ENV = "CDM_SQL_CACHE"
+
+
+class TranslationError(RuntimeError):
+    """A provider could not translate a question."""
+
+
+def normalize_question(question: str) -> str:
+    """Lowercase, collapse whitespace and drop trailing punctuation."""
+    return re.sub(r"\s+", " ", question.strip().lower()).rstrip("?.!; ")
+
+
+def strip_sql_fences(text: str) -> str:
+    """Remove markdown code fences around generated SQL."""
+    sql_query = text.strip()
+    if sql_query.startswith("```"):
+        lines = sql_query.split("\n")
+        sql_query = "\n".join(lines[1:-1]) if len(lines) > 2 else sql_query
+        sql_query = sql_query.replace("```sql", "").replace("```", "").strip()
+    return sql_query
+
+
+class TranslationProvider:
+    """Turns a question (and the tool's prompt) into SQL."""
+
+    name = "base"
+
+    def translate(self, question: str, prompt: str, context) -> str:
+        """
+        Translate a question to SQL.
+
+        Args:
+            question: Natural-language question
+            prompt: Full prompt built by the query tool
+            context: PromptContext of the store
+
+        Returns:
+            SQL query string
+        """
+        raise NotImplementedError
+
+
+class AnthropicProvider(TranslationProvider):
+    """Claude API translation."""
+
+    name = "anthropic"
+
+    def __init__(self, api_key: Optional[str] = None, model: str = DEFAULT_MODEL, max_tokens: int = 1024):
+        """
+        Initialize the Claude client.
+
+        Args:
+            api_key: Anthropic API key (or use ANTHROPIC_API_KEY env var)
+            model: Model name
+            max_tokens: Response token limit
+        """
+        try:
+            from anthropic import Anthropic
+        except ImportError:
+            raise RuntimeError("anthropic package not installed. Install it with: uv add anthropic")
+
+        api_key = api_key or os.environ.get("ANTHROPIC_API_KEY")
+        if not api_key:
+            raise ValueError(
+                "Anthropic API key required. Set ANTHROPIC_API_KEY environment variable "
+                "or pass --api-key parameter."
+            )
+        self.client = Anthropic(api_key=api_key)
+        self.model = model
+        self.max_tokens = max_tokens
+
+    def translate(self, question: str, prompt: str, context) -> str:
+        try:
+            response = self.client.messages.create(
+                model=self.model,
+                max_tokens=self.max_tokens,
+                messages=[
+                    {"role": "user", "content": prompt}
+                ]
+            )
+            return strip_sql_fences(response.content[0].text)
+        except Exception as e:
+            raise TranslationError(f"Failed to translate query: {e}")
+
+
+class TemplateProvider(TranslationProvider):
+    """Rule-based translation of the suggested (count / list / join) questions."""
+
+    name = "template"
+
+    COUNT = re.compile(r"^(?:count(?: the)?(?: number of)?|how many) (?P<x>.+?)(?: records)?(?: are there)?$")
+    JOIN = re.compile(r"^(?:find|list|show)(?: me)?(?: all)? (?P<x>.+?)(?: records)? "
+                      r"with their (?P<y>.+?)(?: information)?$")
+    LIST = re.compile(r"^(?:list|show)(?: me)?(?: all)?(?: the)? (?P<x>.+?)(?: records)?$")
+
+    def translate(self, question: str, prompt: str, context) -> str:
+        text = normalize_question(question)
+
+        match = self.COUNT.match(text)
+        if match:
+            table = self.resolve_table(match['x'], context)
+            return f"SELECT COUNT(*) AS count FROM {table}"
+
+        match = self.JOIN.match(text)
+        if match:
+            left = self.resolve_table(match['x'], context)
+            right = self.resolve_table(match['y'], context)
+            left_column, right_column = self.join_columns(left, right, context)
+            # Self references (parent strain) need an alias for the second copy
+            alias = f"{right}_ref" if right == left else right
+            right_select = f"{alias}.*"
+            if left_column == right_column:
+                right_select += f" EXCLUDE ({right_column})"
+            join = f"{right} AS {alias}" if alias != right else right
+            return (f"SELECT {left}.*, {right_select}\nFROM {left}\n"
+                    f"JOIN {join} ON {left}.{left_column} = {alias}.{right_column}\nLIMIT 100")
+
+        match = self.LIST.match(text)
+        if match:
+            table = self.resolve_table(match['x'], context)
+            return f"SELECT * FROM {table} LIMIT 100"
+
+        raise TranslationError(f"No template matches the question: {question}")
+
+    @staticmethod
+    def resolve_table(phrase: str, context) -> str:
+        """Table for a class name ('Sample') or entity words ('samples')."""
+        if context.schema:
+            for class_name, class_info in context.schema['classes'].items():
+                if class_name.lower() == phrase.replace(" ", "") and class_info.get('table'):
+                    return class_info['table']
+        words = _words(phrase)
+        numbers = re.findall(r"\d+", phrase)
+        for table in sorted(context.tables, key=lambda t: (t.startswith("ddt_"), t)):
+            if (words and words == {w for w in _words(table) if w not in TABLE_PREFIXES}
+                    and all(n in table for n in numbers)):
+                return table
+        raise TranslationError(f"No table found for '{phrase}'")
+
+    @staticmethod
+    def join_columns(left: str, right: str, context):
+        """Columns joining two tables by CDM reference naming (either direction)."""
+        for source, target, flip in ((left, right, False), (right, left, True)):
+            target_columns = {c['name'] for c in context.tables[target]['columns']}
+            for column in context.tables[source]['columns']:
+                name = column['name']
+                if _referenced_table(name) != target:
+                    continue
+                key = target + ("_id" if name.endswith("_id") else "_name")
+                if key in target_columns and (key, source) != (name, target):
+                    return (key, name) if flip else (name, key)
+        raise TranslationError(f"No reference column joins {left} and {right}")
+
+
+def get_provider(
+    name: Optional[str] = None,
+    api_key: Optional[str] = None,
+    max_tokens: int = 1024
+) -> TranslationProvider:
+    """
+    Create a translation provider.
+
+    Args:
+        name: 'anthropic' or 'template' (default: CDM_NL_PROVIDER, else 'anthropic')
+        api_key: Anthropic API key
+        max_tokens: Response token limit for the API provider
+
+    Returns:
+        TranslationProvider
+    """
+    name = name or os.environ.get(PROVIDER_ENV) or "anthropic"
+    if name == "anthropic":
+        return AnthropicProvider(api_key=api_key, max_tokens=max_tokens)
+    if name == "template":
+        return TemplateProvider()
+    raise ValueError(f"Unknown translation provider: {name} (choose from {', '.join(PROVIDERS)})")
+
+
+@dataclass
+class SQLCache:
+    """Validated SQL keyed by normalized question and store/schema fingerprint."""
+
+    cache_dir: Path = field(default_factory=lambda: Path(os.environ.get(CACHE_DIR_ENV, DEFAULT_CACHE_DIR)))
+    enabled: bool = field(default_factory=lambda: os.environ.get(DISABLE_ENV, "").lower()
+                          not in ("0", "off", "false", "no"))
+    hits: int = 0
+    misses: int = 0
+
+    def __post_init__(self):
+        self.cache_dir = Path(self.cache_dir)
+
+    def make_key(self, question: str, fingerprint: str) -> str:
+        """Cache key for a question and a context fingerprint."""
+        raw = f"{normalize_question(question)}|{fingerprint}"
+        return hashlib.sha256(raw.encode()).hexdigest()[:32]
+
+    def get(self, question: str, fingerprint: str) -> Optional[str]:
+        """
+        Look up SQL for a question.
+
+        Args:
+            question: Natural-language question
+            fingerprint: PromptContext fingerprint
+
+        Returns:
+            SQL on a hit, None on a miss (or when caching is disabled)
+        """
+        if not self.enabled:
+            return None
+        path = self.cache_dir / f"{self.make_key(question, fingerprint)}.json"
+        try:
+            with open(path) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        entry['hits'] = entry.get('hits', 0) + 1
+        entry['last_hit'] = time.time()
+        self._write(path, entry)
+        return entry['sql']
+
+    def put(self, question: str, fingerprint: str, sql: str, provider: str) -> None:
+        """
+        Save SQL that executed successfully.
+
+        Args:
+            question: Natural-language question
+            fingerprint: PromptContext fingerprint
+            sql: Validated SQL
+            provider: Name of the provider that produced it
+        """
+        if not self.enabled:
+            return
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        entry = {
+            'question': normalize_question(question),
+            'fingerprint': fingerprint,
+            'sql': sql,
+            'provider': provider,
+            'created': time.time(),
+            'hits': 0,
+            'last_hit': None,
+        }
+        self._write(self.cache_dir / f"{self.make_key(question, fingerprint)}.json", entry)
+
+    def discard(self, question: str, fingerprint: str) -> None:
+        """Remove a question's entry (e.g. its SQL stopped working)."""
+        (self.cache_dir / f"{self.make_key(question, fingerprint)}.json").unlink(missing_ok=True)
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """All entries, most reused first."""
+        entries = []
+        if not self.cache_dir.exists():
+            return entries
+        for path in self.cache_dir.glob("*.json"):
+            try:
+                with open(path) as f:
+                    entry = json.load(f)
+            except (OSError, ValueError):
+                continue
+            entry['path'] = path
+            entries.append(entry)
+        entries.sort(key=lambda e: (-e.get('hits', 0), e.get('question', '')))
+        return entries
+
+    def clear(self) -> int:
+        """Remove every entry."""
+        entries = self.entries()
+        for entry in entries:
+            entry['path'].unlink(missing_ok=True)
+        return len(entries)
+
+    def _write(self, path: Path, entry: Dict[str, Any]) -> None:
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, path)
+        except OSError:
+            tmp_path.unlink(missing_ok=True)
+
+
+def main():
+    """Inspect or clear the generated-SQL cache."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='CDM natural-language query SQL cache')
+    parser.add_argument('command', choices=['stats', 'clear'], help='Action to perform')
+    parser.add_argument('--cache-dir', help=f'Cache directory (default: {DEFAULT_CACHE_DIR})')
+    args = parser.parse_args()
+
+    cache = SQLCache(cache_dir=Path(args.cache_dir)) if args.cache_dir else SQLCache()
+
+    if args.command == 'clear':
+        print(f"🗑️  Removed {cache.clear()} cached queries from {cache.cache_dir}")
+        return 0
+
+    entries = cache.entries()
+    total_hits = sum(e.get('hits', 0) for e in entries)
+    print(f"\n📦 SQL cache: {cache.cache_dir}")
+    print(f"   Questions: {len(entries)}  Reuses: {total_hits}\n")
+    for entry in entries:
+        print(f"  {entry.get('hits', 0):>5} hits  {entry.get('provider', '?'):<10} {entry['question']}")
+    return 0
+
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(main())
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Ontology closure table for subsumption queries over CDM ontology terms.
+
+The loader materializes ``sys_oterm_closure(ancestor_id, descendant_id,
+distance)`` from the ``parent_sys_oterm_id`` links in ``sys_oterm`` and,
+optionally, the is_a edges of an OBO file (e.g.
+``context_measurement_ontology.obo``). Every term also has a row pointing at
+itself with distance 0, so "X or any subtype of X" is a single indexed
+semi-join:
+
+    SELECT * FROM sdt_sample
+    WHERE material_sys_oterm_id IN (
+        SELECT descendant_id FROM sys_oterm_closure WHERE ancestor_id = 'ENVO:00002007'
+    )
+
+``descendant_of_sql()`` builds that filter for any ``*_sys_oterm_id`` column.
+"""
+
+import sys
+from collections import deque
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+CLOSURE_TABLE = "sys_oterm_closure"
+OTERM_TABLE = "sys_oterm"
+
+
+def _quote_literal(value: str) -> str:
+    escaped = str(value).replace("'", "''")
+    return f"'{escaped}'"
+
+
+def _quote_ident(name: str) -> str:
+    escaped = name.replace('"', '""')
+    return f'"{escaped}"'
+
+
+def _table_columns(conn, table_name: str) -> List[str]:
+    rows = conn.execute(
+        "SELECT column_name FROM information_schema.columns WHERE table_name = ?",
+        [table_name]
+    ).fetchall()
+    return [r[0] for r in rows]
+
+
+def sys_oterm_edges(conn) -> List[Tuple[str, str]]:
+    """
+    Read (child, parent) edges from the sys_oterm table.
+
+    Args:
+        conn: DuckDB connection
+
+    Returns:
+        List of (term_id, parent_term_id) pairs (empty if sys_oterm is missing)
+    """
+    columns = _table_columns(conn, OTERM_TABLE)
+    if "sys_oterm_id" not in columns:
+        return []
+    if "parent_sys_oterm_id" not in columns:
+        rows = conn.execute(f"SELECT DISTINCT sys_oterm_id FROM {OTERM_TABLE} "
+                            f"WHERE sys_oterm_id IS NOT NULL").fetchall()
+        return [(r[0], None) for r in rows]
+    rows = conn.execute(
+        f"SELECT DISTINCT CAST(sys_oterm_id AS VARCHAR), CAST(parent_sys_oterm_id AS VARCHAR) "
+        f"FROM {OTERM_TABLE} WHERE sys_oterm_id IS NOT NULL"
+    ).fetchall()
+    return [(child, parent) for child, parent in rows]
+
+
+def obo_edges(obo_path: Path) -> List[Tuple[str, str]]:
+    """
+    Read (child, parent) is_a edges from an OBO file.
+
+    Args:
+        obo_path: Path to the OBO file
+
+    Returns:
+        List of (term_id, parent_term_id) pairs; root terms have parent None
+    """
+    try:
+        from linkml_coral.utils.obo_parser import OBOParser
+    except ImportError:
+        sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+        from linkml_coral.utils.obo_parser import OBOParser
+
+    parser = OBOParser(str(obo_path), use_cache=True)
+    parser.parse()
+    edges = []
+    for term_id in parser.terms:
+        parents = parser.parents(term_id)
+        edges.extend((term_id, parent_id) for parent_id in parents)
+        if not parents:
+            edges.append((term_id, None))
+    return edges
+
+
+def compute_closure(edges: Iterable[Tuple[str, Optional[str]]]) -> List[Tuple[str, str, int]]:
+    """
+    Compute the reflexive-transitive closure of a parent graph.
+
+    Args:
+        edges: (term_id, parent_term_id) pairs; parent None marks a root
+
+    Returns:
+        (ancestor_id, descendant_id, distance) rows, distance being the
+        shortest number of is_a steps (0 for the term itself)
+    """
+    parents: Dict[str, Set[str]] = {}
+    for child, parent in edges:
+        parents.setdefault(child, set())
+        if parent is not None and parent != child:
+            parents[child].add(parent)
+            parents.setdefault(parent, set())
+
+    rows = []
+    for term_id in parents:
+        distances = {term_id: 0}
+        queue = deque([term_id])
+        while queue:
+            node = queue.popleft()
+            for parent in parents[node]:
+                if parent not in distances:
+                    distances[parent] = distances[node] + 1
+                    queue.append(parent)
+        rows.extend((ancestor, term_id, distance) for ancestor, distance in distances.items())
+    return rows
+
+
+def build_closure_table(conn, obo_path: Optional[Path] = None, verbose: bool = False) -> int:
+    """
+    (Re)create sys_oterm_closure with indexes on both term columns.
+
+    Args:
+        conn: DuckDB connection to the CDM store
+        obo_path: Optional OBO file whose is_a edges are merged in
+        verbose: Print detailed progress
+
+    Returns:
+        Number of closure rows (0 if there were no terms to index)
+    """
+    edges = sys_oterm_edges(conn)
+    if obo_path:
+        obo = obo_edges(Path(obo_path))
+        if verbose:
+            print(f"  📖 {len(obo):,} is_a edges from {Path(obo_path).name}")
+        edges.extend(obo)
+    if not edges:
+        return 0
+
+    rows = compute_closure(edges)
+
+    import pyarrow as pa
+    closure = pa.table({
+        "ancestor_id": [r[0] for r in rows],
+        "descendant_id": [r[1] for r in rows],
+        "distance": pa.array([r[2] for r in rows], type=pa.int32()),
+    })
+    conn.register("_oterm_closure_rows", closure)
+    try:
+        conn.execute(f"DROP TABLE IF EXISTS {CLOSURE_TABLE}")
+        conn.execute(f"""
+            CREATE TABLE {CLOSURE_TABLE} AS
+            SELECT ancestor_id, descendant_id, distance
+            FROM _oterm_closure_rows
+            ORDER BY ancestor_id, distance, descendant_id
+        """)
+    finally:
+        conn.unregister("_oterm_closure_rows")
+    conn.execute(f"CREATE INDEX idx_{CLOSURE_TABLE}_ancestor ON {CLOSURE_TABLE} (ancestor_id)")
+    conn.execute(f"CREATE INDEX idx_{CLOSURE_TABLE}_descendant ON {CLOSURE_TABLE} (descendant_id)")
+    return len(rows)
+
+
+def has_closure_table(conn) -> bool:
+    """Check whether the store has a sys_oterm_closure table."""
+    return bool(_table_columns(conn, CLOSURE_TABLE))
+
+
+def descendant_of_sql(column: str, ancestor_id: str, include_self: bool = True) -> str:
+    """
+    SQL filter: ``column`` is the term ``ancestor_id`` or one of its subtypes.
+
+    Args:
+        column: A ``*_sys_oterm_id`` column of the queried table
+        ancestor_id: Ontology term ID (e.g., 'ENVO:00002007')
+        include_self: Also match the ancestor term itself
+
+    Returns:
+        SQL boolean expression usable in a WHERE clause
+    """
+    distance = "" if include_self else " AND distance > 0"
+    return (f"{_quote_ident(column)} IN (SELECT descendant_id FROM {CLOSURE_TABLE} "
+            f"WHERE ancestor_id = {_quote_literal(ancestor_id)}{distance})")
+
+
+def parse_descendant_filter(spec: str) -> Tuple[str, str]:
+    """
+    Parse a ``COLUMN=TERM_ID`` command-line filter.
+
+    Args:
+        spec: e.g. 'material_sys_oterm_id=ENVO:00002007'
+
+    Returns:
+        (column, term_id)
+    """
+    column, sep, term_id = spec.partition("=")
+    if not sep or not column.strip() or not term_id.strip():
+        raise ValueError(f"Expected COLUMN=TERM_ID, got '{spec}'")
+    return column.strip(), term_id.strip()
@@ -0,0 +1,457 @@
+#!/usr/bin/env python3
+"""
+Shared parquet footer scanner for the CDM analysis and catalog tools.
+
+``extract_cdm_metadata``, ``analyze_parquet_metadata``, ``analyze_cdm_parquet``,
+``generate_cdm_schema_report`` and ``create_metadata_catalog`` all need the
+same facts about the 44 CDM tables: row counts, columns and types, Spark field
+metadata (descriptions, microtypes, units, keys) and column statistics. Each
+used to open the footers (and often the data) itself, one file at a time and
+usually only the first file of a table. This module reads them once:
+
+- footers only: no column data is decoded
+- every file of every table, read concurrently with a thread pool
+- per table, Spark field metadata is merged across files (a column missing
+  from the first file still gets its description) and row-group statistics
+  are merged into per-column null counts, min/max and sizes
+- results are cached as JSON under ``~/.cache/linkml-coral/footers``, one file
+  per CDM directory, keyed by each parquet file's size and mtime, so a rerun
+  only reads new or changed files
+
+Usage:
+    from parquet_footers import scan_cdm_footers
+
+    footers = scan_cdm_footers(Path("data/enigma_coral.db"))
+    footers["sdt_sample"]["total_rows"]
+    footers["sdt_sample"]["columns"]["depth_meter"]["null_count"]
+
+    # Print a summary of every table
+    python parquet_footers.py data/enigma_coral.db
+
+Set ``CDM_FOOTER_CACHE=off`` to rescan on every run, or
+``CDM_FOOTER_CACHE_DIR`` to move the cache.
+"""
+
+import argparse
+import datetime
+import decimal
+import hashlib
+import json
+import math
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:
+    print("Error: pyarrow not installed. Run: uv pip install pyarrow")
+    sys.exit(1)
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "linkml-coral" / "footers"
+CACHE_DIR_ENV = "CDM_FOOTER_CACHE_DIR"
+DISABLE_ENV = "CDM_FOOTER_CACHE"
+
+FOOTER_VERSION = 1
+# Footer reads wait on the file system, so use more threads than CPUs
+DEFAULT_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+SPARK_METADATA_KEY = b'org.apache.spark.sql.parquet.row.metadata'
+TABLE_PREFIXES = {'static': 'sdt_', 'system': 'sys_', 'dynamic': 'ddt_'}
+
+
+def _cache_enabled() -> bool:
+    return os.environ.get(DISABLE_ENV, "").lower() not in ("0", "off", "false", "no")
+
+
+def get_footer_cache_path(cdm_db_path: Path) -> Path:
+    """Cache file for a CDM directory's footers."""
+    cache_dir = Path(os.environ.get(CACHE_DIR_ENV, DEFAULT_CACHE_DIR))
+    db_key = hashlib.sha256(str(Path(cdm_db_path).resolve()).encode()).hexdigest()[:16]
+    return cache_dir / f"{Path(cdm_db_path).stem}-{db_key}.json"
+
+
+def table_dirs(cdm_db_path: Path, category: str = 'all', table: Optional[str] = None) -> List[Path]:
+    """
+    CDM table directories, optionally limited to a category or one table.
+
+    Args:
+        cdm_db_path: CDM database directory (e.g. data/enigma_coral.db)
+        category: 'static', 'system', 'dynamic' or 'all'
+        table: Only this table
+
+    Returns:
+        Sorted table directories
+    """
+    prefixes = tuple(TABLE_PREFIXES.values()) if category == 'all' else (TABLE_PREFIXES[category],)
+    return [
+        d for d in sorted(Path(cdm_db_path).iterdir())
+        if d.is_dir() and d.name.startswith(prefixes) and (table is None or d.name == table)
+    ]
+
+
+def table_category(table_name: str) -> Optional[str]:
+    """'static', 'system' or 'dynamic' from the table name prefix."""
+    for category, prefix in TABLE_PREFIXES.items():
+        if table_name.startswith(prefix):
+            return category
+    return None
+
+
+def parquet_files(table_dir: Path) -> List[Path]:
+    """Data files of a (Delta Lake) table directory, skipping _delta_log."""
+    return sorted(f for f in table_dir.glob("*.parquet") if not f.parent.name.startswith('_'))
+
+
+def _json_value(value: Any) -> Any:
+    """Statistics value as something JSON can hold."""
+    if isinstance(value, bytes):
+        return value.decode('utf-8', errors='replace')
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+def _merge_bound(current: Any, value: Any, pick) -> Any:
+    if current is None:
+        return value
+    if value is None:
+        return current
+    try:
+        return pick(current, value)
+    except TypeError:
+        return current
+
+
+def read_footer(path: Path) -> Dict[str, Any]:
+    """
+    Read one parquet file's footer.
+
+    Args:
+        path: Parquet file
+
+    Returns:
+        Dict with row and row group counts, key/value metadata (Spark row
+        metadata parsed), and per-column type, field metadata and statistics
+    """
+    stat = path.stat()
+    parquet_file = pq.ParquetFile(path)
+    metadata = parquet_file.metadata
+    schema = parquet_file.schema_arrow
+
+    key_value = dict(metadata.metadata or {})
+    spark_json = key_value.pop(SPARK_METADATA_KEY, None)
+    table_metadata = {
+        k.decode('utf-8'): v.decode('utf-8', errors='replace')
+        for k, v in key_value.items()
+        if not k.startswith(b'ARROW:')  # serialized Arrow schema, already in 'columns'
+    }
+
+    columns = {}
+    for field in schema:
+        columns[field.name] = {
+            'type': str(field.type),
+            'nullable': field.nullable,
+            'metadata': {
+                k.decode('utf-8'): v.decode('utf-8', errors='replace')
+                for k, v in (field.metadata or {}).items()
+            },
+            'null_count': 0,
+            'min': None,
+            'max': None,
+            'stats_complete': True,
+            'compressed_bytes': 0,
+            'uncompressed_bytes': 0,
+        }
+
+    for i in range(metadata.num_row_groups):
+        row_group = metadata.row_group(i)
+        for j in range(row_group.num_columns):
+            chunk = row_group.column(j)
+            path_parts = chunk.path_in_schema.split('.')
+            column = columns.get(path_parts[0])
+            if column is None:
+                continue
+            column['compressed_bytes'] += chunk.total_compressed_size
+            column['uncompressed_bytes'] += chunk.total_uncompressed_size
+            if len(path_parts) > 1:
+                # Leaf statistics of list/struct columns do not describe the column
+                column['stats_complete'] = False
+                continue
+            stats = chunk.statistics
+            if stats is None or not stats.has_null_count:
+                column['stats_complete'] = False
+            else:
+                column['null_count'] += stats.null_count
+            if stats is not None and stats.has_min_max:
+                column['min'] = _merge_bound(column['min'], stats.min, min)
+                column['max'] = _merge_bound(column['max'], stats.max, max)
+            elif stats is None or stats.null_count != row_group.num_rows:
+                column['stats_complete'] = False
+
+    for column in columns.values():
+        if not column['stats_complete']:
+            column['null_count'] = None
+        column['min'] = _json_value(column['min'])
+        column['max'] = _json_value(column['max'])
+
+    return {
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'num_rows': metadata.num_rows,
+        'num_row_groups': metadata.num_row_groups,
+        'created_by': metadata.created_by,
+        'spark_metadata': json.loads(spark_json.decode('utf-8')) if spark_json else None,
+        'table_metadata': table_metadata,
+        'columns': columns,
+    }
+
+
+def merge_spark_metadata(file_footers: Iterable[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    Union the Spark row metadata of a table's files.
+
+    Fields keep the order they are first seen in; metadata keys a file lacks
+    are filled in from later files.
+
+    Args:
+        file_footers: Footers from read_footer
+
+    Returns:
+        Spark struct metadata ({'type': 'struct', 'fields': [...]}) or None
+    """
+    fields: Dict[str, Dict[str, Any]] = {}
+    found = False
+    for footer in file_footers:
+        spark = footer.get('spark_metadata')
+        if not spark:
+            continue
+        found = True
+        for field in spark.get('fields', []):
+            merged = fields.setdefault(field['name'], {**field, 'metadata': dict(field.get('metadata', {}))})
+            for key, value in field.get('metadata', {}).items():
+                merged['metadata'].setdefault(key, value)
+    if not found:
+        return None
+    return {'type': 'struct', 'fields': list(fields.values())}
+
+
+def merge_table_footers(table_name: str, file_footers: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Combine the footers of a table's files into table-level metadata.
+
+    Args:
+        table_name: CDM table name
+        file_footers: Footers from read_footer, in file order
+
+    Returns:
+        Dict with row/file/byte totals, merged Spark metadata, the first
+        file's key/value metadata and per-column merged statistics
+    """
+    columns: Dict[str, Dict[str, Any]] = {}
+    signatures = set()
+    for footer in file_footers:
+        signatures.add(tuple((name, col['type']) for name, col in footer['columns'].items()))
+        for name, col in footer['columns'].items():
+            merged = columns.get(name)
+            if merged is None:
+                columns[name] = {**col, 'metadata': dict(col['metadata']), 'num_files': 1}
+                continue
+            merged['num_files'] += 1
+            merged['nullable'] = merged['nullable'] or col['nullable']
+            for key, value in col['metadata'].items():
+                merged['metadata'].setdefault(key, value)
+            if merged['null_count'] is None or col['null_count'] is None:
+                merged['null_count'] = None
+            else:
+                merged['null_count'] += col['null_count']
+            merged['min'] = _merge_bound(merged['min'], col['min'], min)
+            merged['max'] = _merge_bound(merged['max'], col['max'], max)
+            merged['stats_complete'] = merged['stats_complete'] and col['stats_complete']
+            merged['compressed_bytes'] += col['compressed_bytes']
+            merged['uncompressed_bytes'] += col['uncompressed_bytes']
+
+    total_rows = sum(f['num_rows'] for f in file_footers)
+    for name, column in columns.items():
+        # Rows of files without the column are NULL in a union_by_name read
+        missing_rows = sum(f['num_rows'] for f in file_footers if name not in f['columns'])
+        if missing_rows and column['null_count'] is not None:
+            column['null_count'] += missing_rows
+        column.pop('stats_complete')
+
+    return {
+        'table_name': table_name,
+        'category': table_category(table_name),
+        'num_files': len(file_footers),
+        'total_rows': total_rows,
+        'num_row_groups': sum(f['num_row_groups'] for f in file_footers),
+        'compressed_bytes': sum(f['size'] for f in file_footers),
+        'uncompressed_bytes': sum(c['uncompressed_bytes'] for c in columns.values()),
+        'schema_consistent': len(signatures) <= 1,
+        'spark_metadata': merge_spark_metadata(file_footers),
+        'table_metadata': file_footers[0]['table_metadata'] if file_footers else {},
+        'columns': columns,
+    }
+
+
+def _load_cache(cache_path: Path, cdm_db_path: Path) -> Dict[str, Dict[str, Any]]:
+    if not _cache_enabled() or not cache_path.exists():
+        return {}
+    try:
+        cached = json.loads(cache_path.read_text())
+    except (OSError, json.JSONDecodeError):
+        return {}
+    if cached.get('version') != FOOTER_VERSION or cached.get('database') != str(Path(cdm_db_path).resolve()):
+        return {}
+    return cached.get('files', {})
+
+
+def _save_cache(cache_path: Path, cdm_db_path: Path, files: Dict[str, Dict[str, Any]]) -> None:
+    if not _cache_enabled():
+        return
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps({
+            'version': FOOTER_VERSION,
+            'database': str(Path(cdm_db_path).resolve()),
+            'files': files,
+        }))
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass  # A cache that cannot be written only costs a rescan
+
+
+def scan_cdm_footers(
+    cdm_db_path: Path,
+    tables: Optional[Iterable[str]] = None,
+    workers: Optional[int] = None,
+    use_cache: bool = True,
+    verbose: bool = False,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Read the footers of every parquet file of the CDM tables concurrently.
+
+    Args:
+        cdm_db_path: CDM database directory (e.g. data/enigma_coral.db)
+        tables: Table names to scan (default: all sdt_/sys_/ddt_ tables)
+        workers: Reader threads (default: DEFAULT_WORKERS)
+        use_cache: Reuse footers of files whose size and mtime are unchanged
+        verbose: Print how many files were read and reused
+
+    Returns:
+        Dict mapping table name to merge_table_footers() output; tables
+        without parquet files are omitted
+    """
+    cdm_db_path = Path(cdm_db_path)
+    if tables is None:
+        dirs = table_dirs(cdm_db_path)
+    else:
+        dirs = [cdm_db_path / name for name in tables if (cdm_db_path / name).is_dir()]
+
+    files_by_table = {d.name: parquet_files(d) for d in dirs}
+    cache_path = get_footer_cache_path(cdm_db_path)
+    cached = _load_cache(cache_path, cdm_db_path) if use_cache else {}
+
+    footers: Dict[str, Dict[str, Any]] = {}
+    to_read = []
+    for table_name, paths in files_by_table.items():
+        for path in paths:
+            key = f"{table_name}/{path.name}"
+            entry = cached.get(key)
+            stat = path.stat()
+            if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+                footers[key] = entry
+            else:
+                to_read.append((key, path))
+
+    start = time.time()
+    if to_read:
+        with ThreadPoolExecutor(max_workers=workers or DEFAULT_WORKERS) as pool:
+            for (key, _), footer in zip(to_read, pool.map(lambda item: read_footer(item[1]), to_read)):
+                footers[key] = footer
+        if use_cache:
+            # Keep cached footers of tables outside this scan
+            scanned = set(files_by_table)
+            kept = {k: v for k, v in cached.items() if k.split('/', 1)[0] not in scanned}
+            _save_cache(cache_path, cdm_db_path, {**kept, **footers})
+
+    if verbose:
+        print(f"📑 Footers: {len(to_read)} file(s) read in {time.time() - start:.2f}s, "
+              f"{len(footers) - len(to_read)} from cache ({cache_path})")
+
+    return {
+        table_name: merge_table_footers(table_name, [footers[f"{table_name}/{p.name}"] for p in paths])
+        for table_name, paths in files_by_table.items()
+        if paths
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Scan CDM parquet footers (rows, columns, statistics) concurrently'
+    )
+    parser.add_argument(
+        'cdm_database',
+        type=Path,
+        nargs='?',
+        default=Path('data/enigma_coral.db'),
+        help='Path to CDM database directory (default: data/enigma_coral.db)'
+    )
+    parser.add_argument(
+        '--category',
+        choices=['static', 'system', 'dynamic', 'all'],
+        default='all',
+        help='Which table category to scan (default: all)'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help=f'Reader threads (default: {DEFAULT_WORKERS})'
+    )
+    parser.add_argument(
+        '--no-cache',
+        dest='use_cache',
+        action='store_false',
+        default=True,
+        help='Read every footer again'
+    )
+    parser.add_argument(
+        '--output',
+        type=Path,
+        help='Save the merged table metadata to a JSON file'
+    )
+    args = parser.parse_args()
+
+    if not args.cdm_database.exists():
+        print(f"Error: Database not found: {args.cdm_database}", file=sys.stderr)
+        sys.exit(1)
+
+    tables = [d.name for d in table_dirs(args.cdm_database, args.category)]
+    footers = scan_cdm_footers(args.cdm_database, tables, workers=args.workers,
+                               use_cache=args.use_cache, verbose=True)
+
+    print(f"\n{'Table':<28} {'Files':>6} {'Rows':>14} {'Columns':>8} {'Size (MB)':>10}")
+    print("-" * 70)
+    for name, info in footers.items():
+        flag = "" if info['schema_consistent'] else "  ⚠️  schemas differ between files"
+        print(f"{name:<28} {info['num_files']:>6} {info['total_rows']:>14,} {len(info['columns']):>8} "
+              f"{info['compressed_bytes'] / 1024 ** 2:>10.1f}{flag}")
+    print(f"\n✅ {len(footers)} table(s), {sum(f['total_rows'] for f in footers.values()):,} rows")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(footers, f, indent=2)
+        print(f"💾 Footer metadata saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,415 @@
+#!/usr/bin/env python3
+"""
+Prompt context for the natural-language query tools.
+
+``NaturalLanguageSQLQuery`` and ``SchemaAwareQuery`` describe the store (and
+the LinkML schema) to the model on every question. Building that description
+means walking every class/induced slot and querying ``information_schema``
+per table, and counting every table's rows. This module builds it once:
+
+- tables and columns come from a single ``information_schema.columns`` query
+- row counts are DuckDB's metadata estimates (``duckdb_tables()``), not
+  ``COUNT(*)`` scans of brick tables
+- classes, slots, relationships and enums come from the schema snapshot,
+  with each class mapped to its table (``Sample`` -> ``sdt_sample``)
+
+The result is saved as JSON under ``~/.cache/linkml-coral/prompt`` keyed by
+the database (one file per store) and validated against the database
+fingerprint (``result_cache.database_fingerprint``) and the schema files'
+hashes, so a reload or schema edit rebuilds it.
+
+``PromptContext.relevant_tables()`` picks the tables a question is about
+(table/class/column name matches, search-index hits, plus the tables they
+reference) so prompts only describe those, keeping prompt size flat as the
+store grows.
+
+Usage:
+    # Show the context a question would send (and its approximate size)
+    python prompt_context.py --db cdm_store.db "samples from lake sediment"
+
+Set ``CDM_PROMPT_CACHE=off`` to rebuild on every run, or
+``CDM_PROMPT_CACHE_DIR`` to move the cache.
+"""
+
+import hashlib
+import json
+import os
+import re
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from result_cache import database_fingerprint
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "linkml-coral" / "prompt"
+CACHE_DIR_ENV = "CDM_PROMPT_CACHE_DIR"
+DISABLE_ENV = "CDM_PROMPT_CACHE"
+
+CONTEXT_VERSION = 1
+DEFAULT_MAX_TABLES = 8
+TABLE_PREFIXES = ("sdt", "sys", "ddt")
+
+# Question words that say nothing about which table is meant
+STOPWORDS = {
+    "a", "all", "an", "and", "any", "are", "as", "at", "by", "count", "data",
+    "each", "find", "for", "from", "get", "give", "have", "how", "id", "in",
+    "is", "list", "many", "me", "most", "name", "number", "of", "on", "or",
+    "per", "records", "show", "than", "that", "the", "their", "there", "to",
+    "top", "what", "where", "which", "with",
+}
+
+
+def _cache_enabled() -> bool:
+    return os.environ.get(DISABLE_ENV, "").lower() not in ("0", "off", "false", "no")
+
+
+def get_context_path(db_path, schema_key: str = "db") -> Path:
+    """Cache file for a database's prompt context."""
+    cache_dir = Path(os.environ.get(CACHE_DIR_ENV, DEFAULT_CACHE_DIR))
+    db_key = hashlib.sha256(str(Path(db_path).resolve()).encode()).hexdigest()[:16]
+    return cache_dir / f"{Path(db_path).stem}-{db_key}-{schema_key}.json"
+
+
+def schema_fingerprint(schema_view) -> Optional[str]:
+    """Hash of the schema files behind a schema snapshot (None without a schema)."""
+    if schema_view is None:
+        return None
+    sources = getattr(schema_view, "data", {}).get("sources")
+    if not sources:
+        return None
+    return hashlib.sha256(json.dumps(sources, sort_keys=True).encode()).hexdigest()[:32]
+
+
+def _words(text: str) -> Set[str]:
+    """Lowercase word stems of identifiers or prose (snake/camel case split)."""
+    text = re.sub(r"([a-z])([A-Z])", r"\1 \2", text)
+    words = set()
+    for word in re.split(r"[^a-z]+", text.lower()):
+        if len(word) < 2 or word in STOPWORDS:
+            continue
+        # Crude plural folding, applied the same way to questions and names
+        if len(word) > 4 and word.endswith("ies"):
+            word = word[:-3] + "y"
+        elif word.endswith(("ches", "shes", "xes", "sses")):
+            word = word[:-2]
+        elif len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        words.add(word)
+    return words
+
+
+def _referenced_table(column: str) -> Optional[str]:
+    """Table a reference column points at by CDM naming, else None."""
+    if column.endswith(("_sys_oterm_id", "_sys_oterm_name")) or column == "parent_sys_oterm_id":
+        return "sys_oterm"
+    for suffix in ("_id", "_name"):
+        if column.endswith(suffix) and column.startswith(TABLE_PREFIXES):
+            return column[:-len(suffix)]
+    return None
+
+
+def describe_database(conn) -> Dict[str, Dict[str, Any]]:
+    """
+    Tables, columns and estimated row counts of a store (two metadata queries).
+
+    Args:
+        conn: DuckDB connection
+
+    Returns:
+        Dict mapping table name to {'columns': [{'name', 'type'}], 'estimated_rows'}
+    """
+    tables: Dict[str, Dict[str, Any]] = {}
+    for table, column, dtype in conn.execute("""
+        SELECT table_name, column_name, data_type
+        FROM information_schema.columns
+        WHERE table_schema = 'main'
+        ORDER BY table_name, ordinal_position
+    """).fetchall():
+        tables.setdefault(table, {'columns': [], 'estimated_rows': 0})
+        tables[table]['columns'].append({'name': column, 'type': dtype})
+
+    for table, estimate in conn.execute("""
+        SELECT table_name, estimated_size
+        FROM duckdb_tables()
+        WHERE schema_name = 'main'
+    """).fetchall():
+        if table in tables:
+            tables[table]['estimated_rows'] = estimate or 0
+    return tables
+
+
+def _class_table(class_name: str, slot_names: List[str], identifier: Optional[str], tables: Iterable[str]) -> Optional[str]:
+    """Store table holding a class (naming convention, else identifier slot minus '_id')."""
+    tables = set(tables)
+    snake = re.sub(r"([a-z0-9])([A-Z])", r"\1_\2", class_name).lower()
+    candidates = [f"sdt_{snake}", f"sys_{snake.removeprefix('system_')}", f"ddt_{snake}"]
+    if identifier and identifier.endswith("_id"):
+        candidates.append(identifier[:-3])
+    candidates += [s[:-3] for s in slot_names[:1] if s.endswith("_id")]
+    return next((t for t in candidates if t in tables), None)
+
+
+def describe_schema(schema_view, tables: Iterable[str] = ()) -> Dict[str, Any]:
+    """
+    Classes (slots, relationships, table), and enums of a LinkML schema.
+
+    Args:
+        schema_view: SchemaSnapshot (or SchemaView)
+        tables: Store tables, used to map classes to tables
+
+    Returns:
+        Dict with 'classes' and 'enums' (the SchemaAwareQuery context layout)
+    """
+    context = {'classes': {}, 'relationships': [], 'enums': {}}
+    all_classes = schema_view.all_classes()
+
+    for class_name in all_classes:
+        cls = schema_view.get_class(class_name)
+        class_info = {
+            'name': class_name,
+            'description': cls.description or '',
+            'slots': {},
+            'relationships': [],
+        }
+        identifier = None
+        for slot_name in schema_view.class_slots(class_name):
+            slot = schema_view.induced_slot(slot_name, class_name)
+            if slot.identifier and identifier is None:
+                identifier = slot_name
+            slot_info = {
+                'name': slot_name,
+                'description': slot.description or '',
+                'range': slot.range,
+                'required': slot.required or False,
+                'multivalued': slot.multivalued or False,
+            }
+            # Check if it's a foreign key (range is another class)
+            if slot.range in all_classes:
+                slot_info['is_foreign_key'] = True
+                slot_info['target_class'] = slot.range
+                class_info['relationships'].append({
+                    'from': class_name,
+                    'to': slot.range,
+                    'via': slot_name,
+                    'required': slot.required or False,
+                })
+            class_info['slots'][slot_name] = slot_info
+        class_info['table'] = _class_table(class_name, list(class_info['slots']), identifier, tables)
+        context['classes'][class_name] = class_info
+
+    for enum_name in schema_view.all_enums():
+        enum = schema_view.get_enum(enum_name)
+        context['enums'][enum_name] = {
+            'name': enum_name,
+            'description': enum.description or '',
+            'values': list(enum.permissible_values.keys()) if enum.permissible_values else [],
+        }
+    return context
+
+
+class PromptContext:
+    """Cached description of a store (and schema) for LLM prompts."""
+
+    def __init__(self, data: Dict[str, Any]):
+        """
+        Initialize from context data.
+
+        Args:
+            data: Dictionary with 'tables' (describe_database) and optional
+                'schema' (describe_schema)
+        """
+        self.data = data
+        self.tables: Dict[str, Dict[str, Any]] = data['tables']
+        self.schema: Optional[Dict[str, Any]] = data.get('schema')
+        self._edges = self._table_edges()
+        self._fingerprint = None
+
+    def fingerprint(self) -> str:
+        """Hash of the tables, columns and schema described (not row counts)."""
+        if self._fingerprint is None:
+            structure = {
+                'tables': {t: [(c['name'], c['type']) for c in info['columns']] for t, info in self.tables.items()},
+                'schema': self.schema,
+            }
+            raw = json.dumps(structure, sort_keys=True, default=str)
+            self._fingerprint = hashlib.sha256(raw.encode()).hexdigest()[:32]
+        return self._fingerprint
+
+    def _table_edges(self) -> Dict[str, Set[str]]:
+        """Tables each table references (by CDM column naming or schema FKs)."""
+        edges: Dict[str, Set[str]] = {table: set() for table in self.tables}
+
+        def link(a, b):
+            if a in edges and b in edges and a != b:
+                edges[a].add(b)
+
+        # Column naming: x_sys_oterm_id -> sys_oterm, sdt_sample_name -> sdt_sample
+        for table, info in self.tables.items():
+            for column in info['columns']:
+                target = _referenced_table(column['name'])
+                if target:
+                    link(table, target)
+        if self.schema:
+            classes = self.schema['classes']
+            for class_info in classes.values():
+                for rel in class_info['relationships']:
+                    target = classes.get(rel['to'], {}).get('table')
+                    link(class_info.get('table'), target)
+        return edges
+
+    def relevant_tables(
+        self,
+        question: str,
+        hint_tables: Iterable[str] = (),
+        max_tables: int = DEFAULT_MAX_TABLES,
+    ) -> List[str]:
+        """
+        Tables a question is about, plus the tables they reference.
+
+        Args:
+            question: Natural-language question
+            hint_tables: Tables of search-index hits for the question
+            max_tables: Maximum tables to return
+
+        Returns:
+            Table names (all tables if nothing in the question matches)
+        """
+        words = _words(question)
+        class_words: Dict[str, Set[str]] = {}
+        if self.schema:
+            for class_name, class_info in self.schema['classes'].items():
+                if class_info.get('table'):
+                    class_words.setdefault(class_info['table'], set()).update(_words(class_name))
+
+        scores: Dict[str, float] = {}
+        for table, info in self.tables.items():
+            name_words = {w for w in _words(table) if w not in TABLE_PREFIXES} | class_words.get(table, set())
+            # Reference columns (sdt_sample_name in a brick) say the question
+            # is about the referenced table, not this one
+            column_words = set()
+            for column in info['columns']:
+                target = _referenced_table(column['name'])
+                if target is None or target == table:
+                    column_words |= _words(column['name'])
+            score = 3 * len(words & name_words) + len(words & (column_words - name_words))
+            if score:
+                scores[table] = score
+        for table in hint_tables:
+            if table in self.tables:
+                scores[table] = scores.get(table, 0) + 2
+
+        if not scores:
+            return sorted(self.tables)
+
+        # Entity tables before the (many, similar) brick tables on ties
+        ranked = sorted(scores, key=lambda t: (-scores[t], t.startswith("ddt_"), t))
+        # Keep the clear matches, then fill with the tables they reference
+        # (not referrers: every brick references sdt_sample)
+        best = scores[ranked[0]]
+        selected = [t for t in ranked if scores[t] * 3 >= best][:max_tables]
+        for table in list(selected):
+            for neighbour in sorted(self._edges.get(table, ())):
+                if len(selected) >= max_tables:
+                    break
+                if neighbour not in selected:
+                    selected.append(neighbour)
+        return sorted(selected)
+
+    def schema_subset(self, tables: Optional[Iterable[str]] = None) -> Optional[Dict[str, Any]]:
+        """Schema context restricted to the classes stored in the given tables."""
+        if self.schema is None or tables is None:
+            return self.schema
+        tables = set(tables)
+        if tables >= set(self.tables):
+            return self.schema
+        classes = {
+            name: info for name, info in self.schema['classes'].items()
+            if info.get('table') in tables
+        }
+        return {'classes': classes, 'relationships': [], 'enums': self.schema['enums']}
+
+
+def build_prompt_context(conn, schema_view=None) -> PromptContext:
+    """
+    Build a prompt context from the store (and schema).
+
+    Args:
+        conn: DuckDB connection
+        schema_view: Optional SchemaSnapshot
+
+    Returns:
+        PromptContext
+    """
+    tables = describe_database(conn)
+    data: Dict[str, Any] = {'version': CONTEXT_VERSION, 'tables': tables}
+    if schema_view is not None:
+        data['schema'] = describe_schema(schema_view, tables)
+    return PromptContext(data)
+
+
+def load_prompt_context(conn, db_path, schema_view=None) -> PromptContext:
+    """
+    Cached prompt context for a store, rebuilt after a reload or schema edit.
+
+    Args:
+        conn: DuckDB connection to the store
+        db_path: Database file (identifies the store)
+        schema_view: Optional SchemaSnapshot
+
+    Returns:
+        PromptContext
+    """
+    db_fingerprint = database_fingerprint(db_path)
+    schema_key = schema_fingerprint(schema_view)
+    use_cache = _cache_enabled() and db_fingerprint is not None and (schema_view is None or schema_key)
+    path = get_context_path(db_path, "db" if schema_view is None else getattr(schema_view, "name", None) or "schema")
+
+    if use_cache and path.exists():
+        try:
+            with open(path) as f:
+                data = json.load(f)
+            if (data.get('version') == CONTEXT_VERSION
+                    and data.get('db_fingerprint') == db_fingerprint
+                    and data.get('schema_fingerprint') == schema_key):
+                return PromptContext(data)
+        except (OSError, ValueError):
+            pass
+
+    context = build_prompt_context(conn, schema_view)
+    if use_cache:
+        context.data['db_fingerprint'] = db_fingerprint
+        context.data['schema_fingerprint'] = schema_key
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_path, 'w') as f:
+                json.dump(context.data, f, separators=(",", ":"))
+            os.replace(tmp_path, path)
+        except OSError:
+            pass
+    return context
+
+
+def main():
+    """Print the prompt context a question would use."""
+    import argparse
+    import duckdb
+
+    parser = argparse.ArgumentParser(description='Show the NL query prompt context for a store')
+    parser.add_argument('question', nargs='?', help='Question to trim the context for')
+    parser.add_argument('--db', default='cdm_store.db', help='Path to CDM store database')
+    parser.add_argument('--max-tables', type=int, default=DEFAULT_MAX_TABLES, help='Max tables in a trimmed context')
+    args = parser.parse_args()
+
+    with duckdb.connect(args.db, read_only=True) as conn:
+        context = load_prompt_context(conn, args.db)
+    tables = context.relevant_tables(args.question, max_tables=args.max_tables) if args.question else sorted(context.tables)
+    for table in tables:
+        info = context.tables[table]
+        print(f"{table} (~{info['estimated_rows']:,} rows): {', '.join(c['name'] for c in info['columns'])}")
+    print(f"\n📋 {len(tables)} of {len(context.tables)} tables", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
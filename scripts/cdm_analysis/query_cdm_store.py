@@ -17,6 +17,17 @@ Usage:
 
     # Trace provenance for an entity (uses CDM table names)
     python query_cdm_store.py --db cdm_store.db lineage sdt_assembly Assembly0000001
+
+    # Estimate a brick statistic with a confidence interval (sampled stores)
+    python query_cdm_store.py --db cdm_store_sample.db estimate ddt_brick0000010 \\
+        --stat mean --column concentration_micromolar
+
+    # Stream a brick (or any table) to Parquet/Arrow/CSV/NDJSON
+    python query_cdm_store.py --db cdm_store.db export ddt_brick0000010 brick.parquet
+
+    # Samples whose material is any kind of sediment (ontology subsumption)
+    python query_cdm_store.py --db cdm_store.db find-by-term sdt_sample \\
+        material_sys_oterm_id ENVO:00002007
 """
 
 import argparse
@@ -25,32 +36,101 @@ import json
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 
+if __name__ == "__main__":
+    # Hand off to a running query daemon before the heavy imports below
+    from query_daemon import forward_to_daemon
+    forward_to_daemon("query_cdm_store")
+
 from linkml_store import Client
 
+from cdm_search import SEARCH_MODES, load_search_index
+from oterm_closure import descendant_of_sql, has_closure_table, parse_descendant_filter
+from brick_sampling import (
+    estimate_count,
+    estimate_mean,
+    estimate_quantile,
+    get_sampling_metadata,
+)
+from result_cache import ResultCache
+from result_export import EXPORT_FORMATS, export_query
+
 
 class CDMStoreQuery:
     """Query interface for CDM store database."""
 
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, use_cache: bool = True):
         """
         Initialize query interface.
 
         Args:
             db_path: Path to DuckDB database file
+            use_cache: Reuse cached results from earlier runs on the same database load
         """
         self.db_path = db_path
         self.client = Client()
         self.db = self.client.attach_database(f"duckdb:///{db_path}", alias="cdm")
+        self._sql_conn = None
+        self._search_index = None
+        self.cache = ResultCache()
+        if not use_cache:
+            self.cache.enabled = False
+
+    def get_sql_connection(self):
+        """Return a read-only DuckDB connection for SQL-level queries."""
+        if self._sql_conn is None:
+            import duckdb
+            self._sql_conn = duckdb.connect(self.db_path, read_only=True)
+        return self._sql_conn
+
+    def get_search_index(self):
+        """Return the store's text search index, or None if it is missing or stale."""
+        if self._search_index is None:
+            self._search_index = load_search_index(self.db_path) or False
+        return self._search_index or None
+
+    def search(
+        self,
+        text: str,
+        tables: Optional[List[str]] = None,
+        mode: str = "auto",
+        limit: int = 20
+    ) -> List[Dict[str, Any]]:
+        """
+        Ranked prefix/substring/fuzzy search over ontology terms and entity names.
+
+        Args:
+            text: Search text
+            tables: Only search these tables (e.g., ["sys_oterm"])
+            mode: 'auto', 'exact', 'prefix', 'substring' or 'fuzzy'
+            limit: Maximum results
+
+        Returns:
+            List of hits (key, text, field, source, match, score)
+        """
+        index = self.get_search_index()
+        if index is None:
+            raise ValueError(
+                "Database has no current search index; rebuild it with: cdm_search.py build --db " + self.db_path
+            )
+        return [hit.to_dict() for hit in index.search(text, limit=limit, mode=mode, sources=tables)]
 
     def get_collection(self, collection_name: str):
         """Get a collection from the database."""
         try:
-            return self.db.get_collection(collection_name)
+            names = self.db.list_collection_names()
         except Exception as e:
             raise ValueError(f"Collection '{collection_name}' not found: {e}")
+        # linkml-store creates unknown collections on access; refuse instead
+        if collection_name not in names:
+            raise ValueError(f"Collection '{collection_name}' not found")
+        return self.db.get_collection(collection_name)
 
     def stats(self) -> Dict[str, Any]:
         """Get database statistics."""
+        cached = self.cache.get('stats', {}, self.db_path)
+        if cached is not None:
+            return cached.payload
+
         stats = {
             'database': self.db_path,
             'collections': {}
@@ -95,6 +175,7 @@ class CDMStoreQuery:
         stats['total_records'] = total_records
         stats['total_collections'] = len(collection_names)
 
+        self.cache.put('stats', {}, self.db_path, payload=stats)
         return stats
 
     def find_by_id(self, collection_name: str, entity_id: str) -> Optional[Dict]:
@@ -126,20 +207,47 @@ class CDMStoreQuery:
 
     def find_samples_by_location(self, location_name: str, limit: int = 100) -> List[Dict]:
         """Find all samples from a specific location."""
+        params = {'location': location_name, 'limit': limit}
+        cached = self.cache.get('samples_by_location', params, self.db_path)
+        if cached is not None:
+            return cached.rows or []
+
         try:
             collection = self.get_collection("sdt_sample")
             result = collection.find({"sdt_location_name": location_name}, limit=limit)
 
             # Extract rows from result
-            if hasattr(result, 'rows'):
-                return result.rows
-            else:
-                return list(result)
+            rows = result.rows if hasattr(result, 'rows') else list(result)
+            self.cache.put('samples_by_location', params, self.db_path, rows=rows)
+            return rows
         except Exception as e:
             raise ValueError(f"Error finding samples: {e}")
 
     def search_ontology_terms(self, search_term: str, limit: int = 50) -> List[Dict]:
         """Search ontology terms by name or ID pattern."""
+        params = {'term': search_term, 'limit': limit}
+        cached = self.cache.get('search_oterm', params, self.db_path)
+        if cached is not None:
+            return cached.rows or []
+
+        index = self.get_search_index()
+        if index is not None:
+            hits = index.search(search_term, limit=limit, mode="substring", sources=["sys_oterm"])
+            # Term IDs are not in the text index; match them by ID as well
+            conn = self.get_sql_connection()
+            ids = [hit.key for hit in hits]
+            cursor = conn.execute(
+                "SELECT * FROM sys_oterm WHERE sys_oterm_id IN (SELECT unnest(?)) "
+                "OR lower(sys_oterm_id) LIKE '%' || lower(?) || '%' LIMIT ?",
+                [ids, search_term, limit + len(ids)]
+            )
+            names = [d[0] for d in cursor.description]
+            rows = {row[0]: dict(zip(names, row)) for row in cursor.fetchall()}
+            rank = {term_id: i for i, term_id in enumerate(ids)}
+            results = sorted(rows.values(), key=lambda r: rank.get(r['sys_oterm_id'], len(rank)))[:limit]
+            self.cache.put('search_oterm', params, self.db_path, rows=results)
+            return results
+
         try:
             collection = self.get_collection("sys_oterm")
             # Simple search - linkml-store may support more advanced filtering
@@ -159,6 +267,7 @@ class CDMStoreQuery:
                    or search_lower in str(term.get('sys_oterm_id', '')).lower()
             ]
 
+            self.cache.put('search_oterm', params, self.db_path, rows=results[:limit])
             return results[:limit]
         except Exception as e:
             raise ValueError(f"Error searching ontology terms: {e}")
@@ -198,8 +307,144 @@ class CDMStoreQuery:
         except Exception as e:
             raise ValueError(f"Error getting processes: {e}")
 
+    def descendant_filter(self, column: str, term_id: str, include_self: bool = True) -> str:
+        """
+        SQL filter matching an ontology term column against a term and its subtypes.
+
+        Args:
+            column: A ``*_sys_oterm_id`` column (e.g., "material_sys_oterm_id")
+            term_id: Ancestor ontology term ID (e.g., "ENVO:00002007")
+            include_self: Also match the term itself
+
+        Returns:
+            SQL boolean expression using the sys_oterm_closure table
+        """
+        if not has_closure_table(self.get_sql_connection()):
+            raise ValueError(
+                "Database has no sys_oterm_closure table; reload it with load_cdm_parquet_to_store.py"
+            )
+        return descendant_of_sql(column, term_id, include_self=include_self)
+
+    def find_by_term(
+        self,
+        table_name: str,
+        column: str,
+        term_id: str,
+        limit: Optional[int] = 100,
+        include_self: bool = True
+    ) -> List[Dict]:
+        """
+        Find rows whose ontology term column is a term or any of its subtypes.
+
+        Args:
+            table_name: CDM table name (e.g., "sdt_sample")
+            column: A ``*_sys_oterm_id`` column of that table
+            term_id: Ancestor ontology term ID
+            limit: Maximum rows to return (None = all)
+            include_self: Also match the term itself
+
+        Returns:
+            List of matching rows
+        """
+        sql = f'SELECT * FROM "{table_name}" WHERE {self.descendant_filter(column, term_id, include_self)}'
+        params = []
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        cursor = self.get_sql_connection().execute(sql, params)
+        names = [d[0] for d in cursor.description]
+        return [dict(zip(names, row)) for row in cursor.fetchall()]
+
+    def export_table(
+        self,
+        table_name: str,
+        output_path: str,
+        columns: Optional[List[str]] = None,
+        where: Optional[str] = None,
+        params: Optional[List[Any]] = None,
+        limit: Optional[int] = None,
+        export_format: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> int:
+        """
+        Stream rows of a table to a file without materializing them.
+
+        Args:
+            table_name: CDM table name (e.g., "ddt_brick0000010")
+            output_path: Output file (.parquet, .arrow, .csv, .ndjson or .json)
+            columns: Columns to export (default: all)
+            where: Optional SQL filter expression
+            params: Parameters for placeholders in ``where``
+            limit: Maximum rows to export (pushed into the query)
+            export_format: Explicit format (default: inferred from extension)
+            metadata: Extra query metadata stored alongside the rows
+
+        Returns:
+            Number of rows written
+        """
+        select = ", ".join(f'"{c}"' for c in columns) if columns else "*"
+        sql = f'SELECT {select} FROM "{table_name}"'
+        params = list(params or [])
+        if where:
+            sql += f" WHERE {where}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return export_query(self.get_sql_connection(), sql, output_path, params,
+                            export_format=export_format, metadata=metadata)
+
+    def estimate(
+        self,
+        table_name: str,
+        statistic: str = "count",
+        column: Optional[str] = None,
+        where: Optional[str] = None,
+        quantile: float = 0.5,
+        confidence: float = 0.95
+    ) -> Dict[str, Any]:
+        """
+        Estimate a population statistic from a (possibly sampled) table.
+
+        Sampled brick tables carry per-row sampling weights, so estimates
+        describe the full brick rather than just the loaded rows.
+
+        Args:
+            table_name: CDM table name (e.g., "ddt_brick0000010")
+            statistic: 'count', 'mean' or 'quantile'
+            column: Numeric column (required for mean/quantile)
+            where: Optional SQL filter expression
+            quantile: Quantile to estimate (for statistic='quantile')
+            confidence: Confidence level for the interval
+
+        Returns:
+            Dict with estimate, std_error, ci_low, ci_high and the sample design
+        """
+        conn = self.get_sql_connection()
+        if statistic == "count":
+            result = estimate_count(conn, table_name, where=where, confidence=confidence)
+        elif statistic in ("mean", "quantile"):
+            if not column:
+                raise ValueError(f"--column is required for statistic '{statistic}'")
+            if statistic == "mean":
+                result = estimate_mean(conn, table_name, column, where=where, confidence=confidence)
+            else:
+                result = estimate_quantile(conn, table_name, column, q=quantile,
+                                           where=where, confidence=confidence)
+        else:
+            raise ValueError(f"Unknown statistic: {statistic}")
+
+        estimate = result.to_dict()
+        estimate['table'] = table_name
+        estimate['sampling'] = get_sampling_metadata(conn, table_name)
+        return estimate
+
     def trace_lineage(self, entity_type: str, entity_id: str, max_depth: int = 10) -> Dict:
         """Trace complete provenance lineage for an entity."""
+        params = {'entity_type': entity_type, 'entity_id': entity_id, 'max_depth': max_depth}
+        cached = self.cache.get('lineage', params, self.db_path)
+        if cached is not None:
+            return cached.payload
+
         lineage = {
             'entity': f"{entity_type}:{entity_id}",
             'upstream': [],  # Entities that produced this entity
@@ -227,6 +472,7 @@ class CDMStoreQuery:
                 }
                 lineage['downstream'].append(downstream_entry)
 
+            self.cache.put('lineage', params, self.db_path, payload=lineage)
             return lineage
 
         except Exception as e:
@@ -283,16 +529,14 @@ def cmd_find_samples(query: CDMStoreQuery, args):
         print()
 
     if args.export:
-        export_data = {
-            'query': 'find_samples',
-            'location': args.location,
-            'count': len(samples),
-            'results': samples
-        }
         export_path = Path(args.export)
-        with open(export_path, 'w') as f:
-            json.dump(export_data, f, indent=2, default=str)
-        print(f"💾 Results exported to: {export_path}")
+        exported = query.export_table(
+            "sdt_sample", export_path,
+            where="sdt_location_name = ?", params=[args.location], limit=args.limit,
+            export_format=args.export_format,
+            metadata={'query': 'find_samples', 'location': args.location, 'count': len(samples)}
+        )
+        print(f"💾 {exported:,} results exported to: {export_path}")
 
     return 0
 
@@ -333,6 +577,76 @@ def cmd_search_oterm(query: CDMStoreQuery, args):
     return 0
 
 
+def cmd_search(query: CDMStoreQuery, args):
+    """Ranked search over ontology terms and entity names."""
+    print(f"\n🔎 Searching for: '{args.text}' ({args.mode})")
+    print(f"{'='*60}\n")
+
+    hits = query.search(args.text, tables=args.table, mode=args.mode, limit=args.limit)
+
+    print(f"Found {len(hits)} match(es):\n")
+    for i, hit in enumerate(hits, 1):
+        print(f"  {i}. {hit['key']}: {hit['text']}")
+        print(f"     {hit['source']}.{hit['field']}  [{hit['match']}, score {hit['score']:.3f}]")
+
+    if args.export:
+        export_data = {
+            'query': 'search',
+            'text': args.text,
+            'mode': args.mode,
+            'count': len(hits),
+            'results': hits
+        }
+        export_path = Path(args.export)
+        with open(export_path, 'w') as f:
+            json.dump(export_data, f, indent=2, default=str)
+        print(f"\n💾 Results exported to: {export_path}")
+
+    return 0
+
+
+def cmd_find_by_term(query: CDMStoreQuery, args):
+    """Find rows by ontology term, including all subtypes."""
+    print(f"\n🌳 Finding {args.table} rows where {args.column} is {args.term_id}"
+          f"{' (subtypes only)' if args.strict else ' or a subtype'}")
+    print(f"{'='*60}\n")
+
+    rows = query.find_by_term(args.table, args.column, args.term_id,
+                              limit=args.limit, include_self=not args.strict)
+
+    print(f"Found {len(rows)} row(s):\n")
+
+    id_column = f"{args.table}_id"
+    name_column = args.column.replace('_sys_oterm_id', '_sys_oterm_name')
+    for i, row in enumerate(rows[:20], 1):
+        print(f"  {i}. {row.get(id_column, '')}  {row.get(args.column)}  {row.get(name_column) or ''}")
+    if len(rows) > 20:
+        print(f"  ... and {len(rows) - 20} more")
+
+    if args.export:
+        export_path = Path(args.export)
+        exported = query.export_table(
+            args.table, export_path,
+            where=query.descendant_filter(args.column, args.term_id, include_self=not args.strict),
+            limit=args.limit,
+            export_format=args.export_format,
+            metadata={'query': 'find_by_term', 'table': args.table, 'column': args.column,
+                      'term_id': args.term_id, 'count': len(rows)}
+        )
+        print(f"\n💾 {exported:,} results exported to: {export_path}")
+
+    return 0
+
+
+def _combine_where(query: CDMStoreQuery, where: Optional[str], under: Optional[List[str]]) -> Optional[str]:
+    """AND a --where expression with any --under COLUMN=TERM_ID filters."""
+    clauses = [f"({where})"] if where else []
+    for spec in under or []:
+        column, term_id = parse_descendant_filter(spec)
+        clauses.append(query.descendant_filter(column, term_id))
+    return " AND ".join(clauses) if clauses else None
+
+
 def cmd_lineage(query: CDMStoreQuery, args):
     """Trace provenance lineage."""
     print(f"\n🔗 Tracing lineage for: {args.entity_type}:{args.entity_id}")
@@ -378,6 +692,77 @@ def cmd_lineage(query: CDMStoreQuery, args):
     return 0
 
 
+def cmd_estimate(query: CDMStoreQuery, args):
+    """Estimate a statistic with a confidence interval."""
+    print(f"\n📐 Estimating {args.stat} for: {args.table}")
+    print(f"{'='*60}\n")
+
+    where = _combine_where(query, args.where, args.under)
+    result = query.estimate(
+        args.table,
+        statistic=args.stat,
+        column=args.column,
+        where=where,
+        quantile=args.quantile,
+        confidence=args.confidence
+    )
+
+    sampling = result['sampling']
+    if sampling:
+        print(f"Sample design: {sampling['method']} "
+              f"({sampling['sample_rows']:,} of {sampling['population_rows']:,} rows)")
+        if sampling.get('strata_column'):
+            print(f"Strata: {sampling['strata_column']}")
+    else:
+        print("Sample design: none (full table, exact answer)")
+    if args.where:
+        print(f"Filter: {args.where}")
+    for spec in args.under or []:
+        print(f"Under: {spec}")
+    print()
+
+    if result['estimate'] is None:
+        print("  (No matching rows in sample)")
+    else:
+        label = result['statistic'] + (f"({args.column})" if args.column else "")
+        print(f"  {label}: {result['estimate']:,.4g}")
+        print(f"  {result['confidence']:.0%} CI: [{result['ci_low']:,.4g}, {result['ci_high']:,.4g}]")
+        print(f"  Std. error: {result['std_error']:,.4g}")
+        print(f"  Sampled rows used: {result['sample_rows']:,}")
+
+    if args.export:
+        export_path = Path(args.export)
+        with open(export_path, 'w') as f:
+            json.dump(result, f, indent=2, default=str)
+        print(f"\n💾 Estimate exported to: {export_path}")
+
+    return 0
+
+
+def cmd_export(query: CDMStoreQuery, args):
+    """Stream a table to Parquet, Arrow IPC, CSV, NDJSON or JSON."""
+    print(f"\n📤 Exporting: {args.table}")
+    print(f"{'='*60}\n")
+
+    columns = [c.strip() for c in args.columns.split(',')] if args.columns else None
+    if args.where:
+        print(f"Filter: {args.where}")
+    for spec in args.under or []:
+        print(f"Under: {spec}")
+    if args.limit is not None:
+        print(f"Limit: {args.limit:,} rows")
+
+    exported = query.export_table(
+        args.table, args.output,
+        columns=columns, where=_combine_where(query, args.where, args.under), limit=args.limit,
+        export_format=args.format,
+        metadata={'query': 'export', 'table': args.table, 'where': args.where, 'under': args.under}
+    )
+    print(f"💾 {exported:,} rows exported to: {args.output}")
+
+    return 0
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='CDM Store Query CLI - Query KBase CDM linkml-store database',
@@ -393,11 +778,28 @@ Examples:
   # Search ontology terms
   python query_cdm_store.py --db cdm_store.db search-oterm "soil"
 
+  # Ranked, typo-tolerant search over term and entity names
+  python query_cdm_store.py --db cdm_store.db search "sedimnt" --table sys_oterm
+
+  # Samples whose material is sediment or any subtype (needs sys_oterm_closure)
+  python query_cdm_store.py --db cdm_store.db find-by-term sdt_sample material_sys_oterm_id ENVO:00002007
+
   # Trace lineage for an assembly (use CDM table name: sdt_assembly)
   python query_cdm_store.py --db cdm_store.db lineage sdt_assembly Assembly0000001
 
   # Export results to JSON
   python query_cdm_store.py --db cdm_store.db stats --export stats.json
+
+  # Stream a whole brick to Parquet (constant memory)
+  python query_cdm_store.py --db cdm_store.db export ddt_brick0000010 brick.parquet
+  python query_cdm_store.py --db cdm_store.db export sdt_sample samples.csv \\
+      --columns sdt_sample_name,depth --where "depth > 10"
+
+  # Estimate brick statistics from a sampled store (with 95% CI)
+  python query_cdm_store.py --db cdm_store_sample.db estimate ddt_brick0000010 --stat count \\
+      --where "molecule_from_list_sys_oterm_name = 'uranium'"
+  python query_cdm_store.py --db cdm_store_sample.db estimate ddt_brick0000010 \\
+      --stat quantile --quantile 0.9 --column concentration_micromolar
         """
     )
 
@@ -406,6 +808,11 @@ Examples:
         default='cdm_store.db',
         help='Path to CDM store database (default: cdm_store.db)'
     )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Ignore cached results and recompute (cache: ~/.cache/linkml-coral/results)'
+    )
 
     subparsers = parser.add_subparsers(dest='command', help='Command to execute')
 
@@ -417,7 +824,10 @@ Examples:
     find_samples_parser = subparsers.add_parser('find-samples', help='Find samples by location')
     find_samples_parser.add_argument('--location', required=True, help='Location name or ID')
     find_samples_parser.add_argument('--limit', type=int, default=100, help='Max results (default: 100)')
-    find_samples_parser.add_argument('--export', help='Export results to JSON file')
+    find_samples_parser.add_argument('--export',
+                                     help='Export results (format from extension: .json, .ndjson, .csv, .parquet, .arrow)')
+    find_samples_parser.add_argument('--export-format', choices=EXPORT_FORMATS,
+                                     help='Export format (overrides the file extension)')
 
     # Search ontology terms command
     search_oterm_parser = subparsers.add_parser('search-oterm', help='Search ontology terms')
@@ -425,12 +835,68 @@ Examples:
     search_oterm_parser.add_argument('--limit', type=int, default=50, help='Max results (default: 50)')
     search_oterm_parser.add_argument('--export', help='Export results to JSON file')
 
+    # Search command
+    search_parser = subparsers.add_parser(
+        'search', help='Ranked prefix/substring/fuzzy search over ontology terms and entity names'
+    )
+    search_parser.add_argument('text', help='Search text (typos allowed)')
+    search_parser.add_argument('--table', action='append',
+                               help='Only search this table, e.g. sys_oterm or sdt_sample (repeatable)')
+    search_parser.add_argument('--mode', choices=SEARCH_MODES, default='auto',
+                               help='Match mode (default: auto = exact > prefix > substring > fuzzy)')
+    search_parser.add_argument('--limit', type=int, default=20, help='Max results (default: 20)')
+    search_parser.add_argument('--export', help='Export results to JSON file')
+
+    # Find by ontology term command
+    find_by_term_parser = subparsers.add_parser(
+        'find-by-term', help='Find rows whose *_sys_oterm_id column is a term or any subtype'
+    )
+    find_by_term_parser.add_argument('table', help='CDM table name (e.g., sdt_sample)')
+    find_by_term_parser.add_argument('column', help='Ontology term column (e.g., material_sys_oterm_id)')
+    find_by_term_parser.add_argument('term_id', help='Ancestor term ID (e.g., ENVO:00002007)')
+    find_by_term_parser.add_argument('--strict', action='store_true',
+                                     help='Match subtypes only, not the term itself')
+    find_by_term_parser.add_argument('--limit', type=int, default=100, help='Max results (default: 100)')
+    find_by_term_parser.add_argument('--export',
+                                     help='Export results (format from extension: .json, .ndjson, .csv, .parquet, .arrow)')
+    find_by_term_parser.add_argument('--export-format', choices=EXPORT_FORMATS,
+                                     help='Export format (overrides the file extension)')
+
     # Lineage command
     lineage_parser = subparsers.add_parser('lineage', help='Trace provenance lineage')
     lineage_parser.add_argument('entity_type', help='CDM table name (e.g., sdt_assembly, sdt_reads)')
     lineage_parser.add_argument('entity_id', help='Entity ID (e.g., Assembly0000001)')
     lineage_parser.add_argument('--export', help='Export lineage to JSON file')
 
+    # Estimate command
+    estimate_parser = subparsers.add_parser(
+        'estimate', help='Estimate count/mean/quantile with confidence interval (sampled bricks)'
+    )
+    estimate_parser.add_argument('table', help='CDM table name (e.g., ddt_brick0000010)')
+    estimate_parser.add_argument('--stat', choices=['count', 'mean', 'quantile'], default='count',
+                                 help='Statistic to estimate (default: count)')
+    estimate_parser.add_argument('--column', help='Numeric column (for mean/quantile)')
+    estimate_parser.add_argument('--where', help='SQL filter expression')
+    estimate_parser.add_argument('--under', action='append', metavar='COLUMN=TERM_ID',
+                                 help='Only rows whose ontology column is TERM_ID or a subtype (repeatable)')
+    estimate_parser.add_argument('--quantile', type=float, default=0.5,
+                                 help='Quantile for --stat quantile (default: 0.5)')
+    estimate_parser.add_argument('--confidence', type=float, default=0.95,
+                                 help='Confidence level (default: 0.95)')
+    estimate_parser.add_argument('--export', help='Export estimate to JSON file')
+
+    # Export command
+    export_parser = subparsers.add_parser('export', help='Stream a table to Parquet/Arrow/CSV/NDJSON/JSON')
+    export_parser.add_argument('table', help='CDM table name (e.g., ddt_brick0000010)')
+    export_parser.add_argument('output', help='Output file (format from extension)')
+    export_parser.add_argument('--columns', help='Comma-separated columns to export (default: all)')
+    export_parser.add_argument('--where', help='SQL filter expression')
+    export_parser.add_argument('--under', action='append', metavar='COLUMN=TERM_ID',
+                               help='Only rows whose ontology column is TERM_ID or a subtype (repeatable)')
+    export_parser.add_argument('--limit', type=int, help='Max rows to export (default: all)')
+    export_parser.add_argument('--format', choices=EXPORT_FORMATS,
+                               help='Export format (overrides the file extension)')
+
     args = parser.parse_args()
 
     if not args.command:
@@ -447,7 +913,7 @@ Examples:
 
     # Initialize query interface
     try:
-        query = CDMStoreQuery(str(db_path))
+        query = CDMStoreQuery(str(db_path), use_cache=not args.no_cache)
     except Exception as e:
         print(f"Error connecting to database: {e}", file=sys.stderr)
         sys.exit(1)
@@ -460,8 +926,16 @@ Examples:
             return cmd_find_samples(query, args)
         elif args.command == 'search-oterm':
             return cmd_search_oterm(query, args)
+        elif args.command == 'search':
+            return cmd_search(query, args)
+        elif args.command == 'find-by-term':
+            return cmd_find_by_term(query, args)
         elif args.command == 'lineage':
             return cmd_lineage(query, args)
+        elif args.command == 'estimate':
+            return cmd_estimate(query, args)
+        elif args.command == 'export':
+            return cmd_export(query, args)
         else:
             print(f"Unknown command: {args.command}", file=sys.stderr)
             return 1
@@ -0,0 +1,481 @@
+#!/usr/bin/env python3
+"""
+CDM Query Daemon - keep query tools warm between CLI invocations.
+
+Every run of ``enigma_query.py``, ``query_cdm_store.py``,
+``cdm_unified_query.py`` or ``nl_sql_query.py`` normally pays for importing
+linkml-store, attaching DuckDB and (for the schema tools) building a
+``SchemaView``. The daemon does that once and keeps the query objects alive.
+While it is running the CLIs forward their arguments and environment to it
+over a Unix socket and just print the captured output, so repeated queries
+skip the start-up cost. The daemon only opens databases read-only, so other
+readers (including ``CDM_QUERY_DAEMON=off`` runs) can use the same store.
+
+Usage:
+    # Start the daemon in the background (idle timeout: 30 minutes)
+    python query_daemon.py start
+
+    # CLIs now use it automatically
+    python query_cdm_store.py --db cdm_store.db stats
+
+    # Show warm objects and request counts
+    python query_daemon.py status
+
+    # Stop it (required before reloading a database it holds open)
+    python query_daemon.py stop
+
+Set ``CDM_QUERY_DAEMON=off`` to bypass a running daemon for one command.
+
+This module only uses the standard library so the forwarding check in the
+CLIs stays cheap.
+"""
+
+import argparse
+import contextlib
+import importlib
+import io
+import json
+import os
+import socket
+import socketserver
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+CDM_ANALYSIS_DIR = Path(__file__).resolve().parent
+
+SOCKET_ENV = "CDM_QUERY_DAEMON_SOCKET"
+DISABLE_ENV = "CDM_QUERY_DAEMON"
+DEFAULT_SOCKET = Path.home() / ".cache" / "linkml-coral" / "query-daemon.sock"
+DEFAULT_IDLE_TIMEOUT = 30 * 60
+
+# Client environment variables that change how a query object is built (API
+# keys, providers, cache locations); pooled objects are keyed on them
+POOL_ENV_PREFIXES = ("CDM_", "ANTHROPIC_", "OPENAI_", "SCHEMA_SNAPSHOT", "OBO_CACHE")
+
+# tool name -> (module, query classes whose instances are kept warm)
+TOOLS: Dict[str, tuple] = {
+    "enigma_query": ("enigma_query", ["ENIGMAProvenanceQuery"]),
+    "query_cdm_store": ("query_cdm_store", ["CDMStoreQuery"]),
+    "nl_sql_query": ("nl_sql_query", ["NaturalLanguageSQLQuery"]),
+    "cdm_unified_query": ("cdm_unified_query", ["UnifiedCDMQuery"]),
+}
+
+
+def get_socket_path() -> Path:
+    """Socket path from $CDM_QUERY_DAEMON_SOCKET or the per-user default."""
+    return Path(os.environ.get(SOCKET_ENV, DEFAULT_SOCKET))
+
+
+# ============================================================================
+# Client side
+# ============================================================================
+
+def send_request(message: Dict[str, Any], socket_path: Optional[Path] = None,
+                 timeout: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Send one request to the daemon and return its response.
+
+    Raises:
+        OSError: If the daemon is not reachable
+    """
+    socket_path = socket_path or get_socket_path()
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(str(socket_path))
+        sock.sendall(json.dumps(message).encode() + b"\n")
+        sock.shutdown(socket.SHUT_WR)
+        chunks = []
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    return json.loads(b"".join(chunks).decode())
+
+
+def forward_to_daemon(tool: str, argv: Optional[List[str]] = None) -> None:
+    """
+    Run a CLI invocation on the daemon if one is running.
+
+    Prints the daemon's captured output and exits with its exit code. Returns
+    without doing anything when no daemon is reachable, so the caller simply
+    continues with a normal local run.
+    """
+    if os.environ.get(DISABLE_ENV, "").lower() in ("0", "off", "false", "no"):
+        return
+    if not hasattr(socket, "AF_UNIX"):
+        return
+    socket_path = get_socket_path()
+    if not socket_path.exists():
+        return
+
+    try:
+        response = send_request({
+            "op": "run",
+            "tool": tool,
+            "argv": sys.argv[1:] if argv is None else argv,
+            "cwd": os.getcwd(),
+            "env": dict(os.environ),
+        }, socket_path)
+    except (OSError, ValueError):
+        return  # Stale socket or daemon shutting down: run locally
+
+    sys.stdout.write(response.get("stdout", ""))
+    sys.stderr.write(response.get("stderr", ""))
+    sys.stdout.flush()
+    sys.stderr.flush()
+    sys.exit(response.get("exit_code", 1))
+
+
+# ============================================================================
+# Daemon side
+# ============================================================================
+
+class _Pinned:
+    """Proxy for a pooled query object; close() is a no-op while pooled."""
+
+    def __init__(self, instance):
+        object.__setattr__(self, "_instance", instance)
+
+    def close(self):
+        pass
+
+    def __getattr__(self, name):
+        return getattr(self._instance, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._instance, name, value)
+
+
+class WarmPool:
+    """Cache of query objects keyed by class, working directory, arguments and environment."""
+
+    def __init__(self):
+        self.instances: Dict[tuple, Any] = {}
+        self.connections: Dict[str, Any] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def factory(self, cls) -> Callable[..., Any]:
+        """Return a drop-in constructor for ``cls`` that reuses instances."""
+        def create(*args, **kwargs):
+            env = sorted((k, v) for k, v in os.environ.items() if k.startswith(POOL_ENV_PREFIXES))
+            key = (cls.__name__, os.getcwd(), repr(args), repr(sorted(kwargs.items())), hash(repr(env)))
+            if key not in self.instances:
+                self.misses += 1
+                self.instances[key] = cls(*args, **kwargs)
+            else:
+                self.hits += 1
+            return _Pinned(self.instances[key])
+        create.__wrapped__ = cls
+        return create
+
+    def read_only_connection(self, db_path: str):
+        """
+        Keep a read-only DuckDB connection open on ``db_path``.
+
+        DuckDB shares one database instance between the connections a process
+        opens on a file with the same settings, so this connection keeps the
+        database warm for the per-query read-only connections of pooled objects.
+        """
+        db_path = str(Path(db_path).resolve())
+        if db_path not in self.connections:
+            import duckdb
+            self.connections[db_path] = duckdb.connect(db_path, read_only=True)
+        return self.connections[db_path]
+
+    def close_all(self):
+        """Close every pooled object and connection."""
+        for instance in self.instances.values():
+            with contextlib.suppress(Exception):
+                if hasattr(instance, "close"):
+                    instance.close()
+        self.instances.clear()
+        for conn in self.connections.values():
+            with contextlib.suppress(Exception):
+                conn.close()
+        self.connections.clear()
+
+    def describe(self) -> List[str]:
+        return [f"{key[0]}{key[2]} (cwd: {key[1]})" for key in self.instances]
+
+
+@contextlib.contextmanager
+def read_only_stores(pool: WarmPool):
+    """
+    Open linkml-store DuckDB databases read-only while the block runs.
+
+    linkml-store attaches DuckDB files read-write, which would let the daemon
+    block loaders and other readers of the store. Inside this block, new
+    DuckDB engines open ``read_only=True`` connections instead; engines are
+    cached on their database objects, so pooled query objects keep them.
+    """
+    try:
+        import duckdb
+        import sqlalchemy
+        from duckdb_engine import ConnectionWrapper
+        from linkml_store.api.stores.duckdb.duckdb_database import DuckDBDatabase
+    except ImportError:
+        yield
+        return
+
+    original = DuckDBDatabase.engine
+
+    def engine(db):
+        handle = db.handle or ""
+        if db._engine is None and handle.startswith("duckdb:///") and ":memory:" not in handle:
+            db_path = str(Path(handle[len("duckdb:///"):]).resolve())
+            pool.read_only_connection(db_path)
+            db._engine = sqlalchemy.create_engine(
+                "duckdb://",
+                creator=lambda: ConnectionWrapper(duckdb.connect(db_path, read_only=True)),
+                poolclass=sqlalchemy.pool.NullPool,
+            )
+        return original.fget(db)
+
+    DuckDBDatabase.engine = property(engine)
+    try:
+        yield
+    finally:
+        DuckDBDatabase.engine = original
+
+
+@contextlib.contextmanager
+def client_environment(env: Optional[Dict[str, str]]):
+    """Replace os.environ with the forwarding client's environment while the block runs."""
+    if env is None:
+        yield
+        return
+    saved = dict(os.environ)
+    os.environ.clear()
+    os.environ.update(env)
+    try:
+        yield
+    finally:
+        os.environ.clear()
+        os.environ.update(saved)
+
+
+class QueryDaemon:
+    """Runs CLI entry points in-process against warm query objects."""
+
+    def __init__(self, tools: Optional[Dict[str, tuple]] = None):
+        self.tools = TOOLS if tools is None else tools
+        self.pool = WarmPool()
+        self.modules: Dict[str, Any] = {}
+        self.started = time.time()
+        self.last_request = time.time()
+        self.requests = 0
+        self.lock = threading.Lock()
+
+        for path in (SCRIPTS_DIR, CDM_ANALYSIS_DIR):
+            if str(path) not in sys.path:
+                sys.path.insert(0, str(path))
+
+    def load_tool(self, tool: str):
+        """Import a tool module once and route its query classes through the pool."""
+        if tool not in self.modules:
+            module_name, class_names = self.tools[tool]
+            module = importlib.import_module(module_name)
+            for class_name in class_names:
+                cls = getattr(module, class_name)
+                setattr(module, class_name, self.pool.factory(getattr(cls, "__wrapped__", cls)))
+            self.modules[tool] = module
+        return self.modules[tool]
+
+    def run(self, tool: str, argv: List[str], cwd: str,
+            env: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """Run ``tool``'s main() with ``argv`` in ``cwd`` (and the client's ``env``) and capture its output."""
+        stdout, stderr = io.StringIO(), io.StringIO()
+        exit_code = 0
+        with self.lock:
+            self.requests += 1
+            self.last_request = time.time()
+            saved_argv, saved_cwd = sys.argv, os.getcwd()
+            try:
+                os.chdir(cwd)
+                with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr), \
+                        client_environment(env), read_only_stores(self.pool):
+                    try:
+                        module = self.load_tool(tool)
+                        sys.argv = [f"{tool}.py"] + list(argv)
+                        exit_code = module.main() or 0
+                    except SystemExit as e:
+                        exit_code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+                        if isinstance(e.code, str):
+                            print(e.code, file=sys.stderr)
+                    except Exception as e:
+                        print(f"Error: {e}", file=sys.stderr)
+                        exit_code = 1
+            finally:
+                sys.argv = saved_argv
+                os.chdir(saved_cwd)
+        return {"stdout": stdout.getvalue(), "stderr": stderr.getvalue(), "exit_code": exit_code}
+
+    def handle(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        """Dispatch one request."""
+        op = message.get("op")
+        if op == "run":
+            if message.get("tool") not in self.tools:
+                return {"stdout": "", "stderr": f"Unknown tool: {message.get('tool')}\n", "exit_code": 1}
+            return self.run(message["tool"], message.get("argv", []), message.get("cwd", os.getcwd()),
+                            message.get("env"))
+        if op == "status":
+            return {
+                "pid": os.getpid(),
+                "uptime_seconds": round(time.time() - self.started, 1),
+                "requests": self.requests,
+                "pool_hits": self.pool.hits,
+                "pool_misses": self.pool.misses,
+                "warm_objects": self.pool.describe(),
+                "tools_loaded": sorted(self.modules),
+            }
+        if op == "stop":
+            return {"stopping": True}
+        return {"error": f"Unknown op: {op}"}
+
+    def close(self):
+        self.pool.close_all()
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        try:
+            message = json.loads(self.rfile.read().decode())
+            response = self.server.daemon.handle(message)
+        except Exception as e:
+            response = {"stdout": "", "stderr": f"Daemon error: {e}\n", "exit_code": 1}
+        self.wfile.write(json.dumps(response, default=str).encode())
+        if response.get("stopping"):
+            self.server.stopping = True
+
+
+class DaemonServer(socketserver.UnixStreamServer):
+    """Unix socket server that answers requests one at a time."""
+
+    def __init__(self, socket_path: Path, daemon: QueryDaemon):
+        self.daemon = daemon
+        self.stopping = False
+        super().__init__(str(socket_path), _RequestHandler)
+        os.chmod(socket_path, 0o600)
+
+    def serve(self, idle_timeout: float = DEFAULT_IDLE_TIMEOUT, poll_interval: float = 1.0):
+        """Serve until stopped or idle for ``idle_timeout`` seconds."""
+        self.timeout = poll_interval
+        while not self.stopping:
+            self.handle_request()
+            if idle_timeout and time.time() - self.daemon.last_request > idle_timeout:
+                break
+
+
+def serve(socket_path: Path, idle_timeout: float = DEFAULT_IDLE_TIMEOUT) -> int:
+    """Run the daemon in the foreground until stopped or idle."""
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+    if socket_path.exists():
+        try:
+            send_request({"op": "status"}, socket_path, timeout=2)
+            print(f"❌ Daemon already running on {socket_path}", file=sys.stderr)
+            return 1
+        except OSError:
+            socket_path.unlink()  # Stale socket from a crashed daemon
+
+    daemon = QueryDaemon()
+    server = DaemonServer(socket_path, daemon)
+    print(f"🚀 CDM query daemon listening on {socket_path} (pid {os.getpid()})")
+    sys.stdout.flush()
+    try:
+        server.serve(idle_timeout=idle_timeout)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        daemon.close()
+        with contextlib.suppress(FileNotFoundError):
+            socket_path.unlink()
+    print("👋 CDM query daemon stopped")
+    return 0
+
+
+def main():
+    """Main CLI entry point."""
+    parser = argparse.ArgumentParser(
+        description='Persistent query daemon for the CDM/ENIGMA query CLIs',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Start in the background, then query as usual
+  python query_daemon.py start
+  python query_cdm_store.py --db cdm_store.db stats
+
+  # Inspect or stop the daemon
+  python query_daemon.py status
+  python query_daemon.py stop
+        """
+    )
+    parser.add_argument('command', choices=['start', 'stop', 'status', 'serve'],
+                        help="'serve' runs in the foreground")
+    parser.add_argument('--socket', help=f'Socket path (default: ${SOCKET_ENV} or {DEFAULT_SOCKET})')
+    parser.add_argument('--idle-timeout', type=float, default=DEFAULT_IDLE_TIMEOUT,
+                        help='Exit after this many idle seconds, 0 = never (default: 1800)')
+    parser.add_argument('--log', help='Log file for the background daemon (default: next to the socket)')
+
+    args = parser.parse_args()
+
+    if not hasattr(socket, "AF_UNIX"):
+        print("❌ The query daemon needs Unix domain sockets", file=sys.stderr)
+        return 1
+
+    socket_path = Path(args.socket) if args.socket else get_socket_path()
+
+    if args.command == 'serve':
+        return serve(socket_path, args.idle_timeout)
+
+    if args.command == 'start':
+        log_path = Path(args.log) if args.log else socket_path.with_suffix(".log")
+        socket_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(log_path, "a") as log:
+            subprocess.Popen(
+                [sys.executable, str(Path(__file__).resolve()), 'serve',
+                 '--socket', str(socket_path), '--idle-timeout', str(args.idle_timeout)],
+                stdout=log, stderr=subprocess.STDOUT, stdin=subprocess.DEVNULL,
+                start_new_session=True,
+            )
+        for _ in range(100):
+            time.sleep(0.1)
+            try:
+                status = send_request({"op": "status"}, socket_path, timeout=2)
+                print(f"🚀 Daemon started (pid {status['pid']}) on {socket_path}")
+                return 0
+            except OSError:
+                continue
+        print(f"❌ Daemon did not start; see {log_path}", file=sys.stderr)
+        return 1
+
+    try:
+        if args.command == 'status':
+            status = send_request({"op": "status"}, socket_path, timeout=5)
+            print(f"\n🟢 Daemon running on {socket_path}")
+            print(f"   PID: {status['pid']}")
+            print(f"   Uptime: {status['uptime_seconds']:.0f}s")
+            print(f"   Requests: {status['requests']} (pool hits: {status['pool_hits']}, "
+                  f"misses: {status['pool_misses']})")
+            print(f"   Tools loaded: {', '.join(status['tools_loaded']) or 'none'}")
+            for obj in status['warm_objects']:
+                print(f"   • {obj}")
+        else:
+            send_request({"op": "stop"}, socket_path, timeout=5)
+            print(f"🛑 Daemon on {socket_path} stopping")
+    except (OSError, ValueError):
+        print(f"⚪ No daemon running on {socket_path}")
+        return 1 if args.command == 'status' else 0
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
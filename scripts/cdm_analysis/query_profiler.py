@@ -0,0 +1,444 @@
+#!/usr/bin/env python3
+"""
+Query-level profiling and a slow-query log for the CDM query tools.
+
+``QueryRunner`` runs the SQL of ``enigma_query.py sql`` / ``unused-reads-sql``
+and of the NL and schema-aware query tools (through ``QueryGuard.execute``).
+Each query is profiled with DuckDB's JSON profiler: latency, CPU time, rows
+scanned and returned, peak buffer memory and the slowest operators. Queries
+slower than a threshold are appended to a JSON Lines slow-query log with a
+hash of the SQL text and the database fingerprint (see ``db_fingerprint.py``),
+so runs of the same query against the same load can be compared.
+
+Each log record has a ``sql`` field, so the log is also a query log for
+``cdm_indexes.py advise``.
+
+Usage:
+    # Rank logged queries by total time
+    python query_profiler.py report --top 20
+
+    # Worst single runs against one database, as JSON
+    python query_profiler.py report --sort max --db cdm_store.db --json
+
+Set ``CDM_SLOW_QUERY_LOG`` to move the log (``off`` disables it),
+``CDM_SLOW_QUERY_MS`` to change the threshold (default 1000; 0 logs every
+query) and ``CDM_QUERY_PROFILE=off`` to skip DuckDB profiling.
+"""
+
+import hashlib
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    from linkml_coral.utils.instrumentation import duckdb_profile
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+    from linkml_coral.utils.instrumentation import duckdb_profile
+
+try:
+    from db_fingerprint import compute_fingerprint, default_mode
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    from db_fingerprint import compute_fingerprint, default_mode
+
+DEFAULT_LOG_PATH = Path.home() / ".cache" / "linkml-coral" / "slow_queries.jsonl"
+LOG_ENV = "CDM_SLOW_QUERY_LOG"
+THRESHOLD_ENV = "CDM_SLOW_QUERY_MS"
+PROFILE_ENV = "CDM_QUERY_PROFILE"
+DEFAULT_THRESHOLD_MS = 1000.0
+MAX_SQL_CHARS = 10_000
+SORT_KEYS = ("total", "max", "count", "memory", "scanned")
+
+_OFF = ("0", "off", "false", "no")
+_MB = 1024 ** 2
+
+
+def normalize_sql(sql: str) -> str:
+    """SQL with whitespace collapsed and any trailing semicolon removed."""
+    return " ".join(sql.split()).rstrip(";").strip()
+
+
+def sql_hash(sql: str) -> str:
+    """Short hash of the normalized SQL text, identifying a query across runs."""
+    return hashlib.sha256(normalize_sql(sql).encode()).hexdigest()[:16]
+
+
+def get_slow_query_log_path() -> Optional[Path]:
+    """Slow-query log from ``CDM_SLOW_QUERY_LOG`` (None if it is 'off')."""
+    value = os.environ.get(LOG_ENV)
+    if value is None:
+        return DEFAULT_LOG_PATH
+    if value.lower() in _OFF or not value:
+        return None
+    return Path(value)
+
+
+def default_threshold_ms() -> float:
+    """Slow-query threshold from ``CDM_SLOW_QUERY_MS`` (default: 1000)."""
+    try:
+        return float(os.environ[THRESHOLD_ENV])
+    except (KeyError, ValueError):
+        return DEFAULT_THRESHOLD_MS
+
+
+@dataclass
+class QueryProfile:
+    """Cost of one query run by a QueryRunner."""
+
+    sql: str
+    tool: str
+    label: Optional[str] = None
+    wall_ms: float = 0.0
+    cpu_ms: Optional[float] = None
+    rows: Optional[int] = None
+    rows_scanned: Optional[int] = None
+    peak_memory_bytes: Optional[int] = None
+    bytes_read: Optional[int] = None
+    operators: List[Dict[str, Any]] = field(default_factory=list)
+    error: Optional[str] = None
+    logged: bool = False
+
+    def summary(self) -> str:
+        """One line of latency, rows and memory figures."""
+        parts = [f"{self.wall_ms:,.1f} ms"]
+        if self.rows is not None:
+            parts.append(f"{self.rows:,} rows")
+        if self.rows_scanned is not None:
+            parts.append(f"{self.rows_scanned:,} scanned")
+        if self.peak_memory_bytes is not None:
+            parts.append(f"peak {self.peak_memory_bytes / _MB:,.1f} MB")
+        return ", ".join(parts)
+
+
+class QueryRunner:
+    """Runs SQL on a DuckDB connection, profiling it and logging slow queries."""
+
+    def __init__(
+        self,
+        conn,
+        db_path=None,
+        tool: str = "cdm",
+        profile: Optional[bool] = None,
+        threshold_ms: Optional[float] = None,
+        log_path=None,
+        show: bool = False
+    ):
+        """
+        Create a runner.
+
+        Args:
+            conn: DuckDB connection
+            db_path: Database file, fingerprinted for log records (None for
+                in-memory databases)
+            tool: Name of the calling tool, recorded in the log
+            profile: Enable DuckDB profiling (None: ``CDM_QUERY_PROFILE``, on
+                by default)
+            threshold_ms: Log queries at least this slow (None:
+                ``CDM_SLOW_QUERY_MS``)
+            log_path: Slow-query log (None: ``CDM_SLOW_QUERY_LOG`` or the
+                default; False to disable logging)
+            show: Print each query's profile to stderr
+        """
+        self.conn = conn
+        self.db_path = Path(db_path) if db_path and str(db_path) != ":memory:" else None
+        self.tool = tool
+        if profile is None:
+            profile = os.environ.get(PROFILE_ENV, "").lower() not in _OFF
+        self.profile = profile
+        self.threshold_ms = default_threshold_ms() if threshold_ms is None else threshold_ms
+        self.log_path = get_slow_query_log_path() if log_path is None else (Path(log_path) if log_path else None)
+        self.show = show
+        self.last: Optional[QueryProfile] = None
+        self._fingerprint: Optional[Dict[str, Any]] = None
+
+        if self.profile:
+            try:
+                conn.execute("SET enable_profiling = 'no_output'")
+            except Exception:
+                self.profile = False
+
+    @contextmanager
+    def track(self, sql: str, label: Optional[str] = None) -> Iterator[QueryProfile]:
+        """
+        Profile the statement a block runs (its last one, if several).
+
+        Use this for statements whose results are consumed elsewhere, e.g.
+        streamed to an export file. Set ``rows`` on the yielded profile when
+        DuckDB profiling is off.
+
+        Args:
+            sql: The statement, as recorded in the log
+            label: Short description (e.g. 'summary', 'export')
+
+        Yields:
+            The QueryProfile, filled in when the block exits
+        """
+        current = QueryProfile(sql=sql, tool=self.tool, label=label)
+        start = time.perf_counter()
+        try:
+            yield current
+        except BaseException as e:
+            current.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            current.wall_ms = round((time.perf_counter() - start) * 1000, 3)
+            # A failed statement leaves the previous statement's profile behind
+            if self.profile and current.error is None:
+                self._apply_profile(current)
+            self.last = current
+            if self.show:
+                print(f"⏱️  {current.label or current.tool}: {current.summary()}", file=sys.stderr)
+                for op in current.operators:
+                    print(f"     {op['type']:<24} {(op['seconds'] or 0) * 1000:>10.1f} ms "
+                          f"{op['rows'] or 0:>12,} rows", file=sys.stderr)
+            if self.log_path and current.wall_ms >= self.threshold_ms:
+                self._log(current)
+
+    def execute(
+        self,
+        sql: str,
+        params: Optional[Sequence[Any]] = None,
+        label: Optional[str] = None
+    ) -> Tuple[List[str], List[tuple]]:
+        """
+        Run a query and fetch all rows.
+
+        Args:
+            sql: SQL statement
+            params: Query parameters
+            label: Short description recorded in the log
+
+        Returns:
+            Tuple of (column names, rows)
+        """
+        with self.track(sql, label) as current:
+            cursor = self.conn.execute(sql, list(params) if params else [])
+            columns = [desc[0] for desc in cursor.description] if cursor.description else []
+            rows = cursor.fetchall()
+            current.rows = len(rows)
+        return columns, rows
+
+    def fetchone(self, sql: str, params: Optional[Sequence[Any]] = None, label: Optional[str] = None):
+        """Run a query and return its first row (see ``execute``)."""
+        with self.track(sql, label) as current:
+            row = self.conn.execute(sql, list(params) if params else []).fetchone()
+            current.rows = 0 if row is None else 1
+        return row
+
+    def _apply_profile(self, current: QueryProfile) -> None:
+        profile = duckdb_profile(self.conn)
+        if not profile:
+            return
+        if "cpu_time" in profile:
+            current.cpu_ms = round(profile["cpu_time"] * 1000, 3)
+        current.rows_scanned = profile.get("cumulative_rows_scanned")
+        current.peak_memory_bytes = profile.get("system_peak_buffer_memory")
+        current.bytes_read = profile.get("total_bytes_read")
+        current.operators = profile.get("operators", [])
+        if current.rows is None:
+            current.rows = profile.get("rows_returned")
+
+    def fingerprint(self) -> Dict[str, Any]:
+        """The database fingerprint recorded with log entries (computed once)."""
+        if self._fingerprint is None:
+            self._fingerprint = {}
+            # Never hash a whole store just to log one query
+            mode = "sampled" if default_mode() == "full" else default_mode()
+            try:
+                fingerprint = compute_fingerprint(self.db_path, mode) if self.db_path else None
+            except OSError:
+                fingerprint = None
+            if fingerprint is not None:
+                self._fingerprint = {"db_fingerprint": fingerprint.digest, "fingerprint_mode": fingerprint.mode}
+        return self._fingerprint
+
+    def _log(self, current: QueryProfile) -> None:
+        record = {
+            "ts": datetime.now().isoformat(timespec="seconds"),
+            "tool": current.tool,
+            "label": current.label,
+            "sql_hash": sql_hash(current.sql),
+            "sql": normalize_sql(current.sql)[:MAX_SQL_CHARS],
+            "db_path": str(self.db_path.resolve()) if self.db_path else None,
+            **self.fingerprint(),
+            **{k: v for k, v in asdict(current).items() if k not in ("sql", "tool", "label", "logged")},
+        }
+        # One append per record, so concurrent tools don't interleave lines
+        try:
+            self.log_path.parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(self.log_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, (json.dumps(record, default=str) + "\n").encode())
+            finally:
+                os.close(fd)
+            current.logged = True
+        except OSError as e:
+            print(f"⚠️  Could not write slow-query log {self.log_path}: {e}", file=sys.stderr)
+
+
+def read_slow_query_log(path=None) -> List[Dict[str, Any]]:
+    """
+    Records of a slow-query log.
+
+    Args:
+        path: Log file (None: ``CDM_SLOW_QUERY_LOG`` or the default)
+
+    Returns:
+        List of records (unreadable lines are skipped)
+    """
+    path = Path(path) if path else get_slow_query_log_path()
+    if path is None or not path.exists():
+        return []
+    records = []
+    with open(path) as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue
+    return records
+
+
+def rank_slow_queries(
+    records: List[Dict[str, Any]],
+    sort: str = "total",
+    tool: Optional[str] = None,
+    db_path=None
+) -> List[Dict[str, Any]]:
+    """
+    Aggregate slow-query records per SQL text, worst first.
+
+    Args:
+        records: Records from ``read_slow_query_log()``
+        sort: 'total' (time), 'max' (single run), 'count', 'memory' (peak)
+            or 'scanned' (rows)
+        tool: Only records of this tool
+        db_path: Only records for this database file
+
+    Returns:
+        List of dicts with sql_hash, sql, runs, total/mean/max ms, peak
+        memory, rows scanned, tools, fingerprints, last run and the slowest
+        run's top operator
+    """
+    if sort not in SORT_KEYS:
+        raise ValueError(f"Unknown sort {sort!r} (choose from {', '.join(SORT_KEYS)})")
+    db_filter = str(Path(db_path).resolve()) if db_path else None
+
+    groups: Dict[str, Dict[str, Any]] = {}
+    for record in records:
+        if tool and record.get("tool") != tool:
+            continue
+        if db_filter and record.get("db_path") != db_filter:
+            continue
+        wall = record.get("wall_ms") or 0.0
+        group = groups.setdefault(record.get("sql_hash") or sql_hash(record.get("sql", "")), {
+            "sql_hash": record.get("sql_hash"), "sql": record.get("sql", ""), "runs": 0,
+            "total_ms": 0.0, "max_ms": 0.0, "peak_memory_mb": None, "max_rows_scanned": None,
+            "errors": 0, "tools": set(), "fingerprints": set(), "last_run": None, "top_operator": None,
+        })
+        group["runs"] += 1
+        group["total_ms"] += wall
+        group["errors"] += 1 if record.get("error") else 0
+        group["tools"].add(record.get("tool"))
+        if record.get("db_fingerprint"):
+            group["fingerprints"].add(record["db_fingerprint"])
+        group["last_run"] = max(filter(None, (group["last_run"], record.get("ts"))), default=None)
+        if wall >= group["max_ms"]:
+            group["max_ms"] = wall
+            operators = record.get("operators") or []
+            group["top_operator"] = operators[0]["type"] if operators else None
+        peak = record.get("peak_memory_bytes")
+        if peak is not None:
+            group["peak_memory_mb"] = max(group["peak_memory_mb"] or 0.0, round(peak / _MB, 1))
+        scanned = record.get("rows_scanned")
+        if scanned is not None:
+            group["max_rows_scanned"] = max(group["max_rows_scanned"] or 0, scanned)
+
+    ranked = []
+    for group in groups.values():
+        group["mean_ms"] = round(group["total_ms"] / group["runs"], 3)
+        group["total_ms"] = round(group["total_ms"], 3)
+        group["tools"] = sorted(filter(None, group["tools"]))
+        group["fingerprints"] = len(group["fingerprints"])
+        ranked.append(group)
+
+    sort_value = {
+        "total": lambda g: g["total_ms"],
+        "max": lambda g: g["max_ms"],
+        "count": lambda g: g["runs"],
+        "memory": lambda g: g["peak_memory_mb"] or 0.0,
+        "scanned": lambda g: g["max_rows_scanned"] or 0,
+    }[sort]
+    return sorted(ranked, key=lambda g: (sort_value(g), g["total_ms"]), reverse=True)
+
+
+def print_slow_query_report(ranked: List[Dict[str, Any]], top: int = 20) -> None:
+    """Print the worst queries from ``rank_slow_queries()``."""
+    if not ranked:
+        print("No slow queries logged.")
+        return
+    print(f"\n🐢 Slowest queries ({min(top, len(ranked))} of {len(ranked)})")
+    print(f"  {'#':>3} {'Runs':>5} {'Total (s)':>10} {'Max (s)':>9} {'Mean (s)':>9} "
+          f"{'Peak MB':>9} {'Rows scanned':>14}  Hash / top operator")
+    for i, group in enumerate(ranked[:top], 1):
+        peak = f"{group['peak_memory_mb']:,.1f}" if group["peak_memory_mb"] is not None else "n/a"
+        scanned = f"{group['max_rows_scanned']:,}" if group["max_rows_scanned"] is not None else "n/a"
+        errors = f", {group['errors']} failed" if group["errors"] else ""
+        print(f"  {i:>3} {group['runs']:>5} {group['total_ms'] / 1000:>10.2f} {group['max_ms'] / 1000:>9.2f} "
+              f"{group['mean_ms'] / 1000:>9.2f} {peak:>9} {scanned:>14}  "
+              f"{group['sql_hash']} / {group['top_operator'] or 'n/a'}")
+        sql = group["sql"]
+        print(f"        {sql[:117] + '...' if len(sql) > 120 else sql}")
+        print(f"        tools: {', '.join(group['tools']) or 'n/a'}; "
+              f"{group['fingerprints']} database load(s); last run {group['last_run']}{errors}")
+
+
+def main():
+    """Report on or clear the slow-query log."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Slow-query log of the CDM query tools')
+    parser.add_argument('--log', help=f'Slow-query log (default: ${LOG_ENV} or {DEFAULT_LOG_PATH})')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    report = subparsers.add_parser('report', help='Rank logged queries, worst first')
+    report.add_argument('--top', type=int, default=20, help='Queries to show (default: 20)')
+    report.add_argument('--sort', choices=SORT_KEYS, default='total',
+                        help='Rank by total time, slowest run, run count, peak memory or rows scanned '
+                             '(default: total)')
+    report.add_argument('--tool', help='Only queries from this tool (e.g. enigma_query.sql, nl_sql_query)')
+    report.add_argument('--db', help='Only queries against this database file')
+    report.add_argument('--json', action='store_true', help='Output the ranking as JSON')
+
+    subparsers.add_parser('clear', help='Delete the slow-query log')
+
+    args = parser.parse_args()
+    log_path = Path(args.log) if args.log else get_slow_query_log_path()
+    if log_path is None:
+        print(f"❌ The slow-query log is disabled ({LOG_ENV}=off)")
+        return 1
+
+    if args.command == 'clear':
+        if log_path.exists():
+            log_path.unlink()
+        print(f"🧹 Cleared {log_path}")
+        return 0
+
+    ranked = rank_slow_queries(read_slow_query_log(log_path), args.sort, args.tool, args.db)
+    if args.json:
+        print(json.dumps(ranked[:args.top], indent=2, default=str))
+    else:
+        print(f"📒 {log_path}")
+        print_slow_query_report(ranked, args.top)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
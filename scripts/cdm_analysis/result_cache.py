@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+On-disk result cache for repeated analytical queries.
+
+Results are keyed by (query kind, normalized parameters, database
+fingerprint). The fingerprint combines the load ID from the loader's
+``<db>.manifest.json`` (when present) with the database file's size and
+modification time, so reloading a store invalidates its cached results
+automatically.
+
+Each entry is a small JSON file (key fields, summary payload) plus an Arrow
+IPC file holding the result rows. The cache is bounded by size and evicts the
+least recently used entries first.
+
+Usage:
+    # Show cache contents / clear the cache
+    python result_cache.py stats
+    python result_cache.py clear
+
+Set ``CDM_RESULT_CACHE=off`` to disable caching, or
+``CDM_RESULT_CACHE_DIR`` to move the cache.
+"""
+
+import hashlib
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "linkml-coral" / "results"
+DEFAULT_MAX_BYTES = 1024 ** 3  # 1 GiB
+
+CACHE_DIR_ENV = "CDM_RESULT_CACHE_DIR"
+DISABLE_ENV = "CDM_RESULT_CACHE"
+
+
+def get_manifest_path(db_path) -> Path:
+    """Path of the load manifest written next to a store by the loader."""
+    db_path = Path(db_path)
+    return db_path.with_name(db_path.name + ".manifest.json")
+
+
+def database_fingerprint(db_path) -> Optional[str]:
+    """
+    Fingerprint identifying one load of a database file.
+
+    Args:
+        db_path: Path to the DuckDB database
+
+    Returns:
+        Hex digest, or None if the database does not exist
+    """
+    db_path = Path(db_path)
+    if not db_path.exists():
+        return None
+    stat = db_path.stat()
+    parts = [str(db_path.resolve()), str(stat.st_size), str(stat.st_mtime_ns)]
+
+    manifest_path = get_manifest_path(db_path)
+    if manifest_path.exists():
+        try:
+            with open(manifest_path) as f:
+                parts.append(str(json.load(f).get('load_id', '')))
+        except (OSError, ValueError):
+            pass
+
+    return hashlib.sha256("|".join(parts).encode()).hexdigest()[:32]
+
+
+def normalize_params(params: Optional[Dict[str, Any]]) -> str:
+    """Canonical JSON for query parameters (sorted keys, None values dropped)."""
+    params = {k: v for k, v in (params or {}).items() if v is not None}
+    return json.dumps(params, sort_keys=True, default=str)
+
+
+@dataclass
+class CachedResult:
+    """A result read back from the cache."""
+
+    rows: Optional[List[Any]]
+    payload: Any
+    created: float
+
+
+@dataclass
+class ResultCache:
+    """Size-bounded LRU cache of query results on local disk."""
+
+    cache_dir: Path = field(default_factory=lambda: Path(os.environ.get(CACHE_DIR_ENV, DEFAULT_CACHE_DIR)))
+    max_bytes: int = DEFAULT_MAX_BYTES
+    enabled: bool = field(default_factory=lambda: os.environ.get(DISABLE_ENV, "").lower()
+                          not in ("0", "off", "false", "no"))
+    events: List[Dict[str, Any]] = field(default_factory=list)
+
+    def __post_init__(self):
+        self.cache_dir = Path(self.cache_dir)
+
+    def make_key(self, kind: str, params: Optional[Dict[str, Any]], fingerprint: str) -> str:
+        """Cache key for a query kind, its parameters and a database fingerprint."""
+        raw = f"{kind}|{normalize_params(params)}|{fingerprint}"
+        return hashlib.sha256(raw.encode()).hexdigest()[:32]
+
+    def get(self, kind: str, params: Optional[Dict[str, Any]], db_path) -> Optional[CachedResult]:
+        """
+        Look up a cached result.
+
+        Args:
+            kind: Query kind (e.g., 'unused_reads', 'stats')
+            params: Query parameters
+            db_path: Database the query runs against
+
+        Returns:
+            CachedResult on a hit, None on a miss (or when caching is disabled)
+        """
+        if not self.enabled:
+            return None
+        fingerprint = database_fingerprint(db_path)
+        if fingerprint is None:
+            return None
+
+        key = self.make_key(kind, params, fingerprint)
+        meta_path = self.cache_dir / f"{key}.json"
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            rows = meta.get('rows')
+            if meta.get('rows_file'):
+                rows = _read_rows(self.cache_dir / meta['rows_file'])
+        except (OSError, ValueError):
+            self._record(kind, key, "miss")
+            return None
+
+        os.utime(meta_path)  # Mark as recently used
+        self._record(kind, key, "hit", rows)
+        return CachedResult(rows=rows, payload=meta.get('payload'), created=meta.get('created', 0))
+
+    def put(
+        self,
+        kind: str,
+        params: Optional[Dict[str, Any]],
+        db_path,
+        rows: Optional[List[Any]] = None,
+        payload: Any = None
+    ) -> None:
+        """
+        Store a result.
+
+        Args:
+            kind: Query kind
+            params: Query parameters
+            db_path: Database the query ran against
+            rows: Result rows (dicts are stored as Arrow, anything else as JSON)
+            payload: JSON-serializable summary stored with the rows
+        """
+        if not self.enabled:
+            return
+        fingerprint = database_fingerprint(db_path)
+        if fingerprint is None:
+            return
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        key = self.make_key(kind, params, fingerprint)
+        meta = {
+            'kind': kind,
+            'params': json.loads(normalize_params(params)),
+            'db_path': str(Path(db_path).resolve()),
+            'fingerprint': fingerprint,
+            'created': time.time(),
+            'payload': payload,
+        }
+
+        if rows and all(isinstance(r, dict) for r in rows) and _write_rows(self.cache_dir / f"{key}.arrow", rows):
+            meta['rows_file'] = f"{key}.arrow"
+        else:
+            meta['rows'] = rows
+
+        tmp_path = self.cache_dir / f"{key}.json.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(meta, f, default=str)
+        tmp_path.replace(self.cache_dir / f"{key}.json")
+
+        self._invalidate_stale(meta['db_path'], fingerprint)
+        self.evict()
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """All cache entries with their size and last access time, oldest first."""
+        entries = []
+        if not self.cache_dir.exists():
+            return entries
+        for meta_path in self.cache_dir.glob("*.json"):
+            try:
+                with open(meta_path) as f:
+                    meta = json.load(f)
+            except (OSError, ValueError):
+                continue
+            files = [meta_path]
+            if meta.get('rows_file'):
+                files.append(self.cache_dir / meta['rows_file'])
+            meta['files'] = files
+            meta['size_bytes'] = sum(p.stat().st_size for p in files if p.exists())
+            meta['last_used'] = meta_path.stat().st_mtime
+            entries.append(meta)
+        entries.sort(key=lambda e: e['last_used'])
+        return entries
+
+    def evict(self) -> int:
+        """Remove least recently used entries until the cache fits in max_bytes."""
+        entries = self.entries()
+        total = sum(e['size_bytes'] for e in entries)
+        removed = 0
+        for entry in entries:
+            if total <= self.max_bytes:
+                break
+            _remove(entry['files'])
+            total -= entry['size_bytes']
+            removed += 1
+        return removed
+
+    def clear(self) -> int:
+        """Remove every cache entry."""
+        entries = self.entries()
+        for entry in entries:
+            _remove(entry['files'])
+        return len(entries)
+
+    def drain_events(self) -> List[Dict[str, Any]]:
+        """Return and reset the hit/miss events recorded since the last call."""
+        events, self.events = self.events, []
+        return events
+
+    def _invalidate_stale(self, db_path: str, fingerprint: str) -> None:
+        """Drop entries for the same database from earlier loads."""
+        for entry in self.entries():
+            if entry.get('db_path') == db_path and entry.get('fingerprint') != fingerprint:
+                _remove(entry['files'])
+
+    def _record(self, kind: str, key: str, status: str, rows: Optional[List[Any]] = None) -> None:
+        event = {'kind': kind, 'key': key, 'status': status}
+        if rows is not None:
+            event['rows'] = len(rows)
+        self.events.append(event)
+
+
+def _write_rows(path: Path, rows: List[Dict[str, Any]]) -> bool:
+    """
+    Write dict rows as an Arrow IPC file.
+
+    Columns are the union of all rows' keys and each column's type is inferred
+    from every row, not just the first. Returns False (store the rows as JSON)
+    if Arrow cannot type them, or if rows have different keys: Arrow would read
+    missing keys back as None, so a hit would not match a fresh run.
+    """
+    columns: Dict[str, List[Any]] = {}
+    for row in rows:
+        for key in row:
+            columns.setdefault(key, [])
+    if any(len(row) != len(columns) for row in rows):
+        return False
+    try:
+        import pyarrow as pa
+        for row in rows:
+            for key, values in columns.items():
+                values.append(row[key])
+        table = pa.Table.from_pydict(columns)
+        with pa.OSFile(str(path), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        return True
+    except Exception:
+        path.unlink(missing_ok=True)
+        return False
+
+
+def _read_rows(path: Path) -> List[Dict[str, Any]]:
+    import pyarrow as pa
+    with pa.memory_map(str(path)) as source:
+        return pa.ipc.open_file(source).read_all().to_pylist()
+
+
+def _remove(paths) -> None:
+    for path in paths:
+        Path(path).unlink(missing_ok=True)
+
+
+def main():
+    """Inspect or clear the result cache."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='CDM/ENIGMA query result cache')
+    parser.add_argument('command', choices=['stats', 'clear'], help='Action to perform')
+    parser.add_argument('--cache-dir', help=f'Cache directory (default: {DEFAULT_CACHE_DIR})')
+    args = parser.parse_args()
+
+    cache = ResultCache(cache_dir=Path(args.cache_dir)) if args.cache_dir else ResultCache()
+
+    if args.command == 'clear':
+        print(f"🗑️  Removed {cache.clear()} cached results from {cache.cache_dir}")
+        return 0
+
+    entries = cache.entries()
+    total = sum(e['size_bytes'] for e in entries)
+    print(f"\n📦 Result cache: {cache.cache_dir}")
+    print(f"   Entries: {len(entries)}  Size: {total / 1024 / 1024:.2f} MB "
+          f"(limit {cache.max_bytes / 1024 / 1024:.0f} MB)\n")
+    for entry in reversed(entries):
+        used = time.strftime('%Y-%m-%d %H:%M', time.localtime(entry['last_used']))
+        print(f"  {used}  {entry['kind']:<20} {entry['size_bytes'] / 1024:>8.1f} KB  "
+              f"{Path(entry['db_path']).name}  {json.dumps(entry['params'])}")
+    return 0
+
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(main())
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Streaming result export for the query CLIs.
+
+Query results are written straight from DuckDB record batches
+(``to_arrow_reader``) so memory stays constant no matter how many rows are
+exported. The output format is inferred from the file extension:
+
+- ``.parquet`` / ``.pq``              Parquet
+- ``.arrow`` / ``.ipc`` / ``.feather`` Arrow IPC file
+- ``.csv``                            CSV with header
+- ``.ndjson`` / ``.jsonl``            Newline-delimited JSON
+- ``.json``                           JSON envelope ``{..., "results": [...]}``
+                                      (the historical ``--export`` layout)
+
+Query metadata (parameters, summaries, provenance IDs) goes into the JSON
+envelope, or into the schema metadata for Parquet and Arrow files.
+"""
+
+import itertools
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import pyarrow as pa
+
+EXPORT_FORMATS = ("json", "ndjson", "csv", "parquet", "arrow")
+
+DEFAULT_BATCH_SIZE = 100_000
+
+# Batches read ahead to type columns that are all None in the first batch
+SCHEMA_LOOKAHEAD_BATCHES = 8
+
+METADATA_KEY = b"cdm_export"
+
+_SUFFIX_FORMATS = {
+    ".json": "json",
+    ".ndjson": "ndjson",
+    ".jsonl": "ndjson",
+    ".csv": "csv",
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".arrow": "arrow",
+    ".ipc": "arrow",
+    ".feather": "arrow",
+}
+
+
+def infer_export_format(path: str, export_format: Optional[str] = None) -> str:
+    """
+    Resolve the export format for a path.
+
+    Args:
+        path: Output file path
+        export_format: Explicit format (overrides the file extension)
+
+    Returns:
+        One of EXPORT_FORMATS (defaults to 'json' for unknown extensions)
+    """
+    if export_format:
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError(
+                f"Unknown export format '{export_format}' (expected one of {', '.join(EXPORT_FORMATS)})"
+            )
+        return export_format
+    return _SUFFIX_FORMATS.get(Path(path).suffix.lower(), "json")
+
+
+def export_query(
+    conn,
+    sql: str,
+    path: str,
+    params: Optional[Sequence[Any]] = None,
+    export_format: Optional[str] = None,
+    metadata: Optional[Dict[str, Any]] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE
+) -> int:
+    """
+    Stream the result of a DuckDB query to a file.
+
+    Args:
+        conn: DuckDB connection
+        sql: SELECT statement to export (push LIMIT/filters into it)
+        path: Output file path
+        params: Query parameters
+        export_format: Explicit format (default: inferred from extension)
+        metadata: Extra query metadata stored alongside the rows
+        batch_size: Rows per record batch
+
+    Returns:
+        Number of rows written
+    """
+    result = conn.execute(sql, list(params) if params else [])
+    if hasattr(result, "to_arrow_reader"):
+        reader = result.to_arrow_reader(batch_size)
+    else:
+        # DuckDB < 1.4
+        reader = result.fetch_record_batch(batch_size)
+    return write_batches(reader.schema, reader, path, export_format, metadata)
+
+
+def export_rows(
+    rows: Iterable[Dict[str, Any]],
+    path: str,
+    export_format: Optional[str] = None,
+    metadata: Optional[Dict[str, Any]] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE
+) -> int:
+    """
+    Export an iterable of dict rows, batching them into Arrow record batches.
+
+    Used for results that are produced in Python rather than by a single SQL
+    query. Only ``batch_size`` rows are materialized at a time, plus up to
+    ``SCHEMA_LOOKAHEAD_BATCHES`` batches read ahead while a column is still
+    all None.
+
+    Returns:
+        Number of rows written
+    """
+    batches = _batches_from_rows(rows, batch_size)
+    schema, batches = _infer_schema(batches)
+    return write_batches(schema, batches, path, export_format, metadata)
+
+
+def write_batches(
+    schema: pa.Schema,
+    batches: Iterable[pa.RecordBatch],
+    path: str,
+    export_format: Optional[str] = None,
+    metadata: Optional[Dict[str, Any]] = None
+) -> int:
+    """
+    Write record batches to a file in the requested format.
+
+    Returns:
+        Number of rows written
+    """
+    export_format = infer_export_format(path, export_format)
+    path = Path(path)
+    metadata = metadata or {}
+
+    if export_format == "parquet":
+        import pyarrow.parquet as pq
+        schema = _with_metadata(schema, metadata)
+        rows = 0
+        with pq.ParquetWriter(path, schema) as writer:
+            for batch in batches:
+                writer.write_batch(batch.replace_schema_metadata(schema.metadata))
+                rows += batch.num_rows
+        return rows
+
+    if export_format == "arrow":
+        schema = _with_metadata(schema, metadata)
+        rows = 0
+        with pa.OSFile(str(path), "wb") as sink, pa.ipc.new_file(sink, schema) as writer:
+            for batch in batches:
+                writer.write_batch(batch.replace_schema_metadata(schema.metadata))
+                rows += batch.num_rows
+        return rows
+
+    if export_format == "csv":
+        import pyarrow.csv as pacsv
+        rows = 0
+        with pacsv.CSVWriter(str(path), schema) as writer:
+            for batch in batches:
+                writer.write_batch(batch)
+                rows += batch.num_rows
+        return rows
+
+    if export_format == "ndjson":
+        rows = 0
+        with open(path, "w") as f:
+            for record in _iter_records(batches):
+                f.write(json.dumps(record, default=str))
+                f.write("\n")
+                rows += 1
+        return rows
+
+    # JSON envelope: metadata keys first, then the rows streamed into "results"
+    rows = 0
+    with open(path, "w") as f:
+        f.write("{\n")
+        for key, value in metadata.items():
+            if key == "results":
+                continue
+            f.write(f"  {json.dumps(key)}: ")
+            f.write(_indent(json.dumps(value, indent=2, default=str)))
+            f.write(",\n")
+        f.write('  "results": [')
+        for record in _iter_records(batches):
+            f.write(",\n    " if rows else "\n    ")
+            f.write(_indent(json.dumps(record, indent=2, default=str), 4))
+            rows += 1
+        f.write("\n  ]\n}\n" if rows else "]\n}\n")
+    return rows
+
+
+def _with_metadata(schema: pa.Schema, metadata: Dict[str, Any]) -> pa.Schema:
+    """Attach query metadata to an Arrow schema."""
+    if not metadata:
+        return schema
+    existing = dict(schema.metadata or {})
+    existing[METADATA_KEY] = json.dumps(metadata, default=str).encode()
+    return schema.with_metadata(existing)
+
+
+def _iter_records(batches: Iterable[pa.RecordBatch]) -> Iterator[Dict[str, Any]]:
+    """Yield one dict per row, converting a single batch at a time."""
+    for batch in batches:
+        yield from batch.to_pylist()
+
+
+def _batches_from_rows(rows: Iterable[Dict[str, Any]], batch_size: int) -> Iterator[pa.RecordBatch]:
+    """Group dict rows into record batches."""
+    chunk: List[Dict[str, Any]] = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= batch_size:
+            yield pa.RecordBatch.from_pylist(chunk)
+            chunk = []
+    if chunk:
+        yield pa.RecordBatch.from_pylist(chunk)
+
+
+def _infer_schema(batches: Iterator[pa.RecordBatch]) -> Tuple[pa.Schema, Iterator[pa.RecordBatch]]:
+    """
+    Schema for a stream of row batches, and the batches cast to it.
+
+    Columns that are all None in the first batch have Arrow's null type.
+    Batches are read ahead until every column has a concrete type, and the
+    read-ahead schemas are unified with type promotion. Columns still None
+    after ``SCHEMA_LOOKAHEAD_BATCHES`` batches become strings, so values
+    that show up later are written as text.
+    """
+    buffered: List[pa.RecordBatch] = []
+    schema = pa.schema([])
+    exhausted = False
+    while len(buffered) < SCHEMA_LOOKAHEAD_BATCHES:
+        batch = next(batches, None)
+        if batch is None:
+            exhausted = True
+            break
+        buffered.append(batch)
+        schema = pa.unify_schemas([b.schema for b in buffered], promote_options="permissive")
+        if not _null_fields(schema):
+            break
+
+    if not exhausted:
+        for name in _null_fields(schema):
+            index = schema.get_field_index(name)
+            schema = schema.set(index, schema.field(index).with_type(pa.string()))
+
+    def cast_all() -> Iterator[pa.RecordBatch]:
+        for batch in itertools.chain(buffered, batches):
+            yield batch if batch.schema.equals(schema) else batch.cast(schema)
+
+    return schema, cast_all()
+
+
+def _null_fields(schema: pa.Schema) -> List[str]:
+    """Names of the columns of a schema that have Arrow's null type."""
+    return [field.name for field in schema if pa.types.is_null(field.type)]
+
+
+def _indent(text: str, spaces: int = 2) -> str:
+    """Indent continuation lines of a pretty-printed JSON value."""
+    return text.replace("\n", "\n" + " " * spaces)
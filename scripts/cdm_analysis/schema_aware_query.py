@@ -18,29 +18,29 @@ Usage:
 
     # Generate query suggestions
     python schema_aware_query.py --db cdm_store.db --suggest-queries
+
+    # Answer a suggested query offline (no API key needed)
+    python schema_aware_query.py --db cdm_store.db "Count Sample records" --provider template
 """
 
 import argparse
 import sys
 import json
-import os
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 import duckdb
 
-try:
-    from linkml_runtime.utils.schemaview import SchemaView
-except ImportError:
-    print("Error: linkml-runtime package not installed.", file=sys.stderr)
-    print("Install it with: uv sync", file=sys.stderr)
-    sys.exit(1)
+from cdm_search import format_hint_lines, load_search_index, search_hint_hits
+from nl_translation import PROVIDERS, SQLCache, get_provider
+from prompt_context import load_prompt_context
+from query_profiler import QueryRunner
+from sql_guard import GuardedResult, QueryGuard, answer_nl_query, run_guarded
 
 try:
-    from anthropic import Anthropic
+    from linkml_coral.utils.schema_snapshot import load_schema_snapshot
 except ImportError:
-    print("Error: anthropic package not installed.", file=sys.stderr)
-    print("Install it with: uv sync", file=sys.stderr)
-    sys.exit(1)
+    sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+    from linkml_coral.utils.schema_snapshot import load_schema_snapshot
 
 
 class SchemaAwareQuery:
@@ -51,7 +51,9 @@ class SchemaAwareQuery:
         db_path: str,
         schema_path: str,
         api_key: Optional[str] = None,
-        verbose: bool = False
+        verbose: bool = False,
+        provider: Optional[str] = None,
+        guard: Optional[QueryGuard] = None
     ):
         """
         Initialize schema-aware query tool.
@@ -61,82 +63,37 @@ class SchemaAwareQuery:
             schema_path: Path to LinkML schema YAML file
             api_key: Anthropic API key
             verbose: Enable verbose output
+            provider: Translation provider name (see nl_translation.py)
+            guard: Execution limits for generated SQL (see sql_guard.py)
         """
         self.db_path = db_path
         self.schema_path = schema_path
         self.verbose = verbose
         self.conn = duckdb.connect(db_path, read_only=True)
+        self._prompt_context = None
+        self._search_index = None
 
         # Load LinkML schema
         if self.verbose:
             print(f"Loading LinkML schema from {schema_path}...", file=sys.stderr)
-        self.schema_view = SchemaView(schema_path)
+        self.schema_view = load_schema_snapshot(schema_path)
 
-        # Initialize Anthropic client
-        api_key = api_key or os.environ.get("ANTHROPIC_API_KEY")
-        if not api_key:
-            raise ValueError(
-                "Anthropic API key required. Set ANTHROPIC_API_KEY environment variable "
-                "or pass --api-key parameter."
-            )
-        self.client = Anthropic(api_key=api_key)
+        self.provider = get_provider(provider, api_key, max_tokens=2048)
+        self.sql_cache = SQLCache()
+        self.guard = guard or QueryGuard()
+        self.guard.configure(self.conn)
+        # Profiles each query (printed when verbose) and logs slow ones
+        self.runner = QueryRunner(self.conn, db_path, tool="schema_aware_query", show=verbose)
+
+    def get_prompt_context(self):
+        """Cached schema and store description (see prompt_context.py)."""
+        if self._prompt_context is None:
+            self._prompt_context = load_prompt_context(self.conn, self.db_path, self.schema_view)
+        return self._prompt_context
 
     def get_schema_context(self) -> Dict[str, Any]:
         """Extract comprehensive schema context from LinkML schema."""
-        context = {
-            'classes': {},
-            'relationships': [],
-            'enums': {}
-        }
-
-        # Get all classes
-        for class_name in self.schema_view.all_classes():
-            cls = self.schema_view.get_class(class_name)
-
-            class_info = {
-                'name': class_name,
-                'description': cls.description or '',
-                'slots': {},
-                'relationships': []
-            }
-
-            # Get slots (attributes)
-            for slot_name in self.schema_view.class_slots(class_name):
-                slot = self.schema_view.induced_slot(slot_name, class_name)
-
-                slot_info = {
-                    'name': slot_name,
-                    'description': slot.description or '',
-                    'range': slot.range,
-                    'required': slot.required or False,
-                    'multivalued': slot.multivalued or False,
-                }
-
-                # Check if it's a foreign key (range is another class)
-                if slot.range in self.schema_view.all_classes():
-                    slot_info['is_foreign_key'] = True
-                    slot_info['target_class'] = slot.range
-                    class_info['relationships'].append({
-                        'from': class_name,
-                        'to': slot.range,
-                        'via': slot_name,
-                        'required': slot.required or False
-                    })
-
-                class_info['slots'][slot_name] = slot_info
-
-            context['classes'][class_name] = class_info
-
-        # Get enums
-        for enum_name in self.schema_view.all_enums():
-            enum = self.schema_view.get_enum(enum_name)
-            context['enums'][enum_name] = {
-                'name': enum_name,
-                'description': enum.description or '',
-                'values': list(enum.permissible_values.keys()) if enum.permissible_values else []
-            }
-
-        return context
+        return self.get_prompt_context().schema
 
     def format_schema_for_prompt(self, context: Dict[str, Any]) -> str:
         """Format schema context for Claude prompt."""
@@ -166,30 +123,29 @@ class SchemaAwareQuery:
 
     def get_database_schema(self) -> Dict[str, Any]:
         """Get actual database schema (tables and columns)."""
-        db_schema = {'tables': {}}
-
-        # Get all tables
-        tables_result = self.conn.execute("""
-            SELECT table_name
-            FROM information_schema.tables
-            WHERE table_schema = 'main'
-            ORDER BY table_name
-        """).fetchall()
-
-        for (table_name,) in tables_result:
-            # Get column information
-            columns_result = self.conn.execute(f"""
-                SELECT column_name, data_type
-                FROM information_schema.columns
-                WHERE table_name = '{table_name}'
-                ORDER BY ordinal_position
-            """).fetchall()
-
-            db_schema['tables'][table_name] = {
-                'columns': [col for col, dtype in columns_result]
+        return {
+            'tables': {
+                table: {'columns': [col['name'] for col in info['columns']]}
+                for table, info in self.get_prompt_context().tables.items()
             }
+        }
+
+    def get_value_hits(self, natural_query: str) -> list:
+        """
+        Stored ontology terms and entity names matching words of the question.
+
+        Uses the store's search index (built by the loader); returns [] when
+        the store has no current index.
+        """
+        if self._search_index is None:
+            self._search_index = load_search_index(self.db_path) or False
+        if not self._search_index:
+            return []
+        return search_hint_hits(self._search_index, natural_query)
 
-        return db_schema
+    def get_value_hints(self, natural_query: str) -> str:
+        """Prompt lines for get_value_hits() ('' if none)."""
+        return format_hint_lines(self.get_value_hits(natural_query))
 
     def translate_to_sql(self, natural_query: str) -> str:
         """
@@ -201,14 +157,24 @@ class SchemaAwareQuery:
         Returns:
             SQL query string
         """
-        schema_context = self.get_schema_context()
-        schema_text = self.format_schema_for_prompt(schema_context)
+        context = self.get_prompt_context()
+        hits = self.get_value_hits(natural_query)
+        tables = context.relevant_tables(natural_query, [h.source for h in hits])
+        if self.verbose:
+            print(f"Describing {len(tables)} of {len(context.tables)} tables", file=sys.stderr)
+        schema_text = self.format_schema_for_prompt(context.schema_subset(tables))
+        hints = format_hint_lines(hits)
+        hints_text = (
+            "Stored values matching the question (use these exact labels/IDs in filters):\n"
+            f"{hints}\n\n" if hints else ""
+        )
         db_schema = self.get_database_schema()
 
         # Format database tables
         db_tables = "\n".join([
             f"  - {table}: {', '.join(info['columns'])}"
             for table, info in sorted(db_schema['tables'].items())
+            if table in tables
         ])
 
         prompt = f"""You are a SQL expert with deep knowledge of the LinkML ENIGMA CDM schema.
@@ -231,71 +197,54 @@ class SchemaAwareQuery:
 5. Consider required fields and multivalued attributes
 6. Use CDM table naming (sdt_*, sys_*, ddt_*)
 
-Natural language query: {natural_query}
+{hints_text}Natural language query: {natural_query}
 
 Generate ONLY the SQL query (no explanations):"""
 
         if self.verbose:
-            print(f"Sending schema-aware prompt to Claude API...", file=sys.stderr)
+            print(f"Sending schema-aware prompt to {self.provider.name} provider...", file=sys.stderr)
 
-        try:
-            response = self.client.messages.create(
-                model="claude-sonnet-4-20250514",
-                max_tokens=2048,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
-            )
+        return self.provider.translate(natural_query, prompt, context)
+
+    def execute_sql(self, sql_query: str) -> List[Dict[str, Any]]:
+        """
+        Execute SQL query and return results.
 
-            sql_query = response.content[0].text.strip()
+        Args:
+            sql_query: SQL query string
 
-            # Remove markdown code blocks if present
-            if sql_query.startswith("```"):
-                lines = sql_query.split("\n")
-                sql_query = "\n".join(lines[1:-1]) if len(lines) > 2 else sql_query
-                sql_query = sql_query.replace("```sql", "").replace("```", "").strip()
+        Returns:
+            List of result rows as dictionaries (at most guard.max_rows)
+        """
+        return self.run_guarded(sql_query).rows
 
-            return sql_query
+    def run_guarded(self, sql_query: str) -> GuardedResult:
+        """
+        Execute SQL through the execution guard (plan check, LIMIT, timeout).
 
-        except Exception as e:
-            raise RuntimeError(f"Failed to translate query: {e}")
+        Args:
+            sql_query: SQL query string
 
-    def execute_sql(self, sql_query: str) -> List[Dict[str, Any]]:
-        """Execute SQL query and return results."""
-        try:
-            result = self.conn.execute(sql_query).fetchall()
-            columns = [desc[0] for desc in self.conn.description]
-
-            return [
-                dict(zip(columns, row))
-                for row in result
-            ]
-        except Exception as e:
-            raise RuntimeError(f"SQL execution failed: {e}\nQuery: {sql_query}")
+        Returns:
+            GuardedResult
+        """
+        return run_guarded(self.guard, self.conn, sql_query, runner=self.runner, verbose=self.verbose)
 
     def query(self, natural_query: str) -> Dict[str, Any]:
         """Execute schema-aware natural language query."""
         if self.verbose:
             print(f"\n🔍 Schema-aware query: {natural_query}", file=sys.stderr)
 
-        # Translate to SQL
-        sql_query = self.translate_to_sql(natural_query)
-
-        if self.verbose:
-            print(f"\n📝 Generated SQL:\n{sql_query}\n", file=sys.stderr)
-
-        # Execute SQL
-        results = self.execute_sql(sql_query)
-
-        if self.verbose:
-            print(f"✅ Query returned {len(results)} rows\n", file=sys.stderr)
-
-        return {
-            'natural_query': natural_query,
-            'sql_query': sql_query,
-            'result_count': len(results),
-            'results': results
-        }
+        # Reuse SQL that already ran for this question against the same schema
+        return answer_nl_query(
+            natural_query,
+            self.get_prompt_context().fingerprint(),
+            self.sql_cache,
+            self.translate_to_sql,
+            self.run_guarded,
+            self.provider.name,
+            verbose=self.verbose,
+        )
 
     def show_schema_info(self) -> str:
         """Display schema information."""
@@ -376,7 +325,10 @@ def format_results_text(query_result: Dict[str, Any]) -> str:
 
     lines.append(f"Query: {query_result['natural_query']}")
     lines.append(f"\nGenerated SQL:\n{query_result['sql_query']}")
-    lines.append(f"\nResults ({query_result['result_count']} rows):")
+    truncated = " - truncated, refine the query for more" if query_result.get('truncated') else ""
+    lines.append(f"\nResults ({query_result['result_count']} rows{truncated}):")
+    for note in query_result.get('notes', []):
+        lines.append(f"  ℹ️  {note}")
 
     if not query_result['results']:
         lines.append("  (no results)")
@@ -453,6 +405,12 @@ Examples:
         help='Anthropic API key (or set ANTHROPIC_API_KEY env var)'
     )
 
+    parser.add_argument(
+        '--provider',
+        choices=PROVIDERS,
+        help='Translation provider (default: CDM_NL_PROVIDER or anthropic)'
+    )
+
     parser.add_argument(
         '--show-schema',
         action='store_true',
@@ -503,7 +461,8 @@ Examples:
             db_path=args.db,
             schema_path=args.schema,
             api_key=args.api_key,
-            verbose=args.verbose
+            verbose=args.verbose,
+            provider=args.provider
         )
 
         # Handle different operations
@@ -0,0 +1,454 @@
+#!/usr/bin/env python3
+"""
+Execution guard for generated SQL.
+
+The natural-language query tools run SQL written by a model. One bad
+translation (a cross join of two brick tables, an unfiltered brick dump)
+can run for minutes and exhaust memory, so ``QueryGuard.execute()`` runs
+generated SQL through a few checks instead of a bare ``fetchall()``:
+
+1. Only a single SELECT statement is accepted.
+2. ``SELECT COUNT(*) FROM ddt_brick...`` is answered from the brick index
+   (``ddt_ndarray.total_rows``) or the sampling metadata (``cdm_sampling``)
+   instead of scanning the brick, when that count matches the rows the
+   brick holds. Sampled bricks are counted as loaded, with a note giving the
+   recorded population count as an estimate.
+3. ``EXPLAIN`` estimates the plan's cardinality; plans whose intermediate
+   results exceed ``max_estimated_rows``, or that cross join a brick table,
+   are refused with an explanation.
+4. A LIMIT is added when the query has none.
+5. The query runs under DuckDB's ``memory_limit`` and is interrupted after
+   ``timeout`` seconds; rows are fetched in batches and cut off at
+   ``max_rows``.
+
+Defaults can be changed with ``CDM_QUERY_TIMEOUT`` (seconds),
+``CDM_QUERY_MAX_ROWS``, ``CDM_QUERY_MEMORY_LIMIT`` (e.g. ``8GB``) and
+``CDM_QUERY_MAX_ESTIMATED_ROWS``.
+
+Usage:
+    # Show what the guard would do with a query (plan estimate, rewrites)
+    python sql_guard.py --db cdm_store.db "SELECT * FROM ddt_brick0000001"
+"""
+
+import json
+import os
+import re
+import sys
+import threading
+import time
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import duckdb
+
+try:
+    from linkml_coral.utils.instrumentation import span
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+    from linkml_coral.utils.instrumentation import span
+
+DEFAULT_TIMEOUT = 120.0
+DEFAULT_MAX_ROWS = 1000
+DEFAULT_MAX_ESTIMATED_ROWS = 100_000_000
+DEFAULT_BATCH_SIZE = 1000
+
+BRICK_PREFIX = "ddt_brick"
+CROSS_JOIN_OPERATORS = ("CROSS_PRODUCT", "NESTED_LOOP_JOIN", "BLOCKWISE_NL_JOIN")
+# A brick cross join larger than this is refused even below max_estimated_rows
+MAX_BRICK_CROSS_ROWS = 1_000_000
+
+_TRAILING_LIMIT = re.compile(r"\blimit\s+\d+(\s+offset\s+\d+)?\s*$", re.IGNORECASE)
+_BRICK_COUNT = re.compile(
+    r"^select\s+count\(\s*\*\s*\)(?:\s+as\s+(?P<alias>\w+))?\s+from\s+(?P<table>ddt_brick\w+)$",
+    re.IGNORECASE,
+)
+
+
+class QueryGuardError(RuntimeError):
+    """Generated SQL was refused or stopped by the guard."""
+
+
+def _env_number(name: str, default, cast=float):
+    try:
+        return cast(os.environ[name])
+    except (KeyError, ValueError):
+        return default
+
+
+@dataclass
+class PlanEstimate:
+    """Cardinality estimates read from an EXPLAIN plan."""
+
+    estimated_rows: int = 0
+    max_intermediate_rows: int = 0
+    scans: Dict[str, int] = field(default_factory=dict)
+    cross_joins: List[Dict[str, Any]] = field(default_factory=list)
+
+
+@dataclass
+class GuardedResult:
+    """Rows of a guarded query and what the guard did to get them."""
+
+    sql: str
+    executed_sql: str
+    columns: List[str]
+    rows: List[Dict[str, Any]]
+    truncated: bool
+    estimate: Optional[PlanEstimate]
+    notes: List[str]
+    elapsed: float
+
+
+def _node_rows(node: Dict[str, Any]) -> Optional[int]:
+    value = node.get('extra_info', {}).get('Estimated Cardinality')
+    try:
+        return int(str(value).lstrip('~'))
+    except (TypeError, ValueError):
+        return None
+
+
+def estimate_plan(conn, sql: str) -> PlanEstimate:
+    """
+    Estimate a query's cardinalities from ``EXPLAIN (FORMAT JSON)``.
+
+    Operators without an estimate (or estimated at 0, which DuckDB reports
+    for some projections) inherit the largest child estimate; cross
+    products without one are the product of their children and ungrouped
+    aggregates return one row.
+
+    Args:
+        conn: DuckDB connection
+        sql: SELECT statement
+
+    Returns:
+        PlanEstimate
+    """
+    plan = json.loads(conn.execute(f"EXPLAIN (FORMAT JSON) {sql}").fetchall()[0][1])
+    estimate = PlanEstimate()
+
+    def walk(node) -> Tuple[int, bool]:
+        child_results = [walk(child) for child in node.get('children', [])]
+        child_rows = [rows for rows, _ in child_results]
+        touches_brick = any(brick for _, brick in child_results)
+        rows = _node_rows(node)
+
+        table = node.get('extra_info', {}).get('Table')
+        if table:
+            table = table.split('.')[-1]
+            estimate.scans[table] = rows or 0
+            touches_brick = touches_brick or table.startswith(BRICK_PREFIX)
+
+        if node.get('name') in CROSS_JOIN_OPERATORS:
+            product = 1
+            for value in child_rows:
+                product *= max(value, 1)
+            rows = max(rows or 0, product)
+            estimate.cross_joins.append({'operator': node['name'], 'rows': rows, 'brick': touches_brick})
+        elif node.get('name') == 'UNGROUPED_AGGREGATE':
+            rows = 1
+        elif not rows:
+            # No estimate (or DuckDB's 0 for some projections)
+            rows = max(child_rows, default=0)
+
+        estimate.max_intermediate_rows = max(estimate.max_intermediate_rows, rows)
+        return rows, touches_brick
+
+    roots = plan if isinstance(plan, list) else [plan]
+    estimate.estimated_rows = max((walk(root)[0] for root in roots), default=0)
+    return estimate
+
+
+@dataclass
+class QueryGuard:
+    """Checks, rewrites, bounds and executes generated SQL."""
+
+    timeout: float = field(default_factory=lambda: _env_number("CDM_QUERY_TIMEOUT", DEFAULT_TIMEOUT))
+    max_rows: int = field(default_factory=lambda: _env_number("CDM_QUERY_MAX_ROWS", DEFAULT_MAX_ROWS, int))
+    memory_limit: Optional[str] = field(default_factory=lambda: os.environ.get("CDM_QUERY_MEMORY_LIMIT"))
+    max_estimated_rows: int = field(default_factory=lambda: _env_number(
+        "CDM_QUERY_MAX_ESTIMATED_ROWS", DEFAULT_MAX_ESTIMATED_ROWS, int))
+    batch_size: int = DEFAULT_BATCH_SIZE
+
+    def configure(self, conn) -> None:
+        """Apply the memory limit to a connection (once, before queries run)."""
+        if self.memory_limit:
+            conn.execute(f"SET memory_limit = '{self.memory_limit}'")
+
+    def prepare(self, conn, sql: str):
+        """
+        Validate and rewrite a query without running it.
+
+        Args:
+            conn: DuckDB connection
+            sql: Generated SQL
+
+        Returns:
+            Tuple of (SQL to execute, PlanEstimate or None, notes)
+
+        Raises:
+            QueryGuardError: If the query is not a single SELECT or its plan
+                is too large
+        """
+        statements = duckdb.extract_statements(sql)
+        if len(statements) != 1:
+            raise QueryGuardError(f"Expected one SQL statement, got {len(statements)}")
+        if statements[0].type != duckdb.StatementType.SELECT:
+            raise QueryGuardError(f"Only SELECT queries are allowed (got {statements[0].type.name})")
+
+        notes = []
+        query = sql.strip().rstrip(';').strip()
+
+        rewritten, population_note = self._brick_count(conn, query)
+        if rewritten:
+            notes.append("answered brick row count from brick metadata")
+            return rewritten, None, notes
+        if population_note:
+            notes.append(population_note)
+
+        estimate = estimate_plan(conn, query)
+        for cross in estimate.cross_joins:
+            if cross['brick'] and cross['rows'] > MAX_BRICK_CROSS_ROWS:
+                raise QueryGuardError(
+                    f"Refusing a cross join over brick tables (~{cross['rows']:,} rows). "
+                    "Join on a shared column (e.g. sdt_sample_name) or filter the bricks first."
+                )
+        if estimate.max_intermediate_rows > self.max_estimated_rows:
+            scanned = "".join(f", {t} ~{n:,}" for t, n in sorted(estimate.scans.items()))
+            raise QueryGuardError(
+                f"Query plan is too large (~{estimate.max_intermediate_rows:,} intermediate rows, "
+                f"limit {self.max_estimated_rows:,}{scanned}). Add filters or aggregate."
+            )
+
+        # Aggregates and small results are left alone
+        if estimate.estimated_rows > self.max_rows and not _TRAILING_LIMIT.search(query):
+            query = f"SELECT * FROM (\n{query}\n) AS guarded LIMIT {self.max_rows + 1}"
+            notes.append(f"added LIMIT {self.max_rows}")
+        return query, estimate, notes
+
+    def execute(self, conn, sql: str, runner=None) -> GuardedResult:
+        """
+        Run a query under the guard.
+
+        Args:
+            conn: DuckDB connection
+            sql: Generated SQL
+            runner: QueryRunner that profiles the query and logs it if slow
+                (see query_profiler.py)
+
+        Returns:
+            GuardedResult with at most max_rows rows
+
+        Raises:
+            QueryGuardError: If the query is refused or exceeds the timeout
+        """
+        start = time.time()
+        query, estimate, notes = self.prepare(conn, sql)
+
+        timer = threading.Timer(self.timeout, conn.interrupt) if self.timeout else None
+        if timer:
+            timer.start()
+        tracked = runner.track(query, label="guarded") if runner else nullcontext()
+        try:
+            with tracked, span("query", category="query", conn=conn, tool="sql_guard", notes=notes) as query_span:
+                cursor = conn.execute(query)
+                columns = [desc[0] for desc in cursor.description]
+                rows = []
+                while len(rows) <= self.max_rows:
+                    batch = cursor.fetchmany(self.batch_size)
+                    if not batch:
+                        break
+                    rows.extend(batch)
+                query_span.add(rows=len(rows))
+        except duckdb.InterruptException:
+            raise QueryGuardError(f"Query exceeded the {self.timeout:g}s timeout and was interrupted")
+        finally:
+            if timer:
+                timer.cancel()
+
+        truncated = len(rows) > self.max_rows
+        if truncated:
+            rows = rows[:self.max_rows]
+            notes.append(f"stopped after {self.max_rows} rows")
+        return GuardedResult(
+            sql=sql,
+            executed_sql=query,
+            columns=columns,
+            rows=[dict(zip(columns, row)) for row in rows],
+            truncated=truncated,
+            estimate=estimate,
+            notes=notes,
+            elapsed=time.time() - start,
+        )
+
+    def _brick_count(self, conn, query: str) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Row count of a whole brick from ddt_ndarray / cdm_sampling, if recorded.
+
+        The recorded count describes the full brick. It only answers the query
+        when it equals the rows the loaded table holds; a sampled or
+        ``--max-rows`` load is counted as usual instead.
+
+        Returns:
+            Tuple of (rewritten SQL or None, note labelling the recorded count
+            as a population estimate or None)
+        """
+        match = _BRICK_COUNT.match(" ".join(query.split()))
+        if not match:
+            return None, None
+        table, alias = match['table'].lower(), match['alias'] or 'count_star()'
+        try:
+            stored = conn.execute(
+                "SELECT estimated_size FROM duckdb_tables() WHERE table_name = ? AND schema_name = 'main'",
+                [table],
+            ).fetchone()
+        except duckdb.Error:
+            stored = None
+        for source, sql in (
+            ("ddt_ndarray", "SELECT total_rows FROM ddt_ndarray WHERE brick_table_name = ?"),
+            ("cdm_sampling", "SELECT population_rows FROM cdm_sampling WHERE table_name = ?"),
+        ):
+            try:
+                row = conn.execute(sql, [table]).fetchone()
+            except duckdb.Error:
+                continue
+            if not row or row[0] is None:
+                continue
+            recorded = int(row[0])
+            if stored and stored[0] == recorded:
+                return f'SELECT {recorded}::BIGINT AS "{alias}"', None
+            return None, (f"{table} holds a sample; the full brick has ~{recorded:,} rows "
+                          f"(population estimate from {source})")
+        return None, None
+
+
+def run_guarded(guard: QueryGuard, conn, sql: str, runner=None, verbose: bool = False) -> GuardedResult:
+    """
+    Execute generated SQL through the guard for the NL query tools.
+
+    Args:
+        guard: Execution limits
+        conn: DuckDB connection
+        sql: Generated SQL
+        runner: QueryRunner that profiles the query (see query_profiler.py)
+        verbose: Print the guard's notes to stderr
+
+    Returns:
+        GuardedResult
+
+    Raises:
+        QueryGuardError: If the guard refuses or stops the query
+        RuntimeError: If the query fails
+    """
+    try:
+        result = guard.execute(conn, sql, runner=runner)
+    except QueryGuardError:
+        raise
+    except Exception as e:
+        raise RuntimeError(f"SQL execution failed: {e}\nQuery: {sql}")
+
+    if verbose and result.notes:
+        print(f"🛡️  Guard: {'; '.join(result.notes)}", file=sys.stderr)
+    return result
+
+
+def answer_nl_query(
+    natural_query: str,
+    fingerprint: str,
+    sql_cache,
+    translate: Callable[[str], str],
+    run: Callable[[str], GuardedResult],
+    provider_name: str,
+    verbose: bool = False
+) -> Dict[str, Any]:
+    """
+    Answer a question with cached or freshly translated SQL.
+
+    SQL cached for the question and ``fingerprint`` is tried first; if it no
+    longer runs it is discarded and the question is translated again. SQL
+    that ran is cached.
+
+    Args:
+        natural_query: User's natural language question
+        fingerprint: Prompt context fingerprint (see prompt_context.py)
+        sql_cache: SQLCache (see nl_translation.py)
+        translate: Translates the question to SQL
+        run: Runs SQL through the guard (e.g. ``run_guarded``)
+        provider_name: Translation provider recorded with cached SQL
+        verbose: Print the SQL and row count to stderr
+
+    Returns:
+        Dictionary with sql, results, and metadata
+    """
+    sql_query = sql_cache.get(natural_query, fingerprint)
+    cached = sql_query is not None
+    if cached:
+        if verbose:
+            print(f"\n♻️  Cached SQL:\n{sql_query}\n", file=sys.stderr)
+        try:
+            result = run(sql_query)
+        except RuntimeError:
+            sql_cache.discard(natural_query, fingerprint)
+            cached = False
+
+    if not cached:
+        sql_query = translate(natural_query)
+        if verbose:
+            print(f"\n📝 Generated SQL:\n{sql_query}\n", file=sys.stderr)
+        result = run(sql_query)
+        sql_cache.put(natural_query, fingerprint, sql_query, provider_name)
+
+    results = result.rows
+    if verbose:
+        print(f"✅ Query returned {len(results)} rows\n", file=sys.stderr)
+
+    return {
+        'natural_query': natural_query,
+        'sql_query': sql_query,
+        'sql_cached': cached,
+        'truncated': result.truncated,
+        'notes': result.notes,
+        'result_count': len(results),
+        'results': results
+    }
+
+
+def main():
+    """Show how the guard would handle a query."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Check generated SQL against the execution guard')
+    parser.add_argument('sql', help='SQL query')
+    parser.add_argument('--db', default='cdm_store.db', help='Path to CDM store database')
+    parser.add_argument('--run', action='store_true', help='Also execute the query')
+    args = parser.parse_args()
+
+    guard = QueryGuard()
+    with duckdb.connect(args.db, read_only=True) as conn:
+        try:
+            query, estimate, notes = guard.prepare(conn, args.sql)
+        except QueryGuardError as e:
+            print(f"🛑 {e}")
+            return 1
+        if estimate:
+            print(f"📊 Estimated rows: ~{estimate.estimated_rows:,} "
+                  f"(largest intermediate ~{estimate.max_intermediate_rows:,})")
+            for table, rows in sorted(estimate.scans.items()):
+                print(f"   scan {table}: ~{rows:,}")
+        for note in notes:
+            print(f"✏️  {note}")
+        print(f"\n{query}")
+        if args.run:
+            try:
+                result = guard.execute(conn, args.sql)
+            except QueryGuardError as e:
+                print(f"🛑 {e}")
+                return 1
+            print(f"\n✅ {len(result.rows)} rows in {result.elapsed:.2f}s"
+                  f"{' (truncated)' if result.truncated else ''}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,619 @@
+#!/usr/bin/env python3
+"""
+Synthetic CDM parquet data for tests and benchmarks.
+
+Writes a directory laid out like a CDM export (``enigma_coral.db``): one
+directory of ``part-*.parquet`` files per table. Columns come from the CDM
+LinkML schema (the induced slots of each class in ``TABLE_TO_CLASS``) and
+values follow the slot ranges, so the data validates and loads like the
+real thing:
+
+- ``sdt_*`` entity tables with ``<Class>NNNNNNN`` IDs, ``<Class>_NNNNNN``
+  names, ``*_ref`` / ``sdt_<table>_name`` references to rows that exist and
+  ontology ID/name pairs drawn from ``sys_oterm``
+- ``sys_process`` with ``input_objects`` / ``output_objects`` strings
+  (``"['Reads:Reads0000001']"``) plus the matching ``sys_process_input`` and
+  ``sys_process_output`` rows, following the ENIGMA provenance chain
+  Location -> Sample -> Reads -> Assembly -> Genome/Bin (only some reads are
+  assembled, so "unused reads" queries have answers)
+- ``ddt_brick*`` tables of configurable count, size and width (a sample
+  dimension, a molecule dimension and numeric variables), described by
+  ``ddt_ndarray`` and ``sys_ddt_typedef``
+
+Row counts are ``BASE_ROWS`` times ``scale`` and output is deterministic for
+a given seed.
+
+Usage:
+    # Default size (~15K entity rows, 3 bricks of 20K rows)
+    python synthetic_cdm.py /tmp/synthetic_coral.db
+
+    # Ten times larger, with five wide bricks
+    python synthetic_cdm.py /tmp/synthetic_coral.db --scale 10 \\
+        --bricks 5 --brick-rows 1000000 --brick-variables 5
+"""
+
+import argparse
+import json
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+try:
+    from linkml_coral.utils.schema_snapshot import load_schema_snapshot
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+    from linkml_coral.utils.schema_snapshot import load_schema_snapshot
+
+from load_cdm_parquet_to_store import CDM_SCHEMA, TABLE_TO_CLASS
+
+
+# Rows per table at scale 1.0 (roughly the proportions of the ENIGMA CDM)
+BASE_ROWS = {
+    "sdt_location": 100,
+    "sdt_sample": 500,
+    "sdt_community": 200,
+    "sdt_reads": 2000,
+    "sdt_assembly": 500,
+    "sdt_bin": 500,
+    "sdt_genome": 600,
+    "sdt_gene": 5000,
+    "sdt_strain": 600,
+    "sdt_taxon": 300,
+    "sdt_asv": 2000,
+    "sdt_protocol": 25,
+    "sdt_image": 100,
+    "sdt_condition": 50,
+    "sdt_dubseq_library": 20,
+    "sdt_tnseq_library": 20,
+    "sdt_enigma": 1,
+    "sys_oterm": 1000,
+}
+# Reference tables that do not grow with the data
+FIXED_TABLES = ("sdt_protocol", "sdt_condition", "sdt_enigma")
+
+DEFAULT_SCALE = 1.0
+DEFAULT_BRICKS = 3
+DEFAULT_BRICK_ROWS = 20_000
+DEFAULT_BRICK_VARIABLES = 2
+DEFAULT_ROWS_PER_FILE = 250_000
+DEFAULT_NULL_FRACTION = 0.1
+DEFAULT_SEED = 42
+MANIFEST_NAME = "_synthetic_cdm.json"
+
+# Provenance chain: (process type, input table, output table)
+PROCESS_STEPS = [
+    ("sampling", "sdt_location", "sdt_sample"),
+    ("community_isolation", "sdt_sample", "sdt_community"),
+    ("strain_isolation", "sdt_sample", "sdt_strain"),
+    ("sequencing", "sdt_sample", "sdt_reads"),
+    ("assembly", "sdt_reads", "sdt_assembly"),
+    ("binning", "sdt_assembly", "sdt_bin"),
+    ("genome_assembly", "sdt_assembly", "sdt_genome"),
+    ("tnseq_library", "sdt_genome", "sdt_tnseq_library"),
+    ("dubseq_library", "sdt_genome", "sdt_dubseq_library"),
+    ("imaging", "sdt_sample", "sdt_image"),
+]
+
+PROCESS_TYPES = [step[0] for step in PROCESS_STEPS] + ["measurement"]
+
+# Ontology term labels; sys_oterm names cycle through these
+TERM_WORDS = [
+    "soil", "sediment", "groundwater", "surface water", "biofilm", "well",
+    "Single End Read", "Paired End Read", "Illumina", "PacBio",
+    "North America", "USA", "temperate grassland", "nitrate", "uranium",
+    "sulfate", "iron", "pH", "temperature", "conductivity",
+]
+ONTOLOGIES = ["ENVO", "ME", "UO", "CHEBI"]
+BRICK_VARIABLES = [
+    ("concentration_micromolar", "float"),
+    ("abundance_count_unit", "int"),
+    ("ph", "float"),
+    ("temperature_degree_celsius", "float"),
+    ("conductivity_microsiemens_per_centimeter", "float"),
+]
+
+INTEGER_RANGES = {"integer", "Count", "Size"}
+FLOAT_RANGES = {"float", "double", "decimal", "Rate", "Depth", "Elevation", "Latitude", "Longitude"}
+
+
+def table_rows(scale: float = DEFAULT_SCALE) -> Dict[str, int]:
+    """Rows per table at a scale (at least one row each)."""
+    return {
+        table: rows if table in FIXED_TABLES else max(1, int(round(rows * scale)))
+        for table, rows in BASE_ROWS.items()
+    }
+
+
+def entity_prefix(table: str) -> str:
+    """ID/name prefix of a table's rows (its class name)."""
+    return TABLE_TO_CLASS[table]
+
+
+def entity_ids(table: str, n: int) -> List[str]:
+    """IDs of a table's rows (``Reads0000001``, ...)."""
+    prefix = entity_prefix(table)
+    return [f"{prefix}{i:07d}" for i in range(1, n + 1)]
+
+
+def entity_names(table: str, n: int) -> List[str]:
+    """Names of a table's rows (``Reads_000001``, ...)."""
+    prefix = entity_prefix(table)
+    return [f"{prefix}_{i:06d}" for i in range(1, n + 1)]
+
+
+def object_string(objects: Sequence[str]) -> str:
+    """CDM array string for a list of ``Type:ID`` objects."""
+    return "[" + ", ".join(f"'{obj}'" for obj in objects) + "]"
+
+
+def ref_table(slot_name: str, own_table: str) -> Optional[str]:
+    """
+    Table a reference column points at, by CDM naming.
+
+    ``<table>_ref`` columns (also ``parent_community_ref``,
+    ``defined_strains_ref``) and ``sdt_<table>_name`` columns other than the
+    table's own name column.
+    """
+    if slot_name.endswith("_ref"):
+        stem = slot_name[:-len("_ref")]
+        for table in TABLE_TO_CLASS:
+            if table.startswith("sdt_") and (stem.endswith(table[4:]) or stem.endswith(table[4:] + "s")):
+                return table
+    if slot_name.startswith("sdt_") and slot_name.endswith("_name"):
+        table = slot_name[:-len("_name")]
+        if table in TABLE_TO_CLASS and table != own_table:
+            return table
+    return None
+
+
+class SyntheticCDM:
+    """Column-wise generator for one synthetic CDM dataset."""
+
+    def __init__(
+        self,
+        scale: float = DEFAULT_SCALE,
+        bricks: int = DEFAULT_BRICKS,
+        brick_rows: int = DEFAULT_BRICK_ROWS,
+        brick_variables: int = DEFAULT_BRICK_VARIABLES,
+        null_fraction: float = DEFAULT_NULL_FRACTION,
+        seed: int = DEFAULT_SEED,
+        schema_path: Path = CDM_SCHEMA
+    ):
+        """
+        Set up sizes, schema and random state.
+
+        Args:
+            scale: Multiplier for ``BASE_ROWS`` (entity and ontology tables)
+            bricks: Number of ``ddt_brick*`` tables
+            brick_rows: Rows per brick table
+            brick_variables: Numeric variable columns per brick (1-5)
+            null_fraction: Share of nulls in optional, non-reference columns
+            seed: Random seed
+            schema_path: CDM LinkML schema
+        """
+        self.scale = scale
+        self.rows = table_rows(scale)
+        self.bricks = bricks
+        self.brick_rows = brick_rows
+        self.brick_variables = max(1, min(brick_variables, len(BRICK_VARIABLES)))
+        self.null_fraction = null_fraction
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+        self.schema_view = load_schema_snapshot(schema_path)
+
+        # Process types come first, then generic terms
+        n_terms = max(self.rows["sys_oterm"], len(PROCESS_TYPES) + 1)
+        self.term_ids = [f"PROCESS:{i + 1:07d}" for i in range(len(PROCESS_TYPES))]
+        self.term_names = list(PROCESS_TYPES)
+        for i in range(n_terms - len(PROCESS_TYPES)):
+            self.term_ids.append(f"{ONTOLOGIES[i % len(ONTOLOGIES)]}:{i + 1:07d}")
+            self.term_names.append(f"{TERM_WORDS[i % len(TERM_WORDS)]} {i // len(TERM_WORDS) + 1}")
+        self.process_terms = dict(zip(PROCESS_TYPES, zip(self.term_ids, self.term_names)))
+        self.names = {table: entity_names(table, n) for table, n in self.rows.items() if table.startswith("sdt_")}
+        self.ids = {table: entity_ids(table, n) for table, n in self.rows.items() if table.startswith("sdt_")}
+
+    # Column generators -------------------------------------------------
+
+    def _choice(self, values: Sequence[Any], n: int) -> List[Any]:
+        return [values[i] for i in self.rng.integers(0, len(values), n)]
+
+    def _with_nulls(self, values: List[Any]) -> List[Any]:
+        if not self.null_fraction:
+            return values
+        mask = self.rng.random(len(values)) < self.null_fraction
+        return [None if null else value for value, null in zip(values, mask)]
+
+    def _column(self, table: str, slot, n: int, term_picks: Dict[str, np.ndarray]) -> List[Any]:
+        """Values for one slot of ``n`` rows."""
+        name, rng_name = slot.name, slot.range or "string"
+
+        if name == f"{table}_id":
+            return self.ids[table][:n]
+        if name == f"{table}_name":
+            return self.names[table][:n]
+
+        target = ref_table(name, table)
+        if target:
+            values = self._choice(self.names[target], n)
+            if slot.multivalued:
+                return [object_string([value]) for value in values]
+            return values
+
+        if name.endswith("_sys_oterm_id") or name.endswith("_sys_oterm_name"):
+            stem = name.rsplit("_sys_oterm_", 1)[0]
+            if stem not in term_picks:
+                term_picks[stem] = self.rng.integers(0, len(self.term_ids), n)
+            pool = self.term_ids if name.endswith("_id") else self.term_names
+            values = [pool[i] for i in term_picks[stem]]
+        elif rng_name == "OntologyTermID":
+            values = self._choice(self.term_ids, n)
+        elif name == "read_count_count_unit":
+            # Log-normal read counts spanning all read_count_category bins
+            values = self.rng.lognormal(10.5, 1.2, n).astype(np.int64).tolist()
+        elif rng_name in INTEGER_RANGES:
+            values = self.rng.integers(0, 100_000, n).tolist()
+        elif rng_name == "Latitude":
+            values = self.rng.uniform(-90, 90, n).round(5).tolist()
+        elif rng_name == "Longitude":
+            values = self.rng.uniform(-180, 180, n).round(5).tolist()
+        elif rng_name in FLOAT_RANGES:
+            values = self.rng.uniform(0, 100, n).round(3).tolist()
+        elif rng_name == "boolean":
+            values = (self.rng.random(n) < 0.5).tolist()
+        elif rng_name == "Date":
+            start = date(2015, 1, 1)
+            values = [(start + timedelta(days=int(d))).isoformat() for d in self.rng.integers(0, 3000, n)]
+        elif rng_name == "Time":
+            values = [f"{h:02d}:{m:02d}" for h, m in zip(self.rng.integers(0, 24, n), self.rng.integers(0, 60, n))]
+        elif rng_name == "Link":
+            values = [f"http://example.org/{table}/{i}" for i in range(1, n + 1)]
+        elif name == "strand":
+            values = self._choice(["+", "-"], n)
+        elif name == "sequence":
+            values = ["".join(self._choice("ACGT", 40)) for _ in range(n)]
+        else:
+            values = [f"{name.replace('_', ' ')} {i}" for i in self.rng.integers(1, 1000, n)]
+
+        if slot.multivalued:
+            values = [object_string([value]) for value in values]
+        if not slot.required and not slot.identifier:
+            values = self._with_nulls(values)
+        return values
+
+    def entity_table(self, table: str) -> pa.Table:
+        """An ``sdt_*`` / ``sys_oterm`` table built from the class's induced slots."""
+        class_name = TABLE_TO_CLASS[table]
+        n = self.rows[table]
+        if table == "sys_oterm":
+            return self.oterm_table()
+
+        columns: Dict[str, List[Any]] = {}
+        term_picks: Dict[str, np.ndarray] = {}
+        for slot in self.schema_view.class_induced_slots(class_name):
+            columns[slot.name] = self._column(table, slot, n, term_picks)
+        # Entities naming a referenced row twice (location_ref and sdt_location_name)
+        # get the same value in both columns
+        for name in columns:
+            target = ref_table(name, table)
+            if name.endswith("_ref") and target != table and f"{target}_name" in columns:
+                columns[f"{target}_name"] = columns[name]
+        return pa.table({name: self._array(values) for name, values in columns.items()})
+
+    def oterm_table(self) -> pa.Table:
+        """``sys_oterm``: a forest of terms, each parented by an earlier term."""
+        n = len(self.term_ids)
+        parents = [None] + [self.term_ids[int(p)] for p in self.rng.integers(0, np.arange(1, n))]
+        return pa.table({
+            "sys_oterm_id": self.term_ids,
+            "sys_oterm_name": self.term_names,
+            "sys_oterm_ontology": [term.split(":")[0] for term in self.term_ids],
+            "parent_sys_oterm_id": parents,
+            "sys_oterm_definition": [f"Definition of {name}" for name in self.term_names],
+            "sys_oterm_synonyms": self._array([None] * n, pa.string()),
+            "sys_oterm_links": self._array([None] * n, pa.string()),
+            "sys_oterm_properties": self._array([None] * n, pa.string()),
+        })
+
+    @staticmethod
+    def _array(values: List[Any], type_: Optional[pa.DataType] = None) -> pa.Array:
+        if type_ is None and all(v is None for v in values):
+            type_ = pa.string()
+        return pa.array(values, type=type_)
+
+    # Provenance ---------------------------------------------------------
+
+    def process_tables(self) -> Dict[str, pa.Table]:
+        """``sys_process``, ``sys_process_input`` and ``sys_process_output``."""
+        processes: List[Dict[str, Any]] = []
+        inputs: List[Dict[str, Any]] = []
+        outputs: List[Dict[str, Any]] = []
+
+        def add(process_type: str, in_objects, out_objects):
+            process_id = f"Process{len(processes) + 1:07d}"
+            term = self.process_terms[process_type]
+            processes.append({
+                "sys_process_id": process_id,
+                "process_type_sys_oterm_id": term[0],
+                "process_type_sys_oterm_name": term[1],
+                "input_objects": object_string(f"{TABLE_TO_CLASS[t]}:{i}" for t, i in in_objects),
+                "output_objects": object_string(f"{TABLE_TO_CLASS[t]}:{i}" for t, i in out_objects),
+            })
+            for rows, objects, kind in ((inputs, in_objects, "input"), (outputs, out_objects, "output")):
+                for index, (table, object_id) in enumerate(objects):
+                    rows.append({
+                        "sys_process_id": process_id,
+                        f"{kind}_object_type": TABLE_TO_CLASS[table],
+                        f"{kind}_object_name": object_id,
+                        f"{kind}_index": index,
+                        f"{table}_id" if table.startswith("sdt_") else "ddt_ndarray_id": object_id,
+                    })
+
+        for process_type, source, target in PROCESS_STEPS:
+            n_out = self.rows[target]
+            if source == "sdt_reads":
+                # Each assembly uses a distinct read; the remaining reads stay unused
+                picks = self.rng.permutation(self.rows[source])[:n_out]
+            else:
+                picks = self.rng.integers(0, self.rows[source], n_out)
+            for out_index, in_index in enumerate(picks):
+                add(process_type, [(source, self.ids[source][int(in_index)])],
+                    [(target, self.ids[target][out_index])])
+
+        for brick in range(1, self.bricks + 1):
+            samples = self._choice(self.ids["sdt_sample"], 3)
+            add("measurement", [("sdt_sample", s) for s in samples],
+                [("ddt_ndarray", f"Brick{brick:07d}")])
+
+        process = self._process_columns(processes)
+        return {
+            "sys_process": process,
+            "sys_process_input": self._link_table("SystemProcessInput", inputs),
+            "sys_process_output": self._link_table("SystemProcessOutput", outputs),
+        }
+
+    def _process_columns(self, processes: List[Dict[str, Any]]) -> pa.Table:
+        n = len(processes)
+        columns: Dict[str, List[Any]] = {}
+        term_picks: Dict[str, np.ndarray] = {}
+        for slot in self.schema_view.class_induced_slots("SystemProcess"):
+            if slot.name in processes[0]:
+                columns[slot.name] = [p[slot.name] for p in processes]
+            else:
+                columns[slot.name] = self._column("sys_process", slot, n, term_picks)
+        return pa.table({name: self._array(values) for name, values in columns.items()})
+
+    def _link_table(self, class_name: str, rows: List[Dict[str, Any]]) -> pa.Table:
+        columns = {}
+        for slot in self.schema_view.class_induced_slots(class_name):
+            type_ = pa.int64() if slot.range == "integer" else pa.string()
+            columns[slot.name] = pa.array([row.get(slot.name) for row in rows], type=type_)
+        return pa.table(columns)
+
+    # Bricks ------------------------------------------------------------
+
+    def brick_columns(self) -> List[tuple]:
+        """(column, scalar type, role, dimension or variable number) of every brick column."""
+        columns = [
+            ("sdt_sample_name", "text", "dimension", 1),
+            ("molecule_sys_oterm_id", "text", "dimension", 2),
+            ("molecule_sys_oterm_name", "text", "dimension", 2),
+        ]
+        columns += [(name, scalar, "variable", number)
+                    for number, (name, scalar) in enumerate(BRICK_VARIABLES[:self.brick_variables], 1)]
+        return columns
+
+    def brick_slices(self, brick: int, rows_per_file: int):
+        """
+        Yield a brick's rows as tables of at most ``rows_per_file`` rows.
+
+        Rows are ordered by sample, then molecule (like the CDM export).
+        """
+        rng = np.random.default_rng([self.seed, brick])
+        n_molecules = min(50, len(self.term_ids))
+        samples = self.names["sdt_sample"]
+        molecules = rng.choice(len(self.term_ids), n_molecules, replace=False)
+        for start in range(0, self.brick_rows, rows_per_file):
+            index = np.arange(start, min(start + rows_per_file, self.brick_rows))
+            n = len(index)
+            sample_index = (index // n_molecules) % len(samples)
+            molecule_index = molecules[index % n_molecules]
+            columns = {
+                "sdt_sample_name": pa.array(np.asarray(samples, dtype=object)[sample_index]),
+                "molecule_sys_oterm_id": pa.array(np.asarray(self.term_ids, dtype=object)[molecule_index]),
+                "molecule_sys_oterm_name": pa.array(np.asarray(self.term_names, dtype=object)[molecule_index]),
+            }
+            for name, scalar in BRICK_VARIABLES[:self.brick_variables]:
+                if scalar == "int":
+                    columns[name] = pa.array(rng.integers(0, 10_000, n))
+                else:
+                    columns[name] = pa.array(rng.normal(50, 15, n).round(4))
+            yield pa.table(columns)
+
+    def brick_metadata(self) -> Dict[str, pa.Table]:
+        """``ddt_ndarray`` and ``sys_ddt_typedef`` rows describing the bricks."""
+        n_molecules = min(50, len(self.term_ids))
+        arrays, typedefs = [], []
+        for brick in range(1, self.bricks + 1):
+            ndarray_id = f"Brick{brick:07d}"
+            n_samples = -(-self.brick_rows // n_molecules)
+            arrays.append({
+                "ddt_ndarray_id": ndarray_id,
+                "brick_table_name": f"ddt_brick{brick:07d}",
+                "n_dimensions": 2,
+                "dimension_sizes": f"[{min(n_samples, len(self.names['sdt_sample']))}, {n_molecules}]",
+                "n_variables": self.brick_variables,
+                "total_rows": self.brick_rows,
+                "associated_entity_type": "Sample",
+                "associated_entity_names": object_string(self.names["sdt_sample"][:3]),
+                "measurement_type_sys_oterm_id": self.term_ids[brick % len(self.term_ids)],
+                "measurement_type_sys_oterm_name": self.term_names[brick % len(self.term_ids)],
+                "creation_date": (date(2020, 1, 1) + timedelta(days=brick)).isoformat(),
+                "description": f"Synthetic measurements {brick}",
+            })
+            for column, scalar, role, number in self.brick_columns():
+                typedefs.append({
+                    "ddt_ndarray_id": ndarray_id,
+                    "brick_id": f"ddt_brick{brick:07d}",
+                    "berdl_column_name": column,
+                    "cdm_column_name": column,
+                    "berdl_column_data_type": role,
+                    "cdm_column_data_type": role,
+                    "scalar_type": scalar,
+                    "dimension_number": number if role == "dimension" else None,
+                    "variable_number": number if role == "variable" else None,
+                })
+        return {
+            "ddt_ndarray": self._link_table("DynamicDataArray", arrays),
+            "sys_ddt_typedef": self._link_table("SystemDDTTypedef", typedefs),
+        }
+
+    def typedef_table(self) -> pa.Table:
+        """``sys_typedef``: one row per column of each static entity class."""
+        rows = []
+        for table, class_name in TABLE_TO_CLASS.items():
+            if not table.startswith("sdt_"):
+                continue
+            for slot in self.schema_view.class_induced_slots(class_name):
+                rows.append({
+                    "type_name": class_name,
+                    "field_name": slot.name,
+                    "cdm_column_name": slot.name,
+                    "scalar_type": "int" if slot.range in INTEGER_RANGES else
+                                   "float" if slot.range in FLOAT_RANGES else "text",
+                    "is_pk": slot.name == f"{table}_id",
+                    "is_upk": slot.name == f"{table}_name",
+                    "is_required": bool(slot.required),
+                })
+        columns = {}
+        for slot in self.schema_view.class_induced_slots("SystemTypedef"):
+            type_ = pa.bool_() if slot.range == "boolean" else pa.string()
+            columns[slot.name] = pa.array([row.get(slot.name) for row in rows], type=type_)
+        return pa.table(columns)
+
+
+def write_table(table: pa.Table, table_dir: Path, rows_per_file: int = DEFAULT_ROWS_PER_FILE) -> int:
+    """Write a table as ``part-NNNNN.parquet`` files; returns rows written."""
+    table_dir.mkdir(parents=True, exist_ok=True)
+    for part, start in enumerate(range(0, max(table.num_rows, 1), rows_per_file)):
+        pq.write_table(table.slice(start, rows_per_file), table_dir / f"part-{part:05d}.parquet")
+    return table.num_rows
+
+
+def generate_cdm(
+    output_dir: Path,
+    scale: float = DEFAULT_SCALE,
+    bricks: int = DEFAULT_BRICKS,
+    brick_rows: int = DEFAULT_BRICK_ROWS,
+    brick_variables: int = DEFAULT_BRICK_VARIABLES,
+    rows_per_file: int = DEFAULT_ROWS_PER_FILE,
+    null_fraction: float = DEFAULT_NULL_FRACTION,
+    seed: int = DEFAULT_SEED,
+    verbose: bool = False
+) -> Dict[str, int]:
+    """
+    Write a synthetic CDM parquet directory.
+
+    Args:
+        output_dir: Directory to create (one sub-directory per table)
+        scale: Multiplier for ``BASE_ROWS``
+        bricks: Number of ``ddt_brick*`` tables
+        brick_rows: Rows per brick table
+        brick_variables: Numeric variable columns per brick (1-5)
+        rows_per_file: Maximum rows per parquet file
+        null_fraction: Share of nulls in optional, non-reference columns
+        seed: Random seed
+        verbose: Print each table written
+
+    Returns:
+        Dict mapping table names to row counts
+    """
+    output_dir = Path(output_dir)
+    generator = SyntheticCDM(scale, bricks, brick_rows, brick_variables, null_fraction, seed)
+    counts: Dict[str, int] = {}
+
+    def write(name: str, table: pa.Table):
+        counts[name] = write_table(table, output_dir / name, rows_per_file)
+        if verbose:
+            print(f"  ✓ {name}: {counts[name]:,} rows")
+
+    for table in BASE_ROWS:
+        write(table, generator.entity_table(table))
+    for name, table in generator.process_tables().items():
+        write(name, table)
+    write("sys_typedef", generator.typedef_table())
+    for name, table in generator.brick_metadata().items():
+        write(name, table)
+
+    for brick in range(1, bricks + 1):
+        name = f"ddt_brick{brick:07d}"
+        brick_dir = output_dir / name
+        brick_dir.mkdir(parents=True, exist_ok=True)
+        counts[name] = 0
+        for part, table in enumerate(generator.brick_slices(brick, rows_per_file)):
+            pq.write_table(table, brick_dir / f"part-{part:05d}.parquet")
+            counts[name] += table.num_rows
+        if verbose:
+            print(f"  ✓ {name}: {counts[name]:,} rows")
+
+    manifest = {
+        "scale": scale,
+        "bricks": bricks,
+        "brick_rows": brick_rows,
+        "brick_variables": brick_variables,
+        "null_fraction": null_fraction,
+        "seed": seed,
+        "tables": counts,
+    }
+    (output_dir / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2))
+    return counts
+
+
+def read_manifest(output_dir: Path) -> Optional[Dict[str, Any]]:
+    """Parameters and row counts of a generated directory (None if not synthetic)."""
+    path = Path(output_dir) / MANIFEST_NAME
+    if not path.exists():
+        return None
+    return json.loads(path.read_text())
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Generate a synthetic CDM parquet directory',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python synthetic_cdm.py /tmp/synthetic_coral.db
+  python synthetic_cdm.py /tmp/synthetic_coral.db --scale 10 --bricks 5 --brick-rows 1000000
+        """
+    )
+    parser.add_argument('output', type=Path, help='Output directory (e.g., synthetic_coral.db)')
+    parser.add_argument('--scale', type=float, default=DEFAULT_SCALE,
+                        help=f'Multiplier for entity/ontology table sizes (default: {DEFAULT_SCALE})')
+    parser.add_argument('--bricks', type=int, default=DEFAULT_BRICKS,
+                        help=f'Number of brick tables (default: {DEFAULT_BRICKS})')
+    parser.add_argument('--brick-rows', type=int, default=DEFAULT_BRICK_ROWS,
+                        help=f'Rows per brick table (default: {DEFAULT_BRICK_ROWS:,})')
+    parser.add_argument('--brick-variables', type=int, default=DEFAULT_BRICK_VARIABLES,
+                        help=f'Numeric columns per brick, 1-5 (default: {DEFAULT_BRICK_VARIABLES})')
+    parser.add_argument('--rows-per-file', type=int, default=DEFAULT_ROWS_PER_FILE,
+                        help=f'Maximum rows per parquet file (default: {DEFAULT_ROWS_PER_FILE:,})')
+    parser.add_argument('--null-fraction', type=float, default=DEFAULT_NULL_FRACTION,
+                        help=f'Share of nulls in optional columns (default: {DEFAULT_NULL_FRACTION})')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help=f'Random seed (default: {DEFAULT_SEED})')
+    args = parser.parse_args()
+
+    print(f"🧪 Generating synthetic CDM in {args.output} (scale {args.scale})")
+    counts = generate_cdm(
+        args.output, args.scale, args.bricks, args.brick_rows, args.brick_variables,
+        args.rows_per_file, args.null_fraction, args.seed, verbose=True
+    )
+    print(f"✅ {len(counts)} tables, {sum(counts.values()):,} rows")
+
+
+if __name__ == '__main__':
+    main()
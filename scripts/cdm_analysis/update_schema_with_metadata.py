@@ -3,7 +3,7 @@
 Update LinkML CDM schema files with metadata from parquet files.
 
 This script:
-1. Loads metadata from JSON catalogs
+1. Looks up column metadata in the catalogs (metadata_catalog.py)
 2. Updates schema YAML files with descriptions and annotations
 3. Preserves existing schema structure
 4. Adds validation patterns where applicable
@@ -11,30 +11,36 @@ This script:
 
 import argparse
 import sys
-import json
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 import ruamel.yaml
 
+from metadata_catalog import MetadataCatalog
 
-def load_catalogs(metadata_dir: Path) -> Dict[str, List[Dict[str, Any]]]:
-    """Load all metadata catalogs."""
-    combined_file = metadata_dir / 'all_catalogs.json'
 
-    if not combined_file.exists():
-        print(f"Error: Catalog file not found: {combined_file}", file=sys.stderr)
+def load_catalogs(source: Path) -> MetadataCatalog:
+    """Open the metadata catalogs (catalog directory or store database)."""
+    try:
+        return MetadataCatalog.open(source)
+    except FileNotFoundError as e:
+        print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
 
-    with open(combined_file) as f:
-        return json.load(f)
 
+def create_column_lookup(catalog: MetadataCatalog, slot_names: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Look up catalog metadata for slot names in one query.
+
+    Args:
+        catalog: Metadata catalogs
+        slot_names: Slot (column) names of a schema file
 
-def create_column_lookup(column_catalog: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
-    """Create lookup table: table.column -> metadata."""
+    Returns:
+        Dict of column name -> metadata of its first catalog entry
+    """
     lookup = {}
-    for col in column_catalog:
-        key = f"{col['table_name']}.{col['column_name']}"
-        lookup[key] = col
+    for col in catalog.columns(names=slot_names):
+        lookup.setdefault(col['column_name'], col)
     return lookup
 
 
@@ -109,7 +115,7 @@ def update_slot_with_metadata(
 
 def update_schema_file(
     schema_file: Path,
-    column_lookup: Dict[str, Dict[str, Any]],
+    catalog: MetadataCatalog,
     dry_run: bool = False
 ) -> int:
     """
@@ -131,16 +137,12 @@ def update_schema_file(
         return 0
 
     slots_updated = 0
+    column_lookup = create_column_lookup(catalog, list(schema['slots'].keys()))
 
     # Update each slot
     for slot_name, slot_def in schema['slots'].items():
         # Try to find matching metadata
-        # Look for exact match first
-        metadata = None
-        for key, meta in column_lookup.items():
-            if meta['column_name'] == slot_name:
-                metadata = meta
-                break
+        metadata = column_lookup.get(slot_name)
 
         if not metadata:
             continue
@@ -169,6 +171,12 @@ def main():
         help='Directory containing metadata catalog files'
     )
 
+    parser.add_argument(
+        '--store-db',
+        type=Path,
+        help='Read the catalogs from the cdm_metadata schema of this store instead of --metadata-dir'
+    )
+
     parser.add_argument(
         '--schema-dir',
         type=Path,
@@ -195,9 +203,8 @@ def main():
 
     # Load catalogs
     print("📥 Loading metadata catalogs...")
-    catalogs = load_catalogs(args.metadata_dir)
-    column_lookup = create_column_lookup(catalogs['column_catalog'])
-    print(f"   ✅ Loaded metadata for {len(column_lookup)} columns")
+    catalog = load_catalogs(args.store_db or args.metadata_dir)
+    print(f"   ✅ Opened metadata for {catalog.counts()['column_catalog']} columns")
     print()
 
     # Find schema files to update
@@ -223,7 +230,7 @@ def main():
         try:
             slots_updated = update_schema_file(
                 schema_file,
-                column_lookup,
+                catalog,
                 dry_run=args.dry_run
             )
 
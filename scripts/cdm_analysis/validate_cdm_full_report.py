@@ -37,6 +37,12 @@ except ImportError:
 
 import yaml
 
+try:
+    from linkml_coral.utils.instrumentation import configure_tracing, print_trace_summary, span
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+    from linkml_coral.utils.instrumentation import configure_tracing, print_trace_summary, span
+
 
 # Script paths
 SCRIPT_DIR = Path(__file__).parent
@@ -329,15 +335,19 @@ def validate_table(
     if chunk_size:
         args.extend(["--chunk-size", str(chunk_size)])
 
-    result = subprocess.run(args, capture_output=True, text=True)
+    # The validator subprocess records its validation_chunk spans to the same trace
+    with span("validate_table", category="validate", table=table_path.name,
+              class_name=class_name, max_rows=max_rows, chunk_size=chunk_size) as table_span:
+        result = subprocess.run(args, capture_output=True, text=True)
 
-    elapsed = time.time() - start_time
+        elapsed = time.time() - start_time
 
-    # Parse errors from output
-    errors = []
-    for line in result.stderr.split("\n") + result.stdout.split("\n"):
-        if line.strip().startswith("[ERROR]"):
-            errors.append(line.strip())
+        # Parse errors from output
+        errors = []
+        for line in result.stderr.split("\n") + result.stdout.split("\n"):
+            if line.strip().startswith("[ERROR]"):
+                errors.append(line.strip())
+        table_span.set(errors=len(errors))
 
     # Only consider error count, not exit code
     # (linkml-validate may return non-zero for reasons other than validation errors)
@@ -370,6 +380,14 @@ def main():
         help='Validate ALL rows (may be very slow for large tables)'
     )
 
+    parser.add_argument(
+        '--trace',
+        type=Path,
+        metavar='FILE',
+        help='Record per-table and per-chunk timing/memory spans to FILE '
+             '(.jsonl for JSON Lines, otherwise a Chrome trace)'
+    )
+
     args = parser.parse_args()
 
     if not args.database.exists():
@@ -378,6 +396,8 @@ def main():
 
     # Create output directory
     args.output_dir.mkdir(parents=True, exist_ok=True)
+    if args.trace:
+        configure_tracing(args.trace)
 
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 
@@ -490,6 +510,8 @@ def main():
     print(f"📄 Markdown report: {md_file}")
     print(f"📊 JSON report: {json_file}")
     print()
+    if args.trace:
+        print_trace_summary(args.trace)
 
     sys.exit(0 if report.tables_failed == 0 else 1)
 
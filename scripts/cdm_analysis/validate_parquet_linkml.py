@@ -20,6 +20,12 @@ from pathlib import Path
 from typing import Optional, Dict, List, Tuple
 import yaml
 
+try:
+    from linkml_coral.utils.instrumentation import span
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+    from linkml_coral.utils.instrumentation import span
+
 try:
     import pandas as pd
 except ImportError:
@@ -275,12 +281,16 @@ def validate_parquet_file(
             if verbose:
                 print(f"\n  Validating rows {offset:,} to {offset + rows_to_read:,}...")
 
-            df = read_parquet_sample(parquet_path, max_rows=rows_to_read, offset=offset)
+            with span("validation_chunk", category="validate", table=parquet_path.name,
+                      class_name=class_name, offset=offset) as chunk_span:
+                df = read_parquet_sample(parquet_path, max_rows=rows_to_read, offset=offset)
 
-            if df.empty:
-                break
+                if df.empty:
+                    break
 
-            success, output = validate_with_linkml(df, class_name, schema_path, verbose=verbose)
+                success, output = validate_with_linkml(df, class_name, schema_path, verbose=verbose)
+                chunk_span.add(rows=len(df), bytes=int(df.memory_usage(deep=True).sum()))
+                chunk_span.set(success=success)
 
             if not success:
                 all_success = False
@@ -294,13 +304,17 @@ def validate_parquet_file(
 
     else:
         # Single validation
-        df = read_parquet_sample(parquet_path, max_rows=max_rows)
+        with span("validation_chunk", category="validate", table=parquet_path.name,
+                  class_name=class_name, offset=0) as chunk_span:
+            df = read_parquet_sample(parquet_path, max_rows=max_rows)
 
-        if df.empty:
-            print("Warning: Empty DataFrame")
-            return True
+            if df.empty:
+                print("Warning: Empty DataFrame")
+                return True
 
-        success, output = validate_with_linkml(df, class_name, schema_path, verbose=verbose)
+            success, output = validate_with_linkml(df, class_name, schema_path, verbose=verbose)
+            chunk_span.add(rows=len(df), bytes=int(df.memory_usage(deep=True).sum()))
+            chunk_span.set(success=success)
 
         if success:
             if verbose:
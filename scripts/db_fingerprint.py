@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+Database fingerprints for query provenance.
+
+Hashing a 15-20 GB store on every tracked query takes minutes, so a
+fingerprint can be taken in one of three modes:
+
+- ``fast``: file size, modification time and the load ID from the loader's
+  ``<db>.manifest.json`` (no file reads)
+- ``sampled``: SHA-256 of fixed-stride blocks read through ``mmap`` (the
+  first and last block are always included); files no larger than the
+  sample are hashed in full
+- ``full``: SHA-256 of the whole file, streamed in large reads; with
+  ``start_fingerprint()`` it runs in a background thread while the query
+  executes
+
+Computed fingerprints are cached per (path, size, mtime, mode), so a store
+is hashed at most once per load.
+
+Usage:
+    python db_fingerprint.py enigma_data.db --mode full
+
+Set ``CDM_FINGERPRINT_MODE`` to change the tracker's default mode,
+``CDM_FINGERPRINT_CACHE=off`` to disable the cache, or
+``CDM_FINGERPRINT_CACHE_DIR`` to move it.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Optional
+
+try:
+    from result_cache import database_fingerprint, get_manifest_path
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).parent / "cdm_analysis"))
+    from result_cache import database_fingerprint, get_manifest_path
+
+MODES = ("fast", "sampled", "full")
+DEFAULT_MODE = "sampled"
+SAMPLE_BLOCKS = 64
+BLOCK_SIZE = 1024 ** 2  # 1 MiB per sampled block
+READ_SIZE = 8 * 1024 ** 2  # Streamed reads for full hashes
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "linkml-coral" / "fingerprints"
+CACHE_DIR_ENV = "CDM_FINGERPRINT_CACHE_DIR"
+DISABLE_ENV = "CDM_FINGERPRINT_CACHE"
+MODE_ENV = "CDM_FINGERPRINT_MODE"
+
+
+@dataclass
+class Fingerprint:
+    """A database fingerprint and how it was obtained."""
+
+    mode: str
+    digest: str
+    size_bytes: int
+    mtime_ns: int
+    load_id: Optional[str] = None
+    seconds: float = 0.0
+    cached: bool = False
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def default_mode() -> str:
+    """Fingerprint mode from ``CDM_FINGERPRINT_MODE`` (default: sampled)."""
+    mode = os.environ.get(MODE_ENV, DEFAULT_MODE).lower()
+    return mode if mode in MODES else DEFAULT_MODE
+
+
+def read_load_id(db_path) -> Optional[str]:
+    """Load ID recorded in the loader's manifest, if any."""
+    try:
+        with open(get_manifest_path(db_path)) as f:
+            load_id = json.load(f).get('load_id')
+    except (OSError, ValueError):
+        return None
+    return str(load_id) if load_id else None
+
+
+def sample_offsets(size: int, blocks: int = SAMPLE_BLOCKS, block_size: int = BLOCK_SIZE) -> list:
+    """Start offsets of ``blocks`` evenly spaced blocks covering a file of ``size`` bytes."""
+    if size <= blocks * block_size:
+        return [0]
+    last = size - block_size
+    return [round(i * last / (blocks - 1)) for i in range(blocks)]
+
+
+def hash_sampled(path: Path, blocks: int = SAMPLE_BLOCKS, block_size: int = BLOCK_SIZE) -> str:
+    """SHA-256 of the file size and fixed-stride blocks of its content."""
+    size = path.stat().st_size
+    if size <= blocks * block_size:
+        return hash_full(path)
+
+    sha256_hash = hashlib.sha256(str(size).encode())
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        for offset in sample_offsets(size, blocks, block_size):
+            sha256_hash.update(mapped[offset:offset + block_size])
+    return sha256_hash.hexdigest()
+
+
+def hash_full(path: Path) -> str:
+    """SHA-256 of the whole file."""
+    sha256_hash = hashlib.sha256()
+    buffer = bytearray(READ_SIZE)
+    view = memoryview(buffer)
+    with open(path, "rb", buffering=0) as f:
+        while True:
+            n = f.readinto(buffer)
+            if not n:
+                break
+            sha256_hash.update(view[:n])
+    return sha256_hash.hexdigest()
+
+
+class FingerprintCache:
+    """Fingerprints on local disk, keyed by (path, size, mtime, mode)."""
+
+    def __init__(self, cache_dir=None, enabled: Optional[bool] = None):
+        self.cache_dir = Path(cache_dir or os.environ.get(CACHE_DIR_ENV, DEFAULT_CACHE_DIR))
+        if enabled is None:
+            enabled = os.environ.get(DISABLE_ENV, "").lower() not in ("0", "off", "false", "no")
+        self.enabled = enabled
+
+    def _entry_path(self, path: Path, size: int, mtime_ns: int, mode: str) -> Path:
+        raw = f"{path.resolve()}|{size}|{mtime_ns}|{mode}"
+        return self.cache_dir / f"{hashlib.sha256(raw.encode()).hexdigest()[:32]}.json"
+
+    def get(self, path: Path, size: int, mtime_ns: int, mode: str) -> Optional[Fingerprint]:
+        if not self.enabled:
+            return None
+        try:
+            with open(self._entry_path(path, size, mtime_ns, mode)) as f:
+                return Fingerprint(**{**json.load(f), "seconds": 0.0, "cached": True})
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def put(self, path: Path, fingerprint: Fingerprint) -> None:
+        if not self.enabled:
+            return
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        entry_path = self._entry_path(path, fingerprint.size_bytes, fingerprint.mtime_ns, fingerprint.mode)
+        tmp_path = entry_path.with_suffix(f".json.{os.getpid()}.tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(fingerprint.to_dict(), f)
+        os.replace(tmp_path, entry_path)
+
+
+def compute_fingerprint(
+    db_path,
+    mode: Optional[str] = None,
+    cache: Optional[FingerprintCache] = None
+) -> Optional[Fingerprint]:
+    """
+    Fingerprint a database file.
+
+    Args:
+        db_path: Path to the database
+        mode: 'fast', 'sampled' or 'full' (None: ``CDM_FINGERPRINT_MODE``)
+        cache: Fingerprint cache (None: the default cache)
+
+    Returns:
+        Fingerprint, or None if the database does not exist
+    """
+    path = Path(db_path)
+    mode = mode or default_mode()
+    if mode not in MODES:
+        raise ValueError(f"Unknown fingerprint mode {mode!r} (choose from {', '.join(MODES)})")
+    if not path.exists():
+        return None
+
+    stat = path.stat()
+    load_id = read_load_id(path)
+    if mode == "fast":
+        return Fingerprint(mode, database_fingerprint(path), stat.st_size, stat.st_mtime_ns, load_id)
+
+    cache = cache or FingerprintCache()
+    cached = cache.get(path, stat.st_size, stat.st_mtime_ns, mode)
+    if cached is not None:
+        return cached
+
+    started = time.perf_counter()
+    digest = hash_full(path) if mode == "full" else hash_sampled(path)
+    fingerprint = Fingerprint(mode, digest, stat.st_size, stat.st_mtime_ns, load_id,
+                              seconds=round(time.perf_counter() - started, 3))
+
+    # Don't cache a hash of a file that changed while it was read
+    after = path.stat()
+    if (after.st_size, after.st_mtime_ns) == (stat.st_size, stat.st_mtime_ns):
+        cache.put(path, fingerprint)
+    return fingerprint
+
+
+class PendingFingerprint:
+    """A fingerprint being computed in a background thread."""
+
+    def __init__(self, db_path, mode: Optional[str] = None, cache: Optional[FingerprintCache] = None):
+        self.mode = mode or default_mode()
+        self._result: Optional[Fingerprint] = None
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._run, args=(db_path, cache),
+                                        name="db-fingerprint", daemon=True)
+        self._thread.start()
+
+    def _run(self, db_path, cache):
+        try:
+            self._result = compute_fingerprint(db_path, self.mode, cache)
+        except BaseException as e:  # Re-raised in result()
+            self._error = e
+
+    def done(self) -> bool:
+        return not self._thread.is_alive()
+
+    def result(self, timeout: Optional[float] = None) -> Optional[Fingerprint]:
+        """
+        Wait for the fingerprint.
+
+        Args:
+            timeout: Seconds to wait (None: until finished)
+
+        Returns:
+            Fingerprint, or None if the database does not exist
+
+        Raises:
+            TimeoutError: If the fingerprint is not ready within ``timeout``
+        """
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            raise TimeoutError(f"{self.mode} fingerprint not finished after {timeout}s")
+        if self._error is not None:
+            raise self._error
+        return self._result
+
+
+def start_fingerprint(
+    db_path,
+    mode: Optional[str] = None,
+    cache: Optional[FingerprintCache] = None
+):
+    """
+    Start fingerprinting a database without waiting for a full hash.
+
+    Fast and sampled fingerprints (and cached full ones) are returned
+    directly; an uncached full hash runs in a background thread.
+
+    Args:
+        db_path: Path to the database
+        mode: 'fast', 'sampled' or 'full' (None: ``CDM_FINGERPRINT_MODE``)
+        cache: Fingerprint cache (None: the default cache)
+
+    Returns:
+        Fingerprint (or None if the database does not exist), or a
+        PendingFingerprint for a full hash in progress
+    """
+    mode = mode or default_mode()
+    path = Path(db_path)
+    if mode != "full" or not path.exists():
+        return compute_fingerprint(path, mode, cache)
+
+    cache = cache or FingerprintCache()
+    stat = path.stat()
+    cached = cache.get(path, stat.st_size, stat.st_mtime_ns, mode)
+    if cached is not None:
+        return cached
+    return PendingFingerprint(path, mode, cache)
+
+
+def main():
+    """Print a database fingerprint."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Database fingerprint for query provenance')
+    parser.add_argument('db', help='Path to database file')
+    parser.add_argument('--mode', choices=MODES, default=default_mode(),
+                        help=f'Fingerprint mode (default: {default_mode()})')
+    parser.add_argument('--no-cache', action='store_true', help='Recompute even if cached')
+    args = parser.parse_args()
+
+    fingerprint = compute_fingerprint(args.db, args.mode, FingerprintCache(enabled=not args.no_cache))
+    if fingerprint is None:
+        print(f"❌ Database not found: {args.db}")
+        return 1
+    source = "cached" if fingerprint.cached else f"{fingerprint.seconds:.2f}s"
+    print(f"🔑 {fingerprint.mode}: {fingerprint.digest} ({source})")
+    if fingerprint.load_id:
+        print(f"   Load ID: {fingerprint.load_id}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -12,14 +12,35 @@ import json
 from pathlib import Path
 from typing import Optional
 
+if __name__ == "__main__":
+    # Hand off to a running query daemon before the heavy imports below
+    sys.path.insert(0, str(Path(__file__).parent / "cdm_analysis"))
+    from query_daemon import forward_to_daemon
+    forward_to_daemon("enigma_query")
+
 from query_enigma_provenance import ENIGMAProvenanceQuery
 from query_provenance_tracker import QueryProvenanceTracker
 
+try:
+    from result_export import EXPORT_FORMATS, export_query, export_rows
+    from query_profiler import QueryRunner
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).parent / "cdm_analysis"))
+    from result_export import EXPORT_FORMATS, export_query, export_rows
+    from query_profiler import QueryRunner
+
+
+def _where_clause(conditions):
+    """Build a WHERE clause and parameter list from (sql, value) pairs."""
+    if not conditions:
+        return "", []
+    return " WHERE " + " AND ".join(sql for sql, _ in conditions), [v for _, v in conditions]
+
 
 def cmd_unused_reads(query: ENIGMAProvenanceQuery, args):
     """Find unused 'good' reads that were not used in assemblies."""
     # Start provenance tracking
-    tracker = QueryProvenanceTracker(args.db, args.provenance_dir)
+    tracker = QueryProvenanceTracker(args.db, args.provenance_dir, args.fingerprint)
     params = {
         "min_count": args.min_count,
         "top_n": args.top_n,
@@ -88,31 +109,28 @@ def cmd_unused_reads(query: ENIGMAProvenanceQuery, args):
         # Export if requested
         output_files = {}
         if args.export:
-            export_data = {
+            export_metadata = {
                 'query': 'unused_reads',
                 'parameters': {'min_count': args.min_count},
                 'summary': summary,
-                'results': unused_reads if not args.ids_only else list(unused_reads),
                 'provenance': {'execution_id': execution_id}
             }
+            rows = unused_reads if not args.ids_only else ({'reads_id': r} for r in unused_reads)
             export_path = Path(args.export)
-            with open(export_path, 'w') as f:
-                json.dump(export_data, f, indent=2, default=str)
-            print(f"\n💾 Results exported to: {export_path}")
+            exported = export_rows(rows, export_path, export_format=args.export_format,
+                                   metadata=export_metadata)
+            print(f"\n💾 {exported:,} results exported to: {export_path}")
             output_files['results'] = str(export_path)
 
-        # Record database stats and complete provenance tracking
-        db_stats = {
-            'total_reads': summary['total_good_reads'] + (len(query.get_all_reads()) - summary['total_good_reads']),
-            'total_assemblies': len(query.get_all_assemblies()),
-            'total_processes': query.get_collection("Process").find({}).num_rows
-        }
-        tracker.record_database_stats(db_stats)
+        # Record database stats, cache usage and complete provenance tracking
+        tracker.record_database_stats(query.get_database_counts())
+        tracker.record_cache_events(query.cache.drain_events())
         tracker.end_query(summary, output_files)
 
         return 0
 
     except Exception as e:
+        tracker.record_cache_events(query.cache.drain_events())
         tracker.end_query({}, error=str(e))
         raise
 
@@ -218,15 +236,18 @@ def cmd_find(query: ENIGMAProvenanceQuery, args):
                         pass
                     query_dict[key] = value
 
-        # Execute query
-        qr = collection.find(query_dict)
-        results = qr.rows[:args.limit] if len(qr.rows) < args.limit else list(collection.find_iter(query_dict))[:args.limit]
+        # Execute query (--limit is pushed into the query)
+        qr = collection.find(query_dict, limit=args.limit)
+        results = qr.rows
 
-        print(f"Found {len(results)} results")
+        if qr.num_rows > len(results):
+            print(f"Found {qr.num_rows} results (showing {len(results)})")
+        else:
+            print(f"Found {len(results)} results")
 
         if results:
             print(f"\nResults:")
-            for i, record in enumerate(results[:args.limit], 1):
+            for i, record in enumerate(results, 1):
                 # Show key fields
                 id_field = f"{collection_name.lower()}_id"
                 name_field = f"{collection_name.lower()}_name"
@@ -243,12 +264,23 @@ def cmd_find(query: ENIGMAProvenanceQuery, args):
                     if key in record:
                         print(f"     {key}: {record[key]}")
 
-        # Export if requested
+        # Export if requested (streamed from DuckDB)
         if args.export and results:
+            import duckdb
+
+            where_sql, params = _where_clause([(f'"{key}" = ?', value) for key, value in query_dict.items()])
+            export_sql = f'SELECT * FROM "{collection_name}"{where_sql} LIMIT ?'
             export_path = Path(args.export)
-            with open(export_path, 'w') as f:
-                json.dump(results, f, indent=2, default=str)
-            print(f"\n💾 Results exported to: {export_path}")
+            conn = duckdb.connect(args.db, read_only=True)
+            try:
+                exported = export_query(
+                    conn, export_sql, export_path, params + [args.limit],
+                    export_format=args.export_format,
+                    metadata={'query': 'find', 'collection': collection_name, 'filters': query_dict}
+                )
+            finally:
+                conn.close()
+            print(f"\n💾 {exported:,} results exported to: {export_path}")
 
     except Exception as e:
         print(f"Error: {e}")
@@ -278,62 +310,70 @@ def cmd_samples(query: ENIGMAProvenanceQuery, args):
     else:
         print("No filters applied (showing all samples)\n")
 
-    # Get samples
-    samples = query.get_collection("Sample").find({})
-
-    # Apply filters
-    filtered = []
-    for s in samples.rows:
-        depth = s.get('sample_depth')
-        if args.depth_min is not None and (depth is None or depth < args.depth_min):
-            continue
-        if args.depth_max is not None and (depth is None or depth > args.depth_max):
-            continue
-        if args.date and s.get('sample_date') != args.date:
-            continue
-        if args.location and args.location not in str(s.get('sample_location', '')):
-            continue
-        filtered.append(s)
-
-    print(f"Found {len(filtered)} samples matching criteria\n")
-
-    if filtered:
-        # Sort by depth (descending) if depth filter was used
-        if args.depth_min is not None or args.depth_max is not None:
-            filtered.sort(key=lambda x: x.get('sample_depth') or 0, reverse=True)
-
-        # Display results in table format
-        print(f"{'Sample ID':<18} | {'Location':<12} | {'Depth (m)':<10} | {'Date':<12}")
-        print(f"{'-'*18}-+-{'-'*12}-+-{'-'*10}-+-{'-'*12}")
-
-        for s in filtered[:args.limit]:
-            sample_id = s.get('sample_id', '?')
-            location = s.get('sample_location', '?')[:12]
-            depth = s.get('sample_depth')
-            depth_str = f"{depth:.2f}" if depth is not None else "N/A"
-            date = s.get('sample_date', 'N/A')
-            print(f"{sample_id:<18} | {location:<12} | {depth_str:<10} | {date:<12}")
-
-        if len(filtered) > args.limit:
-            print(f"\n... and {len(filtered) - args.limit} more (use --limit to show more)")
+    import duckdb
+
+    # Push filters, ordering and --limit into SQL
+    conditions = []
+    if args.depth_min is not None:
+        conditions.append(("sample_depth >= ?", args.depth_min))
+    if args.depth_max is not None:
+        conditions.append(("sample_depth <= ?", args.depth_max))
+    if args.date:
+        conditions.append(("CAST(sample_date AS VARCHAR) = ?", args.date))
+    if args.location:
+        conditions.append(("contains(CAST(sample_location AS VARCHAR), ?)", args.location))
+    where_sql, params = _where_clause(conditions)
 
-    # Export if requested
-    if args.export and filtered:
-        export_data = {
-            'query': 'samples',
-            'filters': {
-                'depth_min': args.depth_min,
-                'depth_max': args.depth_max,
-                'date': args.date,
-                'location': args.location,
-            },
-            'total_matches': len(filtered),
-            'results': filtered[:args.limit]
-        }
-        export_path = Path(args.export)
-        with open(export_path, 'w') as f:
-            json.dump(export_data, f, indent=2, default=str)
-        print(f"\n💾 Results exported to: {export_path}")
+    # Sort by depth (descending) if depth filter was used
+    order_sql = ""
+    if args.depth_min is not None or args.depth_max is not None:
+        order_sql = " ORDER BY sample_depth DESC NULLS LAST"
+
+    conn = duckdb.connect(args.db, read_only=True)
+    try:
+        total_matches = conn.execute(f"SELECT COUNT(*) FROM Sample{where_sql}", params).fetchone()[0]
+
+        print(f"Found {total_matches} samples matching criteria\n")
+
+        if total_matches:
+            rows = conn.execute(
+                f"SELECT sample_id, sample_location, sample_depth, sample_date "
+                f"FROM Sample{where_sql}{order_sql} LIMIT ?",
+                params + [args.limit]
+            ).fetchall()
+
+            # Display results in table format
+            print(f"{'Sample ID':<18} | {'Location':<12} | {'Depth (m)':<10} | {'Date':<12}")
+            print(f"{'-'*18}-+-{'-'*12}-+-{'-'*10}-+-{'-'*12}")
+
+            for sample_id, location, depth, date in rows:
+                location = str(location or '?')[:12]
+                depth_str = f"{depth:.2f}" if depth is not None else "N/A"
+                print(f"{sample_id or '?':<18} | {location:<12} | {depth_str:<10} | {str(date or 'N/A'):<12}")
+
+            if total_matches > args.limit:
+                print(f"\n... and {total_matches - args.limit} more (use --limit to show more)")
+
+        # Export if requested (streamed from DuckDB)
+        if args.export and total_matches:
+            export_metadata = {
+                'query': 'samples',
+                'filters': {
+                    'depth_min': args.depth_min,
+                    'depth_max': args.depth_max,
+                    'date': args.date,
+                    'location': args.location,
+                },
+                'total_matches': total_matches,
+            }
+            export_path = Path(args.export)
+            exported = export_query(
+                conn, f"SELECT * FROM Sample{where_sql}{order_sql} LIMIT ?", export_path,
+                params + [args.limit], export_format=args.export_format, metadata=export_metadata
+            )
+            print(f"\n💾 {exported:,} results exported to: {export_path}")
+    finally:
+        conn.close()
 
     return 0
 
@@ -351,11 +391,8 @@ def cmd_sql(query: ENIGMAProvenanceQuery, args):
     try:
         # Connect directly to DuckDB for raw SQL
         conn = duckdb.connect(args.db, read_only=True)
-        result = conn.execute(sql)
-
-        # Get column names
-        columns = [desc[0] for desc in result.description]
-        rows = result.fetchall()
+        runner = QueryRunner(conn, args.db, tool="enigma_query.sql", show=args.profile)
+        columns, rows = runner.execute(sql)
 
         print(f"📊 Results: {len(rows)} rows\n")
 
@@ -430,6 +467,7 @@ def cmd_unused_reads_sql(query: ENIGMAProvenanceQuery, args):
     print(f"Finding reads with >= {args.min_count:,} raw reads NOT used in assemblies{filter_desc}...\n")
 
     conn = duckdb.connect(args.db, read_only=True)
+    runner = QueryRunner(conn, args.db, tool="enigma_query.unused_reads_sql", show=args.profile)
 
     # Summary statistics query - dynamically build with read type filter
     summary_sql = f"""
@@ -476,7 +514,7 @@ def cmd_unused_reads_sql(query: ENIGMAProvenanceQuery, args):
         detail_params = [args.min_count] + read_type_params + [args.limit]
 
         # Execute summary query
-        summary_result = conn.execute(summary_sql, summary_params).fetchone()
+        summary_result = runner.fetchone(summary_sql, summary_params, label="summary")
         total_good, used_in_assemblies, unused_good = summary_result
 
         utilization_rate = used_in_assemblies / total_good if total_good > 0 else 0
@@ -488,7 +526,7 @@ def cmd_unused_reads_sql(query: ENIGMAProvenanceQuery, args):
         print(f"  • Utilization rate: {utilization_rate:.1%}")
 
         # Execute detail query
-        detail_result = conn.execute(detail_sql, detail_params).fetchall()
+        _, detail_result = runner.execute(detail_sql, detail_params, label="detail")
 
         if detail_result:
             print(f"\n🔬 Top {len(detail_result)} Unused Reads (by count):\n")
@@ -518,9 +556,8 @@ def cmd_unused_reads_sql(query: ENIGMAProvenanceQuery, args):
             ORDER BY r.reads_read_count DESC
             """
             export_params = [args.min_count] + read_type_params
-            all_unused = conn.execute(export_sql, export_params).fetchall()
 
-            export_data = {
+            export_metadata = {
                 'query': 'unused_reads_sql',
                 'parameters': {
                     'min_count': args.min_count,
@@ -532,16 +569,14 @@ def cmd_unused_reads_sql(query: ENIGMAProvenanceQuery, args):
                     'reads_used_in_assemblies': used_in_assemblies,
                     'unused_good_reads': unused_good,
                     'utilization_rate': utilization_rate
-                },
-                'results': [
-                    {'reads_id': r[0], 'reads_name': r[1], 'reads_read_count': r[2], 'read_count_category': r[3], 'reads_read_type': r[4]}
-                    for r in all_unused
-                ]
+                }
             }
             export_path = Path(args.export)
-            with open(export_path, 'w') as f:
-                json.dump(export_data, f, indent=2, default=str)
-            print(f"\n💾 Results exported to: {export_path}")
+            with runner.track(export_sql, label="export") as export_profile:
+                exported = export_query(conn, export_sql, export_path, export_params,
+                                        export_format=args.export_format, metadata=export_metadata)
+                export_profile.rows = exported
+            print(f"\n💾 {exported:,} results exported to: {export_path}")
 
         conn.close()
         return 0
@@ -654,8 +689,15 @@ Examples:
   # Run arbitrary SQL query
   enigma_query.py sql "SELECT sample_location, COUNT(*) FROM Sample GROUP BY 1"
 
+  # Show the query's DuckDB profile (slow queries are logged either way;
+  # rank them with: just cdm-slow-queries)
+  enigma_query.py --profile sql "SELECT sample_location, COUNT(*) FROM Sample GROUP BY 1"
+
   # Export results to JSON
   enigma_query.py unused-reads --min-count 10000 --export results.json
+
+  # Stream all unused reads to Parquet (constant memory)
+  enigma_query.py unused-reads-sql --min-count 10000 --export unused_reads.parquet
         """
     )
 
@@ -669,6 +711,25 @@ Examples:
         default='query_provenance',
         help='Directory for provenance tracking (default: query_provenance)'
     )
+    parser.add_argument(
+        '--fingerprint',
+        choices=['fast', 'sampled', 'full'],
+        help='Database fingerprint recorded in provenance: size/mtime/load ID (fast), '
+             'hashed blocks (sampled) or a background full hash (full) '
+             '(default: $CDM_FINGERPRINT_MODE or sampled)'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Ignore cached results and recompute (cache: ~/.cache/linkml-coral/results)'
+    )
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help='Print DuckDB profiles (latency, rows scanned, peak memory, slowest operators) '
+             'of the sql and unused-reads-sql queries; slow queries are always logged '
+             '(see cdm_analysis/query_profiler.py)'
+    )
 
     subparsers = parser.add_subparsers(dest='command', help='Command to execute')
 
@@ -697,7 +758,12 @@ Examples:
     parser_unused.add_argument(
         '--export',
         metavar='FILE',
-        help='Export results to JSON file'
+        help='Export results (format from extension: .json, .ndjson, .csv, .parquet, .arrow)'
+    )
+    parser_unused.add_argument(
+        '--export-format',
+        choices=EXPORT_FORMATS,
+        help='Export format (overrides the file extension)'
     )
     parser_unused.add_argument(
         '--read-type',
@@ -759,7 +825,12 @@ Examples:
     parser_find.add_argument(
         '--export',
         metavar='FILE',
-        help='Export results to JSON file'
+        help='Export results (format from extension: .json, .ndjson, .csv, .parquet, .arrow)'
+    )
+    parser_find.add_argument(
+        '--export-format',
+        choices=EXPORT_FORMATS,
+        help='Export format (overrides the file extension)'
     )
 
     # samples command
@@ -798,7 +869,12 @@ Examples:
     parser_samples.add_argument(
         '--export',
         metavar='FILE',
-        help='Export results to JSON file'
+        help='Export results (format from extension: .json, .ndjson, .csv, .parquet, .arrow)'
+    )
+    parser_samples.add_argument(
+        '--export-format',
+        choices=EXPORT_FORMATS,
+        help='Export format (overrides the file extension)'
     )
 
     # samples-with-reads command (actually finds high-count reads)
@@ -875,7 +951,12 @@ Examples:
     parser_unused_sql.add_argument(
         '--export',
         metavar='FILE',
-        help='Export all results to JSON file'
+        help='Export all results (format from extension: .json, .ndjson, .csv, .parquet, .arrow)'
+    )
+    parser_unused_sql.add_argument(
+        '--export-format',
+        choices=EXPORT_FORMATS,
+        help='Export format (overrides the file extension)'
     )
 
     args = parser.parse_args()
@@ -890,7 +971,7 @@ Examples:
 
     # Initialize query interface
     try:
-        query = ENIGMAProvenanceQuery(str(db_path))
+        query = ENIGMAProvenanceQuery(str(db_path), use_cache=not args.no_cache)
     except Exception as e:
         print(f"❌ Error connecting to database: {e}")
         return 1
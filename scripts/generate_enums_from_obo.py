@@ -58,13 +58,13 @@ def sanitize_permissible_value(name: str) -> str:
     return key
 
 
-def should_generate_enum(term: OBOTerm, all_terms: Dict[str, OBOTerm]) -> bool:
+def should_generate_enum(term: OBOTerm, parser: OBOParser) -> bool:
     """
     Determine if a term should have an enum generated.
 
     Args:
         term: The microtype term to check
-        all_terms: All terms in the ontology
+        parser: Parsed ontology (with its indexed term graph)
 
     Returns:
         True if enum should be generated
@@ -78,8 +78,7 @@ def should_generate_enum(term: OBOTerm, all_terms: Dict[str, OBOTerm]) -> bool:
         return False
 
     # Must have at least one child term
-    children = term.get_children(all_terms)
-    if not children:
+    if not parser.children(term.id):
         return False
 
     return True
@@ -87,7 +86,7 @@ def should_generate_enum(term: OBOTerm, all_terms: Dict[str, OBOTerm]) -> bool:
 
 def generate_enum_definition(
     term: OBOTerm,
-    all_terms: Dict[str, OBOTerm],
+    parser: OBOParser,
     include_hierarchy: bool = False
 ) -> Dict:
     """
@@ -95,14 +94,17 @@ def generate_enum_definition(
 
     Args:
         term: The parent term defining the enum
-        all_terms: All terms in the ontology
+        parser: Parsed ontology (with its indexed term graph)
         include_hierarchy: Whether to include full hierarchy or just direct children
 
     Returns:
         LinkML enum definition as a dictionary
     """
     enum_name = sanitize_enum_name(term.name)
-    children = term.get_children(all_terms)
+    if include_hierarchy:
+        children = [parser.terms[t] for t in parser.descendants(term.id) if t in parser.terms]
+    else:
+        children = parser.get_child_terms(term.id)
 
     # Sort children by ID for consistent ordering
     children.sort(key=lambda t: t.id)
@@ -160,7 +162,7 @@ def generate_all_enums(obo_file: str, output_file: str = None, verbose: bool = F
         verbose: Whether to print verbose output
     """
     print(f"Parsing OBO file: {obo_file}")
-    parser = OBOParser(obo_file)
+    parser = OBOParser(obo_file, use_cache=True)
     terms = parser.parse()
 
     print(f"Found {len(terms)} terms")
@@ -173,7 +175,7 @@ def generate_all_enums(obo_file: str, output_file: str = None, verbose: bool = F
     enums_to_generate = {
         term_id: term
         for term_id, term in enum_microtypes.items()
-        if should_generate_enum(term, terms)
+        if should_generate_enum(term, parser)
     }
 
     print(f"Generating enums for {len(enums_to_generate)} microtypes")
@@ -182,10 +184,10 @@ def generate_all_enums(obo_file: str, output_file: str = None, verbose: bool = F
     all_enums = {}
     for term_id, term in enums_to_generate.items():
         if verbose:
-            children = term.get_children(terms)
+            children = parser.children(term_id)
             print(f"  Generating {sanitize_enum_name(term.name)} ({len(children)} values)")
 
-        enum_def = generate_enum_definition(term, terms)
+        enum_def = generate_enum_definition(term, parser)
         all_enums.update(enum_def)
 
     # Create the enums section
@@ -2,16 +2,30 @@
 """
 Generate HTML validation report from JSON validation results.
 
-This script converts JSON validation output into an interactive HTML report
-with filtering, sorting, and quality metrics visualization.
+This script converts validation output into an interactive HTML report with
+filtering, sorting, and quality metrics visualization.
+
+The results are streamed: JSON Lines reports (``--report-format jsonl``) are
+read one record at a time, and legacy ``.json`` reports are still accepted.
+Issues are aggregated by (file, status, field, message template) with counts
+and a few example rows. Every issue row is also written to paginated
+drill-down pages next to the report, so the main page stays small however
+many records fail.
 """
 
 import argparse
 import json
+import re
 import sys
+from dataclasses import dataclass, field
+from html import escape
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Any
+from typing import Any, Dict, Iterator, List, Optional, TextIO, Tuple
+
+DEFAULT_MAX_EXAMPLES = 5
+DEFAULT_SHARD_SIZE = 5000
+VALUE_DISPLAY_CHARS = 50
 
 
 HTML_TEMPLATE = """<!DOCTYPE html>
@@ -276,6 +290,48 @@ HTML_TEMPLATE = """<!DOCTYPE html>
             border-radius: 6px;
             margin: 20px 0;
         }
+        .group-table td.count {
+            font-weight: bold;
+            text-align: right;
+            white-space: nowrap;
+        }
+
+        .template {
+            font-family: "SF Mono", Menlo, Consolas, monospace;
+            font-size: 13px;
+        }
+
+        .examples {
+            font-size: 13px;
+            color: #555;
+        }
+
+        .examples li {
+            list-style: none;
+        }
+
+        .examples a, .shards a {
+            color: #2980b9;
+        }
+
+        .shards {
+            margin: 10px 0 20px;
+            font-size: 14px;
+        }
+
+        .shards a {
+            margin-right: 12px;
+        }
+
+        .back-link {
+            display: inline-block;
+            margin-bottom: 20px;
+            color: #2980b9;
+        }
+
+        tr:target {
+            background: #fff3cd;
+        }
     </style>
 </head>
 <body>
@@ -333,15 +389,300 @@ HTML_TEMPLATE = """<!DOCTYPE html>
 </html>
 """
 
+STYLE_BLOCK = HTML_TEMPLATE[HTML_TEMPLATE.index('<style>'):HTML_TEMPLATE.index('</style>') + len('</style>')]
+
+SHARD_HEADER = """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <title>{{title}}</title>
+    """ + STYLE_BLOCK + """
+</head>
+<body>
+    <div class="container">
+        <a class="back-link" href="{{back_href}}">← Back to report</a>
+        <h1>{{title}}</h1>
+        <table>
+            <thead>
+                <tr>
+                    <th>Line</th>
+                    <th>Entity ID</th>
+                    <th>Status</th>
+                    <th>Field</th>
+                    <th>Value</th>
+                    <th>Message</th>
+                </tr>
+            </thead>
+            <tbody>
+"""
+
+SHARD_FOOTER = """            </tbody>
+        </table>
+    </div>
+</body>
+</html>
+"""
+
+_QUOTED = re.compile(r"'[^']*'|\"[^\"]*\"")
+_NUMBER = re.compile(r"(?<![\w.])\d+(?:\.\d+)?(?![\w.])")
+
+
+def iter_validation_events(path: Path) -> Iterator[Dict[str, Any]]:
+    """
+    Stream run, file and record events from a validation report.
+
+    Args:
+        path: A ``.jsonl`` report (read line by line) or a legacy ``.json``
+            report (loaded whole and replayed as the same events)
+
+    Returns:
+        Iterator of event dicts with a ``type`` of run, file or record
+    """
+    if path.suffix == '.jsonl':
+        with open(path, 'r') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        return
+
+    with open(path, 'r') as f:
+        data = json.load(f)
+    yield {'type': 'run', 'validation_date': data.get('validation_date')}
+    for file_data in data.get('files', []):
+        summary = {k: v for k, v in file_data.items() if k != 'record_results'}
+        yield {'type': 'file', **summary}
+        for record in file_data.get('record_results', []):
+            yield {'type': 'record', 'filename': file_data['filename'], **record}
+
+
+def message_template(message: str, value: Optional[str] = None) -> str:
+    """
+    Reduce a validation message to a template shared by similar issues.
+
+    The offending value, quoted strings and numbers are replaced with
+    placeholders, so "3 invalid FK references" and "7 invalid FK references"
+    are counted together.
 
-def generate_file_section(file_data: Dict[str, Any]) -> str:
+    Args:
+        message: Validation message
+        value: The value the message is about
+
+    Returns:
+        Message template
+    """
+    template = message or ''
+    if value and str(value) in template:
+        template = re.sub(r'(?<!\w)' + re.escape(str(value)) + r'(?!\w)', '<value>', template)
+    template = _QUOTED.sub('<text>', template)
+    return _NUMBER.sub('<n>', template)
+
+
+def _slug(filename: str) -> str:
+    """A filename made safe for drill-down page names."""
+    return re.sub(r'[^A-Za-z0-9._-]+', '_', filename)
+
+
+def _issue_row(record: Dict[str, Any], result: Dict[str, Any], anchor: bool = False) -> str:
+    """One HTML table row for a validation issue."""
+    line = record.get('record_line', '')
+    row_id = f' id="L{line}"' if anchor else ''
+    status = result.get('status', '')
+    value = str(result.get('value') or '')[:VALUE_DISPLAY_CHARS]
+    return (f'<tr{row_id}><td>{line}</td>'
+            f'<td>{escape(str(record.get("entity_id") or "N/A"))}</td>'
+            f'<td class="status-{escape(status.lower())}">{escape(status)}</td>'
+            f'<td>{escape(str(result.get("field") or ""))}</td>'
+            f'<td>{escape(value)}</td>'
+            f'<td>{escape(str(result.get("message") or ""))}</td></tr>\n')
+
+
+class ShardWriter:
+    """Write a file's issue rows to drill-down pages of at most shard_size rows."""
+
+    def __init__(self, details_dir: Path, filename: str, shard_size: int, back_href: str):
+        """
+        Initialize the writer.
+
+        Args:
+            details_dir: Directory holding the drill-down pages
+            filename: Validated file the issues belong to
+            shard_size: Maximum issue rows per page
+            back_href: Link from a page back to the main report
+        """
+        self.details_dir = details_dir
+        self.filename = filename
+        self.shard_size = shard_size
+        self.back_href = back_href
+        self.shards: List[Dict[str, Any]] = []
+        self._handle: Optional[TextIO] = None
+        self._last_line = None
+
+    def add(self, record: Dict[str, Any], result: Dict[str, Any]) -> str:
+        """
+        Append an issue row.
+
+        Args:
+            record: Record event the issue belongs to
+            result: The validation result
+
+        Returns:
+            Link to the record's row, relative to the main report
+        """
+        if self._handle is None or self.shards[-1]['rows'] >= self.shard_size:
+            self._open_next()
+        shard = self.shards[-1]
+        line = record.get('record_line')
+        anchor = line != self._last_line
+        self._handle.write(_issue_row(record, result, anchor=anchor))
+        self._last_line = line
+        shard['rows'] += 1
+        shard['first_line'] = line if shard['first_line'] is None else shard['first_line']
+        shard['last_line'] = line
+        return f"{shard['href']}#L{line}"
+
+    def _open_next(self):
+        """Finish the current page and start the next one."""
+        self.close()
+        number = len(self.shards) + 1
+        name = f"{_slug(self.filename)}-{number:04d}.html"
+        self.details_dir.mkdir(parents=True, exist_ok=True)
+        self._handle = open(self.details_dir / name, 'w')
+        title = escape(f"{self.filename} — issues, part {number}")
+        self._handle.write(SHARD_HEADER.replace('{{title}}', title)
+                           .replace('{{back_href}}', escape(self.back_href)))
+        self._last_line = None
+        self.shards.append({'href': f"{self.details_dir.name}/{name}", 'rows': 0,
+                            'first_line': None, 'last_line': None})
+
+    def close(self):
+        """Finish the current page."""
+        if self._handle is not None:
+            self._handle.write(SHARD_FOOTER)
+            self._handle.close()
+            self._handle = None
+
+
+@dataclass
+class IssueGroup:
+    """Issues sharing a status, field and message template."""
+    status: str
+    field: str
+    template: str
+    count: int = 0
+    examples: List[Dict[str, Any]] = field(default_factory=list)
+
+
+@dataclass
+class FileReport:
+    """Aggregated validation issues for one file."""
+    summary: Dict[str, Any]
+    groups: Dict[Tuple[str, str, str], IssueGroup] = field(default_factory=dict)
+    issue_count: int = 0
+    shards: Optional[ShardWriter] = None
+
+    def add(self, record: Dict[str, Any], max_examples: int):
+        """
+        Count a record's issues into their groups.
+
+        Args:
+            record: Record event
+            max_examples: Example rows kept per group
+        """
+        for result in record.get('results', []):
+            status = result.get('status', 'ERROR')
+            if status == 'PASS':
+                continue
+            field_name = result.get('field') or ''
+            template = message_template(result.get('message', ''), result.get('value'))
+            key = (status, field_name, template)
+            group = self.groups.get(key)
+            if group is None:
+                group = self.groups[key] = IssueGroup(status, field_name, template)
+            group.count += 1
+            self.issue_count += 1
+            href = self.shards.add(record, result) if self.shards else None
+            if len(group.examples) < max_examples:
+                group.examples.append({
+                    'line': record.get('record_line'),
+                    'entity_id': record.get('entity_id'),
+                    'value': str(result.get('value') or '')[:VALUE_DISPLAY_CHARS],
+                    'href': href,
+                })
+
+
+def aggregate_validation_results(
+    events: Iterator[Dict[str, Any]],
+    details_dir: Optional[Path] = None,
+    max_examples: int = DEFAULT_MAX_EXAMPLES,
+    shard_size: int = DEFAULT_SHARD_SIZE,
+    back_href: str = '',
+) -> Dict[str, FileReport]:
+    """
+    Aggregate streamed validation events per file.
+
+    Only the file summaries, the issue groups and their example rows are
+    kept in memory; full issue rows go straight to the drill-down pages.
+
+    Args:
+        events: Events from iter_validation_events
+        details_dir: Directory for drill-down pages (None to skip them)
+        max_examples: Example rows kept per issue group
+        shard_size: Issue rows per drill-down page
+        back_href: Link from drill-down pages back to the main report
+
+    Returns:
+        FileReport per filename, in input order
+    """
+    reports: Dict[str, FileReport] = {}
+
+    def report_for(filename: str) -> FileReport:
+        if filename not in reports:
+            shards = None
+            if details_dir is not None and shard_size > 0:
+                shards = ShardWriter(details_dir, filename, shard_size, back_href)
+            reports[filename] = FileReport(summary={'filename': filename}, shards=shards)
+        return reports[filename]
+
+    try:
+        for event in events:
+            kind = event.get('type')
+            if kind == 'file':
+                report_for(event['filename']).summary = {
+                    k: v for k, v in event.items() if k != 'type'}
+            elif kind == 'record':
+                report_for(event['filename']).add(event, max_examples)
+    finally:
+        for report in reports.values():
+            if report.shards:
+                report.shards.close()
+
+    return reports
+
+
+def _example_list(group: IssueGroup) -> str:
+    """Example rows of an issue group, linked to their drill-down rows."""
+    items = []
+    for example in group.examples:
+        text = f"line {example['line']}"
+        if example['entity_id']:
+            text += f" ({escape(str(example['entity_id']))})"
+        if example['value']:
+            text += f": <code>{escape(example['value'])}</code>"
+        if example['href']:
+            text = f'<a href="{escape(example["href"])}">{text}</a>'
+        items.append(f'<li>{text}</li>')
+    return f'<ul class="examples">{"".join(items)}</ul>'
+
+
+def generate_file_section(report: FileReport) -> str:
     """Generate HTML for a single file section."""
-    filename = file_data['filename']
-    total_records = file_data['total_records']
-    pass_count = file_data['pass_count']
-    warning_count = file_data['warning_count']
-    error_count = file_data['error_count']
-    pass_rate = file_data['pass_rate']
+    summary = report.summary
+    filename = escape(str(summary.get('filename', '')))
+    total_records = summary.get('total_records', 0)
+    pass_count = summary.get('pass_count', 0)
+    warning_count = summary.get('warning_count', 0)
+    error_count = summary.get('error_count', 0)
+    pass_rate = summary.get('pass_rate', 0.0)
 
     # File header
     html = f"""
@@ -359,50 +700,47 @@ def generate_file_section(file_data: Dict[str, Any]) -> str:
         <div class="file-content collapsed">
     """
 
-    # Show validation issues if any
-    record_results = file_data.get('record_results', [])
-    has_issues = any(r['results'] for r in record_results)
-
-    if has_issues:
-        html += """
-            <h3>Validation Issues</h3>
-            <table>
+    # Show validation issues, grouped, if any
+    if report.groups:
+        groups = sorted(report.groups.values(), key=lambda g: (-g.count, g.status, g.field, g.template))
+        html += f"""
+            <h3>Validation Issues ({report.issue_count} in {len(groups)} groups)</h3>
+            <table class="group-table">
                 <thead>
                     <tr>
-                        <th>Line</th>
-                        <th>Entity ID</th>
+                        <th>Count</th>
                         <th>Status</th>
                         <th>Field</th>
-                        <th>Value</th>
                         <th>Message</th>
+                        <th>Examples</th>
                     </tr>
                 </thead>
                 <tbody>
         """
-
-        for record in record_results:
-            for result in record['results']:
-                status_class = f"status-{result['status'].lower()}"
-                html += f"""
+        for group in groups:
+            html += f"""
                     <tr>
-                        <td>{record['record_line']}</td>
-                        <td>{record.get('entity_id', 'N/A')}</td>
-                        <td class="{status_class}">{result['status']}</td>
-                        <td>{result.get('field', '')}</td>
-                        <td>{result.get('value', '')[:50]}</td>
-                        <td>{result['message']}</td>
+                        <td class="count">{group.count}</td>
+                        <td class="status-{escape(group.status.lower())}">{escape(group.status)}</td>
+                        <td>{escape(group.field)}</td>
+                        <td class="template">{escape(group.template)}</td>
+                        <td>{_example_list(group)}</td>
                     </tr>
-                """
-
+            """
         html += """
                 </tbody>
             </table>
         """
+        if report.shards and report.shards.shards:
+            links = ''.join(
+                f'<a href="{escape(s["href"])}">part {i} (lines {s["first_line"]}–{s["last_line"]})</a>'
+                for i, s in enumerate(report.shards.shards, 1))
+            html += f'<div class="shards"><strong>All issues:</strong> {links}</div>'
     else:
         html += '<div class="no-issues">✅ No validation issues found - all records passed!</div>'
 
     # Quality metrics if available
-    quality_metrics = file_data.get('quality_metrics', {})
+    quality_metrics = summary.get('quality_metrics', {})
     if quality_metrics:
         html += '<h3>Data Quality Metrics</h3><div class="metrics-grid">'
 
@@ -410,7 +748,7 @@ def generate_file_section(file_data: Dict[str, Any]) -> str:
             completeness = metrics.get('completeness', 0)
             html += f"""
             <div class="metric-card">
-                <h4>{field_name}</h4>
+                <h4>{escape(field_name)}</h4>
                 <div class="metric-row">
                     <span class="metric-label">Completeness:</span>
                     <span class="metric-value">{completeness:.1f}%</span>
@@ -439,72 +777,96 @@ def generate_file_section(file_data: Dict[str, Any]) -> str:
     return html
 
 
-def generate_html_report(json_data: Dict[str, Any]) -> str:
-    """Generate complete HTML report from JSON data."""
-    files = json_data.get('files', [])
+def generate_html_report(
+    input_path: Path,
+    output_path: Path,
+    max_examples: int = DEFAULT_MAX_EXAMPLES,
+    shard_size: int = DEFAULT_SHARD_SIZE,
+) -> Dict[str, FileReport]:
+    """
+    Generate the HTML report and its drill-down pages from validation results.
+
+    The page is written section by section, so memory stays bounded by the
+    number of issue groups rather than the number of failing records.
+
+    Args:
+        input_path: ``.jsonl`` or legacy ``.json`` validation results
+        output_path: HTML report to write; drill-down pages go to
+            ``<stem>_details/`` next to it
+        max_examples: Example rows shown per issue group
+        shard_size: Issue rows per drill-down page (0 for no drill-down pages)
 
-    # Calculate totals
-    total_files = len(files)
-    total_pass = sum(f['pass_count'] for f in files)
-    total_warnings = sum(f['warning_count'] for f in files)
-    total_errors = sum(f['error_count'] for f in files)
+    Returns:
+        FileReport per validated file
+    """
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    details_dir = output_path.parent / f"{output_path.stem}_details"
+    for stale in details_dir.glob('*.html') if details_dir.exists() else []:
+        stale.unlink()
+
+    reports = aggregate_validation_results(
+        iter_validation_events(input_path),
+        details_dir=details_dir,
+        max_examples=max_examples,
+        shard_size=shard_size,
+        back_href=f"../{output_path.name}",
+    )
+    files = [r.summary for r in reports.values()]
 
-    # Generate file sections
-    file_sections = '\n'.join(generate_file_section(f) for f in files)
+    head, tail = HTML_TEMPLATE.split('{{file_sections}}')
+    head = head.replace('{{total_files}}', str(len(files)))
+    head = head.replace('{{total_pass}}', str(sum(f.get('pass_count', 0) for f in files)))
+    head = head.replace('{{total_warnings}}', str(sum(f.get('warning_count', 0) for f in files)))
+    head = head.replace('{{total_errors}}', str(sum(f.get('error_count', 0) for f in files)))
+    tail = tail.replace('{{generation_time}}', datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
 
-    # Fill template
-    html = HTML_TEMPLATE
-    html = html.replace('{{total_files}}', str(total_files))
-    html = html.replace('{{total_pass}}', str(total_pass))
-    html = html.replace('{{total_warnings}}', str(total_warnings))
-    html = html.replace('{{total_errors}}', str(total_errors))
-    html = html.replace('{{file_sections}}', file_sections)
-    html = html.replace('{{generation_time}}', datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+    with open(output_path, 'w') as f:
+        f.write(head)
+        for report in reports.values():
+            f.write(generate_file_section(report))
+        f.write(tail)
 
-    return html
+    return reports
 
 
 def main():
     parser = argparse.ArgumentParser(
-        description='Generate HTML report from JSON validation results'
+        description='Generate HTML report from JSON or JSON Lines validation results'
     )
-    parser.add_argument('json_file', help='JSON validation results file')
+    parser.add_argument('json_file', help='Validation results file (.jsonl or .json)')
     parser.add_argument('--output', '-o',
                        help='Output HTML file (default: <json_file>.html)')
+    parser.add_argument('--max-examples', type=int, default=DEFAULT_MAX_EXAMPLES,
+                       help=f'Example rows shown per issue group (default: {DEFAULT_MAX_EXAMPLES})')
+    parser.add_argument('--shard-size', type=int, default=DEFAULT_SHARD_SIZE,
+                       help=f'Issue rows per drill-down page, 0 to skip them (default: {DEFAULT_SHARD_SIZE})')
 
     args = parser.parse_args()
 
-    # Load JSON data
     json_path = Path(args.json_file)
     if not json_path.exists():
         print(f"Error: JSON file not found: {json_path}", file=sys.stderr)
         sys.exit(1)
 
-    try:
-        with open(json_path, 'r') as f:
-            json_data = json.load(f)
-    except Exception as e:
-        print(f"Error loading JSON: {e}", file=sys.stderr)
-        sys.exit(1)
-
-    # Generate HTML
-    html_content = generate_html_report(json_data)
-
-    # Save HTML
     if args.output:
         output_path = Path(args.output)
     else:
         output_path = json_path.with_suffix('.html')
 
     try:
-        with open(output_path, 'w') as f:
-            f.write(html_content)
-        print(f"✅ HTML report generated: {output_path}")
-        print(f"📊 Open in browser: file://{output_path.absolute()}")
-    except Exception as e:
-        print(f"Error writing HTML: {e}", file=sys.stderr)
+        reports = generate_html_report(
+            json_path, output_path, max_examples=args.max_examples, shard_size=args.shard_size)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Error generating HTML report: {e}", file=sys.stderr)
         sys.exit(1)
 
+    issues = sum(r.issue_count for r in reports.values())
+    groups = sum(len(r.groups) for r in reports.values())
+    pages = sum(len(r.shards.shards) for r in reports.values() if r.shards)
+    print(f"✅ HTML report generated: {output_path}")
+    print(f"   {issues} issue(s) in {groups} group(s), {pages} drill-down page(s)")
+    print(f"📊 Open in browser: file://{output_path.absolute()}")
+
 
 if __name__ == "__main__":
     main()
@@ -18,6 +18,12 @@ import pandas as pd
 from linkml_store import Client
 from linkml_runtime.utils.schemaview import SchemaView
 
+try:
+    from linkml_coral.utils.store_indexes import IndexSpec, build_indexes, store_columns
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+    from linkml_coral.utils.store_indexes import IndexSpec, build_indexes, store_columns
+
 # Import mapping functions from validation script (same directory)
 from validate_tsv_linkml import (
     read_tsv_file,
@@ -328,18 +334,26 @@ def create_indexes(db, verbose: bool = False):
         ('Process', 'output_entity_types'),
     ]
 
-    for collection_name, field_name in index_specs:
-        try:
-            collection = db.get_collection(collection_name)
-            # Note: linkml-store may handle indexing automatically with DuckDB
-            # This is a placeholder for explicit index creation if needed
-            if verbose:
-                print(f"  ✓ Indexed {collection_name}.{field_name}")
-        except Exception as e:
-            if verbose:
-                print(f"  ⚠️  Could not index {collection_name}.{field_name}: {e}")
-
-    print(f"  ✅ Index creation complete")
+    # Collections are DuckDB tables of the same name
+    raw_conn = db.engine.raw_connection()
+    try:
+        conn = raw_conn.driver_connection
+        columns = store_columns(conn)
+        specs = []
+        for collection_name, field_name in index_specs:
+            if field_name in columns.get(collection_name, {}):
+                specs.append(IndexSpec(collection_name, field_name, "query pattern"))
+            elif verbose:
+                print(f"  ⊘ Skipping {collection_name}.{field_name} (not loaded)")
+        created, errors = build_indexes(conn, specs, verbose=verbose)
+        raw_conn.commit()
+    finally:
+        raw_conn.close()
+
+    for error in errors:
+        if verbose:
+            print(f"  ⚠️  Could not index {error}")
+    print(f"  ✅ Created {created} indexes")
 
 
 def show_database_info(db):
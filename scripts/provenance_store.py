@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Indexed, append-only store for query provenance records.
+
+Records live in one SQLite table (``<provenance_dir>/provenance.sqlite``)
+with the full record as JSON next to indexed columns for the execution ID,
+query type, start time and database fingerprint, so loading a record,
+listing recent executions or filtering by time range stays cheap however
+many runs have accumulated. Rows are never updated or deleted (triggers
+reject both).
+
+Writes are batched: ``append()`` buffers records and a background timer
+commits them together (after ``flush_interval`` seconds, once
+``batch_size`` records are pending, on any read, or at exit). This keeps
+long-running processes such as the query daemon from committing once per
+query.
+
+The first time a store is created in a directory holding the previous
+one-JSON-file-per-execution records, those files are imported (they are
+left in place). ``migrate_json_records()`` re-runs the import; records
+already in the store are skipped.
+"""
+
+import atexit
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+STORE_FILENAME = "provenance.sqlite"
+DEFAULT_BATCH_SIZE = 256
+DEFAULT_FLUSH_INTERVAL = 1.0  # seconds
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS executions (
+    execution_id TEXT PRIMARY KEY,
+    query_type TEXT NOT NULL,
+    start_time TEXT NOT NULL,
+    end_time TEXT,
+    duration_seconds REAL,
+    status TEXT,
+    username TEXT,
+    description TEXT,
+    db_path TEXT,
+    db_fingerprint TEXT,
+    record TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_executions_start_time ON executions (start_time);
+CREATE INDEX IF NOT EXISTS idx_executions_query_type ON executions (query_type, start_time);
+CREATE INDEX IF NOT EXISTS idx_executions_fingerprint ON executions (db_fingerprint, start_time);
+CREATE TRIGGER IF NOT EXISTS executions_no_update BEFORE UPDATE ON executions
+BEGIN SELECT RAISE(ABORT, 'provenance records are append-only'); END;
+CREATE TRIGGER IF NOT EXISTS executions_no_delete BEFORE DELETE ON executions
+BEGIN SELECT RAISE(ABORT, 'provenance records are append-only'); END;
+"""
+
+SUMMARY_COLUMNS = ("execution_id", "query_type", "start_time", "duration_seconds",
+                   "status", "username", "db_fingerprint")
+
+_stores: Dict[Path, "ProvenanceStore"] = {}
+_stores_lock = threading.Lock()
+
+
+def _row(metadata: Dict[str, Any]) -> tuple:
+    """Indexed column values and JSON text for one provenance record."""
+    execution = metadata["execution"]
+    database = metadata.get("database", {})
+    return (
+        execution["execution_id"],
+        execution["query_type"],
+        execution["start_time"],
+        execution.get("end_time"),
+        execution.get("duration_seconds"),
+        execution.get("status", "unknown"),
+        metadata.get("user", {}).get("username"),
+        execution.get("description"),
+        database.get("path"),
+        database.get("checksum"),
+        json.dumps(metadata, default=str, separators=(",", ":")),
+    )
+
+
+class ProvenanceStore:
+    """Append-only SQLite table of provenance records with batched writes."""
+
+    def __init__(
+        self,
+        provenance_dir="query_provenance",
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL
+    ):
+        """
+        Open (creating if needed) the store in a provenance directory.
+
+        Args:
+            provenance_dir: Directory holding the store (and any JSON records)
+            batch_size: Commit once this many records are pending
+            flush_interval: Seconds a record may stay pending before it is committed
+        """
+        self.provenance_dir = Path(provenance_dir)
+        self.provenance_dir.mkdir(parents=True, exist_ok=True)
+        self.path = self.provenance_dir / STORE_FILENAME
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        created = not self.path.exists()
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.RLock()
+        self._pending: List[tuple] = []
+        self._timer: Optional[threading.Timer] = None
+        atexit.register(self.flush)
+
+        if created:
+            self.migrate_json_records()
+
+    @classmethod
+    def open(cls, provenance_dir="query_provenance") -> "ProvenanceStore":
+        """Shared store for a directory, so one process batches all its writes."""
+        key = Path(provenance_dir).resolve()
+        with _stores_lock:
+            if key not in _stores:
+                _stores[key] = cls(provenance_dir)
+            return _stores[key]
+
+    def append(self, metadata: Dict[str, Any]) -> None:
+        """Queue a provenance record for the next batch."""
+        with self._lock:
+            self._pending.append(_row(metadata))
+            if len(self._pending) >= self.batch_size:
+                self.flush()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.flush_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def append_many(self, records: Iterable[Dict[str, Any]]) -> int:
+        """
+        Write records in batches of ``batch_size``.
+
+        Args:
+            records: Provenance records
+
+        Returns:
+            Number of records queued
+        """
+        count = 0
+        for metadata in records:
+            self.append(metadata)
+            count += 1
+        self.flush()
+        return count
+
+    def flush(self) -> int:
+        """Commit pending records; returns how many were new."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._pending:
+                return 0
+            pending, self._pending = self._pending, []
+            with self._conn:
+                before = self._conn.total_changes
+                self._conn.executemany(
+                    f"INSERT OR IGNORE INTO executions VALUES ({', '.join('?' * 11)})", pending
+                )
+                return self._conn.total_changes - before
+
+    def get(self, execution_id: str) -> Optional[Dict[str, Any]]:
+        """Full record for an execution ID (None if unknown)."""
+        self.flush()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT record FROM executions WHERE execution_id = ?", (execution_id,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def latest(self, query_type: str) -> Optional[Dict[str, Any]]:
+        """Most recent record of a query type (None if there is none)."""
+        self.flush()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT record FROM executions WHERE query_type = ? ORDER BY start_time DESC LIMIT 1",
+                (query_type,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def list(
+        self,
+        query_type: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        fingerprint: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Execution summaries, newest first.
+
+        Args:
+            query_type: Only this query type
+            since: Only executions started at or after this ISO timestamp
+            until: Only executions started before this ISO timestamp
+            fingerprint: Only executions against this database fingerprint
+            limit: Maximum number of summaries (None: all)
+
+        Returns:
+            List of summary dicts (execution_id, query_type, start_time,
+            duration, status, user, fingerprint)
+        """
+        conditions, params = [], []
+        for sql, value in (("query_type = ?", query_type), ("start_time >= ?", since),
+                           ("start_time < ?", until), ("db_fingerprint = ?", fingerprint)):
+            if value is not None:
+                conditions.append(sql)
+                params.append(value)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        sql = (f"SELECT {', '.join(SUMMARY_COLUMNS)} FROM executions{where} "
+               "ORDER BY start_time DESC")
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+
+        self.flush()
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [
+            {
+                "execution_id": execution_id,
+                "query_type": query_type,
+                "start_time": start_time,
+                "duration": duration,
+                "status": status,
+                "user": username,
+                "fingerprint": db_fingerprint,
+            }
+            for execution_id, query_type, start_time, duration, status, username, db_fingerprint in rows
+        ]
+
+    def count(self) -> int:
+        """Number of stored executions."""
+        self.flush()
+        with self._lock:
+            return self._conn.execute("SELECT count(*) FROM executions").fetchone()[0]
+
+    def migrate_json_records(self, json_dir=None) -> int:
+        """
+        Import one-file-per-execution JSON records.
+
+        Args:
+            json_dir: Directory of ``<timestamp>_<type>_<id>.json`` files
+                (default: the store's provenance directory)
+
+        Returns:
+            Number of records added (already imported ones are skipped)
+        """
+        def records():
+            for filepath in sorted(Path(json_dir or self.provenance_dir).glob("*.json")):
+                if filepath.name.startswith("latest_"):
+                    continue
+                try:
+                    with open(filepath) as f:
+                        metadata = json.load(f)
+                    metadata["execution"]["execution_id"]
+                except (OSError, ValueError, KeyError, TypeError):
+                    continue
+                yield metadata
+
+        with self._lock:
+            self.flush()
+            added = 0
+            for metadata in records():
+                self._pending.append(_row(metadata))
+                if len(self._pending) >= self.batch_size:
+                    added += self.flush()
+            return added + self.flush()
+
+    def close(self) -> None:
+        """Commit pending records and close the connection."""
+        self.flush()
+        with self._lock:
+            self._conn.close()
+        atexit.unregister(self.flush)
+        # A later open() of the directory gets a fresh store
+        with _stores_lock:
+            key = self.provenance_dir.resolve()
+            if _stores.get(key) is self:
+                del _stores[key]
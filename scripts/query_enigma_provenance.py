@@ -4,26 +4,40 @@ Query ENIGMA provenance data in LinkML-Store.
 
 This library provides functions for querying provenance relationships,
 lineage tracking, and resource utilization analysis in the ENIGMA dataset.
+
+Expensive analytical results (unused reads, read summaries, lineage) are
+cached on disk per database load; see cdm_analysis/result_cache.py.
 """
 
+import sys
 from typing import List, Dict, Any, Set, Optional, Tuple
 from pathlib import Path
 from linkml_store import Client
 
+try:
+    from result_cache import ResultCache
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).parent / "cdm_analysis"))
+    from result_cache import ResultCache
+
 
 class ENIGMAProvenanceQuery:
     """Query interface for ENIGMA provenance and lineage data."""
 
-    def __init__(self, db_path: str = "enigma_data.db"):
+    def __init__(self, db_path: str = "enigma_data.db", use_cache: bool = True):
         """
         Initialize the query interface.
 
         Args:
             db_path: Path to the DuckDB database file
+            use_cache: Reuse cached results from earlier runs on the same database load
         """
         self.client = Client()
         self.db = self.client.attach_database(f"duckdb:///{db_path}", alias="enigma")
         self.db_path = db_path
+        self.cache = ResultCache()
+        if not use_cache:
+            self.cache.enabled = False
 
     def get_collection(self, name: str):
         """Get a collection by name."""
@@ -70,6 +84,10 @@ class ENIGMAProvenanceQuery:
 
     def get_reads_summary(self) -> Dict[str, Any]:
         """Get summary statistics for all reads."""
+        cached = self.cache.get('reads_summary', {}, self.db_path)
+        if cached is not None:
+            return cached.payload
+
         reads = self.get_all_reads()
 
         if not reads:
@@ -82,7 +100,7 @@ class ENIGMAProvenanceQuery:
             cat = r.get('read_count_category', 'unknown')
             categories[cat] = categories.get(cat, 0) + 1
 
-        return {
+        summary = {
             'total': len(reads),
             'with_counts': len(read_counts),
             'min_count': min(read_counts) if read_counts else 0,
@@ -90,6 +108,22 @@ class ENIGMAProvenanceQuery:
             'avg_count': sum(read_counts) / len(read_counts) if read_counts else 0,
             'categories': categories
         }
+        self.cache.put('reads_summary', {}, self.db_path, payload=summary)
+        return summary
+
+    def get_database_counts(self) -> Dict[str, int]:
+        """Get record counts for Reads, Assembly and Process."""
+        cached = self.cache.get('database_counts', {}, self.db_path)
+        if cached is not None:
+            return cached.payload
+
+        counts = {
+            'total_reads': self.get_collection("Reads").find({}).num_rows,
+            'total_assemblies': self.get_collection("Assembly").find({}).num_rows,
+            'total_processes': self.get_collection("Process").find({}).num_rows
+        }
+        self.cache.put('database_counts', {}, self.db_path, payload=counts)
+        return counts
 
     # ========================================================================
     # Assembly Queries
@@ -190,12 +224,17 @@ class ENIGMAProvenanceQuery:
         Returns:
             Set of reads IDs that were used as input to assembly processes
         """
+        cached = self.cache.get('reads_used_in_assemblies', {}, self.db_path)
+        if cached is not None:
+            return set(cached.rows or [])
+
         # Get all processes that create assemblies
         assembly_processes = self.get_reads_to_assembly_processes()
 
         # Extract reads IDs from input objects
         reads_ids = self.extract_entity_ids(assembly_processes, 'input', 'Reads')
 
+        self.cache.put('reads_used_in_assemblies', {}, self.db_path, rows=sorted(reads_ids))
         return reads_ids
 
     # ========================================================================
@@ -230,6 +269,17 @@ class ENIGMAProvenanceQuery:
         if exclude_16s:
             print(f"  🧬 Excluding 16S/metagenome data (keeping only Single End isolate reads)")
 
+        cache_params = {
+            'min_count': min_count,
+            'return_details': return_details,
+            'read_type': read_type,
+            'exclude_16s': exclude_16s
+        }
+        cached = self.cache.get('unused_reads', cache_params, self.db_path)
+        if cached is not None:
+            print(f"  ♻️  Using cached result (database unchanged since last run)")
+            return cached.rows or [], cached.payload
+
         # Step 1: Get all "good" reads
         all_good_reads = self.get_all_reads(min_count=min_count)
 
@@ -280,6 +330,7 @@ class ENIGMAProvenanceQuery:
                 'total_wasted_reads': sum(unused_counts)
             }
 
+        self.cache.put('unused_reads', cache_params, self.db_path, rows=unused_reads, payload=summary)
         return unused_reads, summary
 
     # ========================================================================
@@ -357,6 +408,10 @@ class ENIGMAProvenanceQuery:
         Returns:
             Dictionary with lineage information
         """
+        cached = self.cache.get('assembly_lineage', {'assembly_id': assembly_id}, self.db_path)
+        if cached is not None:
+            return cached.payload
+
         chain = self.get_entity_provenance_chain('Assembly', assembly_id)
 
         lineage = {
@@ -379,6 +434,7 @@ class ENIGMAProvenanceQuery:
         lineage['input_reads'] = list(lineage['input_reads'])
         lineage['input_samples'] = list(lineage['input_samples'])
 
+        self.cache.put('assembly_lineage', {'assembly_id': assembly_id}, self.db_path, payload=lineage)
         return lineage
 
     # ========================================================================
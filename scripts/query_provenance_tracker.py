@@ -21,25 +21,37 @@ from pathlib import Path
 from typing import Dict, Any, Optional
 import sys
 
+from db_fingerprint import Fingerprint, default_mode, start_fingerprint
+from provenance_store import ProvenanceStore
+
 
 class QueryProvenanceTracker:
     """Track and record query execution provenance."""
 
-    def __init__(self, db_path: str, provenance_dir: str = "query_provenance"):
+    def __init__(
+        self,
+        db_path: str,
+        provenance_dir: str = "query_provenance",
+        fingerprint_mode: Optional[str] = None
+    ):
         """
         Initialize provenance tracker.
 
         Args:
             db_path: Path to the database being queried
             provenance_dir: Directory to store provenance records
+            fingerprint_mode: Database fingerprint mode ('fast', 'sampled' or
+                'full'; None: ``CDM_FINGERPRINT_MODE``, default sampled)
         """
         self.db_path = Path(db_path)
         self.provenance_dir = Path(provenance_dir)
         self.provenance_dir.mkdir(exist_ok=True)
+        self.fingerprint_mode = fingerprint_mode or default_mode()
 
         self.execution_id = None
         self.start_time = None
         self.metadata = {}
+        self._fingerprint = None
 
     def start_query(
         self,
@@ -86,11 +98,15 @@ class QueryProvenanceTracker:
                 "last_modified": datetime.fromtimestamp(
                     self.db_path.stat().st_mtime
                 ).isoformat() if self.db_path.exists() else None,
-                "checksum": self._compute_db_checksum() if self.db_path.exists() else None
+                "checksum": None
             },
             "environment": self._get_environment_info()
         }
 
+        # A full hash runs in the background while the query executes
+        self._fingerprint = start_fingerprint(self.db_path, self.fingerprint_mode)
+        self._record_fingerprint()
+
         return self.execution_id
 
     def record_database_stats(self, stats: Dict[str, Any]):
@@ -102,6 +118,21 @@ class QueryProvenanceTracker:
         """
         self.metadata["database_stats"] = stats
 
+    def record_cache_events(self, events: list):
+        """
+        Record result cache hits/misses for this query execution.
+
+        Args:
+            events: Cache events ({'kind', 'key', 'status'}) from ResultCache.drain_events()
+        """
+        if not events:
+            return
+        self.metadata["cache"] = {
+            "hits": sum(1 for e in events if e["status"] == "hit"),
+            "misses": sum(1 for e in events if e["status"] == "miss"),
+            "events": events
+        }
+
     def end_query(
         self,
         results_summary: Dict[str, Any],
@@ -131,21 +162,32 @@ class QueryProvenanceTracker:
         if output_files:
             self.metadata["outputs"] = output_files
 
+        self._record_fingerprint(wait=True)
+
         # Save provenance record
         self._save_provenance_record()
 
         return self.execution_id
 
-    def _compute_db_checksum(self) -> str:
-        """Compute SHA256 checksum of database file."""
-        sha256_hash = hashlib.sha256()
-
-        # Read in chunks to handle large files
-        with open(self.db_path, "rb") as f:
-            for byte_block in iter(lambda: f.read(4096), b""):
-                sha256_hash.update(byte_block)
-
-        return sha256_hash.hexdigest()
+    def _record_fingerprint(self, wait: bool = False):
+        """Record the database fingerprint once it is available."""
+        fingerprint = self._fingerprint
+        if fingerprint is None or self.metadata["database"]["checksum"] is not None:
+            return
+        if not isinstance(fingerprint, Fingerprint):
+            if not (wait or fingerprint.done()):
+                return
+            fingerprint = fingerprint.result()
+            if fingerprint is None:
+                return
+
+        self.metadata["database"]["checksum"] = fingerprint.digest
+        self.metadata["database"]["fingerprint"] = {
+            "mode": fingerprint.mode,
+            "load_id": fingerprint.load_id,
+            "seconds": fingerprint.seconds,
+            "cached": fingerprint.cached
+        }
 
     def _get_environment_info(self) -> Dict[str, Any]:
         """Gather environment information."""
@@ -172,22 +214,11 @@ class QueryProvenanceTracker:
         }
 
     def _save_provenance_record(self):
-        """Save provenance record to JSON file."""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        query_type = self.metadata["execution"]["query_type"]
-        filename = f"{timestamp}_{query_type}_{self.execution_id}.json"
-
-        filepath = self.provenance_dir / filename
-
-        with open(filepath, 'w') as f:
-            json.dump(self.metadata, f, indent=2, default=str)
+        """Append the provenance record to the directory's provenance store."""
+        store = ProvenanceStore.open(self.provenance_dir)
+        store.append(self.metadata)
 
-        # Also create a latest symlink/copy for easy access
-        latest_file = self.provenance_dir / f"latest_{query_type}.json"
-        with open(latest_file, 'w') as f:
-            json.dump(self.metadata, f, indent=2, default=str)
-
-        print(f"\n📋 Provenance record saved: {filepath}")
+        print(f"\n📋 Provenance record saved: {store.path}")
         print(f"   Execution ID: {self.execution_id}")
 
     @classmethod
@@ -202,49 +233,38 @@ class QueryProvenanceTracker:
         Returns:
             Provenance metadata dictionary
         """
-        prov_dir = Path(provenance_dir)
-
-        # Search for file with this execution ID
-        for filepath in prov_dir.glob(f"*_{execution_id}.json"):
-            with open(filepath) as f:
-                return json.load(f)
-
-        raise FileNotFoundError(f"No provenance record found for execution ID: {execution_id}")
+        metadata = ProvenanceStore.open(provenance_dir).get(execution_id)
+        if metadata is None:
+            raise FileNotFoundError(f"No provenance record found for execution ID: {execution_id}")
+        return metadata
 
     @classmethod
-    def list_executions(cls, provenance_dir: str = "query_provenance") -> list:
+    def list_executions(
+        cls,
+        provenance_dir: str = "query_provenance",
+        query_type: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        fingerprint: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> list:
         """
-        List all tracked query executions.
+        List tracked query executions, newest first.
 
         Args:
             provenance_dir: Directory containing provenance records
+            query_type: Only this query type
+            since: Only executions started at or after this ISO timestamp
+            until: Only executions started before this ISO timestamp
+            fingerprint: Only executions against this database checksum
+            limit: Maximum number of executions (None: all)
 
         Returns:
             List of provenance summaries
         """
-        prov_dir = Path(provenance_dir)
-        executions = []
-
-        for filepath in sorted(prov_dir.glob("*.json"), reverse=True):
-            if filepath.name.startswith("latest_"):
-                continue
-
-            try:
-                with open(filepath) as f:
-                    metadata = json.load(f)
-                    executions.append({
-                        "file": filepath.name,
-                        "execution_id": metadata["execution"]["execution_id"],
-                        "query_type": metadata["execution"]["query_type"],
-                        "start_time": metadata["execution"]["start_time"],
-                        "duration": metadata["execution"].get("duration_seconds"),
-                        "status": metadata["execution"].get("status", "unknown"),
-                        "user": metadata["user"]["username"]
-                    })
-            except Exception:
-                continue
-
-        return executions
+        return ProvenanceStore.open(provenance_dir).list(
+            query_type=query_type, since=since, until=until, fingerprint=fingerprint, limit=limit
+        )
 
     @classmethod
     def generate_provenance_report(cls, execution_id: str, provenance_dir: str = "query_provenance") -> str:
@@ -303,7 +323,13 @@ class QueryProvenanceTracker:
         report.append(f"Path:            {db_info['path']}")
         report.append(f"Size:            {db_info.get('size_mb', 'N/A')} MB")
         report.append(f"Last Modified:   {db_info.get('last_modified', 'N/A')}")
-        report.append(f"Checksum:        {db_info.get('checksum', 'N/A')[:16]}...")
+        report.append(f"Checksum:        {(db_info.get('checksum') or 'N/A')[:16]}...")
+        if "fingerprint" in db_info:
+            fp_info = db_info["fingerprint"]
+            report.append(f"Fingerprint:     {fp_info.get('mode')}"
+                          f"{' (cached)' if fp_info.get('cached') else ''}")
+            if fp_info.get("load_id"):
+                report.append(f"Load ID:         {fp_info['load_id']}")
         report.append("")
 
         # Database Stats
@@ -314,6 +340,17 @@ class QueryProvenanceTracker:
                 report.append(f"  {key}: {value}")
             report.append("")
 
+        # Result cache
+        if "cache" in metadata:
+            cache_info = metadata["cache"]
+            report.append("RESULT CACHE")
+            report.append("-" * 40)
+            report.append(f"Hits:            {cache_info.get('hits', 0)}")
+            report.append(f"Misses:          {cache_info.get('misses', 0)}")
+            for event in cache_info.get("events", []):
+                report.append(f"  {event['kind']}: {event['status']}")
+            report.append("")
+
         # Results
         if "results" in metadata:
             report.append("RESULTS SUMMARY")
@@ -345,15 +382,33 @@ def main():
     import argparse
 
     parser = argparse.ArgumentParser(description='Query Provenance Tracker')
-    parser.add_argument('--list', action='store_true', help='List all tracked executions')
+    parser.add_argument('--list', action='store_true', help='List tracked executions (newest first)')
     parser.add_argument('--report', metavar='EXEC_ID', help='Generate report for execution ID')
+    parser.add_argument('--show', metavar='EXEC_ID', help='Print the full JSON record for execution ID')
+    parser.add_argument('--latest', metavar='QUERY_TYPE',
+                        help='Print the full JSON record of the most recent execution of a query type')
+    parser.add_argument('--migrate', nargs='?', const='', metavar='JSON_DIR',
+                        help='Import one-file-per-execution JSON records (default: the provenance directory)')
     parser.add_argument('--provenance-dir', default='query_provenance',
                        help='Provenance directory (default: query_provenance)')
+    parser.add_argument('--query-type', help='Only list this query type')
+    parser.add_argument('--since', help='Only list executions started at or after this ISO time')
+    parser.add_argument('--until', help='Only list executions started before this ISO time')
+    parser.add_argument('--fingerprint', help='Only list executions against this database checksum')
+    parser.add_argument('--limit', type=int, default=50, help='Maximum executions to list (default: 50, 0: all)')
 
     args = parser.parse_args()
 
-    if args.list:
-        executions = QueryProvenanceTracker.list_executions(args.provenance_dir)
+    if args.migrate is not None:
+        store = ProvenanceStore.open(args.provenance_dir)
+        added = store.migrate_json_records(args.migrate or None)
+        print(f"✅ Imported {added} record(s) into {store.path} ({store.count()} total)")
+
+    elif args.list:
+        executions = QueryProvenanceTracker.list_executions(
+            args.provenance_dir, query_type=args.query_type, since=args.since, until=args.until,
+            fingerprint=args.fingerprint, limit=args.limit or None
+        )
         print(f"\n📋 Query Execution History ({len(executions)} executions)\n")
         print(f"{'Date/Time':<20} {'Query Type':<20} {'Duration':<10} {'Status':<10} {'User':<15} {'ID':<16}")
         print("-" * 100)
@@ -367,9 +422,19 @@ def main():
         report = QueryProvenanceTracker.generate_provenance_report(args.report, args.provenance_dir)
         print(report)
 
+    elif args.show:
+        print(json.dumps(QueryProvenanceTracker.load_provenance(args.show, args.provenance_dir), indent=2))
+
+    elif args.latest:
+        metadata = ProvenanceStore.open(args.provenance_dir).latest(args.latest)
+        if metadata is None:
+            print(f"❌ No {args.latest} executions in {args.provenance_dir}", file=sys.stderr)
+            return 1
+        print(json.dumps(metadata, indent=2))
+
     else:
         parser.print_help()
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
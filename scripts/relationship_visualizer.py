@@ -12,7 +12,12 @@ import re
 from pathlib import Path
 from typing import Dict, List, Tuple, Set, Optional
 from dataclasses import dataclass
-from linkml_runtime.utils.schemaview import SchemaView
+
+try:
+    from linkml_coral.utils.schema_snapshot import SchemaSnapshot, load_schema_snapshot
+except ImportError:
+    # Fallback for when running from the repository root without installing
+    from src.linkml_coral.utils.schema_snapshot import SchemaSnapshot, load_schema_snapshot
 
 
 @dataclass
@@ -37,7 +42,7 @@ class EntityInfo:
 class RelationshipExtractor:
     """Extract relationship information from LinkML schema."""
     
-    def __init__(self, schema_view: SchemaView):
+    def __init__(self, schema_view: SchemaSnapshot):
         self.schema_view = schema_view
         self.relationships: List[Relationship] = []
         self.entities: Dict[str, EntityInfo] = {}
@@ -60,7 +65,7 @@ class RelationshipExtractor:
                 
                 # Check for foreign key annotation
                 if slot_def.annotations:
-                    for annotation in slot_def.annotations:
+                    for annotation in slot_def.annotations.values():
                         if annotation.tag == 'foreign_key':
                             fk_value = annotation.value
                             
@@ -247,7 +252,7 @@ def main():
     print(f"📁 Output directory: {output_dir}")
     
     # Load schema and extract relationships
-    schema_view = SchemaView(str(schema_path))
+    schema_view = load_schema_snapshot(schema_path)
     extractor = RelationshipExtractor(schema_view)
     relationships_by_class = extractor.extract_relationships()
     
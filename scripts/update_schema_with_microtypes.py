@@ -301,7 +301,7 @@ def update_schema(
     enums = load_generated_enums(enums_file)
 
     print(f"Parsing OBO file {obo_file}")
-    obo_parser = OBOParser(obo_file)
+    obo_parser = OBOParser(obo_file, use_cache=True)
     obo_parser.parse()
 
     # Add semantic types
@@ -57,7 +57,7 @@ def run_validation(
         enable_enum: Enable enum validation
         enable_fk: Enable FK validation
         enable_quality: Enable quality metrics
-        report_format: Report format (console, json, csv, all)
+        report_format: Report format (console, json, jsonl, csv, all)
         output_dir: Output directory for reports
         verbose: Verbose output
 
@@ -137,7 +137,7 @@ def main():
                        help='Disable FK validation')
     parser.add_argument('--no-quality', action='store_true',
                        help='Disable quality metrics')
-    parser.add_argument('--report-format', choices=['console', 'json', 'csv', 'all'],
+    parser.add_argument('--report-format', choices=['console', 'json', 'jsonl', 'csv', 'all'],
                        default='all',
                        help='Report format (default: all)')
     parser.add_argument('--exclude',
@@ -10,7 +10,7 @@ Enhanced with:
 - Pre-validation enum checking with detailed error reporting
 - Foreign key validation across TSV files
 - Data quality metrics collection
-- Multi-format reporting (JSON, CSV, HTML)
+- Multi-format reporting (JSON, JSON Lines, CSV, HTML)
 """
 
 import argparse
@@ -25,8 +25,6 @@ from typing import Dict, List, Any, Tuple
 from collections import defaultdict
 from datetime import datetime
 
-from linkml_runtime.utils.schemaview import SchemaView
-
 # Add src to path for imports
 sys.path.insert(0, str(Path(__file__).parent / 'src'))
 
@@ -41,6 +39,7 @@ try:
         DataQualityAnalyzer,
         build_fk_index_from_tsvs
     )
+    from linkml_coral.utils.schema_snapshot import SchemaSnapshot, load_schema_snapshot
 except ImportError:
     # Fallback for when running from different directory
     from src.linkml_coral.utils.validation_utils import (
@@ -52,11 +51,12 @@ except ImportError:
         DataQualityAnalyzer,
         build_fk_index_from_tsvs
     )
+    from src.linkml_coral.utils.schema_snapshot import SchemaSnapshot, load_schema_snapshot
 
 
-def load_schema(schema_path: Path) -> SchemaView:
-    """Load the LinkML schema from file."""
-    return SchemaView(str(schema_path))
+def load_schema(schema_path: Path) -> SchemaSnapshot:
+    """Load the LinkML schema from file (via the precompiled snapshot)."""
+    return load_schema_snapshot(schema_path)
 
 
 def read_tsv_file(tsv_path: Path) -> List[Dict[str, Any]]:
@@ -72,7 +72,7 @@ def read_tsv_file(tsv_path: Path) -> List[Dict[str, Any]]:
     return data
 
 
-def map_tsv_to_schema_fields(data: List[Dict[str, Any]], class_name: str, schema_view: SchemaView) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+def map_tsv_to_schema_fields(data: List[Dict[str, Any]], class_name: str, schema_view: SchemaSnapshot) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
     """Map TSV column names to schema field names."""
     if not data:
         return data, {"status": "no_data"}
@@ -449,7 +449,7 @@ def print_validation_errors(errors: List[str], max_errors: int = 10, temp_file_p
 def validate_enums_in_data(
     mapped_data: List[Dict[str, Any]],
     class_name: str,
-    schema_view: SchemaView,
+    schema_view: SchemaSnapshot,
     enum_validator: EnumValidator
 ) -> List[RecordValidationResult]:
     """
@@ -458,7 +458,7 @@ def validate_enums_in_data(
     Args:
         mapped_data: List of records with mapped field names
         class_name: Schema class name
-        schema_view: SchemaView instance
+        schema_view: SchemaSnapshot instance
         enum_validator: EnumValidator instance
 
     Returns:
@@ -512,7 +512,7 @@ def validate_enums_in_data(
 def validate_foreign_keys_in_data(
     mapped_data: List[Dict[str, Any]],
     class_name: str,
-    schema_view: SchemaView,
+    schema_view: SchemaSnapshot,
     fk_validator: ForeignKeyValidator
 ) -> Dict[int, RecordValidationResult]:
     """
@@ -521,7 +521,7 @@ def validate_foreign_keys_in_data(
     Args:
         mapped_data: List of records with mapped field names
         class_name: Schema class name
-        schema_view: SchemaView instance
+        schema_view: SchemaSnapshot instance
         fk_validator: ForeignKeyValidator instance
 
     Returns:
@@ -626,6 +626,33 @@ def export_results_json(
     print(f"📄 Exported JSON report to {output_path}")
 
 
+def export_results_jsonl(
+    file_results: List[FileValidationResult],
+    output_path: Path
+):
+    """
+    Export validation results to JSON Lines.
+
+    The first line describes the run. Each file then gets a ``file`` line with
+    its counts and quality metrics, followed by one ``record`` line per record
+    with issues. Report generators can stream this without loading the whole
+    run into memory.
+
+    Args:
+        file_results: Validation results per file
+        output_path: Output .jsonl file
+    """
+    with open(output_path, 'w') as f:
+        f.write(json.dumps({'type': 'run', 'validation_date': datetime.now().isoformat()}) + '\n')
+        for file_result in file_results:
+            f.write(json.dumps({'type': 'file', **file_result.summary_dict()}) + '\n')
+            for record_result in file_result.record_results:
+                record = {'type': 'record', 'filename': file_result.filename, **record_result.to_dict()}
+                f.write(json.dumps(record) + '\n')
+
+    print(f"📄 Exported JSON Lines report to {output_path}")
+
+
 def export_results_csv(
     file_results: List[FileValidationResult],
     output_path: Path
@@ -709,7 +736,7 @@ def main():
                        help='Directory containing all TSV files (for FK index building)')
 
     # Reporting options
-    parser.add_argument('--report-format', choices=['console', 'json', 'csv', 'all'],
+    parser.add_argument('--report-format', choices=['console', 'json', 'jsonl', 'csv', 'all'],
                        default='console',
                        help='Output format for validation report')
     parser.add_argument('--output-dir',
@@ -719,7 +746,7 @@ def main():
     
     # Setup output directory
     output_dir = Path(args.output_dir) if args.output_dir else Path('validation_reports')
-    if args.report_format in ['json', 'csv', 'all']:
+    if args.report_format != 'console':
         output_dir.mkdir(exist_ok=True)
 
     # Load schema
@@ -942,6 +969,10 @@ def main():
             json_path = output_dir / f'validation_report_{timestamp}.json'
             export_results_json(all_file_results, json_path)
 
+        if args.report_format in ['jsonl', 'all']:
+            jsonl_path = output_dir / f'validation_report_{timestamp}.jsonl'
+            export_results_jsonl(all_file_results, jsonl_path)
+
         if args.report_format in ['csv', 'all']:
             csv_path = output_dir / f'validation_report_{timestamp}.csv'
             export_results_csv(all_file_results, csv_path)
@@ -1,6 +1,7 @@
 """Utilities for linkml-coral."""
 
 from .obo_parser import OBOParser
+from .search_index import SearchIndex, SearchHit
 from .validation_utils import (
     ValidationStatus,
     ValidationResult,
@@ -15,6 +16,8 @@ from .validation_utils import (
 
 __all__ = [
     "OBOParser",
+    "SearchIndex",
+    "SearchHit",
     "ValidationStatus",
     "ValidationResult",
     "RecordValidationResult",
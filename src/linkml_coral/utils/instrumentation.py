@@ -0,0 +1,421 @@
+#!/usr/bin/env python3
+"""
+Timing and memory spans for loader, validation and query hot paths.
+
+A span measures one unit of work (a table load, a load chunk, a cast
+rebuild, a validation chunk, a query)::
+
+    with span("table_load", category="load", table="sdt_sample") as s:
+        conn.execute(...)
+        s.add(rows=count, bytes=parquet_bytes)
+
+Each finished span records wall and CPU time, resident memory at start and
+end and its peak in between (sampled with psutil), rows and bytes processed,
+its parent span and any attributes. Spans given a DuckDB connection
+(``conn=``) also record DuckDB's profile of the last statement they ran, or
+the one before ``capture_profile()`` (latency, rows scanned, peak buffer
+memory, slowest operators), when DuckDB profiling is on.
+
+Tracing is off unless a trace file is configured, either with
+``configure_tracing()`` (the CLIs' ``--trace FILE``) or the ``CDM_TRACE``
+environment variable, which subprocesses inherit. Files ending in
+``.jsonl`` get one JSON record per span; anything else is written as a
+Chrome trace (open it in ``chrome://tracing`` or https://ui.perfetto.dev).
+Set ``CDM_TRACE_DUCKDB=1`` (``--profile-duckdb``) to add DuckDB profiles.
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+TRACE_ENV = "CDM_TRACE"
+PROFILE_ENV = "CDM_TRACE_DUCKDB"
+FORMATS = ("jsonl", "chrome")
+DEFAULT_SAMPLE_INTERVAL = 0.05  # seconds between RSS samples
+TOP_OPERATORS = 5
+
+_MB = 1024 ** 2
+
+
+def trace_format(path) -> str:
+    """Trace file format for a path: 'jsonl' for .jsonl files, else 'chrome'."""
+    return "jsonl" if Path(path).suffix == ".jsonl" else "chrome"
+
+
+def _rss() -> Optional[int]:
+    if psutil is None:
+        return None
+    try:
+        return psutil.Process().memory_info().rss
+    except psutil.Error:
+        return None
+
+
+def duckdb_profile(conn) -> Optional[Dict[str, Any]]:
+    """
+    Summary of DuckDB's profile for the last statement run on a connection.
+
+    Args:
+        conn: DuckDB connection with profiling enabled
+
+    Returns:
+        Dict of latency, CPU time, rows and memory figures plus the slowest
+        operators, or None if no profile is available
+    """
+    try:
+        profile = json.loads(conn.get_profiling_information(format="json"))
+    except Exception:
+        return None
+
+    operators = []
+
+    def walk(node):
+        for child in node.get("children", []):
+            if "operator_type" in child:
+                operators.append(child)
+            walk(child)
+
+    walk(profile)
+    operators.sort(key=lambda op: op.get("operator_timing", 0), reverse=True)
+    summary = {
+        key: profile[key]
+        for key in ("latency", "cpu_time", "rows_returned", "cumulative_rows_scanned",
+                    "cumulative_cardinality", "system_peak_buffer_memory", "total_bytes_read")
+        if key in profile
+    }
+    summary["query"] = " ".join(str(profile.get("query_name", "")).split())[:500]
+    summary["operators"] = [
+        {
+            "type": op.get("operator_type"),
+            "seconds": op.get("operator_timing"),
+            "rows": op.get("operator_cardinality"),
+        }
+        for op in operators[:TOP_OPERATORS]
+    ]
+    return summary
+
+
+@dataclass
+class Span:
+    """One measured unit of work; use ``add()``/``set()`` while it is open."""
+
+    name: str
+    category: str = "cdm"
+    attrs: Dict[str, Any] = field(default_factory=dict)
+    rows: Optional[int] = None
+    bytes: Optional[int] = None
+    parent: Optional[str] = None
+    depth: int = 0
+    start: float = 0.0
+    start_cpu: float = 0.0
+    rss_start: Optional[int] = None
+    rss_peak: Optional[int] = None
+    profile: Optional[Dict[str, Any]] = None
+    conn: Any = field(default=None, repr=False)
+
+    def add(self, rows: int = 0, bytes: int = 0) -> None:
+        """Count rows and bytes processed by this span."""
+        if rows:
+            self.rows = (self.rows or 0) + rows
+        if bytes:
+            self.bytes = (self.bytes or 0) + bytes
+
+    def set(self, **attrs) -> None:
+        """Attach attributes to the span record."""
+        self.attrs.update(attrs)
+
+    def capture_profile(self) -> None:
+        """Keep the DuckDB profile of the statement just run (instead of the span's last one)."""
+        if self.conn is not None:
+            self.profile = duckdb_profile(self.conn)
+
+    def observe_rss(self, rss: Optional[int]) -> None:
+        if rss is not None and (self.rss_peak is None or rss > self.rss_peak):
+            self.rss_peak = rss
+
+
+class Tracer:
+    """Records spans to a JSON Lines or Chrome trace file."""
+
+    def __init__(
+        self,
+        path=None,
+        fmt: Optional[str] = None,
+        profile_duckdb: bool = False,
+        sample_interval: float = DEFAULT_SAMPLE_INTERVAL,
+        truncate: bool = False
+    ):
+        """
+        Create a tracer.
+
+        Args:
+            path: Trace file (None: tracing disabled)
+            fmt: 'jsonl' or 'chrome' (default: from the file suffix)
+            profile_duckdb: Enable DuckDB profiling on spans given a connection
+            sample_interval: Seconds between RSS samples while spans are open
+            truncate: Start a new trace file instead of appending
+        """
+        self.path = Path(path) if path else None
+        self.format = fmt or (trace_format(path) if path else "jsonl")
+        if self.format not in FORMATS:
+            raise ValueError(f"Unknown trace format {self.format!r} (choose from {', '.join(FORMATS)})")
+        self.profile_duckdb = profile_duckdb
+        self.sample_interval = sample_interval
+
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._open: List[Span] = []
+        self._sampler: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        if self.path and truncate:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text("")
+
+    @property
+    def enabled(self) -> bool:
+        return self.path is not None
+
+    @contextmanager
+    def span(self, name: str, category: str = "cdm", conn=None, **attrs) -> Iterator[Span]:
+        """
+        Measure a block of work.
+
+        Args:
+            name: Span name (e.g. 'table_load', 'validation_chunk')
+            category: Span category (e.g. 'load', 'validate', 'query')
+            conn: DuckDB connection the block runs statements on (for profiles)
+            **attrs: Attributes recorded with the span
+
+        Yields:
+            The open Span
+        """
+        current = Span(name, category, dict(attrs))
+        if not self.enabled:
+            yield current
+            return
+
+        stack = self._stack()
+        current.parent = stack[-1].name if stack else None
+        current.depth = len(stack)
+        if conn is not None and self.profile_duckdb:
+            try:
+                conn.execute("SET enable_profiling = 'no_output'")
+                current.conn = conn
+            except Exception:
+                pass
+        current.rss_start = _rss()
+        current.observe_rss(current.rss_start)
+        stack.append(current)
+        with self._lock:
+            self._open.append(current)
+        self._start_sampler()
+        current.start = time.time()
+        current.start_cpu = time.process_time()
+
+        error = None
+        try:
+            yield current
+        except BaseException as e:
+            error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            wall = time.time() - current.start
+            cpu = time.process_time() - current.start_cpu
+            rss_end = _rss()
+            current.observe_rss(rss_end)
+            stack.pop()
+            with self._lock:
+                self._open.remove(current)
+            if current.profile is None:
+                current.capture_profile()
+            current.conn = None
+            self._emit(current, wall, cpu, rss_end, error)
+
+    def _stack(self) -> List[Span]:
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    def _start_sampler(self) -> None:
+        if psutil is None or self._sampler is not None:
+            return
+        self._sampler = threading.Thread(target=self._sample, name="trace-rss", daemon=True)
+        self._sampler.start()
+
+    def _sample(self) -> None:
+        while not self._stop.wait(self.sample_interval):
+            with self._lock:
+                if not self._open:
+                    continue
+                rss = _rss()
+                for open_span in self._open:
+                    open_span.observe_rss(rss)
+
+    def _emit(self, current: Span, wall: float, cpu: float, rss_end: Optional[int], error: Optional[str]) -> None:
+        record = {
+            "name": current.name,
+            "cat": current.category,
+            "ts": current.start,
+            "wall_s": round(wall, 6),
+            "cpu_s": round(cpu, 6),
+            "rss_start_mb": _mb(current.rss_start),
+            "rss_end_mb": _mb(rss_end),
+            "rss_peak_mb": _mb(current.rss_peak),
+            "rows": current.rows,
+            "bytes": current.bytes,
+            "rows_per_s": round(current.rows / wall) if current.rows and wall > 0 else None,
+            "parent": current.parent,
+            "depth": current.depth,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "attrs": current.attrs,
+        }
+        if current.profile:
+            record["duckdb"] = current.profile
+        if error:
+            record["error"] = error
+
+        if self.format == "chrome":
+            args = {k: v for k, v in record.items()
+                    if k not in ("name", "cat", "ts", "pid", "tid") and v is not None}
+            event = {
+                "name": current.name, "cat": current.category, "ph": "X",
+                "ts": int(current.start * 1e6), "dur": int(wall * 1e6),
+                "pid": record["pid"], "tid": record["tid"], "args": args,
+            }
+            line = json.dumps(event, default=str)
+        else:
+            line = json.dumps(record, default=str)
+
+        # One append per span, so subprocesses tracing to the same file don't interleave
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                if self.format == "chrome":
+                    # JSON Array Format: the closing ']' is optional
+                    line = ("[\n" if os.fstat(fd).st_size == 0 else ",\n") + line
+                else:
+                    line += "\n"
+                os.write(fd, line.encode())
+            finally:
+                os.close(fd)
+
+    def close(self) -> None:
+        """Stop the RSS sampler."""
+        self._stop.set()
+
+
+def _mb(value: Optional[int]) -> Optional[float]:
+    return round(value / _MB, 1) if value is not None else None
+
+
+_tracer: Optional[Tracer] = None
+
+
+def get_tracer() -> Tracer:
+    """The process tracer (configured from ``CDM_TRACE`` on first use)."""
+    global _tracer
+    if _tracer is None:
+        _tracer = Tracer(
+            os.environ.get(TRACE_ENV) or None,
+            profile_duckdb=os.environ.get(PROFILE_ENV, "").lower() in ("1", "on", "true", "yes"),
+        )
+    return _tracer
+
+
+def configure_tracing(path, profile_duckdb: bool = False, fmt: Optional[str] = None) -> Tracer:
+    """
+    Start a new trace file for this process and its subprocesses.
+
+    Args:
+        path: Trace file (.jsonl for JSON Lines, otherwise Chrome trace)
+        profile_duckdb: Record DuckDB profiles for spans given a connection
+        fmt: Override the format implied by the suffix
+
+    Returns:
+        The configured Tracer
+    """
+    global _tracer
+    if _tracer is not None:
+        _tracer.close()
+    _tracer = Tracer(path, fmt=fmt, profile_duckdb=profile_duckdb, truncate=True)
+    os.environ[TRACE_ENV] = str(path)
+    os.environ[PROFILE_ENV] = "1" if profile_duckdb else ""
+    return _tracer
+
+
+def span(name: str, category: str = "cdm", conn=None, **attrs):
+    """Measure a block of work with the process tracer (see ``Tracer.span``)."""
+    return get_tracer().span(name, category, conn=conn, **attrs)
+
+
+def read_trace(path) -> List[Dict[str, Any]]:
+    """
+    Span records from a JSON Lines or Chrome trace file.
+
+    Args:
+        path: Trace file
+
+    Returns:
+        List of span records (Chrome events are flattened to the JSONL fields)
+    """
+    path = Path(path)
+    text = path.read_text()
+    if trace_format(path) == "jsonl":
+        return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+    text = text.strip().rstrip(",")
+    events = json.loads(text if text.endswith("]") else text + "]") if text else []
+    return [
+        {"name": e["name"], "cat": e.get("cat"), "ts": e["ts"] / 1e6, "pid": e.get("pid"),
+         "tid": e.get("tid"), **e.get("args", {})}
+        for e in events if e.get("ph") == "X"
+    ]
+
+
+def summarize_trace(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Per-span-name totals, slowest first.
+
+    Args:
+        records: Span records (from ``read_trace()``)
+
+    Returns:
+        List of dicts with name, count, wall_s, cpu_s, rows and peak RSS
+    """
+    totals: Dict[str, Dict[str, Any]] = {}
+    for record in records:
+        total = totals.setdefault(record["name"], {
+            "name": record["name"], "count": 0, "wall_s": 0.0, "cpu_s": 0.0,
+            "rows": 0, "rss_peak_mb": None,
+        })
+        total["count"] += 1
+        total["wall_s"] += record.get("wall_s") or 0.0
+        total["cpu_s"] += record.get("cpu_s") or 0.0
+        total["rows"] += record.get("rows") or 0
+        peak = record.get("rss_peak_mb")
+        if peak is not None and (total["rss_peak_mb"] is None or peak > total["rss_peak_mb"]):
+            total["rss_peak_mb"] = peak
+    return sorted(totals.values(), key=lambda t: t["wall_s"], reverse=True)
+
+
+def print_trace_summary(path) -> None:
+    """Print per-span-name totals for a trace file."""
+    summary = summarize_trace(read_trace(path))
+    print(f"\n⏱️  Trace summary ({path})")
+    print(f"  {'Span':<22} {'Count':>6} {'Wall (s)':>10} {'CPU (s)':>10} {'Rows':>14} {'Peak RSS (MB)':>14}")
+    for total in summary:
+        peak = f"{total['rss_peak_mb']:,.1f}" if total["rss_peak_mb"] is not None else "n/a"
+        print(f"  {total['name']:<22} {total['count']:>6} {total['wall_s']:>10.2f} "
+              f"{total['cpu_s']:>10.2f} {total['rows']:>14,} {peak:>14}")
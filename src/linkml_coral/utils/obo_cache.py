@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Binary cache of parsed OBO files.
+
+``OBOParser.parse()`` stores the parsed term table and its is_a graph index
+(adjacency, depth, ancestor/descendant bitsets) as two Arrow IPC files,
+keyed by the SHA-256 of the OBO file. The next parse of an unchanged file
+memory-maps those instead of re-reading the text; editing the OBO changes the
+hash, so a stale cache is never used.
+
+Cache location: ``~/.cache/linkml-coral/obo`` (override with
+``OBO_CACHE_DIR``; set ``OBO_CACHE=off`` to disable).
+"""
+
+import hashlib
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+import pyarrow as pa
+
+from .obo_parser import OBOTerm
+
+CACHE_VERSION = 1
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "linkml-coral" / "obo"
+CACHE_DIR_ENV = "OBO_CACHE_DIR"
+DISABLE_ENV = "OBO_CACHE"
+
+TERMS_FILE = "terms.arrow"
+GRAPH_FILE = "graph.arrow"
+
+_STRING_LIST = pa.list_(pa.string())
+
+
+def cache_enabled() -> bool:
+    """Whether the OBO cache is enabled (``OBO_CACHE=off`` disables it)."""
+    return os.environ.get(DISABLE_ENV, "").lower() not in ("0", "off", "false", "no")
+
+
+def file_hash(path) -> str:
+    """SHA-256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def get_cache_path(obo_file, cache_dir=None, digest: Optional[str] = None) -> Path:
+    """
+    Cache directory for one version of an OBO file.
+
+    Args:
+        obo_file: Path to the OBO file
+        cache_dir: Cache root (default: $OBO_CACHE_DIR or ~/.cache/linkml-coral/obo)
+        digest: Precomputed file hash
+
+    Returns:
+        Path of the form ``<cache_dir>/<stem>-<hash>``
+    """
+    cache_dir = Path(cache_dir or os.environ.get(CACHE_DIR_ENV, DEFAULT_CACHE_DIR))
+    digest = digest or file_hash(obo_file)
+    return cache_dir / f"{Path(obo_file).stem}-v{CACHE_VERSION}-{digest[:24]}"
+
+
+def save_parsed(parser, path) -> Path:
+    """
+    Write a parsed OBOParser (terms and graph index) to a cache directory.
+
+    Args:
+        parser: OBOParser after parse()
+        path: Cache directory (see get_cache_path)
+
+    Returns:
+        The cache directory
+    """
+    path = Path(path)
+    terms = list(parser.terms.values())
+    term_table = pa.table({
+        "id": pa.array([t.id for t in terms], pa.string()),
+        "name": pa.array([t.name for t in terms], pa.string()),
+        "namespace": pa.array([t.namespace for t in terms], pa.string()),
+        "definition": pa.array([t.definition for t in terms], pa.string()),
+        "is_a": pa.array([t.is_a for t in terms], _STRING_LIST),
+        "property_names": pa.array([list(t.property_values) for t in terms], _STRING_LIST),
+        "property_values": pa.array([list(t.property_values.values()) for t in terms], _STRING_LIST),
+        "xrefs": pa.array([t.xrefs for t in terms], _STRING_LIST),
+        "comments": pa.array([t.comments for t in terms], _STRING_LIST),
+    }).replace_schema_metadata({
+        "ontology_id": parser.ontology_id or "",
+        "format_version": parser.format_version or "",
+    })
+
+    nbytes = (len(parser._order) + 7) // 8
+    order = parser._order
+    graph_table = pa.table({
+        "node": pa.array(order, pa.string()),
+        "depth": pa.array([parser._depth[n] for n in order], pa.int32()),
+        "parents": pa.array([parser._parents[n] for n in order], _STRING_LIST),
+        "children": pa.array([parser._children[n] for n in order], _STRING_LIST),
+        "ancestors": pa.array([parser._ancestor_bits[n].to_bytes(nbytes, "little") for n in order], pa.binary()),
+        "descendants": pa.array([parser._descendant_bits[n].to_bytes(nbytes, "little") for n in order], pa.binary()),
+    })
+
+    # Write to a temporary directory and rename, so readers never see half a cache
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_dir = Path(tempfile.mkdtemp(dir=path.parent, prefix=".tmp-"))
+    try:
+        for name, table in ((TERMS_FILE, term_table), (GRAPH_FILE, graph_table)):
+            with pa.OSFile(str(tmp_dir / name), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        try:
+            tmp_dir.rename(path)
+        except OSError:
+            # Another process cached the same file first
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+    except Exception:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+    return path
+
+
+def load_parsed(parser, path) -> bool:
+    """
+    Populate an OBOParser from a cache directory.
+
+    Args:
+        parser: OBOParser to fill (terms, header and graph index)
+        path: Cache directory (see get_cache_path)
+
+    Returns:
+        True if the cache was loaded, False if it is missing or unreadable
+    """
+    path = Path(path)
+    try:
+        with pa.memory_map(str(path / TERMS_FILE)) as source:
+            term_table = pa.ipc.open_file(source).read_all()
+        with pa.memory_map(str(path / GRAPH_FILE)) as source:
+            graph_table = pa.ipc.open_file(source).read_all()
+    except (OSError, pa.ArrowInvalid):
+        return False
+
+    metadata = term_table.schema.metadata or {}
+    columns = {name: term_table.column(name).to_pylist() for name in term_table.column_names}
+    terms = {}
+    for i, term_id in enumerate(columns["id"]):
+        terms[term_id] = OBOTerm(
+            id=term_id,
+            name=columns["name"][i],
+            namespace=columns["namespace"][i],
+            definition=columns["definition"][i],
+            is_a=columns["is_a"][i],
+            property_values=dict(zip(columns["property_names"][i], columns["property_values"][i])),
+            xrefs=columns["xrefs"][i],
+            comments=columns["comments"][i],
+        )
+
+    graph = {name: graph_table.column(name).to_pylist() for name in graph_table.column_names}
+    order = graph["node"]
+    parser.terms = terms
+    parser.ontology_id = metadata.get(b"ontology_id", b"").decode() or None
+    parser.format_version = metadata.get(b"format_version", b"").decode() or None
+    parser._order = order
+    parser._bit = {node: 1 << i for i, node in enumerate(order)}
+    parser._depth = dict(zip(order, graph["depth"]))
+    parser._parents = dict(zip(order, graph["parents"]))
+    parser._children = dict(zip(order, graph["children"]))
+    parser._ancestor_bits = {n: int.from_bytes(b, "little") for n, b in zip(order, graph["ancestors"])}
+    parser._descendant_bits = {n: int.from_bytes(b, "little") for n, b in zip(order, graph["descendants"])}
+    parser._indexed = True
+    parser._name_index = None
+    return True
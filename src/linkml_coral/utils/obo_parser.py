@@ -4,12 +4,25 @@ OBO file parser for extracting microtypes and ontology terms.
 
 This parser reads OBO-format ontology files and extracts microtype definitions
 for use in LinkML schema generation.
+
+After parsing, the is_a graph is indexed once: parent/child adjacency, term
+depth and the ancestor/descendant closure (stored as integer bitsets over a
+topological ordering). Hierarchy queries such as ``children``,
+``descendants``, ``ancestors``, ``is_a_transitive`` and
+``lowest_common_ancestor`` then avoid rescanning the term dictionary, which
+keeps enum generation fast on large ontologies.
+
+With ``use_cache=True`` the parsed terms and graph index are stored in a
+binary sidecar keyed by the OBO file hash (see ``obo_cache``), so repeated
+runs skip re-parsing an unchanged file.
 """
 
 from pathlib import Path
-from typing import Dict, List, Optional, Set
+from typing import Dict, Iterator, List, Optional, Set
 from dataclasses import dataclass, field
 
+from .search_index import SearchIndex
+
 
 @dataclass
 class OBOTerm:
@@ -50,7 +63,12 @@ class OBOTerm:
         return self.property_values.get('valid_units')
 
     def get_children(self, all_terms: Dict[str, 'OBOTerm']) -> List['OBOTerm']:
-        """Get all direct children of this term."""
+        """
+        Get all direct children of this term.
+
+        This scans every term; use OBOParser.get_child_terms() for repeated
+        lookups.
+        """
         children = []
         for term in all_terms.values():
             if self.id in term.is_a:
@@ -61,25 +79,69 @@ class OBOTerm:
 class OBOParser:
     """Parser for OBO format ontology files."""
 
-    def __init__(self, obo_file: str):
+    def __init__(self, obo_file: str, use_cache: bool = False, cache_dir: Optional[str] = None):
         """
         Initialize the OBO parser.
 
         Args:
             obo_file: Path to the OBO file to parse
+            use_cache: Load/store the parsed result in the binary OBO cache
+                (ignored when OBO_CACHE=off)
+            cache_dir: Cache root (default: $OBO_CACHE_DIR or ~/.cache/linkml-coral/obo)
         """
         self.obo_file = Path(obo_file)
+        self.use_cache = use_cache
+        self.cache_dir = cache_dir
+        self.from_cache = False
         self.terms: Dict[str, OBOTerm] = {}
         self.ontology_id: Optional[str] = None
         self.format_version: Optional[str] = None
 
+        # Graph index, built by build_index()
+        self._parents: Dict[str, List[str]] = {}
+        self._children: Dict[str, List[str]] = {}
+        self._depth: Dict[str, int] = {}
+        self._bit: Dict[str, int] = {}
+        self._order: List[str] = []
+        self._ancestor_bits: Dict[str, int] = {}
+        self._descendant_bits: Dict[str, int] = {}
+        self._indexed = False
+        self._name_index: Optional[SearchIndex] = None
+        self._name_index_ids: List[str] = []
+
     def parse(self) -> Dict[str, OBOTerm]:
         """
         Parse the OBO file and return all terms.
 
+        With use_cache, an unchanged file is loaded from the binary cache
+        instead of being re-parsed.
+
         Returns:
             Dictionary mapping term IDs to OBOTerm objects
         """
+        cache_path = None
+        if self.use_cache:
+            from . import obo_cache
+            if obo_cache.cache_enabled():
+                cache_path = obo_cache.get_cache_path(self.obo_file, self.cache_dir)
+                if obo_cache.load_parsed(self, cache_path):
+                    self.from_cache = True
+                    return self.terms
+
+        self._parse_text()
+        self.build_index()
+
+        if cache_path is not None:
+            try:
+                obo_cache.save_parsed(self, cache_path)
+            except OSError:
+                # A read-only cache directory only costs the speedup
+                pass
+
+        return self.terms
+
+    def _parse_text(self) -> None:
+        """Read terms and header fields from the OBO text."""
         with open(self.obo_file, 'r') as f:
             lines = f.readlines()
 
@@ -163,7 +225,79 @@ class OBOParser:
         if current_term and current_term.id:
             self.terms[current_term.id] = current_term
 
-        return self.terms
+    def build_index(self) -> None:
+        """
+        Index the is_a graph: adjacency, depth and transitive closure.
+
+        Called by parse(); call it again after modifying self.terms directly.
+        Parents referenced by is_a but not defined in the file are indexed
+        as root nodes. Terms caught in an is_a cycle are indexed with the
+        closure of their acyclic part.
+        """
+        parents: Dict[str, List[str]] = {}
+        children: Dict[str, List[str]] = {}
+        for term_id, term in self.terms.items():
+            parents[term_id] = list(dict.fromkeys(p for p in term.is_a if p != term_id))
+            children.setdefault(term_id, [])
+            for parent_id in parents[term_id]:
+                children.setdefault(parent_id, []).append(term_id)
+        for node_id in children:
+            parents.setdefault(node_id, [])
+
+        # Topological order (parents before children), Kahn's algorithm
+        pending = {node_id: len(p) for node_id, p in parents.items()}
+        order = [node_id for node_id, count in pending.items() if count == 0]
+        for node_id in order:
+            for child_id in children[node_id]:
+                pending[child_id] -= 1
+                if pending[child_id] == 0:
+                    order.append(child_id)
+        if len(order) < len(pending):
+            seen = set(order)
+            order.extend(node_id for node_id in pending if node_id not in seen)
+
+        bit = {node_id: 1 << i for i, node_id in enumerate(order)}
+        position = {node_id: i for i, node_id in enumerate(order)}
+        ancestor_bits: Dict[str, int] = {}
+        depth: Dict[str, int] = {}
+        for node_id in order:
+            bits = 0
+            node_depth = 0
+            for parent_id in parents[node_id]:
+                if position[parent_id] < position[node_id]:
+                    bits |= bit[parent_id] | ancestor_bits[parent_id]
+                    node_depth = max(node_depth, depth[parent_id] + 1)
+            ancestor_bits[node_id] = bits
+            depth[node_id] = node_depth
+
+        descendant_bits: Dict[str, int] = {}
+        for node_id in reversed(order):
+            bits = 0
+            for child_id in children[node_id]:
+                if position[child_id] > position[node_id]:
+                    bits |= bit[child_id] | descendant_bits[child_id]
+            descendant_bits[node_id] = bits
+
+        self._parents = parents
+        self._children = children
+        self._depth = depth
+        self._bit = bit
+        self._order = order
+        self._ancestor_bits = ancestor_bits
+        self._descendant_bits = descendant_bits
+        self._indexed = True
+        self._name_index = None
+
+    def _ensure_index(self) -> None:
+        if not self._indexed:
+            self.build_index()
+
+    def _ids_from_bits(self, bits: int) -> Iterator[str]:
+        """Yield term IDs for the set bits of a closure bitset."""
+        while bits:
+            low = bits & -bits
+            yield self._order[low.bit_length() - 1]
+            bits ^= low
 
     def get_microtypes(self) -> Dict[str, OBOTerm]:
         """
@@ -244,16 +378,141 @@ class OBOParser:
         """
         if term_id not in self.terms:
             return set()
+        return self.descendants(term_id)
+
+    def parents(self, term_id: str) -> List[str]:
+        """
+        Get the direct is_a parents of a term.
+
+        Args:
+            term_id: The term ID
+
+        Returns:
+            List of parent term IDs, in file order
+        """
+        self._ensure_index()
+        return list(self._parents.get(term_id, []))
+
+    def children(self, term_id: str) -> List[str]:
+        """
+        Get the direct is_a children of a term.
+
+        Args:
+            term_id: The term ID
+
+        Returns:
+            List of child term IDs, in file order
+        """
+        self._ensure_index()
+        return list(self._children.get(term_id, []))
 
-        descendants = set()
-        term = self.terms[term_id]
-        children = term.get_children(self.terms)
+    def get_child_terms(self, term_id: str) -> List[OBOTerm]:
+        """
+        Get the direct children of a term as OBOTerm objects.
+
+        Args:
+            term_id: The term ID
 
-        for child in children:
-            descendants.add(child.id)
-            descendants.update(self.get_all_descendants(child.id))
+        Returns:
+            List of child OBOTerm objects, in file order
+        """
+        return [self.terms[child_id] for child_id in self.children(term_id) if child_id in self.terms]
 
-        return descendants
+    def descendants(self, term_id: str) -> Set[str]:
+        """
+        Get all transitive is_a descendants of a term.
+
+        Args:
+            term_id: The term ID
+
+        Returns:
+            Set of descendant term IDs (excluding the term itself)
+        """
+        self._ensure_index()
+        return set(self._ids_from_bits(self._descendant_bits.get(term_id, 0)))
+
+    def ancestors(self, term_id: str) -> Set[str]:
+        """
+        Get all transitive is_a ancestors of a term.
+
+        Args:
+            term_id: The term ID
+
+        Returns:
+            Set of ancestor term IDs (excluding the term itself)
+        """
+        self._ensure_index()
+        return set(self._ids_from_bits(self._ancestor_bits.get(term_id, 0)))
+
+    def is_a_transitive(self, term_id: str, ancestor_id: str) -> bool:
+        """
+        Check whether a term is (transitively) a subclass of another term.
+
+        Args:
+            term_id: The candidate descendant term ID
+            ancestor_id: The candidate ancestor term ID
+
+        Returns:
+            True if ancestor_id is reachable from term_id via is_a
+        """
+        self._ensure_index()
+        ancestor_bit = self._bit.get(ancestor_id)
+        if ancestor_bit is None:
+            return False
+        return bool(self._ancestor_bits.get(term_id, 0) & ancestor_bit)
+
+    def depth(self, term_id: str) -> Optional[int]:
+        """
+        Get the depth of a term (longest is_a path from a root).
+
+        Args:
+            term_id: The term ID
+
+        Returns:
+            Depth (roots are 0), or None for unknown terms
+        """
+        self._ensure_index()
+        return self._depth.get(term_id)
+
+    def lowest_common_ancestors(self, term_a: str, term_b: str) -> List[str]:
+        """
+        Get the deepest shared ancestors of two terms.
+
+        A term counts as its own ancestor here, so the LCA of a term and one
+        of its descendants is the term itself. In a DAG there may be several
+        equally deep candidates.
+
+        Args:
+            term_a: First term ID
+            term_b: Second term ID
+
+        Returns:
+            Sorted list of lowest common ancestor IDs (empty if none)
+        """
+        self._ensure_index()
+        if term_a not in self._bit or term_b not in self._bit:
+            return []
+        common = ((self._ancestor_bits[term_a] | self._bit[term_a])
+                  & (self._ancestor_bits[term_b] | self._bit[term_b]))
+        if not common:
+            return []
+        shared = list(self._ids_from_bits(common))
+        deepest = max(self._depth[node_id] for node_id in shared)
+        return sorted(node_id for node_id in shared if self._depth[node_id] == deepest)
+
+    def lowest_common_ancestor(self, term_a: str, term_b: str) -> Optional[str]:
+        """
+        Get a single lowest common ancestor of two terms.
+
+        Args:
+            term_a: First term ID
+            term_b: Second term ID
+
+        Returns:
+            The deepest shared ancestor ID (smallest ID on ties), or None
+        """
+        candidates = self.lowest_common_ancestors(term_a, term_b)
+        return candidates[0] if candidates else None
 
     def find_terms_by_name(self, name: str, case_sensitive: bool = False) -> List[OBOTerm]:
         """
@@ -266,17 +525,57 @@ class OBOParser:
         Returns:
             List of matching OBOTerm objects
         """
+        term_list = list(self.terms.values())
+        candidates = self.get_name_index().candidate_ids(name)
+        if candidates is not None:
+            term_list = [self.terms[self._name_index_ids[i]] for i in candidates]
+
         if not case_sensitive:
             name = name.lower()
 
         results = []
-        for term in self.terms.values():
+        for term in term_list:
             term_name = term.name if case_sensitive else term.name.lower()
             if name in term_name:
                 results.append(term)
 
         return results
 
+    def get_name_index(self) -> SearchIndex:
+        """
+        Get the trigram index over term names (built on first use).
+
+        Hits are keyed by term ID. Rebuilt after build_index().
+
+        Returns:
+            SearchIndex for ranked prefix/substring/fuzzy name search
+        """
+        self._ensure_index()
+        if self._name_index is None:
+            index = SearchIndex()
+            self._name_index_ids = []
+            for term_id, term in self.terms.items():
+                if term.name and term.name.strip():
+                    index.add(term_id, term.name, field='name', source=self.ontology_id or '')
+                    self._name_index_ids.append(term_id)
+            self._name_index = index
+        return self._name_index
+
+    def search_terms(self, query: str, limit: int = 20, mode: str = 'auto') -> List[OBOTerm]:
+        """
+        Ranked name search (exact > prefix > substring > fuzzy).
+
+        Args:
+            query: Text to search for
+            limit: Maximum number of terms to return
+            mode: 'auto', 'exact', 'prefix', 'substring' or 'fuzzy'
+
+        Returns:
+            List of matching OBOTerm objects, best match first
+        """
+        hits = self.get_name_index().search(query, limit=limit, mode=mode)
+        return [self.terms[hit.key] for hit in hits]
+
 
 def main():
     """Example usage of the OBO parser."""
@@ -310,7 +609,7 @@ def main():
     for i, (term_id, term) in enumerate(enum_types.items()):
         if i >= 5:
             break
-        children = term.get_children(terms)
+        children = parser.children(term_id)
         print(f"  {term_id}: {term.name} ({len(children)} children)")
 
 
@@ -0,0 +1,459 @@
+#!/usr/bin/env python3
+"""
+Precompiled LinkML schema snapshots.
+
+Constructing ``SchemaView`` on the CDM schema resolves five imported files and
+induces slots on demand, which costs most of a second at every script start.
+A snapshot is the fully induced schema written once as plain JSON:
+
+- classes with their ordered slot lists and induced slot definitions
+- slots, enums (with permissible values) and types
+- foreign keys (slots whose range is a class, or annotated ``foreign_key``
+  or ``constraint_type: foreign_key``)
+
+``load_schema_snapshot()`` returns a ``SchemaSnapshot`` that answers the
+``SchemaView`` calls the scripts use (``all_classes``, ``get_class``,
+``class_slots``, ``induced_slot``, ``get_enum``, ...) from that JSON. Snapshots
+are cached under ``~/.cache/linkml-coral/schema`` (override with
+``SCHEMA_SNAPSHOT_DIR``; ``SCHEMA_SNAPSHOT=off`` disables the cache) and
+record the SHA-256 of every schema file they were built from, so editing any
+imported file triggers a rebuild.
+
+Usage:
+    # Build (or refresh) the cached snapshot
+    python -m linkml_coral.utils.schema_snapshot src/linkml_coral/schema/cdm/linkml_coral_cdm.yaml
+
+    # Write a snapshot to an explicit file
+    python -m linkml_coral.utils.schema_snapshot SCHEMA --output cdm_schema.snapshot.json
+"""
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+from collections import namedtuple
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+SNAPSHOT_VERSION = 1
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "linkml-coral" / "schema"
+CACHE_DIR_ENV = "SCHEMA_SNAPSHOT_DIR"
+DISABLE_ENV = "SCHEMA_SNAPSHOT"
+
+Annotation = namedtuple("Annotation", ["tag", "value"])
+
+
+def cache_enabled() -> bool:
+    """Whether the snapshot cache is enabled (``SCHEMA_SNAPSHOT=off`` disables it)."""
+    return os.environ.get(DISABLE_ENV, "").lower() not in ("0", "off", "false", "no")
+
+
+def _file_hash(path) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def get_snapshot_path(schema_path, cache_dir=None) -> Path:
+    """
+    Cache file for a schema's snapshot.
+
+    Args:
+        schema_path: Root schema YAML file
+        cache_dir: Cache root (default: $SCHEMA_SNAPSHOT_DIR or ~/.cache/linkml-coral/schema)
+
+    Returns:
+        Path of the form ``<cache_dir>/<stem>-<path hash>.json``
+    """
+    cache_dir = Path(cache_dir or os.environ.get(CACHE_DIR_ENV, DEFAULT_CACHE_DIR))
+    resolved = str(Path(schema_path).resolve())
+    key = hashlib.sha256(resolved.encode()).hexdigest()[:16]
+    return cache_dir / f"{Path(schema_path).stem}-{key}.json"
+
+
+class SnapshotElement:
+    """
+    Read-only view of one schema element.
+
+    Like the LinkML metamodel classes, unset scalar fields read as None and
+    unset list/dict fields (``annotations``, ``mixins``, ...) as empty.
+    """
+
+    __slots__ = ("_data", "_containers")
+
+    def __init__(self, data: Dict[str, Any], containers: Optional[Dict[str, Dict[str, str]]] = None):
+        self._data = data
+        self._containers = containers or {}
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        value = self._data.get(name)
+        if value is None:
+            kind = self._containers.get("fields", {}).get(name)
+            return [] if kind == "list" else {} if kind == "dict" else None
+        if name == "annotations":
+            return {
+                tag: Annotation(tag, ann.get("value") if isinstance(ann, dict) else ann)
+                for tag, ann in value.items()
+            }
+        if name == "permissible_values":
+            containers = {"fields": self._containers.get("permissible_value", {})}
+            return {text: SnapshotElement(pv, containers) for text, pv in value.items()}
+        return value
+
+    def __repr__(self) -> str:
+        return f"SnapshotElement({self._data.get('name') or self._data.get('text')!r})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The element's stored fields."""
+        return dict(self._data)
+
+
+def build_snapshot(schema_path) -> Dict[str, Any]:
+    """
+    Induce a schema with SchemaView and flatten it to JSON-ready data.
+
+    Args:
+        schema_path: Root schema YAML file
+
+    Returns:
+        Snapshot dictionary (see SchemaSnapshot)
+    """
+    from linkml_runtime.dumpers import json_dumper
+    from linkml_runtime.utils.schemaview import SchemaView
+
+    sv = SchemaView(str(schema_path))
+    sv.imports_closure()
+    source_files = sorted({
+        str(Path(schema.source_file).resolve())
+        for schema in sv.schema_map.values() if schema.source_file
+    })
+
+    class_names = list(sv.all_classes())
+    classes = {}
+    for class_name in class_names:
+        class_data = json_dumper.to_dict(sv.get_class(class_name))
+        slot_names = [str(s) for s in sv.class_slots(class_name)]
+        class_data["class_slots"] = slot_names
+        class_data["induced_slots"] = {
+            slot_name: json_dumper.to_dict(sv.induced_slot(slot_name, class_name))
+            for slot_name in slot_names
+        }
+        classes[class_name] = class_data
+
+    schema = sv.schema
+    return {
+        "snapshot_version": SNAPSHOT_VERSION,
+        "schema_path": str(Path(schema_path).resolve()),
+        "sources": {path: _file_hash(path) for path in source_files},
+        "schema": {
+            key: getattr(schema, key)
+            for key in ("id", "name", "title", "description", "version")
+            if getattr(schema, key, None)
+        },
+        "classes": classes,
+        "slots": {str(name): json_dumper.to_dict(sv.get_slot(name)) for name in sv.all_slots()},
+        "enums": {str(name): json_dumper.to_dict(sv.get_enum(name)) for name in sv.all_enums()},
+        "types": {str(name): json_dumper.to_dict(sv.get_type(name)) for name in sv.all_types()},
+        "foreign_keys": _foreign_keys(classes),
+        "containers": _container_fields(),
+    }
+
+
+def _container_fields() -> Dict[str, Dict[str, str]]:
+    """List/dict-valued fields of each metamodel class (they default to empty)."""
+    import dataclasses
+    from linkml_runtime.linkml_model.meta import (
+        ClassDefinition, EnumDefinition, PermissibleValue, SlotDefinition, TypeDefinition,
+    )
+
+    containers = {}
+    for kind, blank in (
+        ("class", ClassDefinition(name="_")),
+        ("slot", SlotDefinition(name="_")),
+        ("enum", EnumDefinition(name="_")),
+        ("type", TypeDefinition(name="_")),
+        ("permissible_value", PermissibleValue(text="_")),
+    ):
+        containers[kind] = {
+            f.name: "list" if isinstance(getattr(blank, f.name), list) else "dict"
+            for f in dataclasses.fields(blank)
+            if isinstance(getattr(blank, f.name), (list, dict))
+        }
+    return containers
+
+
+def _annotation_value(slot_data: Dict[str, Any], tag: str) -> Any:
+    annotation = (slot_data.get("annotations") or {}).get(tag)
+    return annotation.get("value") if isinstance(annotation, dict) else annotation
+
+
+def _foreign_keys(classes: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Find foreign key slots in induced class data.
+
+    A slot is a foreign key if its range is a class, it has a
+    ``foreign_key: Class.slot`` annotation, or (CDM style) it is annotated
+    ``constraint_type: foreign_key``. For the CDM style the target is the
+    "FK to Class.slot" in the description if given, else the other class
+    whose primary/unique key the slot name ends with (``material_sys_oterm_id``
+    -> the class keyed by ``sys_oterm_id``).
+    """
+    key_owners: Dict[str, str] = {}
+    for class_name, class_data in classes.items():
+        for slot_name, slot_data in class_data["induced_slots"].items():
+            if slot_data.get("identifier") or \
+                    _annotation_value(slot_data, "constraint_type") in ("primary_key", "unique_key"):
+                key_owners.setdefault(slot_name, class_name)
+
+    foreign_keys = []
+    for class_name, class_data in classes.items():
+        for slot_name, slot_data in class_data["induced_slots"].items():
+            target = None
+            declared = _annotation_value(slot_data, "foreign_key")
+            if isinstance(declared, str) and "." in declared:
+                target = tuple(declared.split(".", 1))
+            elif slot_data.get("range") in classes:
+                target = (slot_data["range"], None)
+            elif _annotation_value(slot_data, "constraint_type") == "foreign_key":
+                match = re.search(r"FK to (\w+)\.(\w+)", slot_data.get("description") or "")
+                if match:
+                    target = match.groups()
+                else:
+                    owners = [
+                        (key, owner) for key, owner in key_owners.items()
+                        if owner != class_name and (slot_name == key or slot_name.endswith("_" + key))
+                    ]
+                    if owners:
+                        key, owner = max(owners, key=lambda item: len(item[0]))
+                        target = (owner, key)
+            if target:
+                foreign_keys.append({
+                    "class": class_name,
+                    "slot": slot_name,
+                    "target_class": target[0],
+                    "target_slot": target[1],
+                    "required": bool(slot_data.get("required")),
+                    "multivalued": bool(slot_data.get("multivalued")),
+                })
+    return foreign_keys
+
+
+class SchemaSnapshot:
+    """SchemaView-compatible accessor over a snapshot dictionary."""
+
+    def __init__(self, data: Dict[str, Any]):
+        """
+        Initialize from snapshot data.
+
+        Args:
+            data: Dictionary produced by build_snapshot()
+        """
+        self.data = data
+        self.schema = SnapshotElement(data["schema"])
+        self._containers = {kind: {"fields": fields} for kind, fields in data["containers"].items()}
+        self._containers["enum"]["permissible_value"] = data["containers"]["permissible_value"]
+        self._classes = self._elements(data["classes"], "class")
+        self._slots = self._elements(data["slots"], "slot")
+        self._enums = self._elements(data["enums"], "enum")
+        self._types = self._elements(data["types"], "type")
+        self._induced: Dict[tuple, SnapshotElement] = {}
+
+    def _elements(self, items: Dict[str, Dict[str, Any]], kind: str) -> Dict[str, SnapshotElement]:
+        containers = self._containers[kind]
+        return {name: SnapshotElement(item, containers) for name, item in items.items()}
+
+    @property
+    def name(self) -> Optional[str]:
+        """Schema name."""
+        return self.data["schema"].get("name")
+
+    @property
+    def source_files(self) -> List[str]:
+        """Schema files the snapshot was built from."""
+        return list(self.data["sources"])
+
+    def is_current(self) -> bool:
+        """Whether every source file still has the hash recorded at build time."""
+        try:
+            return all(_file_hash(path) == digest for path, digest in self.data["sources"].items())
+        except OSError:
+            return False
+
+    def all_classes(self) -> Dict[str, SnapshotElement]:
+        """All classes, in schema order."""
+        return self._classes
+
+    def all_slots(self) -> Dict[str, SnapshotElement]:
+        """All slots, in schema order."""
+        return self._slots
+
+    def all_enums(self) -> Dict[str, SnapshotElement]:
+        """All enums, in schema order."""
+        return self._enums
+
+    def all_types(self) -> Dict[str, SnapshotElement]:
+        """All types, including imported linkml:types."""
+        return self._types
+
+    def get_class(self, class_name: str) -> Optional[SnapshotElement]:
+        """Class definition, or None."""
+        return self._classes.get(class_name)
+
+    def get_slot(self, slot_name: str) -> Optional[SnapshotElement]:
+        """Slot definition (not induced for any class), or None."""
+        return self._slots.get(slot_name)
+
+    def get_enum(self, enum_name: str) -> Optional[SnapshotElement]:
+        """Enum definition, or None."""
+        return self._enums.get(enum_name)
+
+    def get_type(self, type_name: str) -> Optional[SnapshotElement]:
+        """Type definition, or None."""
+        return self._types.get(type_name)
+
+    def class_slots(self, class_name: str) -> List[str]:
+        """Names of all slots of a class, including inherited and mixin slots."""
+        class_data = self.data["classes"].get(class_name)
+        return list(class_data["class_slots"]) if class_data else []
+
+    def induced_slot(self, slot_name: str, class_name: Optional[str] = None) -> SnapshotElement:
+        """
+        Slot as it applies to a class (with inherited and slot_usage values).
+
+        Args:
+            slot_name: Slot name
+            class_name: Class name (None returns the global slot definition)
+
+        Returns:
+            Slot element
+
+        Raises:
+            ValueError: If the slot is not defined (for the class)
+        """
+        if class_name is None:
+            slot = self._slots.get(slot_name)
+            if slot is None:
+                raise ValueError(f"No such slot {slot_name}")
+            return slot
+        key = (slot_name, class_name)
+        if key not in self._induced:
+            class_data = self.data["classes"].get(class_name, {})
+            slot_data = class_data.get("induced_slots", {}).get(slot_name)
+            if slot_data is None:
+                raise ValueError(f"No such slot {slot_name} in class {class_name}")
+            self._induced[key] = SnapshotElement(slot_data, self._containers["slot"])
+        return self._induced[key]
+
+    def class_induced_slots(self, class_name: str) -> List[SnapshotElement]:
+        """Induced definitions of every slot of a class."""
+        return [self.induced_slot(s, class_name) for s in self.class_slots(class_name)]
+
+    def foreign_keys(self, class_name: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Foreign key slots.
+
+        Args:
+            class_name: Only FKs declared on this class (None for all)
+
+        Returns:
+            List of dicts with class, slot, target_class, target_slot,
+            required and multivalued
+        """
+        return [fk for fk in self.data["foreign_keys"] if class_name is None or fk["class"] == class_name]
+
+    def save(self, path) -> Path:
+        """Write the snapshot as JSON (atomically)."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=".tmp-", suffix=".json")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(self.data, f, separators=(",", ":"))
+            os.replace(tmp_name, path)
+        except Exception:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+        return path
+
+    @classmethod
+    def load(cls, path) -> "SchemaSnapshot":
+        """
+        Read a snapshot file.
+
+        Raises:
+            ValueError: If the file is not a snapshot of this version
+        """
+        with open(path) as f:
+            data = json.load(f)
+        if data.get("snapshot_version") != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported schema snapshot version: {data.get('snapshot_version')}")
+        return cls(data)
+
+
+def load_schema_snapshot(schema_path, cache_dir=None, rebuild: bool = False) -> SchemaSnapshot:
+    """
+    Snapshot of a schema, rebuilt only when a schema file has changed.
+
+    Args:
+        schema_path: Root schema YAML file, or a snapshot ``.json`` file
+        cache_dir: Cache root (default: $SCHEMA_SNAPSHOT_DIR or ~/.cache/linkml-coral/schema)
+        rebuild: Ignore any cached snapshot
+
+    Returns:
+        SchemaSnapshot
+    """
+    schema_path = Path(schema_path)
+    if schema_path.suffix == ".json":
+        return SchemaSnapshot.load(schema_path)
+    if not schema_path.exists():
+        raise FileNotFoundError(f"Schema not found: {schema_path}")
+
+    use_cache = cache_enabled()
+    snapshot_path = get_snapshot_path(schema_path, cache_dir)
+    if use_cache and not rebuild and snapshot_path.exists():
+        try:
+            snapshot = SchemaSnapshot.load(snapshot_path)
+            if snapshot.is_current():
+                return snapshot
+        except (OSError, ValueError, KeyError):
+            pass
+
+    snapshot = SchemaSnapshot(build_snapshot(schema_path))
+    if use_cache:
+        try:
+            snapshot.save(snapshot_path)
+        except OSError:
+            # A read-only cache directory only costs the speedup
+            pass
+    return snapshot
+
+
+def main():
+    """Build a schema snapshot."""
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description='Build a precompiled LinkML schema snapshot')
+    parser.add_argument('schema', help='Root schema YAML file')
+    parser.add_argument('--output', '-o', help='Write the snapshot here instead of the cache')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.output:
+        snapshot = SchemaSnapshot(build_snapshot(args.schema))
+        path = snapshot.save(args.output)
+    else:
+        snapshot = load_schema_snapshot(args.schema, rebuild=True)
+        path = get_snapshot_path(args.schema)
+    elapsed = time.perf_counter() - start
+    print(f"✅ {snapshot.name}: {len(snapshot.all_classes())} classes, "
+          f"{len(snapshot.all_slots())} slots, {len(snapshot.all_enums())} enums, "
+          f"{len(snapshot.foreign_keys())} foreign keys ({elapsed:.2f}s)")
+    print(f"📄 {path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""
+Trigram search index for ontology terms and entity names.
+
+Texts are normalized (lowercased, punctuation folded to spaces) and split
+into word trigrams padded like PostgreSQL's ``pg_trgm`` (``"  se"``,
+``" se"``, ``"sed"``, ..., ``"nt "``). An inverted index maps each trigram to
+the documents containing it, so a lookup only touches the posting lists of
+the query's trigrams:
+
+- exact / prefix / substring matches intersect the postings of the query's
+  trigrams and verify the candidates against the normalized text
+- fuzzy matches rank documents by trigram Jaccard similarity, which
+  tolerates typos and word-order differences
+
+Posting lists are kept in Arrow arrays and counted with ``pyarrow.compute``.
+Indexes are saved as Arrow IPC files (documents + postings) and memory-mapped
+on load, so opening a large index costs milliseconds.
+"""
+
+import json
+import re
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import pyarrow as pa
+import pyarrow.compute as pc
+
+INDEX_VERSION = 1
+SEARCH_MODES = ("auto", "exact", "prefix", "substring", "fuzzy")
+
+_MATCH_SCORES = {"exact": 3.0, "prefix": 2.0, "substring": 1.0, "fuzzy": 0.0}
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+DOCUMENTS_FILE = "documents.arrow"
+POSTINGS_FILE = "postings.arrow"
+METADATA_FILE = "index.json"
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase and fold runs of punctuation/whitespace to a single space."""
+    return _NON_ALNUM.sub(" ", str(text).lower()).strip()
+
+
+def trigrams(normalized: str) -> Set[str]:
+    """Padded word trigrams of normalized text."""
+    grams = set()
+    for token in normalized.split():
+        padded = f"  {token} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def _inner_trigrams(normalized: str) -> Set[str]:
+    """
+    Trigrams that any text containing ``normalized`` as a substring must have.
+
+    The first and last tokens may be cut mid-word, so their outer padding is
+    left out; short tokens contribute nothing.
+    """
+    tokens = normalized.split()
+    grams = set()
+    for i, token in enumerate(tokens):
+        padded = token
+        if i > 0:
+            padded = " " + padded
+        if i < len(tokens) - 1:
+            padded = padded + " "
+        grams.update(padded[j:j + 3] for j in range(len(padded) - 2))
+    return {g for g in grams if g.strip()}
+
+
+def _prefix_trigrams(normalized: str) -> Set[str]:
+    """Trigrams that any text with a word starting with ``normalized`` must have."""
+    tokens = normalized.split()
+    grams = _inner_trigrams(normalized)
+    if tokens:
+        padded = f"  {tokens[0]}"
+        grams.update(padded[j:j + 3] for j in range(min(2, len(padded) - 2)))
+    return grams
+
+
+@dataclass
+class SearchHit:
+    """A ranked search result."""
+
+    key: str
+    text: str
+    field: str
+    source: str
+    match: str
+    score: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a plain dictionary (for JSON export)."""
+        return asdict(self)
+
+
+class SearchIndex:
+    """Inverted trigram index over (source, key, field, text) documents."""
+
+    def __init__(self):
+        self.metadata: Dict[str, Any] = {}
+        # Documents and postings while building (see add)
+        self._rows: Dict[str, List[Any]] = {
+            "key": [], "text": [], "field": [], "source": [], "normalized": [], "grams": []
+        }
+        self._gram_docs: Dict[str, List[int]] = {}
+        # Arrow form used for lookups (built lazily from the lists, or loaded)
+        self._documents: Optional[pa.Table] = None
+        self._gram_rows: Dict[str, int] = {}
+        self._offsets: List[int] = []
+        self._doc_ids: Optional[pa.Array] = None
+        self._read_only = False
+
+    def __len__(self) -> int:
+        if self._read_only:
+            return self._documents.num_rows
+        return len(self._rows["key"])
+
+    def add(self, key: str, text: str, field: str = "name", source: str = "") -> None:
+        """
+        Add a document to the index.
+
+        Args:
+            key: Identifier returned with hits (e.g., ontology term ID)
+            text: Text to index
+            field: Name of the field the text came from
+            source: Collection the document belongs to (e.g., table name)
+        """
+        if self._read_only:
+            raise ValueError("Cannot add documents to a loaded search index")
+        if text is None or not str(text).strip():
+            return
+        normalized = normalize_text(text)
+        grams = trigrams(normalized)
+        doc_id = len(self._rows["key"])
+        for name, value in (("key", str(key)), ("text", str(text)), ("field", field),
+                            ("source", source), ("normalized", normalized), ("grams", len(grams))):
+            self._rows[name].append(value)
+        for gram in grams:
+            self._gram_docs.setdefault(gram, []).append(doc_id)
+        self._documents = None
+
+    def _freeze(self) -> None:
+        """Convert the documents and postings built by add() to Arrow arrays."""
+        if self._documents is not None:
+            return
+        self._documents = pa.table({
+            "key": pa.array(self._rows["key"], pa.string()),
+            "text": pa.array(self._rows["text"], pa.string()),
+            "field": pa.array(self._rows["field"], pa.string()),
+            "source": pa.array(self._rows["source"], pa.string()),
+            "normalized": pa.array(self._rows["normalized"], pa.string()),
+            "grams": pa.array(self._rows["grams"], pa.uint32()),
+        })
+        grams = sorted(self._gram_docs)
+        self._set_postings(grams, pa.array([self._gram_docs[g] for g in grams], pa.list_(pa.uint32())))
+
+    def _set_postings(self, grams: List[str], docs: pa.ListArray) -> None:
+        self._gram_rows = {gram: i for i, gram in enumerate(grams)}
+        self._offsets = docs.offsets.to_pylist()
+        self._doc_ids = docs.values
+
+    def _column(self, name: str, doc_ids) -> List[Any]:
+        """Values of a document column at the given positions."""
+        return self._documents.column(name).take(pa.array(doc_ids, pa.uint32())).to_pylist()
+
+    def _posting(self, gram: str) -> pa.Array:
+        row = self._gram_rows.get(gram)
+        if row is None:
+            return pa.array([], pa.uint32())
+        return self._doc_ids.slice(self._offsets[row], self._offsets[row + 1] - self._offsets[row])
+
+    def _overlap(self, grams: Iterable[str]) -> Tuple[pa.Array, pa.Array]:
+        """Documents containing any of ``grams`` and how many of them each contains."""
+        postings = [p for p in (self._posting(g) for g in grams) if len(p)]
+        if not postings:
+            return pa.array([], pa.uint32()), pa.array([], pa.int64())
+        counts = pc.value_counts(pa.chunked_array(postings, pa.uint32()))
+        return counts.field("values"), counts.field("counts")
+
+    def candidate_ids(self, query: str, prefix: bool = False) -> Optional[List[int]]:
+        """
+        Documents that may contain ``query`` as a substring (or word prefix).
+
+        Args:
+            query: Raw query text
+            prefix: Only require the grams of a word-prefix match
+
+        Returns:
+            Sorted document positions, or None if the query is too short to
+            narrow the search (callers then scan every document)
+        """
+        self._freeze()
+        normalized = normalize_text(query)
+        grams = _prefix_trigrams(normalized) if prefix else _inner_trigrams(normalized)
+        if not grams:
+            return None
+        doc_ids, counts = self._overlap(grams)
+        matching = pc.filter(doc_ids, pc.equal(counts, len(grams)))
+        return sorted(matching.to_pylist())
+
+    def search(
+        self,
+        query: str,
+        limit: int = 20,
+        mode: str = "auto",
+        sources: Optional[Iterable[str]] = None,
+        min_similarity: float = 0.3
+    ) -> List[SearchHit]:
+        """
+        Ranked search.
+
+        Args:
+            query: Query text
+            limit: Maximum hits to return
+            mode: 'exact', 'prefix', 'substring', 'fuzzy' or 'auto' (all of them,
+                ranked exact > prefix > substring > fuzzy)
+            sources: Only return documents from these sources
+            min_similarity: Minimum trigram similarity for fuzzy hits
+
+        Returns:
+            Hits ordered by score, at most one per (source, key)
+        """
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"Unknown search mode '{mode}' (expected one of {', '.join(SEARCH_MODES)})")
+        self._freeze()
+        normalized = normalize_text(query)
+        if not normalized:
+            return []
+
+        # Trigram similarity of every document sharing a gram with the query
+        query_grams = trigrams(normalized)
+        doc_ids, shared = self._overlap(query_grams)
+        doc_grams = self._documents.column("grams").take(doc_ids)
+        union = pc.subtract(pc.add(pc.cast(doc_grams, pa.int64()), len(query_grams)), shared)
+        similarity = pc.divide(pc.cast(shared, pa.float64()), pc.cast(union, pa.float64()))
+
+        scored: Dict[int, Tuple[float, str, int]] = {}  # doc_id -> (score, match, text length)
+
+        if mode != "fuzzy":
+            candidates = self.candidate_ids(query, prefix=(mode == "prefix"))
+            if candidates is None and mode != "substring":
+                # Too short for inner trigrams: exact and prefix hits still start a word
+                candidates = self.candidate_ids(query, prefix=True)
+            if candidates is None:
+                candidates = list(range(len(self)))
+            verified = []
+            for doc_id, text in zip(candidates, self._column("normalized", candidates)):
+                if text == normalized:
+                    match = "exact"
+                elif text.startswith(normalized) or f" {normalized}" in text:
+                    match = "prefix"
+                elif normalized in text:
+                    match = "substring"
+                else:
+                    continue
+                if mode == "exact" and match != "exact":
+                    continue
+                if mode == "prefix" and match not in ("exact", "prefix"):
+                    continue
+                verified.append((doc_id, match, len(text)))
+            if verified:
+                positions = pc.index_in(pa.array([v[0] for v in verified], pa.uint32()), value_set=doc_ids)
+                sims = similarity.take(positions).to_pylist()
+                for (doc_id, match, length), sim in zip(verified, sims):
+                    scored[doc_id] = (_MATCH_SCORES[match] + (sim or 0.0), match, length)
+
+        if mode in ("auto", "fuzzy"):
+            keep = pc.greater_equal(similarity, min_similarity)
+            fuzzy = [(d, s) for d, s in zip(pc.filter(doc_ids, keep).to_pylist(),
+                                            pc.filter(similarity, keep).to_pylist())
+                     if d not in scored]
+            texts = self._column("normalized", [d for d, _ in fuzzy])
+            for (doc_id, sim), text in zip(fuzzy, texts):
+                scored[doc_id] = (sim, "fuzzy", len(text))
+
+        ranked = sorted(scored, key=lambda d: (-scored[d][0], scored[d][2], d))
+        sources = set(sources) if sources else None
+        hits: List[SearchHit] = []
+        seen = set()
+        # Fetch hit details a page at a time; usually only the first page is read
+        page = max(limit * 4, 64)
+        for start in range(0, len(ranked), page):
+            chunk = ranked[start:start + page]
+            rows = zip(chunk, *(self._column(c, chunk) for c in ("key", "text", "field", "source")))
+            for doc_id, key, text, field, source in rows:
+                if sources is not None and source not in sources:
+                    continue
+                if (source, key) in seen:
+                    continue
+                seen.add((source, key))
+                score, match, _ = scored[doc_id]
+                hits.append(SearchHit(key=key, text=text, field=field, source=source,
+                                      match=match, score=round(score, 4)))
+                if len(hits) >= limit:
+                    return hits
+        return hits
+
+    def save(self, path, metadata: Optional[Dict[str, Any]] = None) -> Path:
+        """
+        Write the index to a directory of Arrow IPC files.
+
+        Args:
+            path: Index directory (created if needed)
+            metadata: Extra JSON metadata stored with the index
+
+        Returns:
+            The index directory
+        """
+        self._freeze()
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+
+        grams = sorted(self._gram_rows, key=self._gram_rows.get)
+        docs = pa.ListArray.from_arrays(pa.array(self._offsets, pa.int32()), self._doc_ids)
+        postings = pa.table({"gram": pa.array(grams, pa.string()), "docs": docs})
+        for name, table in ((DOCUMENTS_FILE, self._documents), (POSTINGS_FILE, postings)):
+            with pa.OSFile(str(path / name), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+
+        self.metadata = dict(metadata or {})
+        self.metadata.update({
+            "version": INDEX_VERSION,
+            "documents": len(self),
+            "trigrams": len(grams),
+        })
+        with open(path / METADATA_FILE, "w") as f:
+            json.dump(self.metadata, f, indent=2, default=str)
+        return path
+
+    @classmethod
+    def load(cls, path) -> "SearchIndex":
+        """
+        Open an index written by save().
+
+        Args:
+            path: Index directory
+
+        Returns:
+            Read-only SearchIndex backed by memory-mapped Arrow files
+        """
+        path = Path(path)
+        with open(path / METADATA_FILE) as f:
+            metadata = json.load(f)
+        if metadata.get("version") != INDEX_VERSION:
+            raise ValueError(f"Unsupported search index version: {metadata.get('version')}")
+
+        documents = pa.ipc.open_file(pa.memory_map(str(path / DOCUMENTS_FILE))).read_all()
+        postings = pa.ipc.open_file(pa.memory_map(str(path / POSTINGS_FILE))).read_all()
+
+        index = cls()
+        index.metadata = metadata
+        index._documents = documents.combine_chunks()
+        docs = postings.column("docs").combine_chunks() if postings.num_rows else pa.array([], pa.list_(pa.uint32()))
+        index._set_postings(postings.column("gram").to_pylist(), docs)
+        index._read_only = True
+        return index
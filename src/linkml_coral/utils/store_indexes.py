@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+Physical indexes and row order for DuckDB stores.
+
+DuckDB answers selective lookups (``WHERE sdt_sample_id = ?``) from ART
+indexes and skips row groups whose min/max zone maps exclude a filter. This
+module builds both kinds of physical design for a loaded store:
+
+- ``declared_indexes()`` derives ART indexes from the schema (identifier
+  slots, foreign keys), relationship catalog records and computed ``*_category`` columns; ``build_indexes()`` creates them
+- ``sort_table()`` / ``sort_bricks()`` rewrite large bricks ordered by their
+  leading dimension, so zone maps prune row groups for filters on it; the
+  order is recorded in ``cdm_table_order``
+- ``advise()`` runs ``EXPLAIN`` over a recorded query log and suggests the
+  indexes and sort orders that its filters would use
+
+Index and sort statements only touch tables and columns that exist in the
+store, so the same declarations work for partial loads.
+"""
+
+import json
+import re
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+ORDER_TABLE = "cdm_table_order"
+BRICK_PREFIX = "ddt_brick"
+COMPUTED_SUFFIXES = ("_category",)
+# ART indexes cannot be built on nested types
+UNINDEXABLE_TYPES = ("[]", "STRUCT", "MAP", "UNION")
+DEFAULT_SORT_MIN_ROWS = 1_000_000
+DEFAULT_ADVICE_MIN_ROWS = 10_000
+
+_FILTER = re.compile(r'^\(*"?(?P<column>\w+)"?\s*(?P<op>=|>=|<=|>|<|IN\b)', re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class IndexSpec:
+    """An ART index on one column."""
+
+    table: str
+    column: str
+    reason: str  # e.g. 'primary key', 'foreign key', 'computed', 'query log'
+
+    @property
+    def name(self) -> str:
+        """Index name (idx_<table>_<column>)."""
+        return f"idx_{self.table}_{self.column}"
+
+    def sql(self) -> str:
+        """CREATE INDEX statement."""
+        return f'CREATE INDEX IF NOT EXISTS "{self.name}" ON "{self.table}" ("{self.column}")'
+
+
+@dataclass
+class Advice:
+    """A suggested index or sort order, with the query-log weight behind it."""
+
+    kind: str  # 'index' or 'sort'
+    table: str
+    column: str
+    queries: int
+    table_rows: int
+
+    @property
+    def sql(self) -> str:
+        """Statement(s) that apply the advice."""
+        if self.kind == "index":
+            return IndexSpec(self.table, self.column, "query log").sql()
+        return f'CREATE OR REPLACE TABLE "{self.table}" AS SELECT * FROM "{self.table}" ORDER BY "{self.column}"'
+
+    def apply(self, conn) -> None:
+        """Create the index or re-sort the table."""
+        if self.kind == "index":
+            conn.execute(self.sql)
+        else:
+            sort_table(conn, self.table, self.column)
+
+
+def store_columns(conn) -> Dict[str, Dict[str, str]]:
+    """Tables of a store mapped to {column: data type}."""
+    tables: Dict[str, Dict[str, str]] = {}
+    for table, column, dtype in conn.execute("""
+        SELECT table_name, column_name, data_type FROM information_schema.columns
+        WHERE table_schema = 'main' ORDER BY table_name, ordinal_position
+    """).fetchall():
+        tables.setdefault(table, {})[column] = dtype
+    return tables
+
+
+def table_rows(conn) -> Dict[str, int]:
+    """Estimated row count of every table."""
+    return {table: int(rows or 0) for table, rows in conn.execute(
+        "SELECT table_name, estimated_size FROM duckdb_tables() WHERE schema_name = 'main'"
+    ).fetchall()}
+
+
+def existing_indexes(conn) -> Set[Tuple[str, str]]:
+    """(table, column) pairs that already have a single-column index."""
+    indexed = set()
+    for table, expressions in conn.execute(
+        "SELECT table_name, expressions FROM duckdb_indexes() WHERE schema_name = 'main'"
+    ).fetchall():
+        if isinstance(expressions, str):
+            expressions = expressions.strip("[]").split(",")
+        if len(expressions) == 1:
+            indexed.add((table, expressions[0].strip().strip('"\'')))
+    return indexed
+
+
+def table_order(conn) -> Dict[str, str]:
+    """Sort column recorded for each re-sorted table."""
+    try:
+        return dict(conn.execute(f"SELECT table_name, sort_column FROM {ORDER_TABLE}").fetchall())
+    except Exception:
+        return {}
+
+
+def declared_indexes(
+    conn,
+    schema_view=None,
+    relationships: Optional[Iterable[Dict[str, Any]]] = None,
+    include_bricks: bool = False
+) -> List[IndexSpec]:
+    """
+    Indexes declared by the schema, relationship catalog and computed columns.
+
+    Identifier slots are indexed in every table that has them (the owning
+    table's key, a foreign key elsewhere). Brick tables are left to sort
+    order unless ``include_bricks`` is set.
+
+    Args:
+        conn: DuckDB connection to the store
+        schema_view: Optional SchemaSnapshot (or SchemaView)
+        relationships: Optional relationship catalog records (dicts with
+            ``source_table`` and ``source_column``)
+        include_bricks: Also index brick (ddt_brick*) columns
+
+    Returns:
+        IndexSpec list, one per (table, column), for columns in the store
+    """
+    tables = store_columns(conn)
+    specs: Dict[Tuple[str, str], IndexSpec] = {}
+
+    def add(table: str, column: str, reason: str) -> None:
+        dtype = tables.get(table, {}).get(column)
+        if dtype is None or any(t in dtype for t in UNINDEXABLE_TYPES):
+            return
+        if table.startswith(BRICK_PREFIX) and not include_bricks:
+            return
+        specs.setdefault((table, column), IndexSpec(table, column, reason))
+
+    def add_everywhere(column: str, owner_reason: str = "primary key") -> None:
+        for table, columns in tables.items():
+            if column in columns:
+                add(table, column, owner_reason if column.startswith(table) else "foreign key")
+
+    if schema_view is not None:
+        for class_name in schema_view.all_classes():
+            for slot_name in schema_view.class_slots(class_name):
+                if schema_view.induced_slot(slot_name, class_name).identifier:
+                    add_everywhere(slot_name)
+        if hasattr(schema_view, "foreign_keys"):
+            for fk in schema_view.foreign_keys():
+                add_everywhere(fk["slot"], "foreign key")
+
+    for relationship in relationships or ():
+        add(relationship.get("source_table") or "", relationship.get("source_column") or "", "foreign key")
+
+    for table, columns in tables.items():
+        for column in columns:
+            if column.endswith(COMPUTED_SUFFIXES):
+                add(table, column, "computed")
+
+    return sorted(specs.values(), key=lambda s: (s.table, s.column))
+
+
+def build_indexes(conn, specs: Iterable[IndexSpec], verbose: bool = False) -> Tuple[int, List[str]]:
+    """
+    Create indexes that do not exist yet.
+
+    Args:
+        conn: DuckDB connection
+        specs: Indexes to create
+        verbose: Print each index
+
+    Returns:
+        Tuple of (number created, error messages)
+    """
+    existing = existing_indexes(conn)
+    created, errors = 0, []
+    for spec in specs:
+        if (spec.table, spec.column) in existing:
+            continue
+        try:
+            conn.execute(spec.sql())
+        except Exception as e:
+            errors.append(f"{spec.table}.{spec.column}: {e}")
+            continue
+        existing.add((spec.table, spec.column))
+        created += 1
+        if verbose:
+            print(f"  ✓ {spec.name} ({spec.reason})")
+    return created, errors
+
+
+def sort_table(conn, table: str, column: Optional[str] = None) -> str:
+    """
+    Rewrite a table ordered by a column (its leading column by default).
+
+    The table's indexes are recreated after the rewrite.
+
+    Args:
+        conn: DuckDB connection
+        table: Table to re-sort
+        column: Sort column (default: the first column, a brick's leading dimension)
+
+    Returns:
+        The sort column
+    """
+    if column is None:
+        column = conn.execute(f'DESCRIBE "{table}"').fetchone()[0]
+    index_sql = [row[0] for row in conn.execute(
+        "SELECT sql FROM duckdb_indexes() WHERE schema_name = 'main' AND table_name = ?", [table]
+    ).fetchall() if row[0]]
+    conn.execute(f'CREATE OR REPLACE TABLE "{table}" AS SELECT * FROM "{table}" ORDER BY "{column}"')
+    for sql in index_sql:
+        conn.execute(sql)
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {ORDER_TABLE} (
+            table_name VARCHAR PRIMARY KEY, sort_column VARCHAR, sorted_at TIMESTAMP
+        )
+    """)
+    conn.execute(f"INSERT OR REPLACE INTO {ORDER_TABLE} VALUES (?, ?, ?)", [table, column, datetime.now()])
+    return column
+
+
+def sort_bricks(conn, min_rows: int = DEFAULT_SORT_MIN_ROWS, verbose: bool = False) -> List[Tuple[str, str]]:
+    """
+    Re-sort brick tables of at least ``min_rows`` rows by their leading dimension.
+
+    Args:
+        conn: DuckDB connection
+        min_rows: Smaller bricks are left alone (few row groups to prune)
+        verbose: Print each sorted brick
+
+    Returns:
+        List of (table, sort column) that were rewritten
+    """
+    ordered = table_order(conn)
+    sorted_tables = []
+    for table, rows in sorted(table_rows(conn).items()):
+        if not table.startswith(BRICK_PREFIX) or rows < min_rows:
+            continue
+        leading = conn.execute(f'DESCRIBE "{table}"').fetchone()[0]
+        if ordered.get(table) == leading:
+            continue
+        sort_table(conn, table, leading)
+        sorted_tables.append((table, leading))
+        if verbose:
+            print(f"  ✓ {table} ordered by {leading} ({rows:,} rows)")
+    return sorted_tables
+
+
+def _scan_filters(plan_node: Dict[str, Any], found: List[Tuple[str, str, str]]) -> None:
+    """Collect (table, column, operator) from the pushed-down filters of table scans."""
+    info = plan_node.get("extra_info", {})
+    table = info.get("Table")
+    filters = info.get("Filters")
+    if table and filters:
+        if isinstance(filters, str):
+            filters = filters.split(" AND ")
+        for expression in filters:
+            expression = expression.strip().removeprefix("optional:").strip()
+            match = _FILTER.match(expression)
+            if match:
+                found.append((table.split(".")[-1], match["column"], match["op"].upper()))
+    for child in plan_node.get("children", []):
+        _scan_filters(child, found)
+
+
+def advise(
+    conn,
+    queries: Iterable[Tuple[str, int]],
+    min_rows: int = DEFAULT_ADVICE_MIN_ROWS
+) -> Tuple[List[Advice], int]:
+    """
+    Suggest indexes and sort orders for a query log.
+
+    Equality / IN filters on a table suggest an ART index; range filters
+    suggest ordering the table by that column. Brick tables only get sort
+    advice (one column per table: the most used one), since an ART index
+    over a large brick costs more memory than the zone maps it replaces.
+
+    Args:
+        conn: DuckDB connection to the store
+        queries: (sql, weight) pairs, e.g. from a log of executed queries
+        min_rows: Ignore tables smaller than this
+
+    Returns:
+        Tuple of (advice sorted by weight, number of queries that could not
+        be planned)
+    """
+    rows = table_rows(conn)
+    indexed = existing_indexes(conn)
+    ordered = table_order(conn)
+    point: Dict[Tuple[str, str], int] = defaultdict(int)
+    ranged: Dict[Tuple[str, str], int] = defaultdict(int)
+    failed = 0
+
+    for sql, weight in queries:
+        try:
+            plan = json.loads(conn.execute(f"EXPLAIN (FORMAT JSON) {sql}").fetchall()[0][1])
+        except Exception:
+            failed += 1
+            continue
+        found: List[Tuple[str, str, str]] = []
+        for root in plan if isinstance(plan, list) else [plan]:
+            _scan_filters(root, found)
+        # A BETWEEN arrives as two range filters on the same column
+        for table, column, is_point in {(t, c, op in ("=", "IN")) for t, c, op in found}:
+            (point if is_point else ranged)[(table, column)] += weight
+
+    advice = []
+    sort_weights: Dict[str, Dict[str, int]] = defaultdict(dict)
+    for (table, column), weight in point.items():
+        if rows.get(table, 0) < min_rows:
+            continue
+        if table.startswith(BRICK_PREFIX):
+            sort_weights[table][column] = sort_weights[table].get(column, 0) + weight
+        elif (table, column) not in indexed:
+            advice.append(Advice("index", table, column, weight, rows[table]))
+    for (table, column), weight in ranged.items():
+        if rows.get(table, 0) >= min_rows:
+            sort_weights[table][column] = sort_weights[table].get(column, 0) + weight
+    for table, weights in sort_weights.items():
+        column, weight = max(weights.items(), key=lambda item: (item[1], item[0]))
+        if ordered.get(table) != column:
+            advice.append(Advice("sort", table, column, weight, rows[table]))
+
+    advice.sort(key=lambda a: (-a.queries, a.table, a.column))
+    return advice, failed
@@ -10,12 +10,15 @@ Provides comprehensive validation infrastructure including:
 """
 
 from dataclasses import dataclass, field
-from typing import Dict, List, Set, Optional, Any, Tuple
+from typing import TYPE_CHECKING, Dict, List, Set, Optional, Any, Tuple
 from enum import Enum
 from pathlib import Path
 import re
 import statistics
-from linkml_runtime.utils.schemaview import SchemaView
+
+if TYPE_CHECKING:
+    # Only for annotations; importing linkml_runtime costs ~0.5s at startup
+    from linkml_runtime.utils.schemaview import SchemaView
 
 
 class ValidationStatus(Enum):
@@ -73,6 +76,17 @@ class RecordValidationResult:
         """Number of warnings."""
         return sum(1 for r in self.results if r.status == ValidationStatus.WARNING)
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for JSON serialization."""
+        return {
+            'record_line': self.record_line,
+            'entity_id': self.entity_id,
+            'status': self.status.value,
+            'error_count': self.error_count,
+            'warning_count': self.warning_count,
+            'results': [vr.to_dict() for vr in self.results]
+        }
+
 
 @dataclass
 class FileValidationResult:
@@ -104,8 +118,8 @@ class FileValidationResult:
             return 0.0
         return self.pass_count / self.total_records
 
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for JSON serialization."""
+    def summary_dict(self) -> Dict[str, Any]:
+        """File-level counts and quality metrics, without the record results."""
         return {
             'filename': self.filename,
             'total_records': self.total_records,
@@ -113,30 +127,25 @@ class FileValidationResult:
             'warning_count': self.warning_count,
             'error_count': self.error_count,
             'pass_rate': self.pass_rate,
-            'record_results': [
-                {
-                    'record_line': r.record_line,
-                    'entity_id': r.entity_id,
-                    'status': r.status.value,
-                    'error_count': r.error_count,
-                    'warning_count': r.warning_count,
-                    'results': [vr.to_dict() for vr in r.results]
-                }
-                for r in self.record_results
-            ],
             'quality_metrics': self.quality_metrics
         }
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for JSON serialization."""
+        data = self.summary_dict()
+        data['record_results'] = [r.to_dict() for r in self.record_results]
+        return data
+
 
 class EnumValidator:
     """Validates enum field values against schema definitions."""
 
-    def __init__(self, schema: SchemaView):
+    def __init__(self, schema: 'SchemaView'):
         """
         Initialize enum validator.
 
         Args:
-            schema: LinkML schema view
+            schema: LinkML schema view (SchemaView or SchemaSnapshot)
         """
         self.schema = schema
         self._enum_cache: Dict[str, Set[str]] = {}
@@ -0,0 +1,170 @@
+"""
+Unit tests for brick sampling and estimation.
+
+Tests the brick_sampling.py module functionality including:
+- Sample query generation for each sampling method
+- Sampling metadata bookkeeping
+- Count, mean and quantile estimates with confidence intervals
+"""
+
+import pytest
+from pathlib import Path
+import sys
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts" / "cdm_analysis"))
+
+from brick_sampling import (
+    SAMPLE_METHODS,
+    WEIGHT_COLUMN,
+    build_sample_query,
+    calibrate_sample_weights,
+    record_sampling_metadata,
+    clear_sampling_metadata,
+    get_sampling_metadata,
+    estimate_count,
+    estimate_mean,
+    estimate_quantile,
+)
+
+duckdb = pytest.importorskip("duckdb")
+
+POPULATION_ROWS = 20_000
+SOURCE_SQL = "SELECT * FROM population"
+
+
+@pytest.fixture
+def conn():
+    """In-memory population with 4 unevenly sized strata."""
+    conn = duckdb.connect()
+    conn.execute(
+        f"""
+        CREATE TABLE population AS
+        SELECT i AS id,
+               CASE WHEN i % 10 < 6 THEN 'A' WHEN i % 10 < 9 THEN 'B'
+                    WHEN i % 100 < 95 THEN 'C' ELSE 'D' END AS stratum,
+               (i % 1000) / 10.0 AS value
+        FROM range({POPULATION_ROWS}) t(i)
+        """
+    )
+    yield conn
+    conn.close()
+
+
+def load_sample(conn, method, sample_rows, strata_column=None):
+    """Load a sample of the population into 'sample' like the loader does."""
+    conn.execute(
+        "CREATE OR REPLACE TABLE sample AS " +
+        build_sample_query(SOURCE_SQL, method, sample_rows, POPULATION_ROWS,
+                           strata_column=strata_column, seed=7)
+    )
+    loaded = calibrate_sample_weights(conn, "sample", method, POPULATION_ROWS)
+    record_sampling_metadata(conn, "sample", method, POPULATION_ROWS, loaded,
+                             strata_column=strata_column, seed=7)
+    return loaded
+
+
+class TestBuildSampleQuery:
+    """Test sample query generation."""
+
+    @pytest.mark.parametrize("method", SAMPLE_METHODS)
+    def test_weights_sum_to_population(self, conn, method):
+        """Test every method produces weights that add up to the population."""
+        strata = "stratum" if method == "stratified" else None
+        loaded = load_sample(conn, method, 2_000, strata_column=strata)
+
+        assert loaded > 0
+        total_weight = conn.execute(f"SELECT SUM({WEIGHT_COLUMN}) FROM sample").fetchone()[0]
+        assert total_weight == pytest.approx(POPULATION_ROWS)
+
+    def test_stratified_keeps_every_stratum(self, conn):
+        """Test stratified sampling keeps small strata represented."""
+        load_sample(conn, "stratified", 100, strata_column="stratum")
+
+        strata = {row[0] for row in conn.execute("SELECT DISTINCT stratum FROM sample").fetchall()}
+        assert strata == {"A", "B", "C", "D"}
+
+    def test_stratified_requires_column(self):
+        """Test stratified sampling without a strata column is rejected."""
+        with pytest.raises(ValueError):
+            build_sample_query(SOURCE_SQL, "stratified", 100, POPULATION_ROWS)
+
+    def test_unknown_method(self):
+        """Test unknown sampling methods are rejected."""
+        with pytest.raises(ValueError):
+            build_sample_query(SOURCE_SQL, "systematic", 100, POPULATION_ROWS)
+
+    def test_sample_is_reproducible(self, conn):
+        """Test the same seed draws the same reservoir sample."""
+        load_sample(conn, "reservoir", 500)
+        first = conn.execute("SELECT id FROM sample ORDER BY id").fetchall()
+        load_sample(conn, "reservoir", 500)
+        second = conn.execute("SELECT id FROM sample ORDER BY id").fetchall()
+        assert first == second
+
+
+class TestSamplingMetadata:
+    """Test sampling metadata bookkeeping."""
+
+    def test_record_and_clear(self, conn):
+        """Test metadata is recorded, replaced and cleared."""
+        load_sample(conn, "reservoir", 500)
+        load_sample(conn, "stratified", 800, strata_column="stratum")
+
+        metadata = get_sampling_metadata(conn, "sample")
+        assert metadata['method'] == "stratified"
+        assert metadata['population_rows'] == POPULATION_ROWS
+        assert metadata['strata_column'] == "stratum"
+
+        clear_sampling_metadata(conn, "sample")
+        assert get_sampling_metadata(conn, "sample") is None
+
+    def test_missing_table(self, conn):
+        """Test tables without a recorded design are treated as a census."""
+        assert get_sampling_metadata(conn, "population") is None
+
+
+class TestEstimates:
+    """Test estimates from sampled and full tables."""
+
+    def test_census_is_exact(self, conn):
+        """Test estimates on an unsampled table are exact with zero error."""
+        result = estimate_count(conn, "population", where="stratum = 'B'")
+        assert result.estimate == 6_000
+        assert result.std_error == 0
+
+        mean = estimate_mean(conn, "population", "value")
+        assert mean.estimate == pytest.approx(49.95)
+        assert mean.std_error == pytest.approx(0)
+
+    @pytest.mark.parametrize("method,strata", [
+        ("reservoir", None),
+        ("bernoulli", None),
+        ("stratified", "stratum"),
+    ])
+    def test_interval_covers_truth(self, conn, method, strata):
+        """Test sampled count and mean intervals cover the true values."""
+        load_sample(conn, method, 4_000, strata_column=strata)
+
+        count = estimate_count(conn, "sample", where="value < 25", confidence=0.999)
+        assert count.ci_low <= 5_000 <= count.ci_high
+        assert count.std_error > 0
+
+        mean = estimate_mean(conn, "sample", "value", confidence=0.999)
+        assert mean.ci_low <= 49.95 <= mean.ci_high
+
+    def test_stratum_count_is_exact(self, conn):
+        """Test counting a whole stratum in a stratified sample is exact."""
+        load_sample(conn, "stratified", 1_000, strata_column="stratum")
+
+        result = estimate_count(conn, "sample", where="stratum = 'D'")
+        assert result.estimate == pytest.approx(200)
+        assert result.std_error == pytest.approx(0)
+
+    def test_quantile(self, conn):
+        """Test sampled median interval covers the true median."""
+        load_sample(conn, "stratified", 4_000, strata_column="stratum")
+
+        result = estimate_quantile(conn, "sample", "value", q=0.5, confidence=0.999)
+        assert result.ci_low <= 49.95 <= result.ci_high
+        assert result.to_dict()['statistic'].startswith("quantile")
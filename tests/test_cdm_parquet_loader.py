@@ -25,6 +25,10 @@ from load_cdm_parquet_to_store import (
     add_computed_fields,
     get_parquet_row_count,
     read_parquet_data,
+    get_parquet_dictionary_columns,
+    detect_low_cardinality_columns,
+    encode_low_cardinality_columns,
+    encode_shared_label_columns,
     TABLE_TO_CLASS,
 )
 
@@ -444,5 +448,134 @@ class TestFieldPreservation:
         assert result["depth"] == 10.5
 
 
+
+class TestEnumEncoding:
+    """Test dictionary/ENUM encoding of low-cardinality columns."""
+
+    def _write_brick(self, tmpdir: str) -> Path:
+        table_dir = Path(tmpdir) / "ddt_brick0000001"
+        table_dir.mkdir()
+        n = 5000
+        df = pd.DataFrame(
+            {
+                "sdt_sample_name": [f"Sample{i % 20}" for i in range(n)],
+                "molecule_from_list_sys_oterm_id": [f"CHEBI:{i % 7}" for i in range(n)],
+                "comment": [f"free text {i}" for i in range(n)],
+                "concentration_micromolar": [i * 0.5 for i in range(n)],
+            }
+        )
+        df.to_parquet(table_dir / "part-00000.parquet")
+        return table_dir
+
+    def test_dictionary_columns_from_footer(self):
+        """Test that dictionary-encoded string columns are found in footers."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            table_dir = self._write_brick(tmpdir)
+            columns = get_parquet_dictionary_columns(table_dir)
+            assert "sdt_sample_name" in columns
+            assert "molecule_from_list_sys_oterm_id" in columns
+
+    def test_detect_and_encode(self):
+        """Test that repeated labels become ENUMs and unique text stays VARCHAR."""
+        duckdb = pytest.importorskip("duckdb")
+        with tempfile.TemporaryDirectory() as tmpdir:
+            table_dir = self._write_brick(tmpdir)
+            conn = duckdb.connect()
+            conn.execute(
+                f"CREATE TABLE ddt_brick0000001 AS "
+                f"SELECT * FROM read_parquet('{table_dir}/*.parquet')"
+            )
+
+            detected = detect_low_cardinality_columns(conn, "ddt_brick0000001", table_dir)
+            assert set(detected) == {"sdt_sample_name", "molecule_from_list_sys_oterm_id"}
+
+            encoded = encode_low_cardinality_columns(conn, "ddt_brick0000001", list(detected))
+            assert set(encoded) == set(detected)
+
+            types = {row[0]: row[1] for row in conn.execute("DESCRIBE ddt_brick0000001").fetchall()}
+            assert types["sdt_sample_name"].startswith("ENUM")
+            assert types["comment"] == "VARCHAR"
+
+            # String literals still filter ENUM columns transparently
+            count = conn.execute(
+                "SELECT COUNT(*) FROM ddt_brick0000001 "
+                "WHERE molecule_from_list_sys_oterm_id = 'CHEBI:3'"
+            ).fetchone()[0]
+            assert count == len([i for i in range(5000) if i % 7 == 3])
+
+            # Re-encoding (reload) replaces the existing types
+            conn.execute(
+                f"CREATE OR REPLACE TABLE ddt_brick0000001 AS "
+                f"SELECT * FROM read_parquet('{table_dir}/*.parquet')"
+            )
+            assert encode_low_cardinality_columns(conn, "ddt_brick0000001", ["sdt_sample_name"])
+
+    def test_all_null_columns_not_encoded(self):
+        """Test that all-NULL columns stay VARCHAR instead of becoming an empty, unindexable ENUM."""
+        duckdb = pytest.importorskip("duckdb")
+        conn = duckdb.connect()
+        conn.execute(
+            "CREATE TABLE sys_process_input AS SELECT 'Process' || (range % 10) AS sys_process_name, "
+            "NULL::VARCHAR AS sdt_strain_name FROM range(1000)"
+        )
+        assert list(detect_low_cardinality_columns(conn, "sys_process_input")) == ["sys_process_name"]
+        assert encode_low_cardinality_columns(
+            conn, "sys_process_input", ["sys_process_name", "sdt_strain_name"]) == ["sys_process_name"]
+        types = dict(conn.execute("SELECT column_name, data_type FROM duckdb_columns() "
+                                  "WHERE table_name = 'sys_process_input'").fetchall())
+        assert types["sdt_strain_name"] == "VARCHAR"
+        conn.execute("CREATE INDEX idx_strain ON sys_process_input(sdt_strain_name)")
+
+    def test_shared_join_key_enum(self):
+        """Test that join keys of different tables share one ENUM and join on codes."""
+        duckdb = pytest.importorskip("duckdb")
+        with tempfile.TemporaryDirectory() as tmpdir:
+            table_dir = self._write_brick(tmpdir)
+            conn = duckdb.connect()
+            conn.execute(
+                f"CREATE TABLE ddt_brick0000001 AS "
+                f"SELECT * FROM read_parquet('{table_dir}/*.parquet')"
+            )
+            conn.execute(
+                "CREATE TABLE sys_oterm AS SELECT 'CHEBI:' || range AS sys_oterm_id, "
+                "'term ' || range AS sys_oterm_name FROM range(10)"
+            )
+            conn.execute(
+                "CREATE TABLE sdt_sample AS SELECT 'Sample' || range AS sdt_sample_name, "
+                "'free text' AS comment FROM range(30)"
+            )
+
+            detected = detect_low_cardinality_columns(conn, "ddt_brick0000001", table_dir)
+            encoded = encode_shared_label_columns(conn, {"ddt_brick0000001": list(detected)})
+            assert encoded == {
+                "ddt_brick0000001": ["sdt_sample_name", "molecule_from_list_sys_oterm_id"],
+                "sdt_sample": ["sdt_sample_name"],
+                "sys_oterm": ["sys_oterm_id"],
+            }
+
+            def column_type(table, column):
+                return conn.execute(
+                    f"SELECT data_type FROM duckdb_columns() "
+                    f"WHERE table_name = '{table}' AND column_name = '{column}'"
+                ).fetchone()[0]
+
+            shared = column_type("sys_oterm", "sys_oterm_id")
+            assert shared.startswith("ENUM") and "'Sample29'" in shared
+            assert column_type("ddt_brick0000001", "molecule_from_list_sys_oterm_id") == shared
+            assert column_type("sys_oterm", "sys_oterm_name") == "VARCHAR"
+
+            # Same ENUM on both sides: the join compares codes without casts
+            join = (
+                "SELECT COUNT(*) FROM ddt_brick0000001 b "
+                "JOIN sys_oterm t ON b.molecule_from_list_sys_oterm_id = t.sys_oterm_id"
+            )
+            plan = conn.execute(f"EXPLAIN {join}").fetchall()[0][1]
+            assert "CAST" not in plan
+            assert conn.execute(join).fetchone()[0] == 5000
+            assert conn.execute(
+                "SELECT COUNT(*) FROM ddt_brick0000001 WHERE sdt_sample_name = 'Sample3'"
+            ).fetchone()[0] == 250
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -4,10 +4,13 @@ Integration tests for CDM store loader and query interface.
 These tests verify end-to-end functionality of loading CDM parquet data
 into linkml-store and querying it.
 
-Tests require the CDM database to be available at:
-/Users/marcin/Documents/VIMSS/ENIGMA/KBase/ENIGMA_in_CDM/minio/jmc_coral.db
+Tests run against the CDM database at $CDM_DB_PATH (default:
+/Users/marcin/Documents/VIMSS/ENIGMA/KBase/ENIGMA_in_CDM/minio/jmc_coral.db).
+When it is not available, a small synthetic CDM (synthetic_cdm.py) is
+generated instead.
 """
 
+import os
 import pytest
 import tempfile
 import pandas as pd
@@ -25,16 +28,32 @@ from load_cdm_parquet_to_store import (
     CDM_SCHEMA,
 )
 from query_cdm_store import CDMStoreQuery
+from synthetic_cdm import generate_cdm
 
 
-# Check if CDM database is available
-CDM_DB_PATH = Path(
+# Real CDM database, if available
+CDM_DB_PATH = Path(os.environ.get(
+    "CDM_DB_PATH",
     "/Users/marcin/Documents/VIMSS/ENIGMA/KBase/ENIGMA_in_CDM/minio/jmc_coral.db"
-)
-HAS_CDM_DB = CDM_DB_PATH.exists()
+))
+
+
+@pytest.fixture(scope="session")
+def cdm_db_path(tmp_path_factory):
+    """The CDM database, or a small synthetic CDM so the integration tests run anywhere."""
+    if CDM_DB_PATH.exists():
+        return CDM_DB_PATH
+    db_path = tmp_path_factory.mktemp("synthetic_cdm") / "enigma_coral.db"
+    generate_cdm(db_path, scale=0.1, bricks=1, brick_rows=1000)
+    return db_path
+
+
+@pytest.fixture(autouse=True)
+def isolated_result_cache(tmp_path, monkeypatch):
+    """Keep cached query results of the temporary stores out of ~/.cache/linkml-coral."""
+    monkeypatch.setenv("CDM_RESULT_CACHE_DIR", str(tmp_path / "results"))
 
 
-@pytest.mark.skipif(not HAS_CDM_DB, reason="CDM database not available")
 class TestCDMParquetLoading:
     """Integration tests for loading CDM parquet data."""
 
@@ -49,11 +68,11 @@ class TestCDMParquetLoading:
             assert schema_view is not None
             assert db_path.exists()
 
-    def test_load_small_table(self):
+    def test_load_small_table(self, cdm_db_path):
         """Test loading a small CDM table (Protocol)."""
         with tempfile.TemporaryDirectory() as tmpdir:
             db_path = Path(tmpdir) / "test.db"
-            protocol_table = CDM_DB_PATH / "sdt_protocol"
+            protocol_table = cdm_db_path / "sdt_protocol"
 
             if not protocol_table.exists():
                 pytest.skip("Protocol table not found")
@@ -70,12 +89,12 @@ class TestCDMParquetLoading:
             assert count <= 100  # Small table
 
             # Verify collection exists
-            collections = db.list_collections()
-            assert "Protocol" in collections
+            collections = db.list_collection_names()
+            assert "sdt_protocol" in collections
 
             # Verify data
-            collection = db.get_collection("Protocol")
-            records = list(collection.find(limit=10))
+            collection = db.get_collection("sdt_protocol")
+            records = collection.find(limit=10).rows
             assert len(records) > 0
 
             # Check fields
@@ -83,11 +102,11 @@ class TestCDMParquetLoading:
             assert "sdt_protocol_id" in first_record
             assert "sdt_protocol_name" in first_record
 
-    def test_load_medium_table_with_computed_fields(self):
+    def test_load_medium_table_with_computed_fields(self, cdm_db_path):
         """Test loading reads table with computed fields."""
         with tempfile.TemporaryDirectory() as tmpdir:
             db_path = Path(tmpdir) / "test.db"
-            reads_table = CDM_DB_PATH / "sdt_reads"
+            reads_table = cdm_db_path / "sdt_reads"
 
             if not reads_table.exists():
                 pytest.skip("Reads table not found")
@@ -103,8 +122,8 @@ class TestCDMParquetLoading:
             assert count > 0
 
             # Verify computed fields
-            collection = db.get_collection("Reads")
-            records = list(collection.find(limit=10))
+            collection = db.get_collection("sdt_reads")
+            records = collection.find(limit=10).rows
 
             # Check for computed field
             has_category = any("read_count_category" in r for r in records)
@@ -118,11 +137,11 @@ class TestCDMParquetLoading:
                 valid_categories = {"very_high", "high", "medium", "low"}
                 assert categories.issubset(valid_categories)
 
-    def test_load_system_table(self):
+    def test_load_system_table(self, cdm_db_path):
         """Test loading a system table (sys_oterm)."""
         with tempfile.TemporaryDirectory() as tmpdir:
             db_path = Path(tmpdir) / "test.db"
-            oterm_table = CDM_DB_PATH / "sys_oterm"
+            oterm_table = cdm_db_path / "sys_oterm"
 
             if not oterm_table.exists():
                 pytest.skip("sys_oterm table not found")
@@ -144,14 +163,14 @@ class TestCDMParquetLoading:
             assert count > 0
 
             # Verify structure
-            collection = db.get_collection("SystemOntologyTerm")
-            records = list(collection.find(limit=10))
+            collection = db.get_collection("sys_oterm")
+            records = collection.find(limit=10).rows
 
             first_term = records[0]
             assert "sys_oterm_id" in first_term
             assert "sys_oterm_name" in first_term
 
-    def test_load_multiple_tables(self):
+    def test_load_multiple_tables(self, cdm_db_path):
         """Test loading multiple tables at once."""
         with tempfile.TemporaryDirectory() as tmpdir:
             db_path = Path(tmpdir) / "test.db"
@@ -161,7 +180,7 @@ class TestCDMParquetLoading:
 
             # Load subset of tables
             results = load_all_cdm_parquet(
-                CDM_DB_PATH,
+                cdm_db_path,
                 db,
                 schema_view,
                 include_system=False,
@@ -179,12 +198,11 @@ class TestCDMParquetLoading:
             assert len(collections) > 0
 
 
-@pytest.mark.skipif(not HAS_CDM_DB, reason="CDM database not available")
 class TestCDMStoreQuery:
     """Integration tests for querying CDM store."""
 
     @pytest.fixture
-    def test_db(self):
+    def test_db(self, cdm_db_path):
         """Create a test database with sample data."""
         with tempfile.TemporaryDirectory() as tmpdir:
             db_path = Path(tmpdir) / "test.db"
@@ -193,19 +211,19 @@ class TestCDMStoreQuery:
             client, db, schema_view = create_store(str(db_path), CDM_SCHEMA)
 
             # Load small tables for testing
-            protocol_table = CDM_DB_PATH / "sdt_protocol"
+            protocol_table = cdm_db_path / "sdt_protocol"
             if protocol_table.exists():
                 load_parquet_collection(
                     protocol_table, "sdt_protocol", "Protocol", db, schema_view, verbose=False
                 )
 
-            location_table = CDM_DB_PATH / "sdt_location"
+            location_table = cdm_db_path / "sdt_location"
             if location_table.exists():
                 load_parquet_collection(
                     location_table, "sdt_location", "Location", db, schema_view, verbose=False
                 )
 
-            sample_table = CDM_DB_PATH / "sdt_sample"
+            sample_table = cdm_db_path / "sdt_sample"
             if sample_table.exists():
                 load_parquet_collection(
                     sample_table,
@@ -217,7 +235,7 @@ class TestCDMStoreQuery:
                     verbose=False,
                 )
 
-            oterm_table = CDM_DB_PATH / "sys_oterm"
+            oterm_table = cdm_db_path / "sys_oterm"
             if oterm_table.exists():
                 load_parquet_collection(
                     oterm_table,
@@ -254,8 +272,8 @@ class TestCDMStoreQuery:
 
         # Get a location first
         try:
-            location_coll = query.get_collection("Location")
-            locations = list(location_coll.find(limit=1))
+            location_coll = query.get_collection("sdt_location")
+            locations = location_coll.find(limit=1).rows
 
             if locations:
                 location_name = locations[0].get("sdt_location_name")
@@ -302,7 +320,7 @@ class TestCDMStoreQuery:
 
         # Should be able to get loaded collections
         try:
-            collection = query.get_collection("Protocol")
+            collection = query.get_collection("sdt_protocol")
             assert collection is not None
         except ValueError:
             pytest.skip("Protocol collection not loaded")
@@ -0,0 +1,171 @@
+"""
+Unit tests for HTML data dictionary generation.
+
+Tests the generate_data_dictionary.py HTML output including:
+- A light index page with per-table fragments loaded on demand
+- The prebuilt prefix/trigram search index and the page's search over it
+"""
+
+import json
+import re
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts" / "cdm_analysis"))
+
+from metadata_catalog import MetadataCatalog, write_catalog_parquet
+from generate_data_dictionary import (
+    DICTIONARY_ASSETS,
+    SEARCH_SNIPPET_CHARS,
+    build_search_index,
+    generate_html_dictionary,
+    get_html_script,
+)
+
+pytest.importorskip("duckdb")
+
+NUM_BRICKS = 40
+BRICK_COLUMNS = 50
+LONG_DESCRIPTION = "Property of an ontology term. " * 8 + "Flag set when is_valid_property holds."
+
+# Just enough DOM for the page script to initialise under node
+NODE_HARNESS = """
+const element = {addEventListener() {}};
+const document = {getElementById: () => element, getElementsByClassName: () => []};
+%(script)s
+%(index)s
+console.log(JSON.stringify(%(queries)s.map(query => cdmDictionary.search(query))));
+"""
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    """Catalogs with a static table and many wide brick tables."""
+    tables = [{'table_name': 'sdt_sample', 'table_category': 'static', 'total_rows': 10,
+               'num_columns': 2, 'description': 'static table with 2 columns'}]
+    columns = [
+        {'table_name': 'sdt_sample', 'table_category': 'static', 'column_name': 'sdt_sample_id',
+         'column_type': 'string', 'description': 'Sample <b>ID</b>', 'microtype': 'ME:0000267',
+         'is_primary_key': True},
+        {'table_name': 'sdt_sample', 'table_category': 'static', 'column_name': 'depth_meter',
+         'column_type': 'double', 'description': 'Depth below surface', 'microtype': 'ME:0000219'},
+        {'table_name': 'sys_oterm_properties', 'table_category': 'system', 'column_name': 'value',
+         'column_type': 'string', 'description': LONG_DESCRIPTION},
+    ]
+    for b in range(NUM_BRICKS):
+        name = f"ddt_brick{b:07d}"
+        tables.append({'table_name': name, 'table_category': 'dynamic', 'total_rows': 1000,
+                       'num_columns': BRICK_COLUMNS})
+        for c in range(BRICK_COLUMNS):
+            columns.append({'table_name': name, 'table_category': 'dynamic',
+                            'column_name': f"concentration_{c}_micromolar", 'column_type': 'double',
+                            'description': f"Concentration of molecule {c}", 'microtype': 'ME:0000129'})
+    write_catalog_parquet({'table_catalog': tables, 'column_catalog': columns}, tmp_path / "catalogs")
+    with MetadataCatalog.open(tmp_path / "catalogs") as opened:
+        yield opened
+
+
+def page_search(index, queries):
+    """Run the page's own search function over an index with node."""
+    harness = NODE_HARNESS % {
+        'script': get_html_script(),
+        'index': f"cdmDictionary.searchIndex({json.dumps(index)});",
+        'queries': json.dumps(queries),
+    }
+    result = subprocess.run(['node'], input=harness, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout)
+
+
+def decode(deltas):
+    """Undo the delta encoding of a posting list."""
+    ids, current = [], 0
+    for delta in deltas:
+        current += delta
+        ids.append(current)
+    return ids
+
+
+class TestDataDictionary:
+    """Test the lazy HTML dictionary and its search index."""
+
+    def test_page_and_fragments(self, catalog, tmp_path):
+        """Test the page lists tables only and each table's columns are a separate fragment."""
+        out = tmp_path / "docs"
+        page = generate_html_dictionary(catalog, out)
+        assert page == out / "cdm_data_dictionary.html"
+        html = page.read_text()
+
+        # One collapsed entry per table, no column rows inline
+        assert html.count("<details class='table-section'") == NUM_BRICKS + 1
+        assert "concentration_0_micromolar" not in html
+        assert "<tr id=" not in html
+
+        tables_dir = out / DICTIONARY_ASSETS / "tables"
+        fragments = sorted(p.stem for p in tables_dir.glob("*.js"))
+        assert len(fragments) == NUM_BRICKS + 1 and "sdt_sample" in fragments
+        script = (tables_dir / "sdt_sample.js").read_text()
+        match = re.fullmatch(r'cdmDictionary\.fragment\((".*?"), (".*")\);\n', script, re.S)
+        assert json.loads(match.group(1)) == "sdt_sample"
+        fragment = json.loads(match.group(2))
+        assert "<tr id='col-sdt_sample-depth_meter'>" in fragment
+        assert "Sample &lt;b&gt;ID&lt;/b&gt;" in fragment
+        assert 'badge-pk' in fragment
+
+        # Regenerating drops fragments of tables that are gone
+        (tables_dir / "ddt_brick9999999.js").write_text("")
+        generate_html_dictionary(catalog, out)
+        assert not (tables_dir / "ddt_brick9999999.js").exists()
+        assert (out / DICTIONARY_ASSETS / "search_index.js").read_text().startswith(
+            "cdmDictionary.searchIndex({")
+
+    def test_search_index(self, catalog):
+        """Test prefix and trigram posting lists find tables, columns and microtypes."""
+        index = build_search_index(catalog)
+        docs = index['docs']
+        assert len(docs) == (NUM_BRICKS + 1) + 3 + NUM_BRICKS * BRICK_COLUMNS
+        assert len(index['terms']) == len(docs)
+        assert docs[0][:2] == ['ddt_brick0000000', '']
+        # Documents keep a snippet; their tokens cover the full description
+        long_doc = next(i for i, doc in enumerate(docs) if doc[0] == 'sys_oterm_properties')
+        assert docs[long_doc][3] == LONG_DESCRIPTION[:SEARCH_SNIPPET_CHARS]
+        assert 'property' in index['terms'][long_doc].split()
+
+        def lookup(term):
+            """The page's lookup: prefix list for short terms, trigram intersection otherwise."""
+            if len(term) < 3:
+                return set(decode(index['keys'].get('^' + term, [])))
+            ids = None
+            for i in range(len(term) - 2):
+                found = set(decode(index['keys'].get(term[i:i + 3], [])))
+                ids = found if ids is None else ids & found
+            return {i for i in ids if term in index['terms'][i]}
+
+        depth = lookup('depth')
+        assert [docs[i][:2] for i in depth] == [['sdt_sample', 'depth_meter']]
+        # Microtype CURIEs are split into tokens that are both indexed
+        hits = lookup('0000129') & lookup('me')
+        assert len(hits) == NUM_BRICKS * BRICK_COLUMNS
+        assert {docs[i][0] for i in lookup('sa')} == {'sdt_sample'}
+        assert lookup('zzz') == set()
+
+        # Posting lists are sorted and delta-encoded
+        ids = decode(index['keys']['^d'])
+        assert ids == sorted(ids) and all(d >= 0 for d in index['keys']['^d'])
+
+    @pytest.mark.skipif(shutil.which('node') is None, reason="node is not installed")
+    def test_page_search(self, catalog):
+        """Test the page's search finds words past the description snippet and drops false positives."""
+        index = build_search_index(catalog)
+        docs = index['docs']
+        found = page_search(index, ['is_valid_property', 'depth meter', 'depthmeter', 'sa', 'zzz', ''])
+        assert [docs[i][:2] for i in found[0]] == [['sys_oterm_properties', 'value']]
+        assert [docs[i][:2] for i in found[1]] == [['sdt_sample', 'depth_meter']]
+        # All trigrams of "depthmeter" but "hme" are indexed for depth_meter
+        assert found[2] == []
+        assert {docs[i][0] for i in found[3]} == {'sdt_sample'}
+        assert found[4] == [] and found[5] is None
@@ -0,0 +1,111 @@
+"""
+Unit tests for database fingerprints in query provenance.
+
+Tests the db_fingerprint.py module functionality including:
+- Full and sampled hashes and their per-(path, size, mtime) cache
+- Fast fingerprints from file stats and the load manifest
+- Background full hashes recorded by QueryProvenanceTracker
+"""
+
+import hashlib
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from db_fingerprint import (
+    Fingerprint,
+    FingerprintCache,
+    PendingFingerprint,
+    compute_fingerprint,
+    hash_sampled,
+    sample_offsets,
+    start_fingerprint,
+)
+from query_provenance_tracker import QueryProvenanceTracker
+
+
+@pytest.fixture
+def workdir():
+    """Temporary directory holding a database file and a fingerprint cache."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmpdir = Path(tmpdir)
+        (tmpdir / "store.db").write_bytes(os.urandom(300_000))
+        yield tmpdir
+
+
+class TestFingerprints:
+    """Test fingerprint modes and caching."""
+
+    def test_full_hash_cached(self, workdir):
+        """Test a full fingerprint is the file's SHA-256 and is only computed once."""
+        db_path = workdir / "store.db"
+        cache = FingerprintCache(workdir / "cache", enabled=True)
+
+        first = compute_fingerprint(db_path, "full", cache)
+        assert first.digest == hashlib.sha256(db_path.read_bytes()).hexdigest()
+        assert not first.cached
+
+        second = compute_fingerprint(db_path, "full", cache)
+        assert second.cached and second.digest == first.digest
+
+        # A reload (new size/mtime) is hashed again
+        db_path.write_bytes(os.urandom(1000))
+        third = compute_fingerprint(db_path, "full", cache)
+        assert not third.cached and third.digest != first.digest
+        assert compute_fingerprint(workdir / "missing.db", "full", cache) is None
+
+    def test_sampled_and_fast(self, workdir):
+        """Test sampled blocks cover the file's ends and fast fingerprints use the manifest."""
+        db_path = workdir / "store.db"
+        offsets = sample_offsets(300_000, blocks=4, block_size=1000)
+        assert offsets[0] == 0 and offsets[-1] == 299_000 and len(offsets) == 4
+
+        digest = hash_sampled(db_path, blocks=4, block_size=1000)
+        data = bytearray(db_path.read_bytes())
+        data[150_000] ^= 0xFF  # Between sampled blocks
+        db_path.write_bytes(bytes(data))
+        assert hash_sampled(db_path, blocks=4, block_size=1000) == digest
+        data[-1] ^= 0xFF  # Inside the last block
+        db_path.write_bytes(bytes(data))
+        assert hash_sampled(db_path, blocks=4, block_size=1000) != digest
+
+        # Files smaller than the sample are hashed in full
+        cache = FingerprintCache(workdir / "cache", enabled=True)
+        sampled = compute_fingerprint(db_path, "sampled", cache)
+        assert sampled.digest == hashlib.sha256(db_path.read_bytes()).hexdigest()
+
+        fast = compute_fingerprint(db_path, "fast", cache)
+        assert fast.load_id is None
+        (workdir / "store.db.manifest.json").write_text(json.dumps({"load_id": "load-42"}))
+        reloaded = compute_fingerprint(db_path, "fast", cache)
+        assert reloaded.load_id == "load-42" and reloaded.digest != fast.digest
+        with pytest.raises(ValueError, match="Unknown fingerprint mode"):
+            compute_fingerprint(db_path, "md5", cache)
+
+    def test_tracker_background_full_hash(self, workdir, monkeypatch):
+        """Test the tracker hashes in the background and records the fingerprint."""
+        monkeypatch.setenv("CDM_FINGERPRINT_CACHE_DIR", str(workdir / "cache"))
+        monkeypatch.setenv("CDM_FINGERPRINT_CACHE", "on")
+        db_path = workdir / "store.db"
+
+        pending = start_fingerprint(db_path, "full")
+        assert isinstance(pending, PendingFingerprint)
+        assert pending.result(timeout=30).digest == hashlib.sha256(db_path.read_bytes()).hexdigest()
+        assert isinstance(start_fingerprint(db_path, "full"), Fingerprint)  # Now cached
+
+        tracker = QueryProvenanceTracker(str(db_path), str(workdir / "prov"), fingerprint_mode="full")
+        execution_id = tracker.start_query("unused_reads", {"min_count": 1})
+        tracker.end_query({"total": 0})
+
+        metadata = QueryProvenanceTracker.load_provenance(execution_id, str(workdir / "prov"))
+        assert metadata["database"]["checksum"] == hashlib.sha256(db_path.read_bytes()).hexdigest()
+        assert metadata["database"]["fingerprint"]["mode"] == "full"
+        report = QueryProvenanceTracker.generate_provenance_report(execution_id, str(workdir / "prov"))
+        assert "Fingerprint:     full (cached)" in report
@@ -0,0 +1,90 @@
+"""
+Unit tests for hot-path instrumentation spans.
+
+Tests the instrumentation.py module functionality including:
+- Nested spans with timing, rows/bytes and errors in JSON Lines traces
+- Chrome trace files shared by several processes
+- DuckDB profiles attached to spans
+"""
+
+import json
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from linkml_coral.utils.instrumentation import Tracer, read_trace, summarize_trace
+
+
+@pytest.fixture
+def tmpdir():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield Path(tmpdir)
+
+
+class TestSpans:
+    """Test span recording and trace formats."""
+
+    def test_nested_spans_jsonl(self, tmpdir):
+        """Test nested spans record parents, counts and errors."""
+        tracer = Tracer(tmpdir / "trace.jsonl", truncate=True)
+        with tracer.span("table_load", category="load", table="sdt_sample") as load:
+            for chunk in range(2):
+                with tracer.span("load_chunk", category="load", chunk=chunk) as chunk_span:
+                    chunk_span.add(rows=50, bytes=1000)
+            load.add(rows=100)
+        with pytest.raises(ValueError):
+            with tracer.span("validation_chunk", category="validate"):
+                raise ValueError("bad row")
+        tracer.close()
+
+        records = read_trace(tmpdir / "trace.jsonl")
+        assert [r["name"] for r in records] == ["load_chunk", "load_chunk", "table_load", "validation_chunk"]
+        chunk = records[0]
+        assert chunk["parent"] == "table_load" and chunk["depth"] == 1
+        assert chunk["rows"] == 50 and chunk["bytes"] == 1000 and chunk["attrs"] == {"chunk": 0}
+        assert chunk["wall_s"] >= 0 and chunk["cpu_s"] >= 0
+        assert records[2]["attrs"] == {"table": "sdt_sample"} and records[2]["parent"] is None
+        assert records[3]["error"] == "ValueError: bad row"
+
+        summary = {s["name"]: s for s in summarize_trace(records)}
+        assert summary["load_chunk"]["count"] == 2 and summary["load_chunk"]["rows"] == 100
+
+        # Disabled tracers measure nothing and write nothing
+        disabled = Tracer()
+        with disabled.span("query") as query:
+            query.add(rows=1)
+        assert not disabled.enabled and query.start == 0.0
+
+    def test_chrome_trace_shared_by_processes(self, tmpdir):
+        """Test Chrome trace events from several tracers append to one valid file."""
+        path = tmpdir / "trace.json"
+        with Tracer(path, truncate=True).span("validate_table", category="validate"):
+            pass
+        # A subprocess inheriting CDM_TRACE appends rather than truncating
+        with Tracer(path).span("validation_chunk", category="validate") as chunk:
+            chunk.add(rows=10)
+
+        events = json.loads(path.read_text() + "]")
+        assert [e["ph"] for e in events] == ["X", "X"]
+        assert events[1]["args"]["rows"] == 10 and events[1]["dur"] >= 0
+        assert [r["name"] for r in read_trace(path)] == ["validate_table", "validation_chunk"]
+
+    def test_duckdb_profile(self, tmpdir):
+        """Test spans given a connection record the DuckDB profile of their statement."""
+        duckdb = pytest.importorskip("duckdb")
+        conn = duckdb.connect()
+        tracer = Tracer(tmpdir / "trace.jsonl", profile_duckdb=True, truncate=True)
+
+        with tracer.span("load_chunk", conn=conn) as chunk:
+            conn.execute("CREATE TABLE t AS SELECT range AS i FROM range(10000)")
+            chunk.capture_profile()
+            conn.execute("SELECT count(*) FROM t").fetchone()
+        with tracer.span("query", conn=conn):
+            conn.execute("SELECT sum(i) FROM t WHERE i > 10").fetchall()
+
+        load, query = read_trace(tmpdir / "trace.jsonl")
+        assert load["duckdb"]["query"].startswith("CREATE TABLE t")
+        assert query["duckdb"]["cumulative_rows_scanned"] == 10000
+        assert query["duckdb"]["operators"] and "latency" in query["duckdb"]
+        conn.close()
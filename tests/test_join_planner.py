@@ -0,0 +1,142 @@
+"""
+Unit tests for the multi-hop join planner.
+
+Tests the join_planner.py module functionality including:
+- Join edges from schema foreign keys, CDM naming and provenance
+- Compiling entity paths with per-step filters
+- Never joining entities through shared ontology terms
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts" / "cdm_analysis"))
+
+duckdb = pytest.importorskip("duckdb")
+pytest.importorskip("pyarrow")
+
+from join_planner import JoinPlanner
+from linkml_coral.utils.schema_snapshot import load_schema_snapshot
+
+CDM_SCHEMA = Path(__file__).parent.parent / "src" / "linkml_coral" / "schema" / "cdm" / "linkml_coral_cdm.yaml"
+
+
+@pytest.fixture(scope="module")
+def snapshot():
+    """Snapshot of the CDM schema built in a temporary cache."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield load_schema_snapshot(CDM_SCHEMA, cache_dir=tmpdir)
+
+
+@pytest.fixture
+def conn():
+    """Store with two locations, samples, reads and assemblies linked by processes."""
+    conn = duckdb.connect()
+    conn.execute("""
+        CREATE TABLE sdt_location AS SELECT * FROM (VALUES ('Location1', 'L1'), ('Location2', 'L2'))
+            t(sdt_location_id, sdt_location_name)
+    """)
+    conn.execute("""
+        CREATE TABLE sdt_sample AS SELECT * FROM (VALUES
+            ('Sample1', 'S1', 'L1', 'ENVO:1'), ('Sample2', 'S2', 'L1', 'ENVO:1'), ('Sample3', 'S3', 'L2', 'ENVO:1'))
+            t(sdt_sample_id, sdt_sample_name, sdt_location_name, material_sys_oterm_id)
+    """)
+    conn.execute("""
+        CREATE TABLE sdt_reads AS SELECT * FROM (VALUES ('Reads1', 'R1', 'ENVO:1'), ('Reads3', 'R3', 'ENVO:1'))
+            t(sdt_reads_id, sdt_reads_name, read_type_sys_oterm_id)
+    """)
+    conn.execute("""
+        CREATE TABLE sdt_assembly AS SELECT * FROM (VALUES ('Assembly1', 'A1'))
+            t(sdt_assembly_id, sdt_assembly_name)
+    """)
+    conn.execute("CREATE TABLE sys_oterm AS SELECT 'ENVO:1' AS sys_oterm_id, 'soil' AS sys_oterm_name")
+    conn.execute("""
+        CREATE TABLE sys_process_input AS SELECT * FROM (VALUES
+            ('Process1', 'Sample1', NULL), ('Process3', 'Sample3', NULL), ('Process4', NULL, 'Reads1'))
+            t(sys_process_id, sdt_sample_id, sdt_reads_id)
+    """)
+    conn.execute("""
+        CREATE TABLE sys_process_output AS SELECT * FROM (VALUES
+            ('Process1', 'Reads1', NULL), ('Process3', 'Reads3', NULL), ('Process4', NULL, 'Assembly1'))
+            t(sys_process_id, sdt_reads_id, sdt_assembly_id)
+    """)
+    conn.execute("""
+        CREATE TABLE ddt_brick0000001 AS SELECT * FROM (VALUES ('S1', 1.5), ('S2', 2.5), ('S3', 3.5))
+            t(sdt_sample_name, value)
+    """)
+    yield conn
+    conn.close()
+
+
+class TestJoinPlanner:
+    """Test path planning and compilation."""
+
+    def test_location_samples_bricks(self, conn, snapshot):
+        """Test a filtered Location → Sample → brick path runs as one join."""
+        planner = JoinPlanner.from_connection(conn, snapshot)
+        assert planner.resolve("Sample") == "sdt_sample"
+        assert planner.referencing("sdt_sample") == ["ddt_brick0000001"]
+
+        table = planner.run(
+            conn, ["Location", "Sample", "ddt_brick0000001"],
+            filters={"Location": {"sdt_location_name": "L1"}},
+            columns={"Sample": ["sdt_sample_name"], "ddt_brick0000001": ["value"]},
+        )
+        rows = sorted(table.to_pylist(), key=lambda r: r["Sample.sdt_sample_name"])
+        assert [(r["Sample.sdt_sample_name"], r["ddt_brick0000001.value"]) for r in rows] == \
+            [("S1", 1.5), ("S2", 2.5)]
+        assert table.column_names[:2] == ["Location.sdt_location_id", "Location.sdt_location_name"]
+
+    def test_provenance_path(self, conn, snapshot):
+        """Test Sample → Reads → Assembly follows process inputs and outputs."""
+        planner = JoinPlanner.from_connection(conn, snapshot)
+        sql, params = planner.compile(
+            ["Sample", "Reads", "Assembly"],
+            filters={"Reads": {"sdt_reads_name": ["R1", "R3"]}, "Sample": {"sdt_sample_id": "Sample1"}},
+            join_type="LEFT",
+        )
+        assert "sys_process_input" in sql and "sys_process_output" in sql
+        # Step filters are bound in SQL text order: join conditions, then WHERE
+        assert params == ["R1", "R3", "Sample1"]
+
+        rows = conn.execute(sql, params).fetchall()
+        assert rows == [("Sample1", "S1", "Reads1", "R1", "Assembly1", "A1")]
+
+        # Walking the provenance backwards
+        table = planner.run(conn, ["Assembly", "Reads", "Sample"],
+                            columns={"Assembly": [], "Reads": [], "Sample": ["sdt_sample_name"]})
+        assert table.to_pylist() == [{"Sample.sdt_sample_name": "S1"}]
+
+    def test_provenance_prefers_input_to_output(self, conn, snapshot):
+        """Test Sample → Reads joins samples used as inputs when samples are also outputs."""
+        conn.execute("ALTER TABLE sys_process_output ADD COLUMN sdt_sample_id VARCHAR")
+        conn.execute("INSERT INTO sys_process_input VALUES ('Process5', NULL, 'Reads3')")
+        conn.execute("INSERT INTO sys_process_output VALUES ('Process5', NULL, NULL, 'Sample2')")
+        planner = JoinPlanner.from_connection(conn, snapshot)
+
+        edge, = planner.find_path("sdt_sample", "sdt_reads")
+        assert edge.kind == "process" and edge.forward
+        table = planner.run(conn, ["Sample", "Reads"],
+                            columns={"Sample": ["sdt_sample_name"], "Reads": ["sdt_reads_name"]})
+        rows = sorted((r["Sample.sdt_sample_name"], r["Reads.sdt_reads_name"]) for r in table.to_pylist())
+        assert rows == [("S1", "R1"), ("S3", "R3")]
+
+        # Reads → Sample likewise follows the process that used the reads
+        edge, = planner.find_path("sdt_reads", "sdt_sample")
+        assert edge.forward
+
+    def test_no_path_through_ontology_terms(self, conn, snapshot):
+        """Test entities sharing only an ontology term are not joined."""
+        conn.execute("DROP TABLE sys_process_output")
+        planner = JoinPlanner.from_connection(conn, snapshot)
+        with pytest.raises(ValueError, match="No join path"):
+            planner.compile(["Sample", "Reads"])
+        with pytest.raises(ValueError, match="Unknown column"):
+            planner.compile(["Sample"], filters={"Sample": {"sdt_sample_id; DROP TABLE x": 1}})
+        # An ontology term may still be a path step of its own
+        table = planner.run(conn, ["Sample", "sys_oterm"], filters={"Sample": {"sdt_sample_name": "S1"}})
+        assert table.num_rows == 1
@@ -0,0 +1,141 @@
+"""
+Unit tests for memory-budget-aware loading.
+
+Tests the memory_budget.py module and its use by the loader including:
+- Memory size parsing and the DuckDB settings derived from a budget
+- Slice sizes adapting to measured peak RSS and throughput
+- Sliced direct loads and adaptive pandas chunks matching the source parquet
+"""
+
+import sys
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts" / "cdm_analysis"))
+
+from memory_budget import (
+    MIN_SLICE_ROWS,
+    MemoryBudget,
+    SliceController,
+    parquet_footprint,
+    parse_memory_size,
+)
+from load_cdm_parquet_to_store import (
+    CDM_SCHEMA,
+    configure_memory_budget,
+    create_store,
+    get_duckdb_connection,
+    load_parquet_to_duckdb_direct,
+    read_parquet_chunked,
+    release_duckdb_connection,
+)
+
+duckdb = pytest.importorskip("duckdb")
+
+GiB = 1024 ** 3
+
+
+@pytest.fixture
+def brick_dir(tmp_path):
+    """A brick split over 3 parquet files with small row groups."""
+    brick = tmp_path / "ddt_brick0000001"
+    brick.mkdir()
+    for part in range(3):
+        first = part * 150_000
+        table = pa.table({
+            "sdt_sample_name": [f"Sample{(first + i) // 1000:04d}" for i in range(150_000)],
+            "value": pa.array([float(first + i) for i in range(150_000)], type=pa.float32()),
+        })
+        pq.write_table(table, brick / f"part-{part}.parquet", row_group_size=20_000)
+    return brick
+
+
+class TestMemoryBudget:
+    """Test budgets, DuckDB settings and slice control."""
+
+    def test_budget_settings(self, tmp_path):
+        """Test size parsing and the DuckDB settings a budget applies."""
+        assert parse_memory_size("48GB") == 48 * GiB
+        assert parse_memory_size("512 MiB") == 512 * 1024 ** 2
+        assert parse_memory_size("1.5g") == int(1.5 * GiB)
+        assert parse_memory_size("25%", total_bytes=64 * GiB) == 16 * GiB
+        for bad in ("lots", "0GB", "150%", "12XB"):
+            with pytest.raises(ValueError):
+                parse_memory_size(bad)
+
+        budget = MemoryBudget.from_option("10GB", temp_directory=str(tmp_path / "spill"),
+                                          preserve_insertion_order=False)
+        assert budget.duckdb_memory_limit == int(10 * GiB * 0.6)
+        assert 1 <= budget.threads <= 6
+        conn = duckdb.connect()
+        settings = budget.configure(conn)
+        assert settings["memory_limit"] == "6144MiB"
+        row = conn.execute(
+            "SELECT current_setting('memory_limit'), current_setting('threads'), "
+            "current_setting('preserve_insertion_order'), current_setting('temp_directory')"
+        ).fetchone()
+        assert row[0] in ("6.0 GiB", "6.0GiB") and row[1] == budget.threads
+        assert row[2] is False and row[3].endswith("spill")
+        assert MemoryBudget.from_option("auto").limit_bytes > 0
+
+        # One statement while the table fits, slices of about 1/8 of the budget otherwise
+        assert budget.fits_single_pass(2 * GiB) and not budget.fits_single_pass(4 * GiB)
+        assert budget.initial_slice_rows(100) == int(10 * GiB / 8 / 100)
+        assert budget.initial_slice_rows(1000, engine="pandas") == int(10 * GiB / 8 / 10_000)
+        assert budget.initial_slice_rows(10 ** 9) == MIN_SLICE_ROWS["duckdb"]
+
+    def test_slice_controller(self):
+        """Test slices shrink under memory pressure, grow with headroom, and undo slow growth."""
+        budget = MemoryBudget(limit_bytes=GiB, threads=1)
+        controller = SliceController(budget, bytes_per_row=100, rows=1_000_000)
+
+        # Headroom and steady throughput: grow
+        assert controller.record(1_000_000, 1.0, peak_rss=GiB // 4) == 1_500_000
+        # The bigger slice was slower per row: back to the previous size
+        assert controller.record(1_500_000, 3.0, peak_rss=GiB // 4) == 1_000_000
+        # Between the water marks: keep
+        assert controller.record(1_000_000, 1.0, peak_rss=int(GiB * 0.7)) == 1_000_000
+        # Over the high-water mark: halve, down to the minimum slice
+        assert controller.record(1_000_000, 1.0, peak_rss=int(GiB * 0.9)) == 500_000
+        for _ in range(10):
+            controller.record(controller.rows, 1.0, peak_rss=GiB)
+        assert controller.rows == MIN_SLICE_ROWS["duckdb"]
+        assert [h["action"] for h in controller.history[:4]] == ["grow", "undo", "keep", "shrink"]
+
+    def test_sliced_load_matches_parquet(self, brick_dir, tmp_path):
+        """Test a budget too small for one statement loads the same rows in slices."""
+        footprint = parquet_footprint(brick_dir)
+        assert footprint.rows == 450_000 and len(footprint.files) == 3
+        assert footprint.bytes_per_row >= footprint.uncompressed_bytes / footprint.rows
+
+        client, db, _ = create_store(str(tmp_path / "store.db"), CDM_SCHEMA)
+        budget = MemoryBudget(limit_bytes=16 * 1024 ** 2, threads=1)
+        assert not budget.fits_single_pass(footprint.rows * footprint.bytes_per_row)
+        configure_memory_budget(db, budget)
+
+        count = load_parquet_to_duckdb_direct(brick_dir, "ddt_brick0000001", "DynamicDataArray", db)
+        assert count == 450_000
+        conn = get_duckdb_connection(db)
+        assert conn.execute("SELECT current_setting('threads')").fetchone()[0] == 1
+        loaded = conn.execute(
+            "SELECT count(*), count(DISTINCT value), sum(value), typeof(any_value(value)) "
+            "FROM ddt_brick0000001"
+        ).fetchone()
+        assert loaded == (450_000, 450_000, sum(range(450_000)), "DOUBLE")
+        # Slices are inserted in file order
+        first = conn.execute("SELECT value FROM ddt_brick0000001 LIMIT 3").fetchall()
+        assert [v for (v,) in first] == [0.0, 1.0, 2.0]
+        release_duckdb_connection(db)
+
+        # Adaptive pandas chunks follow the current size and stop at max_rows
+        sizes = [5_000, 50_000, 200_000]
+        chunks = []
+        for chunk in read_parquet_chunked(brick_dir, chunk_size=lambda: sizes[min(len(chunks), 2)],
+                                          max_rows=300_000):
+            chunks.append(chunk)
+        assert [len(c) for c in chunks] == [5_000, 50_000, 200_000, 45_000]
+        assert chunks[-1]["value"].iloc[-1] == 299_999.0
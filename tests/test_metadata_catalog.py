@@ -0,0 +1,188 @@
+"""
+Unit tests for the columnar metadata catalogs.
+
+Tests the metadata_catalog.py module and its consumers including:
+- Parquet catalogs and the MetadataCatalog query API
+- Loading the catalogs into an indexed cdm_metadata schema of a store
+- Store indexes from the relationship catalog
+- Data dictionary generation from catalog queries and the JSON fallback
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts" / "cdm_analysis"))
+
+from metadata_catalog import (
+    CATALOG_TABLES,
+    MetadataCatalog,
+    load_catalog_into_duckdb,
+    write_catalog_parquet,
+)
+from create_metadata_catalog import (
+    create_column_catalog,
+    create_microtype_catalog,
+    create_relationship_catalog,
+    create_table_catalog,
+    create_validation_catalog,
+)
+from generate_data_dictionary import generate_markdown_dictionary
+
+duckdb = pytest.importorskip("duckdb")
+
+
+@pytest.fixture
+def catalogs():
+    """Catalogs built from a small static/system metadata set."""
+    metadata = {
+        'static': {
+            'sdt_sample': {
+                'total_rows': 10, 'num_columns': 3,
+                'columns': {
+                    'sdt_sample_id': {'type': 'string', 'pk': True, 'required': True,
+                                      'microtype': 'ME:0000267', 'description': 'Sample ID'},
+                    'depth': {'type': 'double', 'microtype': 'ME:0000219', 'units': 'UO:0000008',
+                              'description': 'Depth below surface', 'null_count': 2,
+                              'min': 0.5, 'max': 9.0},
+                    'sdt_location_name': {'type': 'string', 'fk': 'sdt_location.sdt_location_name',
+                                          'microtype': 'ME:0000228', 'description': 'Location'},
+                },
+            },
+            'sdt_location': {
+                'total_rows': 4, 'num_columns': 2,
+                'columns': {
+                    'sdt_location_name': {'type': 'string', 'upk': True, 'microtype': 'ME:0000228',
+                                          'constraint': '^[A-Z]', 'description': 'Location name'},
+                    'coords': {'type': {'type': 'array', 'elementType': 'double'},
+                               'description': 'Coordinates'},
+                },
+            },
+        },
+        'system': {
+            'sys_oterm': {
+                'total_rows': 3, 'num_columns': 1,
+                'columns': {'sys_oterm_id': {'type': 'string', 'pk': True, 'microtype': 'ME:0000267',
+                                             'description': 'Term ID'}},
+            },
+        },
+        'dynamic': {},
+    }
+    return {
+        'column_catalog': create_column_catalog(metadata),
+        'table_catalog': create_table_catalog(metadata),
+        'validation_catalog': create_validation_catalog(metadata),
+        'microtype_catalog': create_microtype_catalog(metadata),
+        'relationship_catalog': create_relationship_catalog(metadata),
+    }
+
+
+class TestMetadataCatalog:
+    """Test columnar catalogs, the store schema and catalog consumers."""
+
+    def test_parquet_catalog_queries(self, catalogs, tmp_path):
+        """Test the Parquet catalogs answer table, column and microtype lookups."""
+        written = write_catalog_parquet(catalogs, tmp_path)
+        assert set(written) == set(CATALOG_TABLES)
+
+        with MetadataCatalog.open(tmp_path) as catalog:
+            assert catalog.counts() == {
+                'column_catalog': 6, 'table_catalog': 3, 'validation_catalog': 1,
+                'microtype_catalog': 3, 'relationship_catalog': 1,
+            }
+            ids = catalog.columns(microtype='ME:0000267')
+            assert [(c['table_name'], c['column_name']) for c in ids] == [
+                ('sdt_sample', 'sdt_sample_id'), ('sys_oterm', 'sys_oterm_id')]
+            depth = catalog.columns(table='sdt_sample', column='depth')[0]
+            assert (depth['null_count'], depth['min_value'], depth['max_value']) == (2, '0.5', '9.0')
+            assert [c['column_name'] for c in catalog.columns(search='LOCATION')] == [
+                'sdt_location_name', 'sdt_location_name']
+            # Spark complex types are stored as JSON text
+            coords = catalog.columns(names=['coords'])[0]
+            assert json.loads(coords['column_type'])['type'] == 'array'
+
+            assert [t['table_name'] for t in catalog.tables('static')] == ['sdt_location', 'sdt_sample']
+            assert catalog.table('sys_oterm')['total_rows'] == 3
+            assert catalog.table('missing') is None
+            top = catalog.microtypes(limit=1)[0]
+            assert top['usage_count'] == 2 and len(top['columns']) == 2
+
+    def test_store_schema(self, catalogs, tmp_path):
+        """Test the catalogs load into an indexed cdm_metadata schema of a store."""
+        write_catalog_parquet(catalogs, tmp_path / "catalogs")
+        store = tmp_path / "cdm_store.db"
+        with duckdb.connect(str(store)) as conn:
+            conn.execute("CREATE TABLE sdt_sample (sdt_sample_id VARCHAR)")
+            counts = load_catalog_into_duckdb(conn, tmp_path / "catalogs")
+            # Reloading replaces the tables instead of duplicating rows
+            assert load_catalog_into_duckdb(conn, tmp_path / "catalogs") == counts
+            indexes = conn.execute(
+                "SELECT table_name, expressions FROM duckdb_indexes() WHERE schema_name = 'cdm_metadata'"
+            ).fetchall()
+        assert counts['cdm_column_metadata'] == 6
+        indexed = {(table, expr.strip("[]'\"")) for table, expr in indexes}
+        assert {('cdm_column_metadata', 'table_name'), ('cdm_column_metadata', 'column_name'),
+                ('cdm_column_metadata', 'microtype')} <= indexed
+
+        with MetadataCatalog.open(store) as catalog:
+            rels = catalog.relationships('sdt_location')
+            assert [(r['source_table'], r['target_column']) for r in rels] == [
+                ('sdt_sample', 'sdt_location_name')]
+            assert catalog.validation_rules('sdt_location')[0]['validation_pattern'] == '^[A-Z]'
+            rows = catalog.query(
+                "SELECT table_name, count(*) AS n FROM cdm_column_metadata GROUP BY 1 ORDER BY 1")
+            assert rows[0] == {'table_name': 'sdt_location', 'n': 2}
+
+        # A store without the schema, or a directory without catalogs, is reported
+        empty = tmp_path / "empty.db"
+        duckdb.connect(str(empty)).close()
+        with pytest.raises(FileNotFoundError):
+            MetadataCatalog.open(empty)
+        with pytest.raises(FileNotFoundError):
+            MetadataCatalog.open(tmp_path / "nothing-here")
+
+    def test_dictionary_from_catalog_and_json_fallback(self, catalogs, tmp_path):
+        """Test the data dictionary reads the same catalogs from Parquet or legacy JSON."""
+        parquet_dir = tmp_path / "parquet"
+        write_catalog_parquet(catalogs, parquet_dir)
+        json_dir = tmp_path / "json"
+        json_dir.mkdir()
+        with open(json_dir / "all_catalogs.json", "w") as f:
+            json.dump(catalogs, f)
+
+        documents = []
+        for source in (parquet_dir, json_dir):
+            with MetadataCatalog.open(source) as catalog:
+                documents.append(generate_markdown_dictionary(catalog))
+
+        markdown = documents[0]
+        assert "- **Total Columns:** 6" in markdown
+        assert "- **Total Rows:** 17" in markdown
+        assert "### sdt_sample" in markdown and "### sys_oterm" in markdown
+        assert "FK→sdt_location.sdt_location_name" in markdown
+        assert "| ME:0000267 | 2 |" in markdown
+        # Only the generation timestamp differs
+        strip = lambda doc: [l for l in doc.splitlines() if not l.startswith("**Generated:**")]
+        assert strip(documents[0]) == strip(documents[1])
+
+    def test_index_relationships(self, catalogs, tmp_path):
+        """Test store indexes read FK relationships from the store schema or the Parquet catalogs."""
+        from cdm_indexes import build_cdm_indexes
+
+        write_catalog_parquet(catalogs, tmp_path / "catalogs")
+        for load_schema in (False, True):
+            store = tmp_path / f"store_{load_schema}.db"
+            with duckdb.connect(str(store)) as conn:
+                conn.execute("CREATE TABLE sdt_sample (sdt_sample_id VARCHAR, sdt_location_name VARCHAR)")
+                if load_schema:
+                    load_catalog_into_duckdb(conn, tmp_path / "catalogs")
+                    metadata_dir = tmp_path / "nothing-here"
+                else:
+                    metadata_dir = tmp_path / "catalogs"
+                assert build_cdm_indexes(conn, metadata_dir=metadata_dir) == (2, [])
+                indexed = conn.execute(
+                    "SELECT expressions FROM duckdb_indexes() WHERE table_name = 'sdt_sample'").fetchall()
+            assert {expr.strip("[]'\"") for expr, in indexed} == {'sdt_sample_id', 'sdt_location_name'}
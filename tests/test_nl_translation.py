@@ -0,0 +1,102 @@
+"""
+Unit tests for NL query translation providers and the generated-SQL cache.
+
+Tests the nl_translation.py module functionality including:
+- Question normalization
+- Template translation of the suggested queries
+- Skipping translation for repeated questions
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts" / "cdm_analysis"))
+
+duckdb = pytest.importorskip("duckdb")
+
+from nl_translation import SQLCache, TemplateProvider, TranslationError, normalize_question
+from prompt_context import PromptContext, describe_database
+
+
+@pytest.fixture
+def store(monkeypatch):
+    """Store with locations, samples and ontology terms; caches in a temp dir."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        monkeypatch.setenv("CDM_PROMPT_CACHE_DIR", str(Path(tmpdir) / "prompt"))
+        monkeypatch.setenv("CDM_SQL_CACHE_DIR", str(Path(tmpdir) / "sql"))
+        monkeypatch.delenv("CDM_SQL_CACHE", raising=False)
+        db_path = Path(tmpdir) / "store.db"
+        with duckdb.connect(str(db_path)) as conn:
+            conn.execute("""
+                CREATE TABLE sdt_location AS
+                SELECT * FROM (VALUES ('Location0000001', 'L1'), ('Location0000002', 'L2'))
+                    t(sdt_location_id, sdt_location_name)
+            """)
+            conn.execute("""
+                CREATE TABLE sdt_sample AS
+                SELECT * FROM (VALUES ('Sample0000001', 'S1', 'L1'), ('Sample0000002', 'S2', 'L1'))
+                    t(sdt_sample_id, sdt_sample_name, sdt_location_name)
+            """)
+            conn.execute("""
+                CREATE TABLE sys_oterm AS
+                SELECT * FROM (VALUES ('ENVO:1', 'soil', NULL), ('ENVO:2', 'sand', 'ENVO:1'))
+                    t(sys_oterm_id, sys_oterm_name, parent_sys_oterm_id)
+            """)
+        yield db_path
+
+
+def test_normalize_question():
+    """Test case, whitespace and trailing punctuation are ignored."""
+    assert normalize_question("  How many   Samples?") == normalize_question("how many samples")
+
+
+class TestTemplateProvider:
+    """Test the offline rule-based translation."""
+
+    def test_suggested_queries(self, store):
+        """Test count / join / list questions produce runnable SQL."""
+        with duckdb.connect(str(store), read_only=True) as conn:
+            context = PromptContext({'tables': describe_database(conn)})
+            provider = TemplateProvider()
+
+            sql = provider.translate("Count Sample records", "", context)
+            assert conn.execute(sql).fetchall() == [(2,)]
+            sql = provider.translate("Find Sample records with their Location information", "", context)
+            assert "JOIN sdt_location" in sql
+            assert len(conn.execute(sql).fetchall()) == 2
+            sql = provider.translate("Find oterm records with their oterm information", "", context)
+            assert conn.execute(sql).fetchall() == [('ENVO:2', 'sand', 'ENVO:1', 'ENVO:1', 'soil', None)]
+            sql = provider.translate("List all locations", "", context)
+            assert len(conn.execute(sql).fetchall()) == 2
+
+            with pytest.raises(TranslationError):
+                provider.translate("Which genes are essential?", "", context)
+
+
+class TestSQLCache:
+    """Test reuse of validated SQL."""
+
+    def test_repeated_question_skips_translation(self, store):
+        """Test the second ask hits the cache and never calls the provider."""
+        from nl_sql_query import NaturalLanguageSQLQuery
+
+        tool = NaturalLanguageSQLQuery(str(store), provider="template")
+        first = tool.query("How many samples are there?")
+        assert not first['sql_cached']
+
+        def fail(*args):
+            raise AssertionError("translated a cached question")
+
+        tool.provider.translate = fail
+        second = tool.query("how many samples are there")
+        tool.close()
+        assert second['sql_cached']
+        assert second['results'] == first['results'] == [{'count': 2}]
+
+        entries = SQLCache().entries()
+        assert [(e['question'], e['hits'], e['provider']) for e in entries] == \
+            [("how many samples are there", 1, "template")]
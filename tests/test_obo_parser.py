@@ -0,0 +1,136 @@
+"""
+Unit tests for the OBO parser term graph index.
+
+Tests the obo_parser.py module functionality including:
+- Parent/child adjacency
+- Ancestor/descendant closure and is_a_transitive
+- Depth and lowest common ancestors
+"""
+
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from linkml_coral.utils.obo_parser import OBOParser
+
+# ME:1 root
+# ├── ME:2 ── ME:4 ──┐
+# └── ME:3 ──────────┴── ME:5 (two parents)
+#             └── ME:6
+OBO_TEXT = """format-version: 1.2
+ontology: test
+
+[Term]
+id: ME:1
+name: root
+
+[Term]
+id: ME:2
+name: left
+is_a: ME:1 ! root
+
+[Term]
+id: ME:3
+name: right
+is_a: ME:1 ! root
+
+[Term]
+id: ME:4
+name: left child
+is_a: ME:2 ! left
+
+[Term]
+id: ME:5
+name: shared
+is_a: ME:4 ! left child
+is_a: ME:3 ! right
+
+[Term]
+id: ME:6
+name: right child
+is_a: ME:3 ! right
+"""
+
+
+@pytest.fixture
+def parser():
+    """Parser over a small multi-parent ontology."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        obo_file = Path(tmpdir) / "test.obo"
+        obo_file.write_text(OBO_TEXT)
+        parser = OBOParser(str(obo_file))
+        parser.parse()
+        yield parser
+
+
+class TestTermGraph:
+    """Test the indexed is_a graph."""
+
+    def test_children_and_parents(self, parser):
+        """Test direct adjacency matches the is_a lines."""
+        assert parser.children("ME:1") == ["ME:2", "ME:3"]
+        assert parser.children("ME:3") == ["ME:5", "ME:6"]
+        assert parser.parents("ME:5") == ["ME:4", "ME:3"]
+        assert [t.name for t in parser.get_child_terms("ME:2")] == ["left child"]
+
+    def test_closure(self, parser):
+        """Test descendants and ancestors follow every path."""
+        assert parser.descendants("ME:1") == {"ME:2", "ME:3", "ME:4", "ME:5", "ME:6"}
+        assert parser.get_all_descendants("ME:2") == {"ME:4", "ME:5"}
+        assert parser.ancestors("ME:5") == {"ME:1", "ME:2", "ME:3", "ME:4"}
+        assert parser.ancestors("ME:1") == set()
+
+    def test_is_a_transitive(self, parser):
+        """Test transitive subclass checks."""
+        assert parser.is_a_transitive("ME:5", "ME:2")
+        assert parser.is_a_transitive("ME:6", "ME:1")
+        assert not parser.is_a_transitive("ME:6", "ME:2")
+        assert not parser.is_a_transitive("ME:2", "ME:2")
+        assert not parser.is_a_transitive("ME:5", "ME:999")
+
+    def test_depth_and_lca(self, parser):
+        """Test depth uses the longest path and LCAs are the deepest shared ancestors."""
+        assert parser.depth("ME:1") == 0
+        assert parser.depth("ME:5") == 3
+        assert parser.lowest_common_ancestor("ME:5", "ME:6") == "ME:3"
+        assert parser.lowest_common_ancestor("ME:4", "ME:6") == "ME:1"
+        assert parser.lowest_common_ancestor("ME:2", "ME:5") == "ME:2"
+        assert parser.lowest_common_ancestor("ME:1", "ME:999") is None
+
+    def test_rebuild_after_edit(self, parser):
+        """Test build_index picks up terms modified after parsing."""
+        parser.terms["ME:6"].is_a = ["ME:2"]
+        parser.build_index()
+        assert parser.is_a_transitive("ME:6", "ME:2")
+        assert parser.children("ME:3") == ["ME:5"]
+
+
+class TestParseCache:
+    """Test the binary OBO cache."""
+
+    def test_cached_parse_matches(self, parser, monkeypatch):
+        """Test a cached parse restores terms and index, and an edit invalidates it."""
+        monkeypatch.delenv("OBO_CACHE", raising=False)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            obo_file = Path(tmpdir) / "test.obo"
+            obo_file.write_text(OBO_TEXT)
+            cache_dir = Path(tmpdir) / "cache"
+
+            first = OBOParser(str(obo_file), use_cache=True, cache_dir=str(cache_dir))
+            first.parse()
+            assert not first.from_cache
+
+            cached = OBOParser(str(obo_file), use_cache=True, cache_dir=str(cache_dir))
+            cached.parse()
+            assert cached.from_cache
+            assert cached.terms == parser.terms
+            assert cached.ontology_id == "test"
+            assert cached.descendants("ME:3") == parser.descendants("ME:3")
+            assert cached.lowest_common_ancestor("ME:5", "ME:6") == "ME:3"
+
+            obo_file.write_text(OBO_TEXT.replace("name: shared", "name: renamed"))
+            edited = OBOParser(str(obo_file), use_cache=True, cache_dir=str(cache_dir))
+            edited.parse()
+            assert not edited.from_cache
+            assert edited.terms["ME:5"].name == "renamed"
@@ -0,0 +1,99 @@
+"""
+Unit tests for the ontology closure table.
+
+Tests the oterm_closure.py module functionality including:
+- Closure computation (shortest distances, multiple parents)
+- Building sys_oterm_closure from sys_oterm
+- "Descendant of X" filters
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts" / "cdm_analysis"))
+
+from oterm_closure import (
+    build_closure_table,
+    compute_closure,
+    descendant_of_sql,
+    has_closure_table,
+    parse_descendant_filter,
+)
+
+duckdb = pytest.importorskip("duckdb")
+
+
+@pytest.fixture
+def conn():
+    """In-memory store with a small sediment hierarchy and samples."""
+    conn = duckdb.connect()
+    conn.execute("""
+        CREATE TABLE sys_oterm AS SELECT * FROM (VALUES
+            ('ENVO:1', 'sediment', NULL),
+            ('ENVO:2', 'lake sediment', 'ENVO:1'),
+            ('ENVO:3', 'river sediment', 'ENVO:1'),
+            ('ENVO:4', 'lake bottom mud', 'ENVO:2'),
+            ('ENVO:9', 'soil', NULL)
+        ) t(sys_oterm_id, sys_oterm_name, parent_sys_oterm_id)
+    """)
+    conn.execute("""
+        CREATE TABLE sdt_sample AS SELECT * FROM (VALUES
+            ('Sample1', 'ENVO:1'),
+            ('Sample2', 'ENVO:4'),
+            ('Sample3', 'ENVO:3'),
+            ('Sample4', 'ENVO:9')
+        ) t(sdt_sample_id, material_sys_oterm_id)
+    """)
+    yield conn
+    conn.close()
+
+
+class TestComputeClosure:
+    """Test the closure computation."""
+
+    def test_reflexive_and_transitive(self):
+        """Test every term has a self row and reaches all ancestors."""
+        rows = set(compute_closure([("b", "a"), ("c", "b"), ("a", None)]))
+        assert rows == {
+            ("a", "a", 0), ("b", "b", 0), ("c", "c", 0),
+            ("a", "b", 1), ("b", "c", 1), ("a", "c", 2),
+        }
+
+    def test_shortest_distance(self):
+        """Test multiple paths keep the shortest distance."""
+        rows = compute_closure([("b", "a"), ("c", "b"), ("c", "a")])
+        assert ("a", "c", 1) in rows
+        assert ("a", "c", 2) not in rows
+
+
+class TestClosureTable:
+    """Test the materialized sys_oterm_closure table."""
+
+    def test_build(self, conn):
+        """Test the table is created with one row per ancestor/descendant pair."""
+        assert not has_closure_table(conn)
+        count = build_closure_table(conn)
+        assert has_closure_table(conn)
+        # 5 self rows + 4->2, 4->1, 2->1, 3->1
+        assert count == 9
+        assert conn.execute("SELECT count(*) FROM sys_oterm_closure").fetchone()[0] == 9
+
+    def test_descendant_filter(self, conn):
+        """Test filtering a term column by "sediment or any subtype"."""
+        build_closure_table(conn)
+        where = descendant_of_sql("material_sys_oterm_id", "ENVO:1")
+        rows = conn.execute(f"SELECT sdt_sample_id FROM sdt_sample WHERE {where} ORDER BY 1").fetchall()
+        assert [r[0] for r in rows] == ["Sample1", "Sample2", "Sample3"]
+
+        strict = descendant_of_sql("material_sys_oterm_id", "ENVO:1", include_self=False)
+        rows = conn.execute(f"SELECT sdt_sample_id FROM sdt_sample WHERE {strict} ORDER BY 1").fetchall()
+        assert [r[0] for r in rows] == ["Sample2", "Sample3"]
+
+    def test_parse_filter(self):
+        """Test COLUMN=TERM_ID parsing keeps the colon in term IDs."""
+        assert parse_descendant_filter("material_sys_oterm_id=ENVO:1") == ("material_sys_oterm_id", "ENVO:1")
+        with pytest.raises(ValueError):
+            parse_descendant_filter("ENVO:1")
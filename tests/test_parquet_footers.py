@@ -0,0 +1,157 @@
+"""
+Unit tests for the shared parquet footer scanner.
+
+Tests the parquet_footers.py module and its consumers including:
+- Merging Spark metadata, row counts, null counts and min/max across files
+- Reusing cached footers and re-reading files that changed
+- Metadata extraction and catalogs built from one footer scan
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts" / "cdm_analysis"))
+
+from parquet_footers import SPARK_METADATA_KEY, get_footer_cache_path, scan_cdm_footers
+from extract_cdm_metadata import analyze_table
+from create_metadata_catalog import (
+    create_column_catalog,
+    create_table_catalog,
+    load_metadata_from_database,
+)
+
+
+def spark_field(name, spark_type, comment, **extra):
+    """A Spark row metadata field with a JSON comment."""
+    return {
+        "name": name,
+        "type": spark_type,
+        "nullable": True,
+        "metadata": {"comment": json.dumps({"description": comment}), **extra},
+    }
+
+
+def write_spark_parquet(path, table, fields):
+    """Write a parquet file carrying Spark row metadata."""
+    spark = {"type": "struct", "fields": fields}
+    table = table.replace_schema_metadata({SPARK_METADATA_KEY: json.dumps(spark).encode()})
+    pq.write_table(table, path, row_group_size=2)
+
+
+@pytest.fixture
+def cdm_db(tmp_path, monkeypatch):
+    """A CDM database with a two-file sdt_sample and a one-file sys_oterm."""
+    monkeypatch.setenv("CDM_FOOTER_CACHE_DIR", str(tmp_path / "cache"))
+    db = tmp_path / "enigma_coral.db"
+
+    sample = db / "sdt_sample"
+    sample.mkdir(parents=True)
+    id_field = spark_field("sdt_sample_id", "string", "Sample ID", pk=True)
+    depth_field = spark_field("depth", "double", "Depth", units_sys_oterm_id="UO:0000008")
+    write_spark_parquet(
+        sample / "part-0.parquet",
+        pa.table({"sdt_sample_id": ["S1", "S2", "S3"], "depth": [1.5, None, 3.0]}),
+        [id_field, depth_field],
+    )
+    # A later file adds a column the first one lacks
+    write_spark_parquet(
+        sample / "part-1.parquet",
+        pa.table({"sdt_sample_id": ["S4", "S5"], "depth": [0.5, 9.0], "material": ["soil", None]}),
+        [id_field, depth_field, spark_field("material", "string", "Material")],
+    )
+
+    oterm = db / "sys_oterm"
+    oterm.mkdir()
+    write_spark_parquet(
+        oterm / "part-0.parquet",
+        pa.table({"sys_oterm_id": ["ME:1", "UO:2"]}),
+        [spark_field("sys_oterm_id", "string", "Term ID", pk=True)],
+    )
+    # Not a CDM table
+    (db / "_delta_log").mkdir()
+    return db
+
+
+class TestParquetFooters:
+    """Test footer scanning, caching and the tools that consume it."""
+
+    def test_merge_across_files(self, cdm_db):
+        """Test row counts, statistics and Spark fields are merged over all files."""
+        footers = scan_cdm_footers(cdm_db, use_cache=False)
+        assert set(footers) == {"sdt_sample", "sys_oterm"}
+
+        sample = footers["sdt_sample"]
+        assert sample["category"] == "static"
+        assert sample["num_files"] == 2 and sample["total_rows"] == 5
+        assert sample["num_row_groups"] == 3
+        assert not sample["schema_consistent"]
+
+        columns = sample["columns"]
+        assert (columns["sdt_sample_id"]["min"], columns["sdt_sample_id"]["max"]) == ("S1", "S5")
+        assert columns["depth"]["null_count"] == 1
+        assert (columns["depth"]["min"], columns["depth"]["max"]) == (0.5, 9.0)
+        # Rows of the file without the column count as nulls
+        assert columns["material"]["null_count"] == 4
+        assert columns["material"]["num_files"] == 1
+
+        fields = [f["name"] for f in sample["spark_metadata"]["fields"]]
+        assert fields == ["sdt_sample_id", "depth", "material"]
+
+        only = scan_cdm_footers(cdm_db, tables=["sys_oterm"], use_cache=False)
+        assert list(only) == ["sys_oterm"]
+
+    def test_cache_reuse_and_invalidation(self, cdm_db, capsys):
+        """Test unchanged files come from the cache and rewritten files are re-read."""
+        first = scan_cdm_footers(cdm_db, verbose=True)
+        assert "3 file(s) read" in capsys.readouterr().out
+        cache_path = get_footer_cache_path(cdm_db)
+        assert cache_path.parent == Path(os.environ["CDM_FOOTER_CACHE_DIR"])
+        assert cache_path.exists()
+
+        assert scan_cdm_footers(cdm_db, verbose=True) == first
+        assert "0 file(s) read" in capsys.readouterr().out
+
+        # Rewrite one file: only it is read again
+        oterm_file = cdm_db / "sys_oterm" / "part-0.parquet"
+        write_spark_parquet(
+            oterm_file,
+            pa.table({"sys_oterm_id": ["ME:1", "UO:2", "UO:3"]}),
+            [spark_field("sys_oterm_id", "string", "Term ID", pk=True)],
+        )
+        os.utime(oterm_file, ns=(1, 1))
+        footers = scan_cdm_footers(cdm_db, tables=["sys_oterm"], verbose=True)
+        assert "1 file(s) read" in capsys.readouterr().out
+        assert footers["sys_oterm"]["total_rows"] == 3
+
+        # A partial scan keeps the other tables' cached footers
+        assert scan_cdm_footers(cdm_db, verbose=True)["sdt_sample"] == first["sdt_sample"]
+        assert "0 file(s) read" in capsys.readouterr().out
+
+    def test_metadata_from_footers(self, cdm_db):
+        """Test extraction and catalogs use the merged footers of all files."""
+        info = analyze_table(cdm_db / "sdt_sample")
+        assert info["total_rows"] == 5 and info["num_files"] == 2
+        assert info["num_columns"] == 3
+        depth = info["columns"]["depth"]
+        assert depth["description"] == "Depth" and depth["units"] == "UO:0000008"
+        assert (depth["null_count"], depth["min"], depth["max"]) == (1, 0.5, 9.0)
+        assert info["columns"]["sdt_sample_id"]["pk"] is True
+
+        metadata = load_metadata_from_database(cdm_db)
+        assert set(metadata["static"]) == {"sdt_sample"}
+        assert set(metadata["system"]) == {"sys_oterm"}
+        assert metadata["dynamic"] == {}
+
+        columns = {(c["table_name"], c["column_name"]): c for c in create_column_catalog(metadata)}
+        assert columns[("sdt_sample", "material")]["null_count"] == 4
+        assert columns[("sdt_sample", "depth")]["max_value"] == "9.0"
+        assert columns[("sys_oterm", "sys_oterm_id")]["is_primary_key"]
+        tables = {t["table_name"]: t for t in create_table_catalog(metadata)}
+        assert tables["sdt_sample"]["total_rows"] == 5 and tables["sdt_sample"]["num_files"] == 2
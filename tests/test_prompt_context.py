@@ -0,0 +1,83 @@
+"""
+Unit tests for the NL query prompt context.
+
+Tests the prompt_context.py module functionality including:
+- Table/column description without COUNT(*) scans
+- Picking the tables a question is about
+- Reusing the cached context until the store changes
+"""
+
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts" / "cdm_analysis"))
+
+duckdb = pytest.importorskip("duckdb")
+
+from prompt_context import describe_database, get_context_path, load_prompt_context
+from result_cache import get_manifest_path
+
+TABLES = {
+    "sdt_location": ["sdt_location_id", "sdt_location_name", "latitude_degree"],
+    "sdt_sample": ["sdt_sample_id", "sdt_sample_name", "sdt_location_name", "material_sys_oterm_id"],
+    "sdt_reads": ["sdt_reads_id", "read_count"],
+    "sys_oterm": ["sys_oterm_id", "sys_oterm_name"],
+    "ddt_brick0000001": ["sdt_sample_name", "variable_value"],
+    "ddt_brick0000002": ["sdt_sample_name", "variable_value"],
+}
+
+
+@pytest.fixture
+def store(monkeypatch):
+    """Store with a few entity, ontology and brick tables."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        monkeypatch.setenv("CDM_PROMPT_CACHE_DIR", str(Path(tmpdir) / "cache"))
+        monkeypatch.delenv("CDM_PROMPT_CACHE", raising=False)
+        db_path = Path(tmpdir) / "store.db"
+        get_manifest_path(db_path).write_text(json.dumps({"load_id": "first"}))
+        with duckdb.connect(str(db_path)) as conn:
+            for table, columns in TABLES.items():
+                select = ", ".join(f"'x' AS {c}" for c in columns)
+                conn.execute(f"CREATE TABLE {table} AS SELECT {select} FROM range(10)")
+        yield db_path
+
+
+class TestPromptContext:
+    """Test building and trimming the prompt context."""
+
+    def test_describe_database(self, store):
+        """Test columns and metadata row estimates for every table."""
+        with duckdb.connect(str(store), read_only=True) as conn:
+            tables = describe_database(conn)
+        assert set(tables) == set(TABLES)
+        assert [c["name"] for c in tables["sdt_reads"]["columns"]] == TABLES["sdt_reads"]
+        assert tables["sdt_sample"]["estimated_rows"] == 10
+
+    def test_relevant_tables(self, store):
+        """Test matched tables plus the tables they reference, not referrers."""
+        with duckdb.connect(str(store), read_only=True) as conn:
+            context = load_prompt_context(conn, store)
+        assert context.relevant_tables("How many samples per location?") == \
+            ["sdt_location", "sdt_sample", "sys_oterm"]
+        assert context.relevant_tables("reads with read_count over 50000") == ["sdt_reads"]
+        assert context.relevant_tables("hello") == sorted(TABLES)
+        assert "ddt_brick0000001" in context.relevant_tables("brick values")
+
+    def test_cache_follows_reload(self, store):
+        """Test the saved context is reused, then rebuilt after a reload."""
+        with duckdb.connect(str(store), read_only=True) as conn:
+            load_prompt_context(conn, store)
+        path = get_context_path(store)
+        assert path.exists()
+
+        with duckdb.connect(str(store)) as conn:
+            conn.execute("CREATE TABLE sdt_strain AS SELECT 'x' AS sdt_strain_id")
+        get_manifest_path(store).write_text(json.dumps({"load_id": "second"}))
+        with duckdb.connect(str(store), read_only=True) as conn:
+            context = load_prompt_context(conn, store)
+        assert "sdt_strain" in context.tables
@@ -0,0 +1,112 @@
+"""
+Unit tests for the indexed provenance store.
+
+Tests the provenance_store.py module functionality including:
+- Batched writes and indexed lookups (execution ID, query type, time, fingerprint)
+- Append-only records
+- Migration from one-JSON-file-per-execution directories
+"""
+
+import json
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from provenance_store import ProvenanceStore
+
+
+def make_record(execution_id, query_type="unused_reads", start_time="2025-10-14T12:00:00", checksum="abc"):
+    return {
+        "execution": {
+            "execution_id": execution_id,
+            "query_type": query_type,
+            "start_time": start_time,
+            "duration_seconds": 1.5,
+            "status": "success",
+        },
+        "user": {"username": "tester"},
+        "database": {"path": "enigma_data.db", "checksum": checksum},
+        "results": {"total": 3},
+    }
+
+
+@pytest.fixture
+def prov_dir():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield Path(tmpdir)
+
+
+class TestProvenanceStore:
+    """Test writing, querying and migrating provenance records."""
+
+    def test_batched_writes_and_lookups(self, prov_dir):
+        """Test appends are committed in batches and found by indexed filters."""
+        store = ProvenanceStore(prov_dir, batch_size=3, flush_interval=60)
+        store.append(make_record("e1", start_time="2025-10-01T10:00:00"))
+        store.append(make_record("e2", "lineage", "2025-10-02T10:00:00", checksum="def"))
+
+        # Not committed yet: another connection sees nothing
+        with sqlite3.connect(str(store.path)) as other:
+            assert other.execute("SELECT count(*) FROM executions").fetchone()[0] == 0
+        store.append(make_record("e3", start_time="2025-10-03T10:00:00"))
+        with sqlite3.connect(str(store.path)) as other:
+            assert other.execute("SELECT count(*) FROM executions").fetchone()[0] == 3
+
+        store.append(make_record("e4", start_time="2025-10-04T10:00:00"))
+        assert store.get("e4")["results"] == {"total": 3}  # Reads flush pending records
+        assert store.get("missing") is None
+        assert [e["execution_id"] for e in store.list()] == ["e4", "e3", "e2", "e1"]
+        assert [e["execution_id"] for e in store.list(query_type="unused_reads", limit=2)] == ["e4", "e3"]
+        assert [e["execution_id"] for e in store.list(since="2025-10-02", until="2025-10-04")] == ["e3", "e2"]
+        assert [e["execution_id"] for e in store.list(fingerprint="def")] == ["e2"]
+        assert store.latest("lineage")["execution"]["execution_id"] == "e2"
+
+        plan = " ".join(str(row) for row in store._conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM executions WHERE db_fingerprint = 'def'"
+        ))
+        assert "idx_executions_fingerprint" in plan
+        store.close()
+
+    def test_shared_store_reopens_after_close(self, prov_dir):
+        """Test open() shares a store per directory and drops it once closed."""
+        store = ProvenanceStore.open(prov_dir)
+        assert ProvenanceStore.open(prov_dir) is store
+        store.append(make_record("e1"))
+        store.close()
+
+        reopened = ProvenanceStore.open(prov_dir)
+        assert reopened is not store
+        assert reopened.latest("unused_reads")["execution"]["execution_id"] == "e1"
+        reopened.close()
+
+    def test_append_only(self, prov_dir):
+        """Test records cannot be changed or removed, and duplicates are ignored."""
+        store = ProvenanceStore(prov_dir)
+        assert store.append_many([make_record("e1"), make_record("e1", query_type="other")]) == 2
+        assert store.count() == 1
+        assert store.get("e1")["execution"]["query_type"] == "unused_reads"
+        with pytest.raises(sqlite3.IntegrityError, match="append-only"):
+            store._conn.execute("DELETE FROM executions")
+        with pytest.raises(sqlite3.IntegrityError, match="append-only"):
+            store._conn.execute("UPDATE executions SET status = 'error'")
+        store.close()
+
+    def test_migrate_json_directory(self, prov_dir):
+        """Test existing JSON records are imported when the store is created."""
+        for i in range(3):
+            record = make_record(f"e{i}", start_time=f"2025-10-0{i + 1}T10:00:00")
+            (prov_dir / f"2025100{i + 1}_100000_unused_reads_e{i}.json").write_text(json.dumps(record, indent=2))
+        (prov_dir / "latest_unused_reads.json").write_text(json.dumps(make_record("e2")))
+        (prov_dir / "notes.json").write_text("not a record")
+
+        store = ProvenanceStore(prov_dir)
+        assert store.count() == 3
+        assert store.list(limit=1)[0]["execution_id"] == "e2"
+        assert store.migrate_json_records() == 0  # Already imported
+        store.close()
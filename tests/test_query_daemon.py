@@ -0,0 +1,196 @@
+"""
+Unit tests for the CDM query daemon.
+
+Tests the query_daemon.py module functionality including:
+- Warm pooling of query objects
+- Running CLI entry points in-process with captured output and the client's environment
+- Read-only access to linkml-store DuckDB databases
+- Request/response round trips over the Unix socket
+"""
+
+import os
+import socket
+import sys
+import tempfile
+import threading
+import types
+from pathlib import Path
+
+import pytest
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts" / "cdm_analysis"))
+
+from query_daemon import QueryDaemon, DaemonServer, WarmPool, read_only_stores, send_request
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="requires Unix domain sockets")
+
+
+class FakeQuery:
+    """Stand-in for an expensive query object."""
+
+    created = 0
+
+    def __init__(self, db_path):
+        FakeQuery.created += 1
+        self.db_path = db_path
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def fake_main():
+    """CLI entry point in the style of the query tools."""
+    import argparse
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--db')
+    parser.add_argument('--fail', action='store_true')
+    args = parser.parse_args()
+
+    query = fake_tool.FakeQuery(args.db)
+    print(f"db={query.db_path} created={FakeQuery.created}")
+    if os.environ.get("CDM_TEST_SETTING"):
+        print(f"setting={os.environ['CDM_TEST_SETTING']}")
+    query.close()
+    if args.fail:
+        print("boom", file=sys.stderr)
+        sys.exit(3)
+    return 0
+
+
+fake_tool = types.ModuleType("fake_query_tool")
+fake_tool.FakeQuery = FakeQuery
+fake_tool.main = fake_main
+sys.modules["fake_query_tool"] = fake_tool
+
+TOOLS = {"fake": ("fake_query_tool", ["FakeQuery"])}
+
+
+@pytest.fixture
+def daemon():
+    """Daemon with only the fake tool registered."""
+    FakeQuery.created = 0
+    daemon = QueryDaemon(tools=TOOLS)
+    yield daemon
+    daemon.close()
+    fake_tool.FakeQuery = FakeQuery
+
+
+class TestWarmPool:
+    """Test pooling of query objects."""
+
+    def test_reuses_instances(self):
+        """Test identical constructor arguments reuse the same object."""
+        pool = WarmPool()
+        create = pool.factory(FakeQuery)
+
+        first = create("a.db")
+        second = create("a.db")
+        other = create("b.db")
+
+        assert first._instance is second._instance
+        assert other._instance is not first._instance
+        assert (pool.hits, pool.misses) == (1, 2)
+
+    def test_close_is_deferred(self):
+        """Test close() on a pooled object only happens when the pool closes."""
+        pool = WarmPool()
+        query = pool.factory(FakeQuery)("a.db")
+
+        query.close()
+        assert not query._instance.closed
+        pool.close_all()
+        assert query._instance.closed
+
+
+class TestQueryDaemon:
+    """Test in-process tool execution."""
+
+    def test_run_captures_output(self, daemon):
+        """Test stdout, stderr and exit codes are captured."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            result = daemon.run("fake", ["--db", "x.db"], tmpdir)
+            assert result["exit_code"] == 0
+            assert result["stdout"].strip() == "db=x.db created=1"
+
+            failed = daemon.run("fake", ["--db", "x.db", "--fail"], tmpdir)
+            assert failed["exit_code"] == 3
+            assert "boom" in failed["stderr"]
+
+    def test_query_objects_stay_warm(self, daemon):
+        """Test repeated runs construct the query object only once."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            daemon.run("fake", ["--db", "x.db"], tmpdir)
+            result = daemon.run("fake", ["--db", "x.db"], tmpdir)
+        assert "created=1" in result["stdout"]
+
+    def test_argparse_errors(self, daemon):
+        """Test argument errors are reported instead of killing the daemon."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            result = daemon.run("fake", ["--bogus"], tmpdir)
+        assert result["exit_code"] == 2
+        assert "unrecognized arguments" in result["stderr"]
+
+    def test_client_environment(self, daemon):
+        """Test runs see the client's environment and pool objects per setting."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            env = dict(os.environ, CDM_TEST_SETTING="a")
+            first = daemon.run("fake", ["--db", "x.db"], tmpdir, env)
+            again = daemon.run("fake", ["--db", "x.db"], tmpdir, env)
+            other = daemon.run("fake", ["--db", "x.db"], tmpdir, dict(env, CDM_TEST_SETTING="b"))
+        assert "setting=a" in first["stdout"] and "created=1" in again["stdout"]
+        assert "setting=b" in other["stdout"] and "created=2" in other["stdout"]
+        assert "CDM_TEST_SETTING" not in os.environ
+
+    def test_read_only_stores(self, daemon, tmp_path):
+        """Test linkml-store attachments made for a request open DuckDB read-only."""
+        duckdb = pytest.importorskip("duckdb")
+        linkml_store = pytest.importorskip("linkml_store")
+        db_path = tmp_path / "store.db"
+        with duckdb.connect(str(db_path)) as conn:
+            conn.execute("CREATE TABLE sdt_sample AS SELECT 'S1' AS sdt_sample_name")
+
+        # Another process-level reader holds the file read-only
+        reader = duckdb.connect(str(db_path), read_only=True)
+        try:
+            with read_only_stores(daemon.pool):
+                db = linkml_store.Client().attach_database(f"duckdb:///{db_path}", alias="cdm")
+                assert db.get_collection("sdt_sample").find({}).num_rows == 1
+            with db.engine.connect() as conn:
+                with pytest.raises(Exception, match="read-only"):
+                    conn.exec_driver_sql("CREATE TABLE t (i INTEGER)")
+            assert list(daemon.pool.connections) == [str(db_path.resolve())]
+        finally:
+            reader.close()
+
+    def test_unknown_tool(self, daemon):
+        """Test requests for unregistered tools are rejected."""
+        result = daemon.handle({"op": "run", "tool": "rm", "argv": []})
+        assert result["exit_code"] == 1
+
+
+class TestSocketRoundTrip:
+    """Test the Unix socket protocol."""
+
+    def test_run_status_stop(self, daemon):
+        """Test run, status and stop requests over the socket."""
+        with tempfile.TemporaryDirectory(dir="/tmp") as tmpdir:
+            socket_path = Path(tmpdir) / "d.sock"
+            server = DaemonServer(socket_path, daemon)
+            thread = threading.Thread(target=server.serve, kwargs={"idle_timeout": 0, "poll_interval": 0.05})
+            thread.start()
+            try:
+                result = send_request({"op": "run", "tool": "fake", "argv": ["--db", "y.db"], "cwd": tmpdir},
+                                      socket_path, timeout=10)
+                assert result["stdout"].strip() == "db=y.db created=1"
+
+                status = send_request({"op": "status"}, socket_path, timeout=10)
+                assert status["requests"] == 1
+                assert status["tools_loaded"] == ["fake"]
+
+                send_request({"op": "stop"}, socket_path, timeout=10)
+            finally:
+                thread.join(timeout=10)
+                server.server_close()
+            assert not thread.is_alive()
@@ -0,0 +1,108 @@
+"""
+Unit tests for query profiling and the slow-query log.
+
+Tests the query_profiler.py module functionality including:
+- Profiling queries and logging those over the threshold with hash and fingerprint
+- Profiling generated SQL run through the execution guard
+- Ranking logged queries for the slow-query report
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts" / "cdm_analysis"))
+
+duckdb = pytest.importorskip("duckdb")
+
+from query_profiler import QueryRunner, rank_slow_queries, read_slow_query_log, sql_hash
+from sql_guard import QueryGuard
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    """A small store file and an isolated fingerprint cache."""
+    monkeypatch.setenv("CDM_FINGERPRINT_CACHE_DIR", str(tmp_path / "fingerprints"))
+    db = tmp_path / "cdm_store.db"
+    with duckdb.connect(str(db)) as conn:
+        conn.execute("CREATE TABLE sdt_sample AS SELECT range AS i, 'S' || (range % 10) AS sdt_sample_name "
+                     "FROM range(100000)")
+    return db
+
+
+class TestQueryProfiler:
+    """Test the query runner, guard integration and report ranking."""
+
+    def test_profile_and_log(self, store, tmp_path):
+        """Test queries are profiled and only those over the threshold are logged."""
+        log = tmp_path / "slow.jsonl"
+        with duckdb.connect(str(store), read_only=True) as conn:
+            runner = QueryRunner(conn, store, tool="test", threshold_ms=0, log_path=log)
+            columns, rows = runner.execute(
+                "SELECT sdt_sample_name, count(*) AS n FROM sdt_sample WHERE i > ? GROUP BY 1", [10],
+                label="counts")
+            assert columns == ["sdt_sample_name", "n"] and len(rows) == 10
+            profile = runner.last
+            assert profile.rows == 10 and profile.rows_scanned == 100000
+            assert profile.peak_memory_bytes is not None and profile.operators
+            assert profile.logged
+
+            # Above the threshold nothing is logged
+            runner.threshold_ms = 60_000
+            assert runner.fetchone("SELECT count(*) FROM sdt_sample")[0] == 100000
+            assert not runner.last.logged
+
+            # Failed queries are logged with their error
+            runner.threshold_ms = 0
+            with pytest.raises(duckdb.Error):
+                runner.execute("SELECT missing FROM sdt_sample")
+
+            quiet = QueryRunner(conn, store, threshold_ms=0, log_path=False)
+            quiet.execute("SELECT 1")
+            assert not quiet.last.logged
+
+        first, failed = read_slow_query_log(log)
+        assert first["tool"] == "test" and first["label"] == "counts"
+        assert first["sql_hash"] == sql_hash(
+            "SELECT sdt_sample_name, count(*) AS n\n  FROM sdt_sample WHERE i > ? GROUP BY 1;")
+        assert first["db_path"] == str(store.resolve())
+        assert first["db_fingerprint"] and first["rows_scanned"] == 100000
+        assert failed["error"].startswith("BinderException") and failed["rows_scanned"] is None
+
+    def test_guarded_queries(self, store, tmp_path):
+        """Test generated SQL run through the guard is profiled with its rewrite."""
+        log = tmp_path / "slow.jsonl"
+        with duckdb.connect(str(store), read_only=True) as conn:
+            runner = QueryRunner(conn, store, tool="nl_sql_query", threshold_ms=0, log_path=log)
+            result = QueryGuard(max_rows=5).execute(conn, "SELECT * FROM sdt_sample", runner=runner)
+            assert len(result.rows) == 5 and result.truncated
+        record, = read_slow_query_log(log)
+        assert record["label"] == "guarded" and "LIMIT 6" in record["sql"]
+        assert record["operators"]
+
+    def test_rank_slow_queries(self):
+        """Test logged runs are aggregated per SQL text and ranked."""
+        records = [
+            {"sql_hash": "a", "sql": "SELECT a", "tool": "enigma_query.sql", "wall_ms": 1500.0,
+             "db_fingerprint": "f1", "peak_memory_bytes": 10 * 1024 ** 2, "ts": "2026-01-01T00:00:00",
+             "operators": [{"type": "HASH_JOIN"}]},
+            {"sql_hash": "a", "sql": "SELECT a", "tool": "enigma_query.sql", "wall_ms": 2500.0,
+             "db_fingerprint": "f2", "peak_memory_bytes": 30 * 1024 ** 2, "ts": "2026-01-02T00:00:00",
+             "operators": [{"type": "TABLE_SCAN"}]},
+            {"sql_hash": "b", "sql": "SELECT b", "tool": "nl_sql_query", "wall_ms": 3000.0,
+             "rows_scanned": 5, "ts": "2026-01-01T12:00:00", "error": "InterruptException: stop"},
+        ]
+        ranked = rank_slow_queries(records)
+        assert [g["sql_hash"] for g in ranked] == ["a", "b"]
+        worst = ranked[0]
+        assert (worst["runs"], worst["total_ms"], worst["max_ms"], worst["mean_ms"]) == (2, 4000.0, 2500.0, 2000.0)
+        assert worst["peak_memory_mb"] == 30.0 and worst["fingerprints"] == 2
+        assert worst["top_operator"] == "TABLE_SCAN" and worst["last_run"] == "2026-01-02T00:00:00"
+        assert ranked[1]["errors"] == 1
+
+        assert [g["sql_hash"] for g in rank_slow_queries(records, sort="max")] == ["b", "a"]
+        assert [g["sql_hash"] for g in rank_slow_queries(records, tool="nl_sql_query")] == ["b"]
+        with pytest.raises(ValueError):
+            rank_slow_queries(records, sort="slowest")
@@ -0,0 +1,169 @@
+"""
+Unit tests for the query result cache.
+
+Tests the result_cache.py module functionality including:
+- Database fingerprints (file stats and load manifest)
+- Cache hits, misses and hit/miss events
+- Invalidation when the database is reloaded
+- LRU size eviction
+"""
+
+import json
+import os
+import pytest
+import tempfile
+import time
+from pathlib import Path
+import sys
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts" / "cdm_analysis"))
+
+from result_cache import ResultCache, database_fingerprint, get_manifest_path, normalize_params
+
+pytest.importorskip("pyarrow")
+
+
+@pytest.fixture
+def workdir():
+    """Temporary directory holding a fake database file and a cache directory."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmpdir = Path(tmpdir)
+        (tmpdir / "store.db").write_bytes(b"x" * 100)
+        yield tmpdir
+
+
+def make_cache(workdir, **kwargs):
+    return ResultCache(cache_dir=workdir / "cache", enabled=True, **kwargs)
+
+
+def reload_db(db_path: Path, content: bytes = b"y" * 120):
+    """Simulate a reload: new content and a later modification time."""
+    db_path.write_bytes(content)
+    later = time.time() + 10
+    os.utime(db_path, (later, later))
+
+
+class TestFingerprint:
+    """Test database fingerprints."""
+
+    def test_missing_database(self, workdir):
+        """Test a missing database has no fingerprint."""
+        assert database_fingerprint(workdir / "missing.db") is None
+
+    def test_changes_on_reload(self, workdir):
+        """Test the fingerprint changes when the file is rewritten."""
+        db_path = workdir / "store.db"
+        before = database_fingerprint(db_path)
+        assert database_fingerprint(db_path) == before
+
+        reload_db(db_path)
+        assert database_fingerprint(db_path) != before
+
+    def test_manifest_load_id(self, workdir):
+        """Test a new load ID in the load manifest changes the fingerprint."""
+        db_path = workdir / "store.db"
+        manifest = get_manifest_path(db_path)
+        manifest.write_text(json.dumps({"load_id": "a"}))
+        first = database_fingerprint(db_path)
+
+        manifest.write_text(json.dumps({"load_id": "b"}))
+        assert database_fingerprint(db_path) != first
+
+    def test_normalize_params(self):
+        """Test parameter order and None values do not affect the key."""
+        assert normalize_params({"b": 1, "a": 2, "c": None}) == normalize_params({"a": 2, "b": 1})
+
+
+class TestResultCache:
+    """Test cache lookups and storage."""
+
+    def test_miss_then_hit(self, workdir):
+        """Test a stored result is returned for the same kind and parameters."""
+        cache = make_cache(workdir)
+        db_path = workdir / "store.db"
+        rows = [{"reads_id": "Reads0000001", "reads_read_count": 50000}]
+
+        assert cache.get("unused_reads", {"min_count": 10}, db_path) is None
+        cache.put("unused_reads", {"min_count": 10}, db_path, rows=rows, payload={"unused": 1})
+
+        hit = cache.get("unused_reads", {"min_count": 10}, db_path)
+        assert hit.rows == rows
+        assert hit.payload == {"unused": 1}
+        assert cache.get("unused_reads", {"min_count": 20}, db_path) is None
+
+        statuses = [e["status"] for e in cache.drain_events()]
+        assert statuses == ["miss", "hit", "miss"]
+        assert cache.drain_events() == []
+
+    def test_rows_storage(self, workdir):
+        """Test dict rows go to Arrow files and other rows stay in JSON."""
+        cache = make_cache(workdir)
+        db_path = workdir / "store.db"
+
+        cache.put("dicts", {}, db_path, rows=[{"a": 1}, {"a": 2}])
+        cache.put("ids", {}, db_path, rows=["Reads1", "Reads2"])
+
+        assert len(list((workdir / "cache").glob("*.arrow"))) == 1
+        assert cache.get("ids", {}, db_path).rows == ["Reads1", "Reads2"]
+        assert cache.get("dicts", {}, db_path).rows == [{"a": 1}, {"a": 2}]
+
+        # Types come from every row; rows with different keys round-trip via JSON
+        typed = [{"a": None, "b": "x"}, {"a": 2, "b": "y"}]
+        sparse = [{"a": 1}, {"a": 2, "b": "x"}, {"b": "y"}]
+        cache.put("typed", {}, db_path, rows=typed)
+        cache.put("sparse", {}, db_path, rows=sparse)
+        assert len(list((workdir / "cache").glob("*.arrow"))) == 2
+        assert cache.get("typed", {}, db_path).rows == typed
+        assert cache.get("sparse", {}, db_path).rows == sparse
+
+    def test_invalidated_on_reload(self, workdir):
+        """Test reloading the database invalidates and removes old entries."""
+        cache = make_cache(workdir)
+        db_path = workdir / "store.db"
+        cache.put("stats", {}, db_path, payload={"total": 1})
+
+        reload_db(db_path)
+        assert cache.get("stats", {}, db_path) is None
+
+        cache.put("stats", {}, db_path, payload={"total": 2})
+        assert len(cache.entries()) == 1
+        assert cache.get("stats", {}, db_path).payload == {"total": 2}
+
+    def test_lru_eviction(self, workdir):
+        """Test the least recently used entries are evicted first."""
+        db_path = workdir / "store.db"
+        cache = make_cache(workdir)
+        payload = {"data": "z" * 2000}
+
+        cache.put("first", {}, db_path, payload=payload)
+        cache.put("second", {}, db_path, payload=payload)
+        old = time.time() - 100
+        for meta_path in (workdir / "cache").glob("*.json"):
+            os.utime(meta_path, (old, old))
+        cache.get("first", {}, db_path)  # Touch 'first'
+
+        cache.max_bytes = 5000  # room for two entries
+        cache.put("third", {}, db_path, payload=payload)
+
+        kinds = {entry["kind"] for entry in cache.entries()}
+        assert kinds == {"first", "third"}
+
+    def test_disabled(self, workdir):
+        """Test a disabled cache neither stores nor returns results."""
+        cache = ResultCache(cache_dir=workdir / "cache", enabled=False)
+        db_path = workdir / "store.db"
+
+        cache.put("stats", {}, db_path, payload={"total": 1})
+        assert cache.get("stats", {}, db_path) is None
+        assert not (workdir / "cache").exists()
+
+    def test_clear(self, workdir):
+        """Test clearing removes every entry."""
+        cache = make_cache(workdir)
+        db_path = workdir / "store.db"
+        cache.put("a", {}, db_path, rows=[{"x": 1}])
+        cache.put("b", {}, db_path, payload=1)
+
+        assert cache.clear() == 2
+        assert list((workdir / "cache").iterdir()) == []
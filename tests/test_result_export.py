@@ -0,0 +1,175 @@
+"""
+Unit tests for streaming result export.
+
+Tests the result_export.py module functionality including:
+- Format inference from file extensions
+- Streaming DuckDB results to each export format
+- Exporting Python rows in batches
+"""
+
+import json
+import pytest
+import tempfile
+from pathlib import Path
+import sys
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts" / "cdm_analysis"))
+
+from result_export import (
+    EXPORT_FORMATS,
+    METADATA_KEY,
+    infer_export_format,
+    export_query,
+    export_rows,
+)
+
+duckdb = pytest.importorskip("duckdb")
+pa = pytest.importorskip("pyarrow")
+
+SQL = "SELECT i AS id, 'item' || i AS name, i / 2.0 AS value FROM range(2500) t(i) ORDER BY i"
+
+
+def read_export(path: Path, export_format: str):
+    """Read an exported file back as a list of dicts."""
+    if export_format == "parquet":
+        import pyarrow.parquet as pq
+        return pq.read_table(path).to_pylist()
+    if export_format == "arrow":
+        return pa.ipc.open_file(str(path)).read_all().to_pylist()
+    if export_format == "csv":
+        import pyarrow.csv as pacsv
+        return pacsv.read_csv(path).to_pylist()
+    if export_format == "ndjson":
+        return [json.loads(line) for line in path.read_text().splitlines()]
+    return json.loads(path.read_text())["results"]
+
+
+class TestFormatInference:
+    """Test export format inference."""
+
+    @pytest.mark.parametrize("name,expected", [
+        ("out.parquet", "parquet"),
+        ("out.ARROW", "arrow"),
+        ("out.feather", "arrow"),
+        ("out.csv", "csv"),
+        ("out.jsonl", "ndjson"),
+        ("out.json", "json"),
+        ("out.txt", "json"),
+    ])
+    def test_from_extension(self, name, expected):
+        """Test formats are inferred from file extensions."""
+        assert infer_export_format(name) == expected
+
+    def test_explicit_format(self):
+        """Test an explicit format overrides the extension."""
+        assert infer_export_format("out.json", "csv") == "csv"
+        with pytest.raises(ValueError):
+            infer_export_format("out.json", "xlsx")
+
+
+class TestExportQuery:
+    """Test streaming query export."""
+
+    @pytest.mark.parametrize("export_format", EXPORT_FORMATS)
+    def test_round_trip(self, export_format):
+        """Test every format writes all rows across several batches."""
+        conn = duckdb.connect()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "out.dat"
+            count = export_query(conn, SQL, path, export_format=export_format, batch_size=1000)
+
+            assert count == 2500
+            rows = read_export(path, export_format)
+            assert len(rows) == 2500
+            assert rows[0]["name"] == "item0"
+            assert rows[-1]["id"] == 2499
+        conn.close()
+
+    def test_parameters_and_limit(self):
+        """Test query parameters (including a pushed-down LIMIT) are applied."""
+        conn = duckdb.connect()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "out.ndjson"
+            count = export_query(conn, f"SELECT * FROM ({SQL}) WHERE id >= ? LIMIT ?", path, [100, 5])
+
+            assert count == 5
+            assert read_export(path, "ndjson")[0]["id"] == 100
+        conn.close()
+
+    def test_json_envelope_metadata(self):
+        """Test JSON exports keep the metadata envelope layout."""
+        conn = duckdb.connect()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "out.json"
+            export_query(conn, f"{SQL} LIMIT 3", path, metadata={"query": "test", "summary": {"n": 3}})
+
+            data = json.loads(path.read_text())
+            assert data["query"] == "test"
+            assert data["summary"] == {"n": 3}
+            assert len(data["results"]) == 3
+        conn.close()
+
+    def test_parquet_metadata(self):
+        """Test Parquet exports store query metadata in the schema."""
+        import pyarrow.parquet as pq
+
+        conn = duckdb.connect()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "out.parquet"
+            export_query(conn, SQL, path, metadata={"query": "test"})
+
+            metadata = pq.read_schema(path).metadata
+            assert json.loads(metadata[METADATA_KEY]) == {"query": "test"}
+        conn.close()
+
+    def test_empty_result(self):
+        """Test empty results still produce a valid file."""
+        conn = duckdb.connect()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "out.json"
+            assert export_query(conn, f"{SQL} LIMIT 0", path) == 0
+            assert json.loads(path.read_text())["results"] == []
+        conn.close()
+
+
+class TestExportRows:
+    """Test exporting Python rows."""
+
+    def test_generator_in_batches(self):
+        """Test rows from a generator are written across batches."""
+        rows = ({"reads_id": f"Reads{i:07d}", "count": i} for i in range(250))
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "out.parquet"
+            assert export_rows(rows, path, batch_size=100) == 250
+            assert read_export(path, "parquet")[249]["count"] == 249
+
+    def test_no_rows(self):
+        """Test an empty iterable produces an empty JSON result list."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "out.json"
+            assert export_rows([], path, metadata={"query": "none"}) == 0
+            assert json.loads(path.read_text()) == {"query": "none", "results": []}
+
+    @pytest.mark.parametrize("export_format", ["parquet", "arrow", "csv", "json"])
+    def test_column_filled_after_first_batch(self, export_format):
+        """Test a column that is all None in the first batch takes its type from later batches."""
+        rows = [{"a": None, "b": 1}] * 3 + [{"a": "x", "b": 2}]
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / f"out.{export_format}"
+            assert export_rows(rows, path, export_format=export_format, batch_size=2) == 4
+            exported = read_export(path, export_format)
+        assert exported[3]["a"] == "x"
+
+    def test_column_filled_after_lookahead(self, monkeypatch):
+        """Test columns still None after the read-ahead are written as text."""
+        import result_export
+        monkeypatch.setattr(result_export, "SCHEMA_LOOKAHEAD_BATCHES", 2)
+        rows = [{"a": None, "b": i} for i in range(4)] + [{"a": 7, "b": 4}]
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "out.parquet"
+            assert export_rows(rows, path, batch_size=2) == 5
+            import pyarrow.parquet as pq
+            table = pq.read_table(path)
+        assert table.schema.field("a").type == pa.string()
+        assert table.column("a").to_pylist() == [None] * 4 + ["7"]
@@ -0,0 +1,78 @@
+"""
+Unit tests for precompiled schema snapshots.
+
+Tests the schema_snapshot.py module functionality including:
+- SchemaView-compatible accessors on the CDM schema
+- Foreign key extraction
+- Rebuilding when an imported schema file changes
+"""
+
+import shutil
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from linkml_coral.utils.schema_snapshot import SchemaSnapshot, load_schema_snapshot
+
+CDM_SCHEMA_DIR = Path(__file__).parent.parent / "src" / "linkml_coral" / "schema" / "cdm"
+CDM_SCHEMA = CDM_SCHEMA_DIR / "linkml_coral_cdm.yaml"
+
+
+@pytest.fixture(scope="module")
+def snapshot():
+    """Snapshot of the CDM schema built in a temporary cache."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield load_schema_snapshot(CDM_SCHEMA, cache_dir=tmpdir)
+
+
+class TestSchemaSnapshot:
+    """Test the snapshot accessors."""
+
+    def test_matches_schemaview(self, snapshot):
+        """Test class slots and induced slots agree with SchemaView."""
+        from linkml_runtime.utils.schemaview import SchemaView
+
+        sv = SchemaView(str(CDM_SCHEMA))
+        assert snapshot.name == sv.schema.name
+        assert list(snapshot.all_classes()) == list(sv.all_classes())
+        assert snapshot.class_slots("Sample") == list(sv.class_slots("Sample"))
+        for slot_name in sv.class_slots("Sample"):
+            expected = sv.induced_slot(slot_name, "Sample")
+            actual = snapshot.induced_slot(slot_name, "Sample")
+            for field in ("range", "required", "multivalued", "identifier", "pattern"):
+                assert getattr(actual, field) == getattr(expected, field)
+
+    def test_annotations_and_enums(self, snapshot):
+        """Test annotations expose .value and enums expose permissible values."""
+        slot = snapshot.get_slot("sdt_location_name")
+        assert slot.annotations["constraint_type"].value == "unique_key"
+        enum_name = next(iter(snapshot.all_enums()))
+        assert snapshot.get_enum(enum_name).permissible_values
+        assert snapshot.get_class("NoSuchClass") is None
+        with pytest.raises(ValueError):
+            snapshot.induced_slot("no_such_slot", "Sample")
+
+    def test_foreign_keys(self, snapshot):
+        """Test constraint_type: foreign_key slots resolve to the owning key's class."""
+        fks = {(fk["slot"], fk["target_class"]) for fk in snapshot.foreign_keys("Sample")}
+        assert ("material_sys_oterm_id", "SystemOntologyTerm") in fks
+
+    def test_rebuild_on_change(self):
+        """Test a cached snapshot is reused until an imported file changes."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            schema_dir = Path(tmpdir) / "cdm"
+            shutil.copytree(CDM_SCHEMA_DIR, schema_dir)
+            cache_dir = Path(tmpdir) / "cache"
+            schema_path = schema_dir / CDM_SCHEMA.name
+
+            first = load_schema_snapshot(schema_path, cache_dir=cache_dir)
+            assert first.is_current()
+            cached = SchemaSnapshot.load(next(cache_dir.glob("*.json")))
+            assert cached.data == first.data
+
+            base = schema_dir / "cdm_base.yaml"
+            base.write_text(base.read_text() + "\n# edited\n")
+            assert not cached.is_current()
+            rebuilt = load_schema_snapshot(schema_path, cache_dir=cache_dir)
+            assert rebuilt.is_current()
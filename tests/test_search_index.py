@@ -0,0 +1,104 @@
+"""
+Unit tests for the trigram search index.
+
+Tests the search_index.py and cdm_search.py functionality including:
+- Exact, prefix, substring and fuzzy ranking
+- Saving and loading indexes
+- Store indexes over sys_oterm and sdt_* names, and stale-index detection
+"""
+
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts" / "cdm_analysis"))
+
+from linkml_coral.utils.search_index import SearchIndex, normalize_text
+
+
+@pytest.fixture
+def index():
+    """Index over a few sediment terms and a sample name."""
+    index = SearchIndex()
+    index.add("ENVO:1", "sediment", source="sys_oterm")
+    index.add("ENVO:2", "lake sediment", source="sys_oterm")
+    index.add("ENVO:3", "Lake-bottom mud (fine)", source="sys_oterm")
+    index.add("ENVO:4", "soil", source="sys_oterm")
+    index.add("Sample1", "FW106 sediment core", field="sdt_sample_name", source="sdt_sample")
+    return index
+
+
+class TestSearchIndex:
+    """Test ranked lookups."""
+
+    def test_normalize(self):
+        """Test case and punctuation are folded."""
+        assert normalize_text("Lake-bottom mud (fine)") == "lake bottom mud fine"
+
+    def test_ranking(self, index):
+        """Test exact beats prefix, and closer texts rank first within a match kind."""
+        hits = index.search("sediment")
+        assert [(h.key, h.match) for h in hits] == [
+            ("ENVO:1", "exact"), ("ENVO:2", "prefix"), ("Sample1", "prefix")
+        ]
+
+    def test_modes(self, index):
+        """Test each match mode on its own."""
+        assert [h.key for h in index.search("lake", mode="prefix")] == ["ENVO:2", "ENVO:3"]
+        assert [h.key for h in index.search("ttom mu", mode="substring")] == ["ENVO:3"]
+        assert [h.key for h in index.search("soil", mode="exact")] == ["ENVO:4"]
+        assert index.search("sedimnet", mode="fuzzy")[0].key == "ENVO:1"
+
+    def test_sources(self, index):
+        """Test results can be restricted to one source."""
+        hits = index.search("sediment", sources=["sdt_sample"])
+        assert [h.key for h in hits] == ["Sample1"]
+
+    def test_candidates_cover_substrings(self, index):
+        """Test substring candidates never drop a real match."""
+        assert index.candidate_ids("ake sed") == [1]
+        assert index.candidate_ids("so") is None
+
+    def test_save_and_load(self, index):
+        """Test a saved index returns the same hits."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            index.save(Path(tmpdir) / "idx", metadata={"load_id": "abc"})
+            loaded = SearchIndex.load(Path(tmpdir) / "idx")
+            assert len(loaded) == len(index)
+            assert loaded.metadata["load_id"] == "abc"
+            assert [h.to_dict() for h in loaded.search("lake sed")] == \
+                [h.to_dict() for h in index.search("lake sed")]
+            with pytest.raises(ValueError):
+                loaded.add("x", "y")
+
+
+class TestStoreSearch:
+    """Test the CDM store index."""
+
+    def test_build_and_stale(self):
+        """Test the store index covers names and is ignored after a reload."""
+        duckdb = pytest.importorskip("duckdb")
+        from cdm_search import build_search_index, load_search_index
+        from result_cache import get_manifest_path
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = Path(tmpdir) / "store.db"
+            get_manifest_path(db_path).write_text(json.dumps({"load_id": "first"}))
+            with duckdb.connect(str(db_path)) as conn:
+                conn.execute("CREATE TABLE sys_oterm AS SELECT 'ENVO:1' AS sys_oterm_id, "
+                             "'sediment' AS sys_oterm_name, 'Solid material' AS sys_oterm_definition")
+                conn.execute("CREATE TABLE sdt_sample AS SELECT 'Sample1' AS sdt_sample_id, "
+                             "'FW106' AS sdt_sample_name, 'sediment' AS material_sys_oterm_name")
+                build_search_index(conn, db_path)
+
+            index = load_search_index(db_path)
+            fields = {(h.source, h.field) for h in index.search("sediment", limit=10)}
+            assert fields == {("sys_oterm", "sys_oterm_name")}
+            assert index.search("fw106")[0].key == "Sample1"
+
+            get_manifest_path(db_path).write_text(json.dumps({"load_id": "second"}))
+            assert load_search_index(db_path) is None
@@ -0,0 +1,102 @@
+"""
+Unit tests for the generated-SQL execution guard.
+
+Tests the sql_guard.py module functionality including:
+- Refusing non-SELECT and brick cross-join queries
+- Answering brick row counts from the brick index
+- LIMIT injection, row cut-off and the timeout
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts" / "cdm_analysis"))
+
+duckdb = pytest.importorskip("duckdb")
+
+from sql_guard import QueryGuard, QueryGuardError
+
+
+@pytest.fixture
+def conn():
+    """In-memory store with two bricks and a brick index."""
+    conn = duckdb.connect()
+    conn.execute("CREATE TABLE ddt_brick0000001 AS SELECT range AS i, 'S' || (range % 10) AS sdt_sample_name FROM range(5000)")
+    conn.execute("CREATE TABLE ddt_brick0000002 AS SELECT * FROM ddt_brick0000001")
+    conn.execute("CREATE TABLE ddt_brick0000003 AS SELECT * FROM ddt_brick0000001")
+    # Brick 1 was loaded as a 5,000-row sample of 82M rows; brick 3 in full
+    conn.execute("CREATE TABLE ddt_ndarray AS SELECT * FROM (VALUES "
+                 "('ddt_brick0000001', 82000000), ('ddt_brick0000003', 5000)) AS t(brick_table_name, total_rows)")
+    yield conn
+    conn.close()
+
+
+class TestQueryGuard:
+    """Test checks and limits applied to generated SQL."""
+
+    def test_refuses_unsafe_queries(self, conn):
+        """Test writes, multiple statements and brick cross joins are refused."""
+        guard = QueryGuard()
+        for sql in (
+            "DELETE FROM ddt_brick0000001",
+            "SELECT 1; SELECT 2",
+            "SELECT * FROM ddt_brick0000001 a CROSS JOIN ddt_brick0000002 b",
+        ):
+            with pytest.raises(QueryGuardError):
+                guard.execute(conn, sql)
+
+        plan_guard = QueryGuard(max_estimated_rows=1000)
+        with pytest.raises(QueryGuardError, match="too large"):
+            plan_guard.execute(conn, "SELECT * FROM ddt_brick0000001")
+
+    def test_brick_count_from_index(self, conn):
+        """Test a whole-brick COUNT(*) is answered from ddt_ndarray only when it matches the table."""
+        result = QueryGuard().execute(conn, "SELECT COUNT(*) AS n FROM ddt_brick0000003;")
+        assert result.rows == [{'n': 5000}]
+        assert result.executed_sql.startswith("SELECT 5000::BIGINT")
+
+        # A sampled brick counts its loaded rows; the recorded size is only a label
+        result = QueryGuard().execute(conn, "SELECT COUNT(*) AS n FROM ddt_brick0000001")
+        assert result.rows == [{'n': 5000}]
+        assert "82,000,000 rows (population estimate from ddt_ndarray)" in result.notes[0]
+
+        # Unindexed bricks still scan
+        result = QueryGuard().execute(conn, "SELECT COUNT(*) AS n FROM ddt_brick0000002")
+        assert result.rows == [{'n': 5000}]
+        assert not result.notes
+
+    def test_limit_and_truncation(self, conn):
+        """Test large results get a LIMIT and are cut off at max_rows."""
+        guard = QueryGuard(max_rows=100, batch_size=30)
+        result = guard.execute(conn, "SELECT * FROM ddt_brick0000001 ORDER BY i DESC")
+        assert "LIMIT 101" in result.executed_sql
+        assert result.truncated
+        assert len(result.rows) == 100
+        assert result.rows[0]['i'] == 4999
+
+        result = guard.execute(conn, "SELECT sdt_sample_name, COUNT(*) AS n FROM ddt_brick0000001 GROUP BY 1")
+        assert result.executed_sql.startswith("SELECT sdt_sample_name")
+        assert not result.truncated
+        assert len(result.rows) == 10
+
+    def test_timeout(self, conn):
+        """Test a long-running query is interrupted."""
+        guard = QueryGuard(timeout=0.2, max_estimated_rows=10 ** 15)
+        with pytest.raises(QueryGuardError, match="timeout"):
+            guard.execute(conn, "SELECT COUNT(*) FROM range(1000000000000)")
+
+    def test_cli_reports_timeout(self, tmp_path, monkeypatch, capsys):
+        """Test the CLI prints a guard error from --run instead of a traceback."""
+        import sql_guard
+
+        db = tmp_path / "cdm_store.db"
+        duckdb.connect(str(db)).close()
+        monkeypatch.setenv("CDM_QUERY_TIMEOUT", "0.2")
+        monkeypatch.setenv("CDM_QUERY_MAX_ESTIMATED_ROWS", str(10 ** 15))
+        monkeypatch.setattr(sys, "argv", ["sql_guard.py", "--db", str(db), "--run",
+                                          "SELECT COUNT(*) FROM range(1000000000000)"])
+        assert sql_guard.main() == 1
+        assert "🛑" in capsys.readouterr().out
@@ -0,0 +1,102 @@
+"""
+Unit tests for store indexes, brick ordering and the index advisor.
+
+Tests the store_indexes.py module functionality including:
+- Indexes declared by a relationship catalog and computed columns
+- Re-sorting bricks by their leading dimension
+- Advice from a query log
+"""
+
+import pytest
+
+duckdb = pytest.importorskip("duckdb")
+
+from linkml_coral.utils.store_indexes import (
+    IndexSpec,
+    advise,
+    build_indexes,
+    declared_indexes,
+    existing_indexes,
+    sort_bricks,
+    table_order,
+)
+
+
+@pytest.fixture
+def conn():
+    """Store with samples, reads and an unsorted brick."""
+    conn = duckdb.connect()
+    conn.execute("""
+        CREATE TABLE sdt_sample AS
+        SELECT 'Sample' || range AS sdt_sample_id, 'S' || range AS sdt_sample_name,
+               'L' || (range % 7) AS sdt_location_name, range::DOUBLE AS depth_meter
+        FROM range(20000)
+    """)
+    conn.execute("""
+        CREATE TABLE sdt_reads AS
+        SELECT 'Reads' || range AS sdt_reads_id, 'high' AS read_count_category, [range] AS tags
+        FROM range(10)
+    """)
+    conn.execute("""
+        CREATE TABLE ddt_brick0000001 AS
+        SELECT 'S' || ((range * 7919) % 20000) AS sdt_sample_name, range::DOUBLE AS value
+        FROM range(50000)
+    """)
+    yield conn
+    conn.close()
+
+
+def test_declared_indexes(conn):
+    """Test catalog foreign keys and computed columns are indexed once."""
+    relationships = [
+        {"source_table": "sdt_sample", "source_column": "sdt_location_name"},
+        {"source_table": "sdt_sample", "source_column": "missing_column"},
+        {"source_table": "ddt_brick0000001", "source_column": "sdt_sample_name"},
+    ]
+    specs = declared_indexes(conn, relationships=relationships)
+
+    assert specs == [
+        IndexSpec("sdt_reads", "read_count_category", "computed"),
+        IndexSpec("sdt_sample", "sdt_location_name", "foreign key"),
+    ]
+    assert build_indexes(conn, specs) == (2, [])
+    assert build_indexes(conn, specs) == (0, [])
+    assert existing_indexes(conn) == {("sdt_reads", "read_count_category"), ("sdt_sample", "sdt_location_name")}
+
+    created, errors = build_indexes(conn, [IndexSpec("sdt_reads", "tags", "test")])
+    assert created == 0 and len(errors) == 1
+
+
+def test_sort_bricks(conn):
+    """Test large bricks are ordered by their first column, once."""
+    assert sort_bricks(conn, min_rows=100_000) == []
+    assert sort_bricks(conn, min_rows=1000) == [("ddt_brick0000001", "sdt_sample_name")]
+    assert sort_bricks(conn, min_rows=1000) == []
+    assert table_order(conn) == {"ddt_brick0000001": "sdt_sample_name"}
+
+    names = [row[0] for row in conn.execute("SELECT sdt_sample_name FROM ddt_brick0000001").fetchall()]
+    assert names == sorted(names)
+    assert conn.execute("SELECT COUNT(*) FROM ddt_brick0000001").fetchone()[0] == 50000
+
+
+def test_advise_from_query_log(conn):
+    """Test point filters suggest indexes and range filters suggest ordering."""
+    queries = [
+        ("SELECT * FROM sdt_sample WHERE sdt_sample_name = 'S1'", 5),
+        ("SELECT * FROM sdt_sample WHERE depth_meter BETWEEN 1 AND 5", 2),
+        ("SELECT * FROM ddt_brick0000001 WHERE sdt_sample_name IN ('S1', 'S2')", 3),
+        ("SELECT * FROM sdt_reads WHERE sdt_reads_id = 'Reads1'", 9),
+        ("SELECT * FROM no_such_table", 1),
+    ]
+    advice, failed = advise(conn, queries, min_rows=1000)
+    assert failed == 1
+    assert [(a.kind, a.table, a.column, a.queries) for a in advice] == [
+        ("index", "sdt_sample", "sdt_sample_name", 5),
+        ("sort", "ddt_brick0000001", "sdt_sample_name", 3),
+        ("sort", "sdt_sample", "depth_meter", 2),
+    ]
+
+    for item in advice:
+        item.apply(conn)
+    advice, _ = advise(conn, queries, min_rows=1000)
+    assert advice == []
@@ -0,0 +1,120 @@
+"""
+Unit tests for synthetic CDM data and the benchmark harness.
+
+Tests the synthetic_cdm.py and cdm_benchmark.py modules including:
+- Schema-conformant, deterministic entity tables with resolvable references
+- Process input/output object strings matching sys_process_input/output
+- Benchmark runs, per-commit result files and regression comparison
+"""
+
+import json
+import re
+import sys
+import tempfile
+from pathlib import Path
+
+import pyarrow.parquet as pq
+import pytest
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts" / "cdm_analysis"))
+
+from load_cdm_parquet_to_store import CDM_SCHEMA, TABLE_TO_CLASS, extract_provenance_info, load_schema
+from synthetic_cdm import generate_cdm, read_manifest, ref_table
+from cdm_benchmark import compare_results, run_benchmark, save_results
+
+
+@pytest.fixture(scope="module")
+def synthetic():
+    """A small synthetic CDM directory."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        data_dir = Path(tmpdir) / "enigma_coral.db"
+        generate_cdm(data_dir, scale=0.05, bricks=2, brick_rows=500, rows_per_file=100, seed=7)
+        yield data_dir
+
+
+def read(data_dir, table):
+    return pq.read_table(data_dir / table).to_pylist()
+
+
+class TestSyntheticCDM:
+    """Test generated tables against the CDM schema."""
+
+    def test_entity_tables_conform_to_schema(self, synthetic):
+        """Test columns, required values, patterns and references follow the schema."""
+        schema_view = load_schema(CDM_SCHEMA)
+        names = {table: {row[f"{table}_name"] for row in read(synthetic, table)}
+                 for table in TABLE_TO_CLASS if table.startswith("sdt_") and table != "sdt_enigma"}
+
+        for table in names:
+            slots = {slot.name: slot for slot in schema_view.class_induced_slots(TABLE_TO_CLASS[table])}
+            rows = read(synthetic, table)
+            assert set(rows[0]) == set(slots)
+            assert len({row[f"{table}_id"] for row in rows}) == len(rows)
+            for name, slot in slots.items():
+                values = [row[name] for row in rows]
+                if slot.required:
+                    assert None not in values, f"{table}.{name}"
+                if slot.range == "OntologyTermID":
+                    assert all(re.match(r"^[A-Za-z_]+:\d+$", v) for v in values if v)
+                target = ref_table(name, table)
+                if target and not slot.multivalued:
+                    assert set(values) - {None} <= names[target], f"{table}.{name}"
+
+        # Large tables are split into several files; the same seed gives the same data
+        assert len(list((synthetic / "sdt_gene").glob("*.parquet"))) == 3
+        with tempfile.TemporaryDirectory() as tmpdir:
+            generate_cdm(Path(tmpdir), scale=0.05, bricks=0, rows_per_file=100, seed=7)
+            assert read(Path(tmpdir), "sdt_sample") == read(synthetic, "sdt_sample")
+
+    def test_provenance_and_bricks(self, synthetic):
+        """Test process object strings, link tables and brick metadata agree."""
+        processes = read(synthetic, "sys_process")
+        inputs = read(synthetic, "sys_process_input")
+        by_process = {}
+        for row in inputs:
+            by_process.setdefault(row["sys_process_id"], []).append(
+                f"{row['input_object_type']}:{row['input_object_name']}"
+            )
+        for process in processes:
+            parsed = extract_provenance_info(process)
+            assert parsed["input_objects_parsed"] == by_process[process["sys_process_id"]]
+
+        # Every assembly has a read as input, and some reads are never assembled
+        assembled = {row["sdt_reads_id"] for row in inputs if row["sdt_reads_id"]
+                     and row["sys_process_id"] in {p["sys_process_id"] for p in processes
+                                                   if p["output_objects"].startswith("['Assembly:")}}
+        reads = {row["sdt_reads_id"] for row in read(synthetic, "sdt_reads")}
+        assert len(assembled) == len(read(synthetic, "sdt_assembly")) and reads - assembled
+
+        manifest = read_manifest(synthetic)
+        ndarrays = read(synthetic, "ddt_ndarray")
+        assert [a["brick_table_name"] for a in ndarrays] == ["ddt_brick0000001", "ddt_brick0000002"]
+        assert all(manifest["tables"][a["brick_table_name"]] == a["total_rows"] == 500 for a in ndarrays)
+        brick = read(synthetic, "ddt_brick0000001")
+        assert list(brick[0]) == ["sdt_sample_name", "molecule_sys_oterm_id", "molecule_sys_oterm_name",
+                                  "concentration_micromolar", "abundance_count_unit"]
+        assert [row["sdt_sample_name"] for row in brick] == sorted(row["sdt_sample_name"] for row in brick)
+
+    def test_benchmark_results(self, tmp_path):
+        """Test a benchmark run, merged per-commit results and regression detection."""
+        result = run_benchmark("unused_reads", scale=0.05, repeat=2, workdir=tmp_path)
+        assert result.status == "ok", result.note
+        assert result.rows == 100 and len(result.times) == 2 and result.throughput > 0
+
+        def document(results, scales):
+            return {"commit": "abc123", "dirty": False, "machine": {"name": "host"},
+                    "params": {"scales": scales}, "results": results}
+
+        load = {"benchmark": "load", "scale": 1.0, "status": "ok", "throughput": 100_000.0, "unit": "rows/s"}
+        query = {"benchmark": "lineage", "scale": 1.0, "status": "ok", "throughput": 10.0, "unit": "lookups/s"}
+        save_results(document([load], [1.0]), tmp_path / "results")
+        path = save_results(document([query], [1.0]), tmp_path / "results")
+        assert path == tmp_path / "results" / "host" / "abc123.json"
+        saved = json.loads(path.read_text())
+        assert [r["benchmark"] for r in saved["results"]] == ["load", "lineage"]
+
+        head = document([{**load, "throughput": 50_000.0}, {**query, "throughput": 10.5},
+                         {"benchmark": "validate", "scale": 1.0, "status": "skipped"}], [1.0])
+        changes = {row["benchmark"]: row["change"] for row in compare_results(saved, head, threshold=0.1)}
+        assert changes == {"load": "regressed", "lineage": "unchanged"}
@@ -0,0 +1,121 @@
+"""
+Unit tests for the streaming HTML validation report.
+
+Tests the generate_html_validation_report.py script functionality including:
+- Grouping issues by file, status, field and message template
+- Bounded example rows and paginated drill-down pages
+- Reading JSON Lines and legacy JSON validation results alike
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from linkml_coral.utils.validation_utils import (
+    FileValidationResult,
+    RecordValidationResult,
+    ValidationResult,
+    ValidationStatus,
+)
+from generate_html_validation_report import (
+    aggregate_validation_results,
+    generate_html_report,
+    iter_validation_events,
+    message_template,
+)
+from validate_tsv_linkml import export_results_json, export_results_jsonl
+
+NUM_RECORDS = 25
+
+
+@pytest.fixture
+def file_results():
+    """Two validated files, one with FK and enum issues and one clean."""
+    records = []
+    for i in range(NUM_RECORDS):
+        results = [ValidationResult(ValidationStatus.ERROR, "FK reference not found",
+                                    field_name="location", value=f"<Loc{i}>")]
+        if i % 5 == 0:
+            results.append(ValidationResult(ValidationStatus.WARNING, f"{i % 3 + 1} invalid FK references in multivalued field",
+                                            field_name="material", value=f"ENVO:{i}"))
+        records.append(RecordValidationResult(record_line=i + 2, entity_id=f"S{i}", results=results))
+    return [
+        FileValidationResult(filename="Sample.tsv", total_records=30, record_results=records,
+                             quality_metrics={"depth": {"completeness": 50.0}}),
+        FileValidationResult(filename="Location.tsv", total_records=4),
+    ]
+
+
+class TestValidationReport:
+    """Test streaming aggregation and the generated report pages."""
+
+    def test_grouping_and_templates(self, file_results, tmp_path):
+        """Test issues are counted per (status, field, message template)."""
+        assert message_template("Value 'x' is 12 chars", "x") == "Value <text> is <n> chars"
+        assert message_template("Unknown term ENVO:1 in ENVO:10", "ENVO:1") == "Unknown term <value> in ENVO:<n>"
+
+        path = tmp_path / "report.jsonl"
+        export_results_jsonl(file_results, path)
+        events = list(iter_validation_events(path))
+        assert [e["type"] for e in events[:3]] == ["run", "file", "record"]
+        assert len(events) == 1 + 2 + NUM_RECORDS
+
+        reports = aggregate_validation_results(iter(events), max_examples=2)
+        assert list(reports) == ["Sample.tsv", "Location.tsv"]
+        sample = reports["Sample.tsv"]
+        assert sample.summary["error_count"] == NUM_RECORDS
+        groups = {(g.status, g.field, g.template): g for g in sample.groups.values()}
+        assert set(groups) == {
+            ("ERROR", "location", "FK reference not found"),
+            ("WARNING", "material", "<n> invalid FK references in multivalued field"),
+        }
+        fk = groups[("ERROR", "location", "FK reference not found")]
+        assert fk.count == NUM_RECORDS
+        assert [e["line"] for e in fk.examples] == [2, 3]
+        assert sample.issue_count == NUM_RECORDS + NUM_RECORDS // 5
+        assert not reports["Location.tsv"].groups
+
+    def test_page_and_drill_down(self, file_results, tmp_path):
+        """Test the page shows groups only and every issue lands on a drill-down page."""
+        path = tmp_path / "report.jsonl"
+        export_results_jsonl(file_results, path)
+        output = tmp_path / "html" / "report.html"
+        details = output.parent / "report_details"
+        details.mkdir(parents=True)
+        (details / "Gone.tsv-0001.html").write_text("")
+
+        generate_html_report(path, output, max_examples=3, shard_size=10)
+        html = output.read_text()
+        assert html.count('<td class="count">') == 2
+        assert '<td class="count">25</td>' in html
+        # Values are escaped and only the examples are inline
+        assert "&lt;Loc0&gt;" in html and "&lt;Loc3&gt;" not in html
+        assert 'href="report_details/Sample.tsv-0001.html#L2"' in html
+        assert "part 3 (lines 18–26)" in html
+        assert "No validation issues found" in html
+
+        pages = sorted(p.name for p in details.iterdir())
+        assert pages == [f"Sample.tsv-000{i}.html" for i in range(1, 4)]
+        rows = sum(p.read_text().count("<tr") - 1 for p in details.iterdir())
+        assert rows == NUM_RECORDS + NUM_RECORDS // 5
+        first = (details / "Sample.tsv-0001.html").read_text()
+        assert first.count('id="L2"') == 1 and 'href="../report.html"' in first
+
+    def test_legacy_json_input(self, file_results, tmp_path):
+        """Test a legacy JSON report aggregates the same as its JSON Lines twin."""
+        export_results_json(file_results, tmp_path / "report.json")
+        export_results_jsonl(file_results, tmp_path / "report.jsonl")
+        with open(tmp_path / "report.json") as f:
+            assert len(json.load(f)["files"][0]["record_results"]) == NUM_RECORDS
+
+        def summarize(name):
+            reports = aggregate_validation_results(iter_validation_events(tmp_path / name))
+            return {filename: (report.summary, {key: (g.count, g.examples) for key, g in report.groups.items()})
+                    for filename, report in reports.items()}
+
+        assert summarize("report.json") == summarize("report.jsonl")